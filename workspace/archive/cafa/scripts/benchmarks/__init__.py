@@ -0,0 +1,6 @@
+"""
+Benchmarks for performance-critical CAFA 6 pipeline stages.
+Each module is runnable as a script, e.g.:
+
+    python scripts/benchmarks/handcrafted_benchmark.py --n-proteins 20000
+"""
@@ -0,0 +1,134 @@
+"""
+Benchmark: CPU inference throughput (proteins/sec) for MLPModelV3.
+Compares eager fp32 predict_pytorch_full (per-batch numpy copies + np.vstack) against
+the CPU inference engine: BatchNorm folded, fp32 or dynamic int8, float32/float16
+preallocated output, and reports the IA-F1 delta of each on a validation split.
+
+Labels are sampled from the eager model's own probabilities, so the F1 delta measures
+how much each engine changes the model's decisions.
+
+Usage:
+    python scripts/benchmarks/cpu_inference_benchmark.py
+    python scripts/benchmarks/cpu_inference_benchmark.py --samples 50000 --terms 10000 --threads 4
+"""
+
+import argparse
+import copy
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+from sklearn.preprocessing import MultiLabelBinarizer
+
+from benchmarks.benchmark_utils import time_callable, print_benchmark_table
+from models.nn.mlp_trainer_v3 import MLPModelV3
+from utils.cpu_inference import CPUInferenceEngine, accuracy_delta_report, intra_op_threads
+from utils.model_prediction import predict_pytorch_full
+
+
+def _synthetic_model(n_features: int, n_terms: int, seed: int) -> MLPModelV3:
+    """MLPModelV3 with non-trivial BatchNorm statistics (a few train-mode passes)."""
+    torch.manual_seed(seed)
+    model = MLPModelV3(n_features, n_terms)
+    model.train()
+    with torch.no_grad():
+        for _ in range(5):
+            model(torch.randn(512, n_features) * 2 + 0.5)
+        for module in model.modules():
+            if isinstance(module, torch.nn.BatchNorm1d):
+                module.weight.uniform_(0.5, 1.5)
+                module.bias.uniform_(-0.2, 0.2)
+    return model.eval()
+
+
+def run_cpu_inference_benchmark(n_samples: int = 20000,
+                                n_features: int = 1280,
+                                n_terms: int = 5000,
+                                batch_size: int = 1024,
+                                threads: Optional[int] = None,
+                                repeats: int = 1,
+                                seed: int = 42) -> List[Dict]:
+    """
+    Time eager vs engine CPU inference on synthetic features and score IA-F1 deltas.
+
+    Returns:
+        list[dict]: One result row per method
+    """
+    rng = np.random.default_rng(seed)
+    model = _synthetic_model(n_features, n_terms, seed)
+    X = rng.standard_normal((n_samples, n_features), dtype=np.float32)
+
+    engines = {
+        'folded fp32': CPUInferenceEngine(model, quantize=False, num_threads=threads, batch_size=batch_size,
+                                          output_dtype='float32'),
+        'folded fp32 (fp16 out)': CPUInferenceEngine(model, quantize=False, num_threads=threads,
+                                                     batch_size=batch_size, output_dtype='float16'),
+        'folded int8': CPUInferenceEngine(model, quantize=True, num_threads=threads, batch_size=batch_size,
+                                          output_dtype='float32'),
+    }
+
+    eager_model = copy.deepcopy(model)
+    with intra_op_threads(threads):
+        eager_seconds, reference = time_callable(
+            lambda: predict_pytorch_full(eager_model, X, device=torch.device('cpu'), batch_size=batch_size), repeats
+        )
+    rows = [{'method': 'eager fp32 (vstack)', 'seconds': eager_seconds, 'proteins_per_sec': n_samples / eager_seconds,
+             'speedup': 1.0, 'max_abs_diff': '0'}]
+    for name, engine in engines.items():
+        out = np.empty((n_samples, engine.output_dim), dtype=engine.output_dtype)
+        seconds, proba = time_callable(lambda: engine.predict(X, out=out), repeats)
+        rows.append({
+            'method': name,
+            'seconds': seconds,
+            'proteins_per_sec': n_samples / seconds,
+            'speedup': eager_seconds / seconds,
+            'max_abs_diff': f"{np.max(np.abs(proba.astype(np.float32) - reference)):.2e}",
+        })
+
+    # Validation split: labels drawn from the eager probabilities (scaled so terms are sparse)
+    n_val = min(n_samples, 4000)
+    X_val = X[:n_val]
+    y_val = sp.csr_matrix((rng.random(reference[:n_val].shape) < reference[:n_val] * 0.02).astype(np.int8))
+    mlb = MultiLabelBinarizer()
+    mlb.fit([[f'GO:{i:07d}' for i in range(n_terms)]])
+    ia_weights = {term: float(w) for term, w in zip(mlb.classes_, rng.exponential(2.0, n_terms))}
+    threshold_grid = [i / 100 for i in range(1, 51)]
+    report = {row['method']: row for row in accuracy_delta_report(model, X_val, y_val, ia_weights, mlb,
+                                                                  threshold_grid, engines, batch_size)}
+    for row in rows:
+        accuracy = report['eager fp32' if row['method'].startswith('eager') else row['method']]
+        row['ia_f1'] = f"{accuracy['best_f1']:.5f}"
+        row['f1_delta'] = f"{accuracy['f1_delta']:+.5f}"
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark eager vs folded/quantized CPU MLP inference")
+    parser.add_argument('--samples', type=int, default=20000, help='Proteins (rows)')
+    parser.add_argument('--features', type=int, default=1280, help='Feature dimension')
+    parser.add_argument('--terms', type=int, default=5000, help='GO terms (output columns)')
+    parser.add_argument('--batch-size', type=int, default=1024, help='Inference batch size')
+    parser.add_argument('--threads', type=int, default=None, help='Intra-op threads (default: torch default)')
+    parser.add_argument('--repeats', type=int, default=1, help='Timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    rows = run_cpu_inference_benchmark(args.samples, args.features, args.terms, args.batch_size,
+                                       args.threads, args.repeats)
+    print_benchmark_table(
+        rows,
+        ['method', 'seconds', 'proteins_per_sec', 'speedup', 'max_abs_diff', 'ia_f1', 'f1_delta'],
+        title=f"CPU inference ({args.samples:,} x {args.features:,} features, {args.terms:,} terms, "
+              f"{args.threads or torch.get_num_threads()} threads)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: aligning memory-mapped embeddings to target proteins for fused features.
+Compares the previous per-chunk path (Python id→index dict per embedding type, fancy-index
+copy, astype, np.hstack, then a write into the output memmap) against the embedding store
+(hash-index lookup once, chunked sorted gather straight into the output memmap columns),
+plus the one-time store conversion.
+
+Usage:
+    python scripts/benchmarks/embedding_store_benchmark.py
+    python scripts/benchmarks/embedding_store_benchmark.py --n-proteins 200000 --dims 1280 1024 --chunk-size 50000
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+
+from benchmarks.benchmark_utils import time_callable, print_benchmark_table
+from preprocessing.feature_engineering.embeddings.embedding_store import EmbeddingStore, build_embedding_store
+
+
+def _legacy_fused(sources, target_ids, out_path: Path, chunk_size: int) -> np.ndarray:
+    """The per-chunk dict lookup + fancy-index copy + hstack path."""
+    id_mappings = [{str(pid): i for i, pid in enumerate(ids)} for _, ids in sources]
+    common = [pid for pid in target_ids if all(pid in mapping for mapping in id_mappings)]
+    total_dim = sum(embeds.shape[1] for embeds, _ in sources)
+    out = np.memmap(out_path, dtype=np.float32, mode='w+', shape=(len(common), total_dim))
+    for start in range(0, len(common), chunk_size):
+        chunk_ids = common[start:start + chunk_size]
+        parts = []
+        for (embeds, _), id_to_idx in zip(sources, id_mappings):
+            chunk_indices = [id_to_idx[str(pid)] for pid in chunk_ids if str(pid) in id_to_idx]
+            parts.append(embeds[chunk_indices].copy().astype(np.float32))
+        out[start:start + len(chunk_ids)] = np.hstack(parts)
+    out.flush()
+    return out
+
+
+def _store_fused(stores: Sequence[EmbeddingStore], target_ids, out_path: Path, chunk_size: int) -> np.ndarray:
+    """Index lookup once per store, gather into each store's column block."""
+    rows = [store.indices_of(target_ids) for store in stores]
+    common = np.flatnonzero(np.logical_and.reduce([r >= 0 for r in rows]))
+    rows = [r[common] for r in rows]
+    out = np.memmap(out_path, dtype=np.float32, mode='w+', shape=(len(common), sum(s.dim for s in stores)))
+    for start in range(0, len(common), chunk_size):
+        end = min(start + chunk_size, len(common))
+        col_offset = 0
+        for store, store_rows in zip(stores, rows):
+            store.gather_into(store_rows[start:end], out[start:end], col_offset)
+            col_offset += store.dim
+    out.flush()
+    return out
+
+
+def run_embedding_store_benchmark(n_proteins: int = 100000,
+                                  dims: Sequence[int] = (1280, 1024),
+                                  chunk_size: int = 50000,
+                                  repeats: int = 1,
+                                  seed: int = 42) -> List[Dict]:
+    """
+    Time fused alignment on synthetic memory-mapped embeddings (targets: a shuffled 90% subset).
+
+    Returns:
+        list[dict]: One result row per method
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.array([f"P{i:07d}" for i in range(n_proteins)])
+    target_ids = [str(pid) for pid in ids[rng.permutation(n_proteins)[:int(n_proteins * 0.9)]]]
+
+    with tempfile.TemporaryDirectory(prefix='embedding_store_bench_') as tmp_dir:
+        tmp = Path(tmp_dir)
+        sources = []
+        for i, dim in enumerate(dims):
+            path = tmp / f'source_{i}.npy'
+            source = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(n_proteins, dim))
+            for start in range(0, n_proteins, 16384):
+                end = min(start + 16384, n_proteins)
+                source[start:end] = rng.standard_normal((end - start, dim), dtype=np.float32)
+            source.flush()
+            del source
+            sources.append((np.load(path, mmap_mode='r'), ids))
+
+        rows = []
+        legacy_seconds, legacy = time_callable(
+            lambda: _legacy_fused(sources, target_ids, tmp / 'legacy.bin', chunk_size), repeats
+        )
+        rows.append({'method': 'dict + fancy copy + hstack', 'seconds': legacy_seconds, 'speedup': 1.0,
+                     'max_abs_diff': '0'})
+
+        for dtype in ('float32', 'float16'):
+            build_seconds, _ = time_callable(
+                lambda: [build_embedding_store(embeds, source_ids, tmp / f'store_{dtype}_{i}', dtype)
+                         for i, (embeds, source_ids) in enumerate(sources)], 1
+            )
+            rows.append({'method': f'store convert ({dtype}, one-time)', 'seconds': build_seconds, 'speedup': '-',
+                         'max_abs_diff': '-'})
+            stores = [EmbeddingStore.open(tmp / f'store_{dtype}_{i}') for i in range(len(sources))]
+            seconds, fused = time_callable(
+                lambda: _store_fused(stores, target_ids, tmp / f'store_{dtype}.bin', chunk_size), repeats
+            )
+            rows.append({'method': f'store gather ({dtype})', 'seconds': seconds, 'speedup': legacy_seconds / seconds,
+                         'max_abs_diff': f"{np.max(np.abs(fused - legacy)):.2e}"})
+            del fused, stores
+        del legacy, sources
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fused embedding alignment: dict lookups vs embedding store")
+    parser.add_argument('--n-proteins', type=int, default=100000, help='Proteins per embedding source')
+    parser.add_argument('--dims', type=int, nargs='+', default=[1280, 1024], help='Embedding dimension per source')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='Fused extraction chunk size')
+    parser.add_argument('--repeats', type=int, default=1, help='Timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    rows = run_embedding_store_benchmark(args.n_proteins, args.dims, args.chunk_size, args.repeats)
+    print_benchmark_table(
+        rows,
+        ['method', 'seconds', 'speedup', 'max_abs_diff'],
+        title=f"Fused embedding alignment ({args.n_proteins:,} proteins, dims {args.dims}, chunk {args.chunk_size:,})"
+    )
+
+
+if __name__ == "__main__":
+    main()
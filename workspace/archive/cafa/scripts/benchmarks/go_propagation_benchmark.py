@@ -0,0 +1,113 @@
+"""
+Benchmark: GO label propagation on train_terms.tsv.
+Compares the stack-walk propagate_labels_up (parents_map) against the precomputed
+GO closure index, per ontology, and checks that both produce identical labels.
+
+Usage:
+    python scripts/benchmarks/go_propagation_benchmark.py
+    python scripts/benchmarks/go_propagation_benchmark.py --train-terms path/train_terms.tsv --obo path/go-basic.obo
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import pandas as pd
+
+from benchmarks.benchmark_utils import print_benchmark_table
+from config.paths import DATA_INPUT_DIR
+from utils.go_utils import parse_obo_file, propagate_labels_up
+from utils.go_closure import GOClosureIndex, load_go_closure_index, compute_file_checksum
+
+
+def run_go_propagation_benchmark(train_terms_path: Path,
+                                 obo_path: Path,
+                                 ont_codes: List[str] = ('F', 'P', 'C')) -> List[Dict]:
+    """
+    Time legacy vs closure-index label propagation per ontology.
+    
+    Args:
+        train_terms_path: Path to train_terms.tsv
+        obo_path: Path to go-basic.obo
+        ont_codes: Ontologies to benchmark
+        
+    Returns:
+        list[dict]: One result row per ontology plus a setup row
+    """
+    train_terms = pd.read_csv(train_terms_path, sep='\t', names=['protein', 'term', 'ontology'])
+    
+    start = time.perf_counter()
+    parents_map, _ = parse_obo_file(obo_path)
+    parse_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    GOClosureIndex.from_parents_map(parents_map, obo_checksum=compute_file_checksum(obo_path))
+    build_seconds = time.perf_counter() - start
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        load_go_closure_index(obo_path, cache_dir=Path(cache_dir))
+        from utils import go_closure
+        go_closure._CLOSURE_INDEX_CACHE.clear()
+        start = time.perf_counter()
+        closure_index = load_go_closure_index(obo_path, cache_dir=Path(cache_dir))
+        load_seconds = time.perf_counter() - start
+    
+    rows = [{
+        'ontology': 'setup',
+        'proteins': 0,
+        'legacy_s': parse_seconds,
+        'index_s': load_seconds,
+        'speedup': parse_seconds / load_seconds if load_seconds > 0 else float('inf'),
+        'identical': f'build {build_seconds:.2f}s (one-time)'
+    }]
+    
+    for ont_code in ont_codes:
+        ont_terms = train_terms[train_terms['ontology'] == ont_code]
+        protein_terms = ont_terms.groupby('protein')['term'].apply(list).to_dict()
+        
+        start = time.perf_counter()
+        legacy = propagate_labels_up(protein_terms, parents_map)
+        legacy_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        indexed = propagate_labels_up(protein_terms, closure_index=closure_index)
+        index_seconds = time.perf_counter() - start
+        
+        rows.append({
+            'ontology': ont_code,
+            'proteins': len(protein_terms),
+            'legacy_s': legacy_seconds,
+            'index_s': index_seconds,
+            'speedup': legacy_seconds / index_seconds if index_seconds > 0 else float('inf'),
+            'identical': legacy == indexed
+        })
+    
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GO label propagation (legacy vs closure index)")
+    parser.add_argument('--train-terms', type=Path, default=DATA_INPUT_DIR / 'Train' / 'train_terms.tsv',
+                        help='Path to train_terms.tsv')
+    parser.add_argument('--obo', type=Path, default=DATA_INPUT_DIR / 'Train' / 'go-basic.obo',
+                        help='Path to go-basic.obo')
+    args = parser.parse_args()
+    
+    rows = run_go_propagation_benchmark(args.train_terms, args.obo)
+    print_benchmark_table(
+        rows,
+        ['ontology', 'proteins', 'legacy_s', 'index_s', 'speedup', 'identical'],
+        title=f"GO label propagation ({args.train_terms.name})"
+    )
+
+
+if __name__ == "__main__":
+    main()
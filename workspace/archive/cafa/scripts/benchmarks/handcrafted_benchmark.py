@@ -0,0 +1,107 @@
+"""
+Benchmark: handcrafted feature extraction throughput (proteins/sec).
+Compares the vectorized batch engine and the sharded process-pool engine against the
+per-sequence ThreadPoolExecutor path and checks that all produce identical feature matrices.
+
+Usage:
+    python scripts/benchmarks/handcrafted_benchmark.py --n-proteins 20000
+    python scripts/benchmarks/handcrafted_benchmark.py --fasta path/to/train_sequences.fasta
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+
+from benchmarks.benchmark_utils import time_callable, synthetic_sequences, print_benchmark_table
+from preprocessing.feature_engineering.handcrafted import extract_handcrafted_parallel
+
+
+def load_fasta_sequences(fasta_path: Path, limit: Optional[int] = None) -> Dict[str, str]:
+    """Load up to `limit` sequences from a FASTA file (UniProt IDs normalized to accession)."""
+    from Bio import SeqIO
+    
+    sequences = {}
+    for rec in SeqIO.parse(fasta_path, 'fasta'):
+        pid = rec.id.split('|')[1] if '|' in rec.id else rec.id
+        sequences[pid] = str(rec.seq)
+        if limit is not None and len(sequences) >= limit:
+            break
+    return sequences
+
+
+def run_handcrafted_benchmark(sequences: Dict[str, str],
+                              engines: List[str] = ('threads', 'batch', 'processes'),
+                              repeats: int = 3) -> List[Dict]:
+    """
+    Time extract_handcrafted_parallel for each engine.
+    
+    Args:
+        sequences: Dict mapping protein_id -> sequence
+        engines: Engines to compare (first one is the reference for the identity check)
+        repeats: Timed runs per engine (best is reported)
+        
+    Returns:
+        list[dict]: One result row per engine
+    """
+    protein_ids = list(sequences.keys())
+    rows = []
+    reference = None
+    
+    for engine in engines:
+        seconds, features = time_callable(
+            lambda: extract_handcrafted_parallel(sequences, protein_ids, engine=engine),
+            repeats=repeats
+        )
+        if reference is None:
+            reference = features
+        rows.append({
+            'engine': engine,
+            'proteins': len(protein_ids),
+            'seconds': seconds,
+            'proteins_per_sec': len(protein_ids) / seconds if seconds > 0 else float('inf'),
+            'identical': bool(np.array_equal(reference, features))
+        })
+    
+    baseline = rows[0]['proteins_per_sec']
+    for row in rows:
+        row['speedup'] = row['proteins_per_sec'] / baseline if baseline else float('nan')
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark handcrafted feature extraction engines")
+    parser.add_argument('--fasta', type=Path, help='FASTA file to benchmark on (default: synthetic sequences)')
+    parser.add_argument('--n-proteins', type=int, default=20000, help='Number of proteins (default: 20000)')
+    parser.add_argument('--mean-length', type=int, default=450, help='Median synthetic sequence length')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs per engine (default: 3)')
+    parser.add_argument('--engines', default='threads,batch,processes',
+                        help='Comma-separated engines; the first is the reference (default: threads,batch,processes)')
+    args = parser.parse_args()
+    
+    if args.fasta:
+        sequences = load_fasta_sequences(args.fasta, limit=args.n_proteins)
+    else:
+        sequences = synthetic_sequences(args.n_proteins, mean_length=args.mean_length)
+    
+    rows = run_handcrafted_benchmark(
+        sequences,
+        engines=[e.strip() for e in args.engines.split(',') if e.strip()],
+        repeats=args.repeats
+    )
+    print_benchmark_table(
+        rows,
+        ['engine', 'proteins', 'seconds', 'proteins_per_sec', 'speedup', 'identical'],
+        title=f"Handcrafted features ({len(sequences):,} proteins)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: per-ontology label matrix construction for stream_labels.
+Compares the previous path (groupby('protein')['term'].apply(list), Counter top-K,
+MultiLabelBinarizer.fit_transform on Python lists) against the label cache: a miss
+(CSR built from integer-coded columns, saved as .npz) and a hit (.npz load + row selection).
+
+Usage:
+    python scripts/benchmarks/label_cache_benchmark.py
+    python scripts/benchmarks/label_cache_benchmark.py --n-annotations 2000000 --top-k 3000
+"""
+
+import argparse
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MultiLabelBinarizer
+
+from benchmarks.benchmark_utils import time_callable, print_benchmark_table
+from preprocessing.label_cache import load_ontology_labels
+
+
+def _synthetic_train_terms(n_annotations: int, n_proteins: int, n_terms: int, seed: int) -> pd.DataFrame:
+    """Zipf-like term frequencies over three ontologies."""
+    rng = np.random.default_rng(seed)
+    proteins = np.array([f"P{i:07d}" for i in range(n_proteins)])
+    terms = np.array([f"GO:{i:07d}" for i in range(n_terms)])
+    term_codes = np.minimum(rng.zipf(1.3, n_annotations) - 1, n_terms - 1)
+    return pd.DataFrame({
+        'protein': proteins[rng.integers(0, n_proteins, n_annotations)],
+        'term': terms[term_codes],
+        'ontology': np.array(['F', 'P', 'C'])[term_codes % 3],
+    })
+
+
+def _groupby_labels(train_terms: pd.DataFrame, y_train_proteins: List[str], ont_code: str,
+                    top_k_labels: Optional[int]):
+    """The groupby/apply(list)/MultiLabelBinarizer path (no propagation)."""
+    ont_terms = train_terms[train_terms['ontology'] == ont_code]
+    protein_terms = ont_terms.groupby('protein')['term'].apply(list).to_dict()
+    if top_k_labels:
+        counts = Counter()
+        for terms in protein_terms.values():
+            counts.update(terms)
+        top_terms = set(term for term, _ in counts.most_common(top_k_labels))
+        protein_terms = {pid: [t for t in terms if t in top_terms] for pid, terms in protein_terms.items()}
+    mlb = MultiLabelBinarizer(sparse_output=True)
+    return mlb, mlb.fit_transform([protein_terms.get(pid, []) for pid in y_train_proteins])
+
+
+def run_label_cache_benchmark(n_annotations: int = 500000,
+                              n_proteins: int = 80000,
+                              n_terms: int = 30000,
+                              top_k: Optional[int] = None,
+                              repeats: int = 3,
+                              seed: int = 42) -> List[Dict]:
+    """
+    Time label matrix construction for all three ontologies.
+
+    Returns:
+        list[dict]: One result row per method
+    """
+    train_terms = _synthetic_train_terms(n_annotations, n_proteins, n_terms, seed)
+    y_train_proteins = sorted(train_terms['protein'].unique().tolist())
+    ont_codes = ['F', 'P', 'C']
+
+    with tempfile.TemporaryDirectory(prefix='label_cache_bench_') as cache_dir:
+        def cached(clear: bool):
+            if clear:
+                for path in Path(cache_dir).glob('*.npz'):
+                    path.unlink()
+            return [load_ontology_labels(train_terms, y_train_proteins, ont, top_k_labels=top_k,
+                                         use_cache=True, cache_dir=cache_dir) for ont in ont_codes]
+
+        baseline_seconds, baseline = time_callable(
+            lambda: [_groupby_labels(train_terms, y_train_proteins, ont, top_k) for ont in ont_codes], repeats
+        )
+        miss_seconds, _ = time_callable(lambda: cached(clear=True), repeats)
+        hit_seconds, result = time_callable(lambda: cached(clear=False), repeats)
+
+    identical = all((y0 != y1).nnz == 0 and list(m0.classes_) == list(m1.classes_)
+                    for (m0, y0), (m1, y1) in zip(baseline, result))
+    n_labels = sum(y.nnz for _, y in result)
+    return [
+        {'method': 'groupby + MultiLabelBinarizer', 'seconds': baseline_seconds, 'speedup': 1.0,
+         'labels': n_labels, 'identical': '-'},
+        {'method': 'label cache miss (build + save)', 'seconds': miss_seconds,
+         'speedup': baseline_seconds / miss_seconds, 'labels': n_labels, 'identical': identical},
+        {'method': 'label cache hit', 'seconds': hit_seconds, 'speedup': baseline_seconds / hit_seconds,
+         'labels': n_labels, 'identical': identical},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark label matrix construction vs the label cache")
+    parser.add_argument('--n-annotations', type=int, default=500000, help='train_terms rows')
+    parser.add_argument('--n-proteins', type=int, default=80000, help='Distinct proteins')
+    parser.add_argument('--n-terms', type=int, default=30000, help='Distinct GO terms')
+    parser.add_argument('--top-k', type=int, default=None, help='Top-K label restriction')
+    parser.add_argument('--repeats', type=int, default=3, help='Timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    rows = run_label_cache_benchmark(args.n_annotations, args.n_proteins, args.n_terms, args.top_k, args.repeats)
+    print_benchmark_table(
+        rows,
+        ['method', 'seconds', 'speedup', 'labels', 'identical'],
+        title=f"Label matrices for F/P/C ({args.n_annotations:,} annotations, {args.n_proteins:,} proteins)"
+    )
+
+
+if __name__ == "__main__":
+    main()
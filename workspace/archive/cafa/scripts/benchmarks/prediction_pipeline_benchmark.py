@@ -0,0 +1,115 @@
+"""
+Benchmark: sequential vs pipelined batch prediction.
+Features are read from an on-disk memmap, a linear "model" stands in for inference,
+top-k selection is the post-processing step and batches are appended to a columnar
+submission - the same stages make_predictions runs per ontology.
+
+Usage:
+    python scripts/benchmarks/prediction_pipeline_benchmark.py
+    python scripts/benchmarks/prediction_pipeline_benchmark.py --n-proteins 50000 --n-terms 5000 --workers 4
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+
+from benchmarks.benchmark_utils import time_callable, print_benchmark_table
+from prediction.columnar_submission import ColumnarSubmissionWriter, iter_submission_records
+from prediction.prediction_pipeline import run_prediction_pipeline
+from prediction.prediction_utils import select_top_predictions
+
+
+def run_prediction_pipeline_benchmark(n_proteins: int = 20000,
+                                      n_features: int = 512,
+                                      n_terms: int = 2000,
+                                      batch_size: int = 1000,
+                                      workers: int = 2,
+                                      max_preds: int = 200,
+                                      threshold: float = 0.3,
+                                      repeats: int = 1,
+                                      seed: int = 42) -> List[Dict]:
+    """
+    Time one ontology's prediction loop with the pipeline disabled and enabled.
+
+    Returns:
+        list[dict]: One result row per mode (with per-stage utilization of the last run)
+    """
+    rng = np.random.default_rng(seed)
+    work_dir = Path(tempfile.mkdtemp(prefix='prediction_pipeline_bench_'))
+    X = np.lib.format.open_memmap(work_dir / 'X.npy', mode='w+', dtype=np.float32, shape=(n_proteins, n_features))
+    for start in range(0, n_proteins, 10000):
+        X[start:start + 10000] = rng.standard_normal((min(10000, n_proteins - start), n_features), dtype=np.float32)
+    X.flush()
+    X = np.load(work_dir / 'X.npy', mmap_mode='r')
+    W = rng.standard_normal((n_features, n_terms)).astype(np.float32) * 0.05
+    proteins = [f"P{i:07d}" for i in range(n_proteins)]
+    terms = np.array([f"GO:{i:07d}" for i in range(n_terms)])
+    n_batches = (n_proteins + batch_size - 1) // batch_size
+
+    def run(enabled: bool, path: Path):
+        with ColumnarSubmissionWriter(path) as writer:
+            return run_prediction_pipeline(
+                n_batches,
+                read_batch=lambda i: np.asarray(X[i * batch_size:(i + 1) * batch_size]),
+                infer=lambda i, X_batch: 1.0 / (1.0 + np.exp(-(X_batch @ W))),
+                postprocess=lambda i, y: select_top_predictions(y, max_preds, threshold),
+                write=lambda i, sel: writer.write_predictions(proteins[i * batch_size:(i + 1) * batch_size],
+                                                              terms, *sel),
+                postprocess_workers=workers,
+                enabled=enabled
+            )
+
+    rows = []
+    outputs = {}
+    for enabled in (False, True):
+        path = work_dir / f"submission_{'pipeline' if enabled else 'sequential'}.cols"
+        seconds, stats = time_callable(lambda: run(enabled, path), repeats)
+        outputs[enabled] = list(iter_submission_records(path))
+        stages = stats['stages']
+        rows.append({
+            'mode': f'pipeline ({workers} post workers)' if enabled else 'sequential',
+            'seconds': seconds,
+            'speedup': rows[0]['seconds'] / seconds if rows else 1.0,
+            'rows': stats['rows_written'],
+            **{f'{name}_util': f"{stage['utilization']:.0%}" for name, stage in stages.items()},
+        })
+    rows[-1]['identical'] = rows[0]['identical'] = str(outputs[True] == outputs[False])
+
+    import shutil
+    del X
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs pipelined batch prediction")
+    parser.add_argument('--n-proteins', type=int, default=20000, help='Test proteins')
+    parser.add_argument('--n-features', type=int, default=512, help='Feature dimension')
+    parser.add_argument('--n-terms', type=int, default=2000, help='GO terms in the ontology')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Proteins per batch')
+    parser.add_argument('--workers', type=int, default=2, help='Post-processing threads')
+    parser.add_argument('--repeats', type=int, default=1, help='Timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    rows = run_prediction_pipeline_benchmark(args.n_proteins, args.n_features, args.n_terms,
+                                             args.batch_size, args.workers, repeats=args.repeats)
+    print_benchmark_table(
+        rows,
+        ['mode', 'seconds', 'speedup', 'rows', 'read_util', 'inference_util', 'postprocess_util', 'write_util',
+         'identical'],
+        title=f"Batch prediction ({args.n_proteins:,} proteins x {args.n_terms:,} terms, "
+              f"batches of {args.batch_size:,})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark: training/test sequence loading - Bio.SeqIO parsing vs the packed sequence store.
+Each method runs in a fresh interpreter so its RSS growth is measured in isolation:
+get_all_sequences_dict and stream_sequences with SeqIO (SEQUENCE_STORE_ENABLED off),
+the one-time store conversion, and the same loaders served from the store.
+
+Usage:
+    python scripts/benchmarks/sequence_store_benchmark.py
+    python scripts/benchmarks/sequence_store_benchmark.py --n-proteins 200000 --chunk-size 50000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+from benchmarks.benchmark_utils import synthetic_sequences, print_benchmark_table
+
+METHODS = [
+    ('SeqIO get_all_sequences_dict', 'seqio_dict'),
+    ('SeqIO stream_sequences', 'seqio_stream'),
+    ('store build (one-time)', 'store_build'),
+    ('store get_all_sequences_dict', 'store_dict'),
+    ('store stream_sequences', 'store_stream'),
+    ('store zero-copy range scan', 'store_scan'),
+]
+
+
+def _write_inputs(data_dir: Path, n_proteins: int, seed: int) -> None:
+    """Synthetic train_sequences.fasta (UniProt-style headers) and train_terms.tsv (~80% annotated)."""
+    sequences = synthetic_sequences(n_proteins, seed=seed)
+    with open(data_dir / 'train_sequences.fasta', 'w') as f:
+        for pid, seq in sequences.items():
+            f.write(f">sp|{pid}|{pid}_SYN some description\n")
+            for start in range(0, len(seq), 60):
+                f.write(seq[start:start + 60] + '\n')
+    with open(data_dir / 'train_terms.tsv', 'w') as f:
+        for i, pid in enumerate(sequences):
+            if i % 5:
+                f.write(f"{pid}\tGO:{i % 1000:07d}\tF\n")
+
+
+def _worker(method: str, data_dir: Path, store_root: Path, chunk_size: int) -> Dict:
+    """Run one method in this process and report seconds, sequences and RSS growth over the imports."""
+    import psutil
+    import config.features
+    import config.paths
+    config.features.SEQUENCE_STORE_ENABLED = method.startswith('store')
+    config.paths.SEQUENCE_STORE_DIR = store_root
+    from preprocessing.data_streaming import get_all_sequences_dict, stream_sequences
+    from preprocessing.sequence_store import build_sequence_store, get_sequence_store, sequence_store_dir
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    result = None
+    rss_peak = None
+    if method == 'store_build':
+        fasta = data_dir / 'train_sequences.fasta'
+        build_sequence_store(fasta, sequence_store_dir(fasta))
+        n_sequences = get_sequence_store(fasta, build=False).meta['n_sequences']
+    elif method in ('seqio_dict', 'store_dict'):
+        result = get_all_sequences_dict(data_dir)
+        n_sequences = len(result)
+    elif method in ('seqio_stream', 'store_stream'):
+        n_sequences = 0
+        for chunk in stream_sequences(data_dir, chunk_size):
+            n_sequences += len(chunk)
+            # Sampled while a chunk is alive (streaming holds one chunk at a time)
+            rss_peak = max(rss_peak or 0, process.memory_info().rss)
+    else:
+        # Residue histogram over all records without decoding Python strings
+        import numpy as np
+        store = get_sequence_store(data_dir / 'train_sequences.fasta', build=False)
+        counts = np.zeros(256, dtype=np.int64)
+        for start_idx in range(0, len(store), chunk_size):
+            residues, _ = store.residue_range(start_idx, min(start_idx + chunk_size, len(store)))
+            counts += np.bincount(residues, minlength=256)
+        n_sequences = len(store)
+    seconds = time.perf_counter() - start
+    rss_after = rss_peak or process.memory_info().rss
+    del result
+    return {'seconds': seconds, 'sequences': n_sequences, 'rss_mb': (rss_after - rss_before) / (1024 * 1024)}
+
+
+def run_sequence_store_benchmark(n_proteins: int = 100000, chunk_size: int = 50000, seed: int = 42) -> List[Dict]:
+    """
+    Time each loader in a subprocess on a synthetic FASTA.
+
+    Returns:
+        list[dict]: One result row per method
+    """
+    with tempfile.TemporaryDirectory(prefix='sequence_store_bench_') as tmp_dir:
+        data_dir = Path(tmp_dir) / 'Train'
+        data_dir.mkdir()
+        store_root = Path(tmp_dir) / 'sequence_store'
+        _write_inputs(data_dir, n_proteins, seed)
+
+        rows = []
+        baseline = {}
+        for label, method in METHODS:
+            result = subprocess.run(
+                [sys.executable, __file__, '--worker', method, '--data-dir', str(data_dir),
+                 '--store-root', str(store_root), '--chunk-size', str(chunk_size)],
+                capture_output=True, text=True, check=True
+            )
+            row = json.loads(result.stdout.strip().splitlines()[-1])
+            kind = method.split('_', 1)[1]
+            if method.startswith('seqio'):
+                baseline[kind] = row['seconds']
+            row['speedup'] = baseline[kind] / row['seconds'] if kind in baseline and method.startswith('store') else '-'
+            rows.append({'method': label, **row})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SeqIO FASTA parsing vs the packed sequence store")
+    parser.add_argument('--n-proteins', type=int, default=100000, help='Synthetic proteins in the FASTA')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='stream_sequences chunk size')
+    parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--data-dir', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--store-root', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = _worker(args.worker, Path(args.data_dir), Path(args.store_root), args.chunk_size)
+        print(json.dumps(result))
+        return
+
+    rows = run_sequence_store_benchmark(args.n_proteins, args.chunk_size)
+    print_benchmark_table(
+        rows,
+        ['method', 'seconds', 'sequences', 'rss_mb', 'speedup'],
+        title=f"Sequence loading ({args.n_proteins:,} proteins, chunk {args.chunk_size:,})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: MLP v4 SparseDataset loading throughput (samples/sec).
+Compares per-sample fetch + default collate against batch mode (BatchSampler,
+sorted memmap gather, one CSR row slice per batch), with dense or sparse COO labels
+and with the background prefetch thread, on memmap features and CSR labels.
+
+Usage:
+    python scripts/benchmarks/sparse_batch_loader_benchmark.py
+    python scripts/benchmarks/sparse_batch_loader_benchmark.py --samples 40000 --labels 30000 --batch-size 512
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+from torch.utils.data import DataLoader
+
+from benchmarks.benchmark_utils import time_callable, print_benchmark_table
+from models.nn.mlp_trainer_v4 import SparseDataset
+from utils.dataloader_utils import create_sparse_batch_dataloader
+
+
+def _consume(loader) -> int:
+    """Iterate one epoch, densifying sparse labels as train_epoch does; returns samples seen."""
+    n_seen = 0
+    for batch_X, batch_y in loader:
+        if batch_y.is_sparse:
+            batch_y = batch_y.to_dense()
+        n_seen += batch_X.shape[0]
+    return n_seen
+
+
+def _first_batches_match(reference: DataLoader, candidate, n_batches: int = 3) -> bool:
+    """Same seed → same shuffled batches (features and dense labels)."""
+    torch.manual_seed(0)
+    expected = [batch for _, batch in zip(range(n_batches), reference)]
+    torch.manual_seed(0)
+    for (exp_X, exp_y), (got_X, got_y) in zip(expected, candidate):
+        if got_y.is_sparse:
+            got_y = got_y.to_dense()
+        if not (torch.equal(exp_X, got_X) and torch.equal(exp_y, got_y)):
+            return False
+    return True
+
+
+def run_sparse_batch_loader_benchmark(n_samples: int = 20000,
+                                      n_features: int = 1280,
+                                      n_labels: int = 30000,
+                                      batch_size: int = 256,
+                                      repeats: int = 1,
+                                      seed: int = 42) -> List[Dict]:
+    """
+    Time one shuffled epoch per loader configuration on synthetic memmap/CSR data.
+
+    Returns:
+        list[dict]: One result row per loader configuration
+    """
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory(prefix='sparse_loader_bench_') as tmp_dir:
+        X_path = Path(tmp_dir) / 'features.npy'
+        X = np.lib.format.open_memmap(X_path, mode='w+', dtype=np.float32, shape=(n_samples, n_features))
+        for start in range(0, n_samples, 4096):
+            end = min(start + 4096, n_samples)
+            X[start:end] = rng.standard_normal((end - start, n_features), dtype=np.float32)
+        X.flush()
+        X = np.load(X_path, mmap_mode='r')
+        # ~40 labels per protein
+        y = sp.random(n_samples, n_labels, density=40 / n_labels, format='csr', dtype=np.float32,
+                      random_state=seed, data_rvs=np.ones)
+        indices = rng.permutation(n_samples)[: int(n_samples * 0.9)]
+
+        dense_dataset = SparseDataset(X, y, indices)
+        sparse_dataset = SparseDataset(X, y, indices, sparse_labels=True)
+        loaders = {
+            'per-sample + collate': DataLoader(dense_dataset, batch_size=batch_size, shuffle=True, num_workers=0),
+            'batch fetch': create_sparse_batch_dataloader(dense_dataset, batch_size, shuffle=True, prefetch_batches=0),
+            'batch fetch (sparse labels)': create_sparse_batch_dataloader(sparse_dataset, batch_size, shuffle=True,
+                                                                          prefetch_batches=0),
+            'batch fetch + prefetch thread': create_sparse_batch_dataloader(dense_dataset, batch_size, shuffle=True,
+                                                                            prefetch_batches=2),
+        }
+
+        rows = []
+        baseline_seconds = None
+        for method, loader in loaders.items():
+            seconds, n_seen = time_callable(lambda: _consume(loader), repeats)
+            baseline_seconds = baseline_seconds or seconds
+            rows.append({
+                'method': method,
+                'seconds': seconds,
+                'samples_per_sec': n_seen / seconds,
+                'speedup': baseline_seconds / seconds,
+                'identical': True if method.startswith('per-sample') else _first_batches_match(loaders['per-sample + collate'], loader),
+            })
+        del X
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SparseDataset per-sample vs batch loading")
+    parser.add_argument('--samples', type=int, default=20000, help='Proteins (rows)')
+    parser.add_argument('--features', type=int, default=1280, help='Feature dimension')
+    parser.add_argument('--labels', type=int, default=30000, help='GO terms (label columns)')
+    parser.add_argument('--batch-size', type=int, default=256, help='Batch size')
+    parser.add_argument('--repeats', type=int, default=1, help='Timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    rows = run_sparse_batch_loader_benchmark(args.samples, args.features, args.labels, args.batch_size, args.repeats)
+    print_benchmark_table(
+        rows,
+        ['method', 'seconds', 'samples_per_sec', 'speedup', 'identical'],
+        title=f"SparseDataset loading ({args.samples:,} x {args.features:,} features, {args.labels:,} labels, "
+              f"batch {args.batch_size})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: generating every ensemble method from the same submission files (get_all_averages).
+Compares one merge-engine pass per method (average_submissions in a loop: every pass
+re-reads, converts and aligns all inputs) against the fan-out pass (average_submissions_multi:
+inputs aligned once, each block reduced by every method into its own writer).
+
+Usage:
+    python scripts/benchmarks/submission_fan_out_benchmark.py
+    python scripts/benchmarks/submission_fan_out_benchmark.py --n-files 5 --n-rows 2000000
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+
+from benchmarks.benchmark_utils import time_callable, print_benchmark_table
+from config.ensemble import get_available_ensemble_methods
+from prediction.columnar_submission import ColumnarSubmission
+from prediction.submission_averaging import average_submissions, average_submissions_multi
+from utils.cli_utils import build_ensemble_kwargs
+from utils.logging import get_logger
+
+
+def _write_synthetic_submissions(tmp: Path, n_files: int, n_rows: int, n_proteins: int,
+                                 n_terms: int, seed: int) -> List[str]:
+    """TSV submissions over overlapping random (protein, term) keys."""
+    rng = np.random.default_rng(seed)
+    proteins = np.array([f"P{i:07d}" for i in range(n_proteins)])
+    terms = np.array([f"GO:{i:07d}" for i in range(n_terms)])
+    paths = []
+    for i in range(n_files):
+        keys = np.unique(rng.integers(0, n_proteins * n_terms, n_rows))
+        scores = rng.uniform(0.001, 1.0, len(keys))
+        path = tmp / f'submission_{i}.tsv'
+        with open(path, 'w') as f:
+            for protein, term, score in zip(proteins[keys // n_terms], terms[keys % n_terms], scores):
+                f.write(f"{protein}\t{term}\t{score:.3f}\n")
+        paths.append(str(path))
+    return paths
+
+
+def run_submission_fan_out_benchmark(n_files: int = 3,
+                                     n_rows: int = 500000,
+                                     n_proteins: int = 20000,
+                                     n_terms: int = 2000,
+                                     repeats: int = 1,
+                                     seed: int = 42) -> List[Dict]:
+    """
+    Time all seven ensemble methods over synthetic TSV inputs.
+
+    Returns:
+        list[dict]: One result row per mode
+    """
+    get_logger('prediction.submission_averaging').setLevel('WARNING')
+    methods = {method: build_ensemble_kwargs(method, power=2.0, percentile=75.0)
+               for method in get_available_ensemble_methods()}
+
+    with tempfile.TemporaryDirectory(prefix='submission_fan_out_bench_') as tmp_dir:
+        tmp = Path(tmp_dir)
+        inputs = _write_synthetic_submissions(tmp, n_files, n_rows, n_proteins, n_terms, seed)
+        input_bytes = sum(Path(path).stat().st_size for path in inputs)
+
+        def per_method():
+            return {method: average_submissions(inputs, output_path=str(tmp / f'loop_{method}.cols'),
+                                                ensemble_method=method, **kwargs)
+                    for method, kwargs in methods.items()}
+
+        def fan_out():
+            return average_submissions_multi(inputs, {
+                method: {'ensemble_method': method, 'output_path': tmp / f'fan_{method}.cols',
+                         'ensemble_kwargs': kwargs}
+                for method, kwargs in methods.items()
+            })
+
+        loop_seconds, loop_paths = time_callable(per_method, repeats)
+        fan_seconds, fan_paths = time_callable(fan_out, repeats)
+
+        identical = True
+        n_written = 0
+        for method in methods:
+            a, b = ColumnarSubmission(loop_paths[method]), ColumnarSubmission(fan_paths[method])
+            n_written += len(b)
+            identical &= (list(a.iter_records()) == list(b.iter_records()))
+
+    return [
+        {'mode': f'one pass per method ({len(methods)} passes)', 'seconds': loop_seconds, 'speedup': 1.0,
+         'input_mb_read': input_bytes * len(methods) / 1e6, 'rows_written': n_written, 'identical': '-'},
+        {'mode': 'fan-out (1 pass)', 'seconds': fan_seconds, 'speedup': loop_seconds / fan_seconds,
+         'input_mb_read': input_bytes / 1e6, 'rows_written': n_written, 'identical': identical},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark get_all_averages: per-method passes vs one fan-out pass")
+    parser.add_argument('--n-files', type=int, default=3, help='Input submissions')
+    parser.add_argument('--n-rows', type=int, default=500000, help='Rows per input submission')
+    parser.add_argument('--n-proteins', type=int, default=20000, help='Distinct proteins')
+    parser.add_argument('--n-terms', type=int, default=2000, help='Distinct GO terms')
+    parser.add_argument('--repeats', type=int, default=1, help='Timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    rows = run_submission_fan_out_benchmark(args.n_files, args.n_rows, args.n_proteins, args.n_terms, args.repeats)
+    print_benchmark_table(
+        rows,
+        ['mode', 'seconds', 'speedup', 'input_mb_read', 'rows_written', 'identical'],
+        title=f"All ensemble methods over {args.n_files} submissions ({args.n_rows:,} rows each)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: IA-weighted threshold optimization.
+Compares the per-threshold grid loop (binarize + three boolean passes per grid value)
+against the single-pass sweep on a BPO-sized validation set, dense and sparse labels,
+and reports the per-term threshold mode alongside.
+
+Usage:
+    python scripts/benchmarks/threshold_sweep_benchmark.py
+    python scripts/benchmarks/threshold_sweep_benchmark.py --samples 4000 --terms 16000 --grid 50
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import MultiLabelBinarizer
+
+from benchmarks.benchmark_utils import time_callable, print_benchmark_table
+from prediction.threshold_optimization import (
+    compute_ia_weighted_f1,
+    sweep_ia_weighted_f1,
+    optimize_per_term_thresholds
+)
+
+
+def _legacy_grid_f1(y_val_proba: np.ndarray, y_val_true: np.ndarray, ia_weights: Dict[str, float],
+                    mlb: MultiLabelBinarizer, threshold_grid: List[float]) -> np.ndarray:
+    """Grid loop as previously used in optimize_threshold (one dense binarization per threshold)."""
+    f1_scores = []
+    for threshold in threshold_grid:
+        y_pred_binary = (y_val_proba >= threshold).astype(int)
+        _, _, f1 = compute_ia_weighted_f1(y_val_true, y_pred_binary, ia_weights, mlb)
+        f1_scores.append(f1)
+    return np.array(f1_scores)
+
+
+def run_threshold_sweep_benchmark(n_samples: int = 3000,
+                                  n_terms: int = 12000,
+                                  n_thresholds: int = 50,
+                                  repeats: int = 1,
+                                  seed: int = 42) -> List[Dict]:
+    """
+    Time legacy vs single-pass threshold search on synthetic validation data.
+
+    Labels follow a long-tailed term frequency (few frequent terms, many rare ones),
+    and scores are noisy sigmoid-like outputs correlated with the labels.
+
+    Returns:
+        list[dict]: One result row per method
+    """
+    rng = np.random.default_rng(seed)
+    term_freq = np.clip(rng.pareto(1.2, n_terms) * 0.002, 0.0002, 0.3)
+    y_val_true = (rng.random((n_samples, n_terms)) < term_freq).astype(np.int8)
+    # Per-term calibration differs, so per-term thresholds have something to gain
+    term_scale = rng.uniform(0.2, 1.0, n_terms).astype(np.float32)
+    noise = rng.random((n_samples, n_terms), dtype=np.float32) ** 8
+    signal = y_val_true * rng.uniform(0.1, 0.6, (n_samples, n_terms)).astype(np.float32)
+    y_val_proba = np.clip((noise * 0.6 + signal) * term_scale, 0, 1).astype(np.float32)
+
+    mlb = MultiLabelBinarizer()
+    mlb.fit([[f'GO:{i:07d}' for i in range(n_terms)]])
+    ia_weights = {term: float(w) for term, w in zip(mlb.classes_, rng.exponential(2.0, n_terms))}
+    threshold_grid = [i / 100 for i in range(1, n_thresholds + 1)]
+    y_val_sparse = sp.csr_matrix(y_val_true)
+
+    legacy_seconds, legacy_f1 = time_callable(
+        lambda: _legacy_grid_f1(y_val_proba, y_val_true, ia_weights, mlb, threshold_grid), repeats
+    )
+    sweep_seconds, sweep_scores = time_callable(
+        lambda: sweep_ia_weighted_f1(y_val_proba, y_val_true, ia_weights, mlb, threshold_grid), repeats
+    )
+    sparse_seconds, sparse_scores = time_callable(
+        lambda: sweep_ia_weighted_f1(y_val_proba, y_val_sparse, ia_weights, mlb, threshold_grid), repeats
+    )
+    per_term_seconds, (_, per_term_f1) = time_callable(
+        lambda: optimize_per_term_thresholds(y_val_proba, y_val_sparse, ia_weights, mlb, threshold_grid), repeats
+    )
+
+    best = int(np.argmax(legacy_f1))
+    return [
+        {'method': 'grid loop (dense)', 'seconds': legacy_seconds, 'best_f1': float(legacy_f1[best]),
+         'speedup': 1.0, 'identical': True},
+        {'method': 'single-pass sweep (dense)', 'seconds': sweep_seconds, 'best_f1': float(sweep_scores[2].max()),
+         'speedup': legacy_seconds / sweep_seconds, 'identical': np.array_equal(legacy_f1, sweep_scores[2])},
+        {'method': 'single-pass sweep (sparse)', 'seconds': sparse_seconds, 'best_f1': float(sparse_scores[2].max()),
+         'speedup': legacy_seconds / sparse_seconds, 'identical': np.array_equal(legacy_f1, sparse_scores[2])},
+        {'method': 'per-term thresholds (sparse)', 'seconds': per_term_seconds, 'best_f1': per_term_f1,
+         'speedup': legacy_seconds / per_term_seconds, 'identical': '-'},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IA-weighted threshold optimization")
+    parser.add_argument('--samples', type=int, default=3000, help='Validation proteins (rows)')
+    parser.add_argument('--terms', type=int, default=12000, help='GO terms (columns)')
+    parser.add_argument('--grid', type=int, default=50, help='Thresholds in the grid (0.01 steps)')
+    parser.add_argument('--repeats', type=int, default=1, help='Timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    rows = run_threshold_sweep_benchmark(args.samples, args.terms, args.grid, args.repeats)
+    print_benchmark_table(
+        rows,
+        ['method', 'seconds', 'best_f1', 'speedup', 'identical'],
+        title=f"Threshold optimization ({args.samples:,} x {args.terms:,}, {args.grid} thresholds)"
+    )
+
+
+if __name__ == "__main__":
+    main()
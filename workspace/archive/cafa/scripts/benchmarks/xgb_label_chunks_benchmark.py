@@ -0,0 +1,100 @@
+"""
+Benchmark: per-ontology XGBoost training over many GO terms.
+Compares OneVsRestClassifier(XGBClassifier) (X re-quantized for every label, one
+booster per label) against the label-chunked engine (X quantized once, multi-target
+boosters per label chunk), with both multi_strategy settings, plus predict_proba time.
+
+Usage:
+    python scripts/benchmarks/xgb_label_chunks_benchmark.py
+    python scripts/benchmarks/xgb_label_chunks_benchmark.py --n-samples 20000 --n-features 1000 --n-labels 200
+"""
+
+import argparse
+import sys
+import warnings
+from pathlib import Path
+from typing import Dict, List
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+
+from benchmarks.benchmark_utils import time_callable, print_benchmark_table
+from models.xgb.xgboost_label_chunks import train_label_chunked_xgb, resolve_thread_budget
+
+
+def _synthetic_labels(n_samples: int, n_features: int, n_labels: int, seed: int):
+    """Dense features and sparse-ish labels from random linear projections."""
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_samples, n_features), dtype=np.float32)
+    logits = X[:, :32] @ rng.standard_normal((32, n_labels)) + rng.standard_normal((n_samples, n_labels)) * 3
+    return X, (logits > np.quantile(logits, 0.95, axis=0)).astype(np.int64)
+
+
+def run_xgb_label_chunks_benchmark(n_samples: int = 5000,
+                                   n_features: int = 200,
+                                   n_labels: int = 32,
+                                   n_estimators: int = 20,
+                                   chunk_size: int = 32,
+                                   repeats: int = 1,
+                                   seed: int = 42) -> List[Dict]:
+    """
+    Time training and prediction for one synthetic ontology.
+
+    Returns:
+        list[dict]: One result row per engine
+    """
+    import xgboost as xgb
+    from sklearn.multiclass import OneVsRestClassifier
+
+    X, Y = _synthetic_labels(n_samples, n_features, n_labels, seed)
+    params = {'n_estimators': n_estimators, 'max_depth': 6, 'learning_rate': 0.1,
+              'random_state': seed, 'n_jobs': -1, 'verbosity': 0, 'tree_method': 'hist'}
+
+    def train_ovr():
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return OneVsRestClassifier(xgb.XGBClassifier(**params), n_jobs=-1).fit(X, Y)
+
+    ovr_seconds, ovr = time_callable(train_ovr, repeats)
+    ovr_predict_seconds, reference = time_callable(lambda: ovr.predict_proba(X), repeats)
+    rows = [{'engine': 'OneVsRest(XGBClassifier)', 'train_s': ovr_seconds, 'speedup': 1.0,
+             'predict_s': ovr_predict_seconds, 'boosters': n_labels, 'max_abs_diff': '0'}]
+
+    workers, nthread = resolve_thread_budget(params['n_jobs'])
+    for strategy in ('one_output_per_tree', 'multi_output_tree'):
+        seconds, model = time_callable(
+            lambda: train_label_chunked_xgb(X, Y, params, chunk_size=chunk_size, multi_strategy=strategy), repeats
+        )
+        predict_seconds, proba = time_callable(lambda: model.predict_proba(X), repeats)
+        rows.append({'engine': f'label chunks ({strategy}, {workers}x{nthread} threads)', 'train_s': seconds,
+                     'speedup': ovr_seconds / seconds, 'predict_s': predict_seconds, 'boosters': model.n_boosters,
+                     'max_abs_diff': f"{np.max(np.abs(proba - reference)):.2e}"})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XGBoost one-vs-rest vs label-chunked training")
+    parser.add_argument('--n-samples', type=int, default=5000, help='Training samples')
+    parser.add_argument('--n-features', type=int, default=200, help='Feature dimension')
+    parser.add_argument('--n-labels', type=int, default=32, help='GO terms')
+    parser.add_argument('--n-estimators', type=int, default=20, help='Boosting rounds')
+    parser.add_argument('--chunk-size', type=int, default=32, help='Labels per multi-target booster')
+    parser.add_argument('--repeats', type=int, default=1, help='Timing repeats (best is reported)')
+    args = parser.parse_args()
+
+    rows = run_xgb_label_chunks_benchmark(args.n_samples, args.n_features, args.n_labels,
+                                          args.n_estimators, args.chunk_size, args.repeats)
+    print_benchmark_table(
+        rows,
+        ['engine', 'train_s', 'speedup', 'predict_s', 'boosters', 'max_abs_diff'],
+        title=f"XGBoost per-ontology training ({args.n_samples:,} x {args.n_features} features, "
+              f"{args.n_labels} labels, {args.n_estimators} rounds)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,11 @@ from .models import (
 
 from .grid_search import (
     GRID_SEARCH_CONFIGS,
+    GRID_SEARCH_N_WORKERS,
+    GRID_SEARCH_THREADS_PER_WORKER,
+    GRID_SEARCH_MODE,
+    ASHA_MIN_EPOCHS,
+    ASHA_REDUCTION_FACTOR,
     get_grid_search_config
 )
 
@@ -44,22 +49,43 @@ from .features import (
     get_feature_dimensions,
     parse_model_feature_config,
     get_embedding_feature_types,
-    is_valid_embedding_type
+    is_valid_embedding_type,
+    FEATURE_STORE_ENABLED,
+    FEATURE_STORE_MAX_GB,
+    FEATURE_CODE_VERSION,
+    FUSED_FEATURE_LAYOUT,
+    SEQUENCE_STORE_ENABLED,
+    EMBEDDING_STORE_ENABLED,
+    EMBEDDING_STORE_DTYPE,
+    EMBEDDING_STORE_GATHER_ROWS
 )
 
 from .pipelines import (
     PIPELINE_CONFIGS,
+    RUN_PROFILE_CPROFILE_TOP_N,
     get_pipeline_config
 )
 
 from .prediction import (
     PREDICTION_SETTINGS,
     MAX_PREDICTIONS_PER_PROTEIN,
-    SUBMISSION_SORT_CHUNK_SIZE,
+    SUBMISSION_MERGE_BUDGET_ROWS,
+    SUBMISSION_ENSEMBLE_BLOCK_ROWS,
+    SUBMISSION_AVERAGING_FAN_OUT,
     VALIDATION_SAMPLE_SIZE,
     DEFAULT_THRESHOLD,
+    COLUMNAR_SUBMISSION_SUFFIX,
+    COLUMNAR_SUBMISSION_CHUNK_ROWS,
     PREDICTION_PROGRESS_INTERVALS,
     ENSEMBLE_GC_COLLECT_INTERVAL,
+    PREDICTION_PIPELINE_ENABLED,
+    PREDICTION_PIPELINE_PREFETCH_BATCHES,
+    PREDICTION_PIPELINE_POSTPROCESS_WORKERS,
+    PREDICTION_PIPELINE_QUEUE_BATCHES,
+    CPU_INFERENCE_ENABLED,
+    CPU_INFERENCE_QUANTIZE,
+    CPU_INFERENCE_NUM_THREADS,
+    CPU_INFERENCE_OUTPUT_DTYPE,
     BINARY_PREDICTION_THRESHOLD,
     METRICS_EPSILON,
     get_extra_output_name
@@ -71,6 +97,8 @@ from .ensemble import (
     MERGE_METHOD,
     ENSEMBLE_DEFAULTS,
     ENSEMBLE_PARAM_RANGES,
+    ENSEMBLE_FLOAT32_ONLY,
+    ENSEMBLE_SAMPLE_CHUNK_SIZE,
     get_ensemble_default,
     validate_ensemble_param,
     get_available_ensemble_methods
@@ -89,6 +117,8 @@ from .training import (
     PROGRESS_INDICATOR_INTERVAL,
     DEFAULT_RANDOM_SEED,
     FEATURE_EXTRACTION_MAX_WORKERS,
+    PARALLEL_ONTOLOGY_BACKEND,
+    PARALLEL_ONTOLOGY_THREADS,
     EPSILON_SMALL,
     EPSILON_TINY,
     VALIDATION_SPLIT_SIZE,
@@ -97,7 +127,17 @@ from .training import (
     DEFAULT_N_JOBS,
     DEFAULT_VALIDATION_SPLIT,
     LARGE_ONTOLOGY_LABEL_THRESHOLD,
-    REDUCED_BATCH_SIZE_LARGE_ONTOLOGY
+    REDUCED_BATCH_SIZE_LARGE_ONTOLOGY,
+    XGB_TRAINING_ENGINE,
+    XGB_LABEL_CHUNK_SIZE,
+    XGB_LABEL_CHUNK_WORKERS,
+    XGB_THREAD_BUDGET,
+    XGB_MULTI_STRATEGY,
+    DATALOADER_BATCH_FETCH,
+    DATALOADER_PREFETCH_THREAD_BATCHES,
+    MODEL_CACHE_MAX_GB,
+    MODEL_LOAD_MMAP,
+    LABEL_CACHE_ENABLED
 )
 
 # Re-export all configuration symbols
@@ -121,6 +161,11 @@ __all__ = [
     
     # Grid Search
     'GRID_SEARCH_CONFIGS',
+    'GRID_SEARCH_N_WORKERS',
+    'GRID_SEARCH_THREADS_PER_WORKER',
+    'GRID_SEARCH_MODE',
+    'ASHA_MIN_EPOCHS',
+    'ASHA_REDUCTION_FACTOR',
     'get_grid_search_config',
     
     # Features
@@ -140,19 +185,40 @@ __all__ = [
     'parse_model_feature_config',
     'get_embedding_feature_types',
     'is_valid_embedding_type',
+    'FEATURE_STORE_ENABLED',
+    'FEATURE_STORE_MAX_GB',
+    'FEATURE_CODE_VERSION',
+    'FUSED_FEATURE_LAYOUT',
+    'SEQUENCE_STORE_ENABLED',
+    'EMBEDDING_STORE_ENABLED',
+    'EMBEDDING_STORE_DTYPE',
+    'EMBEDDING_STORE_GATHER_ROWS',
     
     # Pipelines
     'PIPELINE_CONFIGS',
     'get_pipeline_config',
+    'RUN_PROFILE_CPROFILE_TOP_N',
     
     # Prediction
     'PREDICTION_SETTINGS',
     'MAX_PREDICTIONS_PER_PROTEIN',
-    'SUBMISSION_SORT_CHUNK_SIZE',
+    'SUBMISSION_MERGE_BUDGET_ROWS',
+    'SUBMISSION_ENSEMBLE_BLOCK_ROWS',
+    'SUBMISSION_AVERAGING_FAN_OUT',
     'VALIDATION_SAMPLE_SIZE',
     'DEFAULT_THRESHOLD',
+    'COLUMNAR_SUBMISSION_SUFFIX',
+    'COLUMNAR_SUBMISSION_CHUNK_ROWS',
     'PREDICTION_PROGRESS_INTERVALS',
     'ENSEMBLE_GC_COLLECT_INTERVAL',
+    'PREDICTION_PIPELINE_ENABLED',
+    'PREDICTION_PIPELINE_PREFETCH_BATCHES',
+    'PREDICTION_PIPELINE_POSTPROCESS_WORKERS',
+    'PREDICTION_PIPELINE_QUEUE_BATCHES',
+    'CPU_INFERENCE_ENABLED',
+    'CPU_INFERENCE_QUANTIZE',
+    'CPU_INFERENCE_NUM_THREADS',
+    'CPU_INFERENCE_OUTPUT_DTYPE',
     'BINARY_PREDICTION_THRESHOLD',
     'METRICS_EPSILON',
     'get_extra_output_name',
@@ -169,6 +235,8 @@ __all__ = [
     'PROGRESS_INDICATOR_INTERVAL',
     'DEFAULT_RANDOM_SEED',
     'FEATURE_EXTRACTION_MAX_WORKERS',
+    'PARALLEL_ONTOLOGY_BACKEND',
+    'PARALLEL_ONTOLOGY_THREADS',
     'EPSILON_SMALL',
     'EPSILON_TINY',
     'VALIDATION_SPLIT_SIZE',
@@ -186,12 +254,22 @@ __all__ = [
     'DATALOADER_MULTIPROCESSING_TIMEOUT',
     'DATALOADER_TEST_WORKERS',
     'DATALOADER_LARGE_DATASET_THRESHOLD_MB',
+    'DATALOADER_BATCH_FETCH',
+    'DATALOADER_PREFETCH_THREAD_BATCHES',
     'FLOAT32_BYTES',
     'MB_TO_BYTES',
     'GB_TO_BYTES',
     'MODEL_FILE_EXTENSION_PKL',
     'MODEL_FILE_EXTENSION_PTH',
     'VALID_ONTOLOGY_CODES',
+    'MODEL_CACHE_MAX_GB',
+    'MODEL_LOAD_MMAP',
+    'LABEL_CACHE_ENABLED',
+    'XGB_TRAINING_ENGINE',
+    'XGB_LABEL_CHUNK_SIZE',
+    'XGB_LABEL_CHUNK_WORKERS',
+    'XGB_THREAD_BUDGET',
+    'XGB_MULTI_STRATEGY',
     'GPU_CHECK_TIMEOUT',
     'MEMMAP_THRESHOLD_MB',
     
@@ -201,6 +279,8 @@ __all__ = [
     'MERGE_METHOD',
     'ENSEMBLE_DEFAULTS',
     'ENSEMBLE_PARAM_RANGES',
+    'ENSEMBLE_FLOAT32_ONLY',
+    'ENSEMBLE_SAMPLE_CHUNK_SIZE',
     'get_ensemble_default',
     'validate_ensemble_param',
     'get_available_ensemble_methods'
@@ -6,7 +6,7 @@ Versioning: Changing default parameter values creates a new ensemble config vers
 Track changes in version comments or git commits.
 """
 
-from typing import List
+from typing import List, Optional
 
 # Ensemble config version (increment when changing defaults)
 ENSEMBLE_CONFIG_VERSION = "1.0"
@@ -17,6 +17,10 @@ DEFAULT_ENSEMBLE_METHOD = "average"
 # Merge method (for 2 submissions)
 MERGE_METHOD = "merge"  # Special method name for outer merge strategy
 
+# Memory controls for ensemble_predictions (results are per sample, so chunking is exact)
+ENSEMBLE_FLOAT32_ONLY: bool = False  # Accumulate models one by one in float32 instead of np.stack (no stacked copy)
+ENSEMBLE_SAMPLE_CHUNK_SIZE: Optional[int] = None  # Ensemble at most N samples at a time (None = whole batch)
+
 # Default parameter values for tunable ensemble methods
 # Change these values to create new ensemble config versions (e.g., v1.1, v1.2)
 ENSEMBLE_DEFAULTS = {
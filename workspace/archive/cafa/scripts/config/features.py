@@ -5,6 +5,29 @@ Feature extraction and embedding configurations.
 # Memory Thresholds
 FEATURE_EXTRACTION_MEMORY_THRESHOLD_MB = 500  # Threshold for using memmap (MB)
 
+# Persistent feature store (preprocessing.feature_store): aligned matrices keyed by
+# sequence content hash, feature list, datatype, fused layout and FEATURE_CODE_VERSION
+FEATURE_STORE_ENABLED = True  # Consult/populate the store in extract_features
+FEATURE_STORE_MAX_GB = 50.0  # Disk budget; least recently used entries are evicted beyond it
+FEATURE_CODE_VERSION = 1  # Bump when extraction/alignment code or embedding files change (invalidates entries)
+
+# Fused feature column layout. 'legacy' is the layout existing fused models were trained on:
+# with preprocessed combined embeddings and hc, every non-hc feature contributes a copy of the
+# combined block (without hc, the combined block alone). 'compact' writes each block once and
+# zero-fills proteins missing structured features - it changes the input width, so models
+# must be retrained on it.
+FUSED_FEATURE_LAYOUT = 'legacy'
+
+# Packed sequence store (preprocessing.sequence_store): FASTA converted once to memory-mapped
+# residues/offsets/ID tables and used by the sequence loaders instead of Bio.SeqIO parsing
+SEQUENCE_STORE_ENABLED = True
+
+# Memory-mapped embedding store (preprocessing.feature_engineering.embeddings.embedding_store):
+# .npy/.qs/.rds embeddings converted once to a row-major matrix with an ID hash index
+EMBEDDING_STORE_ENABLED = True
+EMBEDDING_STORE_DTYPE = 'float32'  # 'float16' halves disk and page cache (lossy; part of the feature store key)
+EMBEDDING_STORE_GATHER_ROWS = 8192  # Rows read per gather when aligning to target proteins
+
 # Feature Extraction Methods
 FEATURE_EXTRACTION_METHODS = {
     "hand_crafted": {
@@ -104,6 +127,16 @@ BATCH_SIZE_CONFIG = {
         "sequence_chunk_size": 50000,    # Load sequences in chunks of 50K proteins
         "feature_chunk_size": 50000,      # Extract features in chunks of 50K proteins
         "embedding_chunk_size": 50000     # Load embeddings in chunks of 50K proteins
+    },
+    
+    # Handcrafted feature extraction execution (see extract_handcrafted_parallel)
+    # engine: 'batch' (vectorized NumPy, in-process), 'threads' (per-sequence ThreadPoolExecutor)
+    #         or 'processes' (batch engine sharded over a process pool, shared-memory output)
+    # Overridable from the CLI with --feature-engine
+    "feature_extraction": {
+        "engine": "batch",
+        "batch_size": 4096,      # Sequences per vectorized call
+        "shard_size": 16384      # Proteins per process-pool shard (row range of the output matrix)
     }
 }
 
@@ -3,6 +3,15 @@ Grid search configurations for hyperparameter tuning.
 Includes per-ontology parameter grids for targeted optimization.
 """
 
+# Parallel trial executor (grid_search.parallel_executor)
+GRID_SEARCH_N_WORKERS = 1  # Worker processes for (combination, fold) trials; 1 = serial search
+GRID_SEARCH_THREADS_PER_WORKER = None  # BLAS/torch threads per worker (None = cpu_count // workers)
+
+# Neural grid search mode: 'grid' (full epochs for every combination) or 'asha' (successive halving)
+GRID_SEARCH_MODE = 'grid'
+ASHA_MIN_EPOCHS = 1  # First rung: trials are compared after this many epochs
+ASHA_REDUCTION_FACTOR = 3  # Rungs at MIN_EPOCHS * factor^k; top 1/factor of each rung continue
+
 # Grid Search Configurations
 GRID_SEARCH_CONFIGS = {
     "lr": {
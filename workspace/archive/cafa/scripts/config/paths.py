@@ -138,6 +138,24 @@ if os.path.exists('/kaggle/input'):
 else:
     GOA_ANNOTATIONS_PATH = PROJECT_ROOT / 'kaggle' / 'input' / 'protein-go-annotations'
 
+# Persistent GO graph caches (closure index keyed by OBO checksum)
+GO_CACHE_DIR = DATA_OUTPUT_DIR / 'go_cache'
+
+# Persistent content-addressed feature matrices (preprocessing.feature_store)
+FEATURE_STORE_DIR = DATA_OUTPUT_DIR / 'feature_store'
+
+# Packed memory-mapped FASTA conversions (preprocessing.sequence_store)
+SEQUENCE_STORE_DIR = DATA_OUTPUT_DIR / 'sequence_store'
+
+# Memory-mapped embedding conversions (preprocessing.feature_engineering.embeddings.embedding_store)
+EMBEDDING_STORE_DIR = DATA_OUTPUT_DIR / 'embedding_store'
+
+# Per-ontology label matrices (preprocessing.label_cache)
+LABEL_CACHE_DIR = DATA_OUTPUT_DIR / 'label_cache'
+
+# JSONL stage profiles written by run.py --profile (utils.profiling)
+RUN_PROFILE_DIR = DATA_OUTPUT_DIR / 'profiles'
+
 # For Kaggle environment, override legacy paths with Kaggle paths
 if os.path.exists('/kaggle/input'):
     EMBEDDING_PATHS.update({
@@ -2,6 +2,9 @@
 Pipeline configurations for CAFA 6 protein function prediction.
 """
 
+# Run profiling (run.py --profile, utils/profiling.py)
+RUN_PROFILE_CPROFILE_TOP_N = 15  # Functions listed per cProfile'd stage in the profile summary
+
 # Pipeline Configurations
 PIPELINE_CONFIGS = {
     "full_pipeline": {
@@ -11,9 +11,13 @@ from .ensemble import (
 
 # Prediction Constants
 MAX_PREDICTIONS_PER_PROTEIN = 1500  # Maximum predictions per protein in submission
-SUBMISSION_SORT_CHUNK_SIZE = 1000000  # Chunk size for sorting large submission files
+SUBMISSION_MERGE_BUDGET_ROWS = 50000000  # Max input rows aligned in memory per block when merging/averaging submissions
+SUBMISSION_ENSEMBLE_BLOCK_ROWS = 1000000  # Keys per ensemble_predictions call when averaging submissions
+SUBMISSION_AVERAGING_FAN_OUT = True  # get_all_averages: one aligned pass feeds every method (False: one pass per method)
 VALIDATION_SAMPLE_SIZE = 1000  # Number of lines to sample for submission validation
 DEFAULT_THRESHOLD = 0.5  # Default threshold for threshold optimization
+COLUMNAR_SUBMISSION_SUFFIX = '.cols'  # Directory suffix of columnar intermediate submissions
+COLUMNAR_SUBMISSION_CHUNK_ROWS = 1000000  # Rows per appended/read chunk of a columnar submission
 
 # Progress update intervals
 PREDICTION_PROGRESS_INTERVALS = {
@@ -24,6 +28,18 @@ PREDICTION_PROGRESS_INTERVALS = {
     "large_file": 10000000  # Progress update for very large files
 }
 
+# CPU inference engine (utils/cpu_inference.py) - used by predict_with_model on CPU devices
+CPU_INFERENCE_ENABLED: bool = True  # BatchNorm-folded MLP writing into a preallocated buffer
+CPU_INFERENCE_QUANTIZE: bool = False  # Dynamic int8 Linear layers (check accuracy_delta_report before enabling)
+CPU_INFERENCE_NUM_THREADS: Optional[int] = None  # Intra-op threads while predicting (None = torch default)
+CPU_INFERENCE_OUTPUT_DTYPE: str = 'float32'  # 'float32' or 'float16' prediction buffer
+
+# Prediction pipeline (prediction/prediction_pipeline.py) - make_predictions and per-ontology ensembles
+PREDICTION_PIPELINE_ENABLED: bool = True  # Overlap feature reads, inference, post-processing and writes (False: sequential)
+PREDICTION_PIPELINE_PREFETCH_BATCHES: int = 2  # Feature batches the reader gathers ahead of inference
+PREDICTION_PIPELINE_POSTPROCESS_WORKERS: int = 2  # Threads for GO propagation + top-k selection
+PREDICTION_PIPELINE_QUEUE_BATCHES: int = 4  # Max batches in flight between inference and the writer
+
 # Ensemble workflow constants
 ENSEMBLE_GC_COLLECT_INTERVAL = 5  # Force gc.collect() every N batches in ensemble workflow
 
@@ -51,7 +67,9 @@ PREDICTION_SETTINGS = {
     "threshold_grid": [i/100 for i in range(1, 51)],  # 0.01 to 0.50 in 0.01 steps
     # Prediction propagation settings
     "propagate_predictions": False,  # Propagate predictions up GO graph after prediction
-    "prediction_propagation_iterations": 3,  # Number of propagation iterations
+    "prediction_propagation_iterations": 3,  # Legacy: propagation now converges in one level-ordered sweep
+    # Post-processing settings
+    "post_process_mode": "vectorized",  # Per-protein 1500 cap: 'vectorized' (grouped top-k) or 'heap' (per-protein heapq)
     # Output naming settings
     "extra_output_name": None,  # Optional descriptive filename for copy of submission.tsv (None or "" to disable)
 }
@@ -13,6 +13,7 @@ DEFAULT_RANDOM_SEED = 42
 # Label propagation settings
 PROPAGATE_TRAIN_LABELS: bool = False  # Propagate training labels up GO graph before training
 TOP_K_LABELS: Optional[int] = None  # Restrict to top-K most frequent GO terms per ontology (e.g., 3000)
+LABEL_CACHE_ENABLED: bool = True  # Cache per-ontology label CSR (.npz) keyed by train_terms/OBO hash, ontology, propagate, top-K
 
 # Memory management settings
 # These control memory usage during training to prevent OOM errors
@@ -23,6 +24,10 @@ FREE_FEATURES_AFTER_ONTOLOGY: bool = True  # Free feature matrix after each onto
 # Feature extraction parallelization
 FEATURE_EXTRACTION_MAX_WORKERS: int = 4  # Max workers for ThreadPoolExecutor in parallel feature extraction
 
+# Multi-ontology training (run_train_parallel_ontologies)
+PARALLEL_ONTOLOGY_BACKEND: str = 'thread'  # 'thread' (in-process) or 'process' (opt-in: X/labels in shared memory, per-worker thread budget; avoid with GPU models)
+PARALLEL_ONTOLOGY_THREADS: Optional[int] = None  # Threads per ontology worker process (None: available CPUs // workers)
+
 # Numerical constants for stability
 EPSILON_SMALL: float = 1e-10  # Small epsilon for geometric mean, clipping operations
 EPSILON_TINY: float = 1e-12  # Tiny epsilon for F1 score calculations
@@ -38,6 +43,13 @@ DEFAULT_VALIDATION_SPLIT: float = 0.2  # Default validation split for MLP traine
 LARGE_ONTOLOGY_LABEL_THRESHOLD: int = 10000  # Threshold for large ontologies (affects streaming metrics)
 REDUCED_BATCH_SIZE_LARGE_ONTOLOGY: int = 512  # Fallback batch size for large ontologies
 
+# XGBoost label-chunked training (models/xgb/xgboost_label_chunks.py)
+XGB_TRAINING_ENGINE: str = 'label_chunked'  # 'label_chunked' (one quantized DMatrix per ontology) or 'ovr' (OneVsRestClassifier(XGBClassifier))
+XGB_LABEL_CHUNK_SIZE: int = 256  # GO terms per multi-target booster (bounds the n_samples x chunk gradient buffers)
+XGB_LABEL_CHUNK_WORKERS: Optional[int] = None  # Concurrent chunk trainers (None: 1 with native multi-target trees, else up to 4)
+XGB_THREAD_BUDGET: Optional[int] = None  # Total XGBoost threads shared by chunk workers (None: n_jobs if > 0, else all cores)
+XGB_MULTI_STRATEGY: str = 'one_output_per_tree'  # 'one_output_per_tree' (same trees as one-vs-rest) or 'multi_output_tree' (vector leaves)
+
 # DataLoader constants
 DATALOADER_PRELOAD_THRESHOLD_MB: int = 1000  # Threshold for GPU pre-loading (1GB)
 DATALOADER_PRELOAD_MAX_MB: int = 4000  # Maximum GPU preload size (4GB)
@@ -58,6 +70,10 @@ DATALOADER_MAX_WORKERS_VERY_LARGE_LABELS: int = 0  # Maximum workers for very la
 DATALOADER_VERY_LARGE_LABEL_SPACE_THRESHOLD: int = 15000  # Threshold for very large label spaces (use 0 workers)
 DATALOADER_DISABLE_PERSISTENT_FOR_LARGE_LABELS: bool = True  # Disable persistent_workers for large label spaces to free memory between epochs
 
+# Batch-level sparse DataLoader (SparseDataset batch mode, MLP v4)
+DATALOADER_BATCH_FETCH: bool = True  # Fetch whole batches per dataset call (sorted memmap gather + one CSR row slice)
+DATALOADER_PREFETCH_THREAD_BATCHES: int = 2  # Batches prepared ahead by the background prefetch thread (0 = disabled)
+
 # Memory constants
 FLOAT32_BYTES: int = 4  # Bytes per float32 element
 MB_TO_BYTES: int = 1024**2  # Conversion factor: MB to bytes
@@ -68,6 +84,8 @@ MEMMAP_THRESHOLD_MB: int = 2000  # Memory threshold for using memory-mapped arra
 MODEL_FILE_EXTENSION_PKL: str = '.pkl'  # File extension for sklearn models
 MODEL_FILE_EXTENSION_PTH: str = '.pth'  # File extension for PyTorch models
 VALID_ONTOLOGY_CODES: list = ['F', 'P', 'C']  # Valid ontology codes
+MODEL_CACHE_MAX_GB: float = 4.0  # Budget for deserialized models kept by the model registry LRU cache
+MODEL_LOAD_MMAP: bool = True  # Memory-map PyTorch checkpoints on CPU loads (torch.load(mmap=True))
 
 # GPU utilities constants
 GPU_CHECK_TIMEOUT: int = 2  # Timeout for nvidia-smi check (seconds)
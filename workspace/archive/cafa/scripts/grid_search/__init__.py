@@ -21,6 +21,15 @@ from .checkpoint_manager import (
     convert_numpy_types
 )
 
+# Parallel (combination, fold) trial executor
+from .parallel_executor import (
+    GridTrial,
+    TrialCheckpoint,
+    build_trials,
+    run_parallel_trials,
+    aggregate_trial_records
+)
+
 __all__ = [
     'run_grid_search',
     'get_best_params_summary', 
@@ -31,5 +40,10 @@ __all__ = [
     'load_checkpoint',
     'normalize_param_combo',
     'validate_checkpoint',
-    'convert_numpy_types'
+    'convert_numpy_types',
+    'GridTrial',
+    'TrialCheckpoint',
+    'build_trials',
+    'run_parallel_trials',
+    'aggregate_trial_records'
 ]
@@ -0,0 +1,110 @@
+"""
+Asynchronous successive halving (ASHA) for the neural network grid search.
+
+Trials report their validation F1 after every epoch (train_ontology_model's
+epoch_callback). At rung epochs min_epochs * reduction_factor^k a trial continues
+only if its score is in the top 1/reduction_factor of all scores recorded at that
+rung so far; otherwise it is stopped and the remaining epochs go to later trials.
+Decisions never wait for other trials, so the grid is still walked in order.
+
+Rung scores are kept per fold (trials are only compared on the same data split)
+and serialized into the grid search checkpoint, so a resumed search prunes
+against the same history.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ASHAScheduler:
+    """Rung bookkeeping and promotion decisions for successive-halving pruning."""
+
+    def __init__(self,
+                 max_epochs: int,
+                 min_epochs: Optional[int] = None,
+                 reduction_factor: Optional[int] = None,
+                 rungs: Optional[Dict[str, Dict[str, List[float]]]] = None):
+        """
+        Args:
+            max_epochs: Full training budget per trial (grid_search_epochs)
+            min_epochs: First rung (default: ASHA_MIN_EPOCHS)
+            reduction_factor: Keep the top 1/reduction_factor at each rung (default: ASHA_REDUCTION_FACTOR)
+            rungs: Restored rung scores {fold: {rung_epoch: [scores]}} from a checkpoint
+        """
+        from config.grid_search import ASHA_MIN_EPOCHS, ASHA_REDUCTION_FACTOR
+
+        self.max_epochs = max_epochs
+        self.min_epochs = min_epochs or ASHA_MIN_EPOCHS
+        self.reduction_factor = reduction_factor or ASHA_REDUCTION_FACTOR
+        if self.reduction_factor < 2:
+            raise ValueError(f"reduction_factor must be >= 2, got {self.reduction_factor}")
+
+        self.rung_epochs = []
+        epoch = self.min_epochs
+        while epoch < max_epochs:
+            self.rung_epochs.append(epoch)
+            epoch *= self.reduction_factor
+        self.rungs: Dict[str, Dict[str, List[float]]] = rungs or {}
+
+    def should_continue(self, fold_idx: int, epoch: int, score: float) -> bool:
+        """
+        Record a score at a rung epoch and decide whether the trial continues.
+
+        With fewer than reduction_factor scores at the rung, the trial continues
+        (not enough evidence to rank it).
+        """
+        if epoch not in self.rung_epochs:
+            return True
+        scores = self.rungs.setdefault(str(fold_idx), {}).setdefault(str(epoch), [])
+        scores.append(float(score))
+        n_promoted = len(scores) // self.reduction_factor
+        if n_promoted == 0:
+            return True
+        cutoff = np.sort(scores)[::-1][n_promoted - 1]
+        return score >= cutoff
+
+    def rung_cutoff(self, fold_idx: int, epoch: int) -> Optional[float]:
+        """Current promotion cutoff at a rung (None while the rung promotes everything)."""
+        scores = self.rungs.get(str(fold_idx), {}).get(str(epoch), [])
+        n_promoted = len(scores) // self.reduction_factor
+        return float(np.sort(scores)[::-1][n_promoted - 1]) if n_promoted else None
+
+    def make_epoch_callback(self, fold_idx: int, trial_state: Dict[str, Any]) -> Callable:
+        """
+        Build a train_ontology_model epoch_callback for one trial fold.
+
+        trial_state receives 'epoch_scores' (per-epoch validation F1), 'rung_scores'
+        and, when pruned, 'pruned_at_epoch'.
+        """
+        trial_state.setdefault('epoch_scores', [])
+        trial_state.setdefault('rung_scores', {})
+
+        def epoch_callback(epoch: int, train_metrics: Dict[str, float], val_metrics: Dict[str, float]) -> bool:
+            score = float(val_metrics['f1_score'])
+            trial_state['epoch_scores'].append(score)
+            if epoch not in self.rung_epochs:
+                return False
+            trial_state['rung_scores'][str(epoch)] = score
+            if self.should_continue(fold_idx, epoch, score):
+                logger.info(f"         ⤴️  Rung {epoch} epochs: F1 {score:.4f} promoted")
+                return False
+            trial_state['pruned_at_epoch'] = epoch
+            logger.info(f"         ✂️  Rung {epoch} epochs: F1 {score:.4f} below cutoff "
+                        f"{self.rung_cutoff(fold_idx, epoch):.4f} - pruned")
+            return True
+
+        return epoch_callback
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Checkpoint representation."""
+        return {
+            'min_epochs': self.min_epochs,
+            'reduction_factor': self.reduction_factor,
+            'rung_epochs': self.rung_epochs,
+            'rungs': self.rungs,
+        }
@@ -63,7 +63,8 @@ def validate_checkpoint(
     checkpoint: Dict[str, Any],
     param_grid: Dict[str, List],
     cv: Optional[int] = None,
-    grid_search_epochs: Optional[int] = None
+    grid_search_epochs: Optional[int] = None,
+    search_mode: Optional[str] = None
 ) -> Tuple[bool, Optional[str]]:
     """
     Validate that checkpoint matches current grid search settings.
@@ -73,6 +74,7 @@ def validate_checkpoint(
         param_grid: Current parameter grid
         cv: Current CV folds setting (optional)
         grid_search_epochs: Current grid search epochs setting (optional)
+        search_mode: Current search mode ('grid' or 'asha'; checkpoints without it are 'grid')
         
     Returns:
         Tuple of (is_valid, error_message)
@@ -88,6 +90,9 @@ def validate_checkpoint(
     if grid_search_epochs is not None and checkpoint.get('grid_search_epochs') != grid_search_epochs:
         return False, "grid_search_epochs doesn't match current setting"
     
+    if search_mode is not None and checkpoint.get('search_mode', 'grid') != search_mode:
+        return False, "search_mode doesn't match current search mode"
+    
     return True, None
 
 
@@ -33,7 +33,10 @@ def run_grid_search(
     scoring: str = 'f1_samples',
     n_jobs: int = -1,
     save_results: bool = True,
-    output_dir: Optional[Path] = None
+    output_dir: Optional[Path] = None,
+    n_workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    resume: bool = True
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
     Run grid search for hyperparameter tuning.
@@ -50,10 +53,21 @@ def run_grid_search(
         n_jobs: Number of parallel jobs (-1 for all cores)
         save_results: Whether to save results to JSON
         output_dir: Directory to save results (defaults to kaggle/working)
+        n_workers: Trial worker processes (default: GRID_SEARCH_N_WORKERS); >1 replaces
+                   GridSearchCV with the parallel (combination, fold) executor, which
+                   resumes from a JSONL trial checkpoint in output_dir
+        threads_per_worker: Thread cap per worker (default: GRID_SEARCH_THREADS_PER_WORKER)
+        resume: Whether the parallel executor resumes from its trial checkpoint (default: True)
         
     Returns:
         tuple: (best_params, full_results_dict)
     """
+    from config.grid_search import GRID_SEARCH_N_WORKERS, GRID_SEARCH_THREADS_PER_WORKER
+    if n_workers is None:
+        n_workers = GRID_SEARCH_N_WORKERS
+    if threads_per_worker is None:
+        threads_per_worker = GRID_SEARCH_THREADS_PER_WORKER
+    
     print(f"🔍 Starting grid search for {ont_code} ontology...")
     print(f"   Parameters: {len(param_grid)} param groups")
     print(f"   CV folds: {cv}")
@@ -118,24 +132,31 @@ def run_grid_search(
         # For XGBoost and other multi-label models, use parameters directly
         transformed_param_grid = param_grid
     
-    # Run grid search
-    print(f"   Running {len(transformed_param_grid)} parameter combinations...")
-    grid_search = GridSearchCV(
-        estimator=model,
-        param_grid=transformed_param_grid,
-        cv=cv_strategy,
-        scoring=scorer,
-        n_jobs=n_jobs,
-        verbose=1,
-        return_train_score=True
-    )
-    
-    # Fit the grid search
-    grid_search.fit(X_train, y_train_dense)
-    
-    # Extract results
-    best_params_raw = grid_search.best_params_
-    best_score = grid_search.best_score_
+    if n_workers > 1:
+        best_params_raw, best_score, cv_results = _run_grid_search_parallel(
+            model_class, transformed_param_grid, use_estimator_prefix, X_train, y_train_dense,
+            cv_strategy, scoring, model_type, ont_code, output_dir, n_workers, threads_per_worker, resume
+        )
+    else:
+        # Run grid search
+        print(f"   Running {len(transformed_param_grid)} parameter combinations...")
+        grid_search = GridSearchCV(
+            estimator=model,
+            param_grid=transformed_param_grid,
+            cv=cv_strategy,
+            scoring=scorer,
+            n_jobs=n_jobs,
+            verbose=1,
+            return_train_score=True
+        )
+        
+        # Fit the grid search
+        grid_search.fit(X_train, y_train_dense)
+        
+        # Extract results
+        best_params_raw = grid_search.best_params_
+        best_score = grid_search.best_score_
+        cv_results = pd.DataFrame(grid_search.cv_results_).to_dict('records')
     
     # Transform best_params back to original parameter names
     best_params = {}
@@ -152,7 +173,6 @@ def run_grid_search(
     print(f"   ✅ Best params: {best_params}")
     
     # Prepare full results
-    results_df = pd.DataFrame(grid_search.cv_results_)
     full_results = {
         'best_params': best_params,
         'best_score': float(best_score),
@@ -164,7 +184,7 @@ def run_grid_search(
         'n_labels': y_train.shape[1],
         'timestamp': datetime.now().isoformat(),
         'execution_time_seconds': time.time() - start_time,
-        'cv_results': results_df.to_dict('records')
+        'cv_results': cv_results
     }
     
     # Save results if requested
@@ -197,6 +217,115 @@ def run_grid_search(
     return best_params, full_results
 
 
+def _make_scorer(scoring: str):
+    if scoring == 'f1_samples':
+        return make_scorer(f1_score, average='samples', zero_division=0)
+    from sklearn.metrics import get_scorer
+    return get_scorer(scoring)
+
+
+def sklearn_fold_trial(
+    X_train: np.ndarray,
+    y_train: Any,
+    params: Dict[str, Any],
+    train_indices: np.ndarray,
+    val_indices: np.ndarray,
+    model_class: Any,
+    use_estimator_prefix: bool,
+    scoring: str
+) -> Dict[str, float]:
+    """
+    Parallel executor trial: fit one (combination, fold) and score it like GridSearchCV.
+    
+    params use GridSearchCV names (estimator__ prefix for OneVsRestClassifier models).
+    The one-vs-rest wrapper runs single-job: parallelism comes from the trial workers.
+    """
+    if use_estimator_prefix:
+        model = OneVsRestClassifier(model_class(), n_jobs=1)
+    else:
+        model = model_class()
+    model.set_params(**params)
+    
+    fit_start = time.time()
+    model.fit(X_train[train_indices], y_train[train_indices])
+    fit_time = time.time() - fit_start
+    
+    scorer = _make_scorer(scoring)
+    return {
+        'test_score': float(scorer(model, X_train[val_indices], y_train[val_indices])),
+        'train_score': float(scorer(model, X_train[train_indices], y_train[train_indices])),
+        'fit_time': fit_time
+    }
+
+
+def _run_grid_search_parallel(
+    model_class: Any,
+    transformed_param_grid: Dict[str, List],
+    use_estimator_prefix: bool,
+    X_train: np.ndarray,
+    y_train: Any,
+    cv_strategy: KFold,
+    scoring: str,
+    model_type: str,
+    ont_code: str,
+    output_dir: Path,
+    n_workers: int,
+    threads_per_worker: Optional[int],
+    resume: bool = True
+) -> Tuple[Dict[str, Any], float, List[Dict[str, Any]]]:
+    """
+    Evaluate the grid with the parallel trial executor instead of GridSearchCV.
+    
+    Returns:
+        tuple: (best_params with GridSearchCV names, best_score, cv_results records)
+    """
+    from sklearn.model_selection import ParameterGrid
+    from grid_search.parallel_executor import (
+        TrialCheckpoint, build_trials, run_parallel_trials, aggregate_trial_records
+    )
+    
+    # ParameterGrid order matches GridSearchCV, so ties resolve to the same combination
+    combos = list(ParameterGrid(transformed_param_grid))
+    splits = list(cv_strategy.split(np.arange(X_train.shape[0])))
+    print(f"   Running {len(combos)} parameter combinations × {len(splits)} folds in parallel...")
+    
+    checkpoint = TrialCheckpoint(output_dir, model_type, ont_code, {
+        'param_grid': transformed_param_grid, 'cv_folds': len(splits), 'scoring': scoring,
+        'n_samples': X_train.shape[0]
+    })
+    records = run_parallel_trials(
+        sklearn_fold_trial, build_trials(combos, splits), X_train, y_train, checkpoint,
+        n_workers=n_workers, threads_per_worker=threads_per_worker,
+        trial_kwargs={'model_class': model_class, 'use_estimator_prefix': use_estimator_prefix,
+                      'scoring': scoring},
+        resume=resume
+    )
+    
+    cv_results = []
+    for combo in aggregate_trial_records(combos, len(splits), records, score_key='test_score'):
+        test_scores = [fold['test_score'] for fold in combo['folds']]
+        result = {
+            'params': combo['params'],
+            'mean_fit_time': float(np.mean([fold['fit_time'] for fold in combo['folds']])),
+            'mean_test_score': float(np.mean(test_scores)),
+            'std_test_score': float(np.std(test_scores)),
+            'mean_train_score': float(np.mean([fold['train_score'] for fold in combo['folds']])),
+        }
+        for fold in combo['folds']:
+            result[f"split{fold['fold'] - 1}_test_score"] = fold['test_score']
+        cv_results.append(result)
+    
+    if not cv_results:
+        raise RuntimeError("All grid search trials failed")
+    
+    mean_scores = np.array([result['mean_test_score'] for result in cv_results])
+    ranks = (-mean_scores).argsort(kind='stable').argsort() + 1
+    for result, rank in zip(cv_results, ranks):
+        result['rank_test_score'] = int(rank)
+    best = int(np.argmax(mean_scores))
+    return cv_results[best]['params'], float(mean_scores[best]), cv_results
+
+
 def load_grid_search_results(filepath: Path) -> Dict[str, Any]:
     """
     Load grid search results from JSON file.
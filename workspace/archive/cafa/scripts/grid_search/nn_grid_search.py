@@ -37,7 +37,10 @@ def run_nn_grid_search(
     save_results: bool = True,
     output_dir: Optional[Path] = None,
     checkpoint_path: Optional[Path] = None,
-    resume: bool = True
+    resume: bool = True,
+    n_workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    search_mode: Optional[str] = None
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
     Run grid search for PyTorch neural network models with k-fold CV support.
@@ -56,6 +59,12 @@ def run_nn_grid_search(
         output_dir: Directory to save results (defaults to kaggle/working)
         checkpoint_path: Explicit path to checkpoint file (None = auto-detect)
         resume: Whether to resume from checkpoint if found (default: True)
+        n_workers: Trial worker processes (default: GRID_SEARCH_N_WORKERS); >1 runs
+                   (combination, fold) trials in parallel with a JSONL trial checkpoint
+        threads_per_worker: Thread cap per worker (default: GRID_SEARCH_THREADS_PER_WORKER)
+        search_mode: 'grid' (every combination trains grid_search_epochs on every fold) or
+                     'asha' (successive-halving pruning on per-epoch validation F1);
+                     default: GRID_SEARCH_MODE. ASHA runs serially.
         
     Returns:
         tuple: (best_params, full_results_dict)
@@ -68,6 +77,21 @@ def run_nn_grid_search(
     
     start_time = time.time()
     
+    from config.grid_search import GRID_SEARCH_N_WORKERS, GRID_SEARCH_THREADS_PER_WORKER, GRID_SEARCH_MODE
+    if n_workers is None:
+        n_workers = GRID_SEARCH_N_WORKERS
+    if threads_per_worker is None:
+        threads_per_worker = GRID_SEARCH_THREADS_PER_WORKER
+    if search_mode is None:
+        search_mode = GRID_SEARCH_MODE
+    if search_mode not in ('grid', 'asha'):
+        raise ValueError(f"Unknown search_mode: {search_mode}. Expected 'grid' or 'asha'")
+    if search_mode == 'asha' and n_workers > 1:
+        # Rung decisions depend on scores reported so far, which live in this process
+        logger.warning(f"   ⚠️  ASHA mode runs trials serially - ignoring n_workers={n_workers}")
+        n_workers = 1
+    logger.info(f"   Search mode: {search_mode}")
+    
     # Set up output directory
     if output_dir is None:
         try:
@@ -101,12 +125,14 @@ def run_nn_grid_search(
     tested_combinations_set = set()
     start_combo_idx = 1
     
-    if resume:
+    # Parallel mode resumes from (or, with resume=False, rotates) its own JSONL trial log instead
+    if resume and n_workers <= 1:
         checkpoint = load_checkpoint(checkpoint_path, output_dir, model_name, ont_code)
         if checkpoint:
             # Validate checkpoint matches current grid search settings
             is_valid, error_msg = validate_checkpoint(
-                checkpoint, param_grid, cv=cv, grid_search_epochs=grid_search_epochs
+                checkpoint, param_grid, cv=cv, grid_search_epochs=grid_search_epochs,
+                search_mode=search_mode
             )
             if not is_valid:
                 logger.warning(f"   ⚠️  Checkpoint {error_msg} - ignoring checkpoint")
@@ -139,6 +165,15 @@ def run_nn_grid_search(
         best_score = -float('inf')
         best_params = None
     
+    # Successive-halving scheduler (rung history restored on resume)
+    scheduler = None
+    if search_mode == 'asha':
+        from grid_search.asha import ASHAScheduler
+        restored_rungs = checkpoint.get('asha', {}).get('rungs') if checkpoint else None
+        scheduler = ASHAScheduler(grid_search_epochs, rungs=restored_rungs)
+        logger.info(f"   ASHA rungs at epochs {scheduler.rung_epochs} (max {grid_search_epochs}, "
+                    f"keep top 1/{scheduler.reduction_factor})")
+    
     # Prepare CV splits
     n_samples = y_train.shape[0]
     if cv == 1:
@@ -152,168 +187,132 @@ def run_nn_grid_search(
         splits = list(kfold.split(np.arange(n_samples)))
         logger.info(f"   Using {cv}-fold cross-validation")
     
-    # Process each parameter combination
-    # Track actual number of tested combinations (not enumerate position)
-    n_actually_tested = len(tested_combinations_set) if tested_combinations_set else 0
-    
-    for combo_idx, param_combo in enumerate(param_combinations):
-        # Build hyperparameter dict for this combination
-        hyperparams = dict(zip(param_names, param_combo))
-        
-        # Override epochs for grid search speed
-        hyperparams['epochs'] = grid_search_epochs
-        
-        # Check if this combination was already tested
-        normalized_combo = normalize_param_combo(hyperparams)
-        if normalized_combo in tested_combinations_set:
-            logger.info(f"\n   [{combo_idx + 1}/{total_combinations}] Skipping (already tested): {hyperparams}")
-            continue
-        
-        # Increment counter only for combinations we're actually testing
-        n_actually_tested += 1
-        logger.info(f"\n   [{n_actually_tested}/{total_combinations}] Testing: {hyperparams}")
-        
-        # Run CV or validation split
-        fold_scores = []
-        fold_losses = []
-        fold_times = []
+    if n_workers > 1:
+        # Parallel (combination, fold) trials with an append-only JSONL checkpoint
+        all_results, best_params, best_score = _run_nn_grid_search_parallel(
+            train_fn, param_combinations, param_names, splits, X_train, y_train,
+            ont_code, ont_name, model_name, cv, validation_split, grid_search_epochs,
+            param_grid, output_dir, n_workers, threads_per_worker, resume
+        )
+    else:
+        # Process each parameter combination
+        # Track actual number of tested combinations (not enumerate position)
+        n_actually_tested = len(tested_combinations_set) if tested_combinations_set else 0
         
-        for fold_idx, (train_indices, val_indices) in enumerate(splits, 1):
-            fold_start = time.time()
+        for combo_idx, param_combo in enumerate(param_combinations):
+            # Build hyperparameter dict for this combination
+            hyperparams = dict(zip(param_names, param_combo))
             
-            logger.info(f"      Fold {fold_idx}/{len(splits)}...")
+            # Override epochs for grid search speed
+            hyperparams['epochs'] = grid_search_epochs
             
-            # Train model with this hyperparameter combination
-            try:
-                # For CV: subset data to fold's train indices, then use validation_split internally
-                # The trainer will further split this into train/val for early stopping
-                if isinstance(X_train, (str, Path)):
-                    # Memmap paths: can't easily subset, so use full data with validation_split
-                    # This means CV won't work perfectly with memmap, but validation split will
-                    logger.warning("      ⚠️  Memmap detected - using validation split (CV not fully supported)")
-                    model = train_fn(
-                        X_train, y_train, ont_code, ont_name,
-                        validation_split=validation_split,
-                        **hyperparams
-                    )
-                else:
-                    # Subset to fold's training data
-                    # The trainer will use validation_split to create train/val from this subset
-                    X_fold_data = X_train[train_indices]
-                    y_fold_data = y_train[train_indices]
-                    
-                    # Train on fold's training data (trainer will split internally for early stopping)
-                    model = train_fn(
-                        X_fold_data, y_fold_data, ont_code, ont_name,
-                        validation_split=validation_split,  # Split fold's train data into train/val
-                        **hyperparams
-                    )
-                
-                if model is None:
-                    logger.warning(f"      ⚠️  Model training returned None - skipping fold")
-                    continue
-                
-                # Evaluate on fold's validation set (val_indices)
-                # This is the true hold-out set for this fold
-                from models.nn.mlp_trainer_v3 import validate_epoch, SparseDataset
-                from torch.utils.data import DataLoader
-                from utils.gpu_utils import get_device
-                
-                device = get_device()
-                model.eval()
-                
-                # Create validation dataset from fold's validation indices
-                if isinstance(X_train, (str, Path)):
-                    # For memmap, pass path and indices
-                    val_dataset = SparseDataset(X_train, y_train, val_indices, label_smoothing=0.0)
-                else:
-                    val_dataset = SparseDataset(X_train, y_train, val_indices, label_smoothing=0.0)
+            # Check if this combination was already tested
+            normalized_combo = normalize_param_combo(hyperparams)
+            if normalized_combo in tested_combinations_set:
+                logger.info(f"\n   [{combo_idx + 1}/{total_combinations}] Skipping (already tested): {hyperparams}")
+                continue
+            
+            # Increment counter only for combinations we're actually testing
+            n_actually_tested += 1
+            logger.info(f"\n   [{n_actually_tested}/{total_combinations}] Testing: {hyperparams}")
+            
+            # Run CV or validation split
+            fold_scores = []
+            fold_losses = []
+            fold_times = []
+            pruned_state = None
+            
+            for fold_idx, (train_indices, val_indices) in enumerate(splits, 1):
+                fold_start = time.time()
                 
-                val_loader = DataLoader(val_dataset, batch_size=hyperparams.get('batch_size', 256), 
-                                      shuffle=False, num_workers=0)
+                logger.info(f"      Fold {fold_idx}/{len(splits)}...")
                 
-                # Use same loss as training
-                from models.nn.mlp_trainer_v3 import SparseBCEWithLogitsLoss, FocalBCEWithLogitsLoss
-                if hyperparams.get('use_focal_loss', False):
-                    criterion = FocalBCEWithLogitsLoss(
-                        alpha=hyperparams.get('focal_alpha', 0.25),
-                        gamma=hyperparams.get('focal_gamma', 2.0)
+                # Train model with this hyperparameter combination
+                try:
+                    trial_state = {}
+                    epoch_callback = scheduler.make_epoch_callback(fold_idx, trial_state) if scheduler else None
+                    fold_metrics = _evaluate_nn_fold(
+                        train_fn, X_train, y_train, train_indices, val_indices,
+                        hyperparams, ont_code, ont_name, validation_split,
+                        epoch_callback=epoch_callback,
+                        skip_evaluation=lambda: 'pruned_at_epoch' in trial_state
                     )
-                else:
-                    criterion = SparseBCEWithLogitsLoss()
-                
-                # Validate on fold's hold-out set
-                val_metrics = validate_epoch(model, val_loader, criterion, device)
-                val_f1 = val_metrics['f1_score']
-                val_loss = val_metrics['loss']
-                
-                fold_scores.append(val_f1)
-                fold_losses.append(val_loss)
-                fold_times.append(time.time() - fold_start)
-                
-                logger.info(f"         Fold {fold_idx} F1: {val_f1:.4f}, Loss: {val_loss:.4f}")
-                
-                # Cleanup GPU memory
-                del model, val_loader, val_dataset
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-                
-            except Exception as e:
-                logger.error(f"      ❌ Error in fold {fold_idx}: {e}")
+                    if 'pruned_at_epoch' in trial_state:
+                        # Losing trial: stop this combination, its remaining budget goes to later ones
+                        pruned_state = dict(trial_state, fold=fold_idx, seconds=time.time() - fold_start)
+                        break
+                    if fold_metrics is None:
+                        logger.warning(f"      ⚠️  Model training returned None - skipping fold")
+                        continue
+                    val_f1, val_loss = fold_metrics
+                    
+                    fold_scores.append(val_f1)
+                    fold_losses.append(val_loss)
+                    fold_times.append(time.time() - fold_start)
+                    
+                    logger.info(f"         Fold {fold_idx} F1: {val_f1:.4f}, Loss: {val_loss:.4f}")
+                    
+                except Exception as e:
+                    logger.error(f"      ❌ Error in fold {fold_idx}: {e}")
+                    continue
+            
+            if pruned_state is not None:
+                logger.info(f"   ✂️  Pruned at epoch {pruned_state['pruned_at_epoch']} "
+                            f"(fold {pruned_state['fold']}, {pruned_state['seconds']:.1f}s)")
+                all_results.append({
+                    'params': hyperparams.copy(),
+                    'pruned': True,
+                    'pruned_at_epoch': pruned_state['pruned_at_epoch'],
+                    'pruned_fold': pruned_state['fold'],
+                    'rung_scores': pruned_state['rung_scores'],
+                    'epoch_scores': pruned_state['epoch_scores'],
+                    'mean_f1_score': None,
+                    'fold_scores': [float(s) for s in fold_scores],
+                    'fold_losses': [float(l) for l in fold_losses]
+                })
+                tested_combinations_set.add(normalized_combo)
+                _save_serial_checkpoint(output_dir, model_name, ont_code, param_grid, all_results,
+                                        best_params, best_score, tested_combinations_set,
+                                        total_combinations, cv, grid_search_epochs, search_mode, scheduler)
                 continue
-        
-        if not fold_scores:
-            logger.warning(f"   ⚠️  No successful folds for this combination - skipping")
-            continue
-        
-        # Average scores across folds
-        avg_f1 = np.mean(fold_scores)
-        avg_loss = np.mean(fold_losses)
-        avg_time = np.mean(fold_times)
-        std_f1 = np.std(fold_scores)
-        
-        logger.info(f"   ✅ Avg F1: {avg_f1:.4f} (±{std_f1:.4f}), Avg Loss: {avg_loss:.4f}, Time: {avg_time:.1f}s")
-        
-        # Store results
-        result = {
-            'params': hyperparams.copy(),
-            'mean_f1_score': float(avg_f1),
-            'std_f1_score': float(std_f1),
-            'mean_loss': float(avg_loss),
-            'mean_time': float(avg_time),
-            'fold_scores': [float(s) for s in fold_scores],
-            'fold_losses': [float(l) for l in fold_losses]
-        }
-        all_results.append(result)
-        
-        # Update best
-        if avg_f1 > best_score:
-            best_score = avg_f1
-            best_params = hyperparams.copy()
-            logger.info(f"   🎯 New best score: {best_score:.4f}")
-        
-        # Add to tested combinations set
-        tested_combinations_set.add(normalized_combo)
-        
-        # Save checkpoint after each parameter combination completes
-        # Convert tested combinations set back to list of dicts (excluding epochs)
-        tested_combinations_list = [
-            dict(sorted_combo)  # Convert tuple back to dict
-            for sorted_combo in tested_combinations_set
-        ]
-        save_checkpoint(
-            output_dir=output_dir,
-            model_name=model_name,
-            ont_code=ont_code,
-            param_grid=param_grid,
-            all_results=all_results,
-            best_params=best_params,
-            best_score=best_score,
-            tested_combinations=tested_combinations_list,
-            total_combinations=total_combinations,
-            cv=cv,
-            grid_search_epochs=grid_search_epochs
-        )
+            
+            if not fold_scores:
+                logger.warning(f"   ⚠️  No successful folds for this combination - skipping")
+                continue
+            
+            # Average scores across folds
+            avg_f1 = np.mean(fold_scores)
+            avg_loss = np.mean(fold_losses)
+            avg_time = np.mean(fold_times)
+            std_f1 = np.std(fold_scores)
+            
+            logger.info(f"   ✅ Avg F1: {avg_f1:.4f} (±{std_f1:.4f}), Avg Loss: {avg_loss:.4f}, Time: {avg_time:.1f}s")
+            
+            # Store results
+            result = {
+                'params': hyperparams.copy(),
+                'mean_f1_score': float(avg_f1),
+                'std_f1_score': float(std_f1),
+                'mean_loss': float(avg_loss),
+                'mean_time': float(avg_time),
+                'fold_scores': [float(s) for s in fold_scores],
+                'fold_losses': [float(l) for l in fold_losses]
+            }
+            all_results.append(result)
+            
+            # Update best
+            if avg_f1 > best_score:
+                best_score = avg_f1
+                best_params = hyperparams.copy()
+                logger.info(f"   🎯 New best score: {best_score:.4f}")
+            
+            # Add to tested combinations set
+            tested_combinations_set.add(normalized_combo)
+            
+            # Save checkpoint after each parameter combination completes
+            _save_serial_checkpoint(output_dir, model_name, ont_code, param_grid, all_results,
+                                    best_params, best_score, tested_combinations_set,
+                                    total_combinations, cv, grid_search_epochs, search_mode, scheduler)
     
     logger.info(f"\n   ✅ Best score: {best_score:.4f}")
     logger.info(f"   ✅ Best params: {best_params}")
@@ -328,6 +327,8 @@ def run_nn_grid_search(
         'n_samples': n_samples,
         'n_labels': y_train.shape[1],
         'n_combinations_tested': len(all_results),
+        'search_mode': search_mode,
+        'n_pruned': sum(1 for result in all_results if result.get('pruned')),
         'timestamp': datetime.now().isoformat(),
         'execution_time_seconds': time.time() - start_time,
         'all_results': all_results
@@ -364,3 +365,226 @@ def run_nn_grid_search(
     
     return best_params, full_results
 
+
+def _evaluate_nn_fold(
+    train_fn: Callable,
+    X_train: Union[np.ndarray, Path],
+    y_train: csr_matrix,
+    train_indices: np.ndarray,
+    val_indices: np.ndarray,
+    hyperparams: Dict[str, Any],
+    ont_code: str,
+    ont_name: str,
+    validation_split: float,
+    epoch_callback: Optional[Callable] = None,
+    skip_evaluation: Optional[Callable[[], bool]] = None
+) -> Optional[Tuple[float, float]]:
+    """
+    Train one fold and score it on the fold's hold-out indices.
+    
+    Args:
+        epoch_callback: Forwarded to train_fn for per-epoch reporting (ASHA)
+        skip_evaluation: Checked after training; True skips hold-out scoring (pruned trial)
+    
+    Returns:
+        tuple: (val_f1, val_loss), or None if training returned no model or scoring was skipped
+    """
+    if epoch_callback is not None:
+        # Only passed when set, so trainers without per-epoch reporting still work in grid mode
+        hyperparams = dict(hyperparams, epoch_callback=epoch_callback)
+    # For CV: subset data to fold's train indices, then use validation_split internally
+    # The trainer will further split this into train/val for early stopping
+    if isinstance(X_train, (str, Path)):
+        # Memmap paths: can't easily subset, so use full data with validation_split
+        # This means CV won't work perfectly with memmap, but validation split will
+        logger.warning("      ⚠️  Memmap detected - using validation split (CV not fully supported)")
+        model = train_fn(
+            X_train, y_train, ont_code, ont_name,
+            validation_split=validation_split,
+            **hyperparams
+        )
+    else:
+        # Subset to fold's training data
+        # The trainer will use validation_split to create train/val from this subset
+        X_fold_data = X_train[train_indices]
+        y_fold_data = y_train[train_indices]
+        
+        # Train on fold's training data (trainer will split internally for early stopping)
+        model = train_fn(
+            X_fold_data, y_fold_data, ont_code, ont_name,
+            validation_split=validation_split,  # Split fold's train data into train/val
+            **hyperparams
+        )
+    
+    if model is None or (skip_evaluation is not None and skip_evaluation()):
+        return None
+    
+    # Evaluate on fold's validation set (val_indices)
+    # This is the true hold-out set for this fold
+    from models.nn.mlp_trainer_v3 import validate_epoch, SparseDataset
+    from torch.utils.data import DataLoader
+    from utils.gpu_utils import get_device
+    
+    device = get_device()
+    model.eval()
+    
+    # Create validation dataset from fold's validation indices (memmap path or array)
+    val_dataset = SparseDataset(X_train, y_train, val_indices, label_smoothing=0.0)
+    
+    val_loader = DataLoader(val_dataset, batch_size=hyperparams.get('batch_size', 256), 
+                          shuffle=False, num_workers=0)
+    
+    # Use same loss as training
+    from models.nn.mlp_trainer_v3 import SparseBCEWithLogitsLoss, FocalBCEWithLogitsLoss
+    if hyperparams.get('use_focal_loss', False):
+        criterion = FocalBCEWithLogitsLoss(
+            alpha=hyperparams.get('focal_alpha', 0.25),
+            gamma=hyperparams.get('focal_gamma', 2.0)
+        )
+    else:
+        criterion = SparseBCEWithLogitsLoss()
+    
+    # Validate on fold's hold-out set
+    val_metrics = validate_epoch(model, val_loader, criterion, device)
+    
+    # Cleanup GPU memory
+    del model, val_loader, val_dataset
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    
+    return val_metrics['f1_score'], val_metrics['loss']
+
+
+def _save_serial_checkpoint(
+    output_dir: Path,
+    model_name: str,
+    ont_code: str,
+    param_grid: Dict[str, List],
+    all_results: List[Dict[str, Any]],
+    best_params: Optional[Dict[str, Any]],
+    best_score: float,
+    tested_combinations_set: set,
+    total_combinations: int,
+    cv: int,
+    grid_search_epochs: int,
+    search_mode: str,
+    scheduler: Optional[Any]
+) -> Path:
+    """Write the serial-search checkpoint; ASHA adds its mode and rung history."""
+    # Convert tested combinations set back to list of dicts (excluding epochs)
+    tested_combinations_list = [
+        dict(sorted_combo)  # Convert tuple back to dict
+        for sorted_combo in tested_combinations_set
+    ]
+    extra_metadata = {}
+    if scheduler is not None:
+        extra_metadata = {'search_mode': search_mode, 'asha': scheduler.to_dict()}
+    return save_checkpoint(
+        output_dir=output_dir,
+        model_name=model_name,
+        ont_code=ont_code,
+        param_grid=param_grid,
+        all_results=all_results,
+        best_params=best_params,
+        best_score=best_score,
+        tested_combinations=tested_combinations_list,
+        total_combinations=total_combinations,
+        cv=cv,
+        grid_search_epochs=grid_search_epochs,
+        **extra_metadata
+    )
+
+
+def nn_fold_trial(
+    X_train: Union[np.ndarray, Path],
+    y_train: csr_matrix,
+    params: Dict[str, Any],
+    train_indices: np.ndarray,
+    val_indices: np.ndarray,
+    train_fn: Callable,
+    ont_code: str,
+    ont_name: str,
+    validation_split: float
+) -> Dict[str, float]:
+    """Parallel executor trial: one (combination, fold) of the neural grid search."""
+    fold_metrics = _evaluate_nn_fold(
+        train_fn, X_train, y_train, train_indices, val_indices,
+        params, ont_code, ont_name, validation_split
+    )
+    if fold_metrics is None:
+        raise RuntimeError("Model training returned None")
+    return {'f1_score': float(fold_metrics[0]), 'loss': float(fold_metrics[1])}
+
+
+def _run_nn_grid_search_parallel(
+    train_fn: Callable,
+    param_combinations: List[Tuple],
+    param_names: List[str],
+    splits: List[Tuple[np.ndarray, np.ndarray]],
+    X_train: Union[np.ndarray, Path],
+    y_train: csr_matrix,
+    ont_code: str,
+    ont_name: str,
+    model_name: str,
+    cv: int,
+    validation_split: float,
+    grid_search_epochs: int,
+    param_grid: Dict[str, List],
+    output_dir: Path,
+    n_workers: int,
+    threads_per_worker: Optional[int],
+    resume: bool = True
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]], float]:
+    """
+    Run all (combination, fold) trials in the parallel executor.
+    
+    Returns:
+        tuple: (all_results in the serial result format, best_params, best_score)
+    """
+    from grid_search.parallel_executor import (
+        TrialCheckpoint, build_trials, run_parallel_trials, aggregate_trial_records
+    )
+    
+    combos = []
+    for param_combo in param_combinations:
+        hyperparams = dict(zip(param_names, param_combo))
+        hyperparams['epochs'] = grid_search_epochs
+        combos.append(hyperparams)
+    
+    checkpoint = TrialCheckpoint(output_dir, model_name, ont_code, {
+        'param_grid': param_grid, 'cv_folds': cv, 'grid_search_epochs': grid_search_epochs,
+        'validation_split': validation_split, 'n_samples': y_train.shape[0]
+    })
+    records = run_parallel_trials(
+        nn_fold_trial, build_trials(combos, splits), X_train, y_train, checkpoint,
+        n_workers=n_workers, threads_per_worker=threads_per_worker,
+        trial_kwargs={'train_fn': train_fn, 'ont_code': ont_code, 'ont_name': ont_name,
+                      'validation_split': validation_split},
+        log=logger.info,
+        resume=resume
+    )
+    
+    all_results = []
+    best_score = -float('inf')
+    best_params = None
+    for combo in aggregate_trial_records(combos, len(splits), records):
+        fold_scores = [fold['f1_score'] for fold in combo['folds']]
+        fold_losses = [fold['loss'] for fold in combo['folds']]
+        avg_f1 = float(np.mean(fold_scores))
+        all_results.append({
+            'params': combo['params'].copy(),
+            'mean_f1_score': avg_f1,
+            'std_f1_score': float(np.std(fold_scores)),
+            'mean_loss': float(np.mean(fold_losses)),
+            'mean_time': float(np.mean([fold['seconds'] for fold in combo['folds']])),
+            'fold_scores': [float(s) for s in fold_scores],
+            'fold_losses': [float(l) for l in fold_losses]
+        })
+        # Same tie-breaking as the serial loop: first combination in grid order wins
+        if avg_f1 > best_score:
+            best_score = avg_f1
+            best_params = combo['params'].copy()
+    
+    logger.info(f"   ✅ {len(all_results)}/{len(combos)} combinations with successful folds "
+                f"(trial log: {checkpoint.path})")
+    return all_results, best_params, best_score
@@ -0,0 +1,271 @@
+"""
+Parallel trial executor for grid search.
+
+Runs (parameter combination, fold) trials concurrently in a process pool:
+- X is shared through a memmap (arrays are written once; workers map the file
+  read-only instead of receiving a pickled copy), labels are loaded once per worker
+- each worker caps BLAS/OpenMP/torch threads so workers don't oversubscribe cores
+- every finished trial is appended to a JSONL checkpoint; resume replays the file
+  in one pass and only re-runs trials without an 'ok' record, a fresh run rotates
+  the old log to <name>.jsonl.prev
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.sparse import issparse, load_npz, save_npz
+
+from grid_search.checkpoint_manager import convert_numpy_types, normalize_param_combo
+
+_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+# Per-process state set by _init_worker (X memmap/path and labels)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+class GridTrial(NamedTuple):
+    """One (parameter combination, fold) unit of work."""
+    trial_id: str
+    combo_idx: int
+    fold_idx: int
+    params: Dict[str, Any]
+    train_indices: np.ndarray
+    val_indices: np.ndarray
+
+
+def trial_id_for(params: Dict[str, Any], fold_idx: int) -> str:
+    """Stable trial id from the normalized parameter combination (epochs excluded) and fold."""
+    combo = json.dumps(normalize_param_combo(params), default=str)
+    return f"{hashlib.sha1(combo.encode()).hexdigest()[:16]}_f{fold_idx}"
+
+
+def build_trials(param_combinations: Sequence[Dict[str, Any]],
+                 splits: Sequence[Tuple[np.ndarray, np.ndarray]]) -> List[GridTrial]:
+    """Expand combinations × folds into trials (fold-major within a combination)."""
+    return [
+        GridTrial(trial_id_for(params, fold_idx), combo_idx, fold_idx, params, train_indices, val_indices)
+        for combo_idx, params in enumerate(param_combinations)
+        for fold_idx, (train_indices, val_indices) in enumerate(splits, 1)
+    ]
+
+
+class TrialCheckpoint:
+    """
+    Append-only JSONL trial log.
+
+    One line per finished trial; the file name carries a hash of the search settings,
+    so a changed grid, fold count or epoch budget starts a new log instead of mixing results.
+    """
+
+    def __init__(self, output_dir: Path, model_name: str, ont_code: str, settings: Dict[str, Any]):
+        settings_hash = hashlib.sha1(
+            json.dumps(convert_numpy_types(settings), sort_keys=True, default=str).encode()
+        ).hexdigest()[:12]
+        self.path = Path(output_dir) / f"grid_search_trials_{model_name}_{ont_code}_{settings_hash}.jsonl"
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Latest record per trial id (a truncated last line from a crash is ignored)."""
+        records = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records[record['trial_id']] = record
+        return records
+
+    def rotate(self) -> Optional[Path]:
+        """Move an existing log aside (replacing an older rotated one) so the next run starts empty."""
+        if not self.path.exists():
+            return None
+        rotated = self.path.with_name(self.path.name + '.prev')
+        os.replace(self.path, rotated)
+        return rotated
+
+    def append(self, record: Dict[str, Any]) -> None:
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(convert_numpy_types(record)) + '\n')
+            f.flush()
+
+
+def share_features(X: Union[np.ndarray, Path, str], work_dir: Path) -> Tuple[Path, bool]:
+    """
+    Make X available to workers as a memory-mappable file.
+
+    Returns:
+        tuple: (path, is_original_path) - is_original_path is True when X was already a
+               memmap path (trainers then receive the path itself, as in the serial search)
+    """
+    if isinstance(X, (str, Path)):
+        return Path(X), True
+    path = Path(work_dir) / 'shared_features.npy'
+    np.save(path, np.ascontiguousarray(X, dtype=np.float32))
+    return path, False
+
+
+@contextmanager
+def _thread_env(n_threads: int) -> Iterator[None]:
+    """Temporarily export thread caps so spawned workers start with them."""
+    previous = {var: os.environ.get(var) for var in _THREAD_ENV_VARS}
+    os.environ.update({var: str(n_threads) for var in _THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, value in previous.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _init_worker(x_path: str, x_is_path: bool, y_path: str, n_threads: int) -> None:
+    """Pool initializer: cap threads and open shared inputs once per worker."""
+    # OMP_NUM_THREADS (exported by _thread_env) also caps torch intra-op threads
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(n_threads)
+    except ImportError:
+        pass
+
+    from utils.memory_efficient import load_features_memmap
+    _WORKER_STATE['X'] = Path(x_path) if x_is_path else load_features_memmap(x_path)
+    _WORKER_STATE['y'] = load_npz(y_path).tocsr() if y_path.endswith('.npz') else np.load(y_path, mmap_mode='r')
+
+
+def _run_trial(trial_fn: Callable, trial: GridTrial, trial_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point: run one trial against the shared inputs and return its record."""
+    start = time.time()
+    record = {
+        'trial_id': trial.trial_id,
+        'combo_idx': trial.combo_idx,
+        'fold': trial.fold_idx,
+        'params': trial.params,
+        'worker_pid': os.getpid(),
+    }
+    try:
+        metrics = trial_fn(_WORKER_STATE['X'], _WORKER_STATE['y'], trial.params,
+                           trial.train_indices, trial.val_indices, **trial_kwargs)
+        record.update(status='ok', **metrics)
+    except Exception as e:
+        record.update(status='error', error=f"{type(e).__name__}: {e}")
+    record['seconds'] = time.time() - start
+    return record
+
+
+def run_parallel_trials(trial_fn: Callable,
+                        trials: Sequence[GridTrial],
+                        X: Union[np.ndarray, Path, str],
+                        y: Any,
+                        checkpoint: TrialCheckpoint,
+                        n_workers: int,
+                        threads_per_worker: Optional[int] = None,
+                        trial_kwargs: Optional[Dict[str, Any]] = None,
+                        log: Callable[[str], None] = print,
+                        resume: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Run trials in a process pool, appending each result to the JSONL checkpoint.
+
+    Args:
+        trial_fn: Module-level callable (X, y, params, train_indices, val_indices, **trial_kwargs)
+                  -> dict of metrics (must be picklable by reference)
+        trials: Trials to run
+        X: Features (array is shared via a temporary .npy memmap; a memmap path is passed through)
+        y: Labels (sparse matrix or array), written once for the workers
+        checkpoint: Trial log; when resuming, trials with an 'ok' record are skipped
+        n_workers: Worker processes
+        threads_per_worker: BLAS/torch threads per worker (default: cpu_count // n_workers)
+        trial_kwargs: Extra keyword arguments forwarded to trial_fn
+        log: Progress/report sink (print or logger.info)
+        resume: Skip trials already in the checkpoint; False rotates the log and reruns everything
+
+    Returns:
+        dict: trial_id -> latest record, including trials restored from the checkpoint
+    """
+    if resume:
+        records = checkpoint.load()
+    else:
+        records = {}
+        rotated = checkpoint.rotate()
+        if rotated is not None:
+            log(f"   📂 Starting fresh grid search (previous trial log moved to {rotated.name})")
+    pending = [trial for trial in trials if records.get(trial.trial_id, {}).get('status') != 'ok']
+    n_done = len(trials) - len(pending)
+    if n_done:
+        log(f"   ✅ Resuming from {checkpoint.path.name}: {n_done}/{len(trials)} trials already done")
+    if not pending:
+        return records
+
+    if threads_per_worker is None:
+        threads_per_worker = max(1, (os.cpu_count() or 1) // n_workers)
+    log(f"   🚀 Running {len(pending)} trials on {n_workers} workers × {threads_per_worker} threads")
+
+    start_time = time.time()
+    with tempfile.TemporaryDirectory(prefix='grid_search_shared_') as work_dir:
+        x_path, x_is_path = share_features(X, Path(work_dir))
+        if issparse(y):
+            y_path = Path(work_dir) / 'shared_labels.npz'
+            save_npz(y_path, y.tocsr())
+        else:
+            y_path = Path(work_dir) / 'shared_labels.npy'
+            np.save(y_path, np.asarray(y))
+
+        # Workers are spawned lazily on submit, so the caps stay exported for the whole pool lifetime
+        with _thread_env(threads_per_worker), ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(str(x_path), x_is_path, str(y_path), threads_per_worker)
+        ) as executor:
+            futures = {executor.submit(_run_trial, trial_fn, trial, trial_kwargs or {}): trial for trial in pending}
+            for n_finished, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                checkpoint.append(record)
+                records[record['trial_id']] = record
+
+                elapsed = time.time() - start_time
+                trials_per_hour = n_finished / elapsed * 3600 if elapsed > 0 else float('inf')
+                if record['status'] == 'ok':
+                    summary = ', '.join(f"{k}: {v:.4f}" for k, v in record.items()
+                                        if k in ('f1_score', 'loss', 'test_score') and isinstance(v, float))
+                else:
+                    summary = f"❌ {record['error']}"
+                log(f"      [{n_done + n_finished}/{len(trials)}] combo {record['combo_idx'] + 1} "
+                    f"fold {record['fold']}: {summary} ({record['seconds']:.1f}s, "
+                    f"{trials_per_hour:.1f} trials/hour)")
+
+    elapsed = time.time() - start_time
+    log(f"   ⏱️  {len(pending)} trials in {elapsed:.1f}s "
+        f"({len(pending) / elapsed * 3600 if elapsed > 0 else 0:.1f} trials/hour)")
+    return records
+
+
+def aggregate_trial_records(param_combinations: Sequence[Dict[str, Any]],
+                            n_folds: int,
+                            records: Dict[str, Dict[str, Any]],
+                            score_key: str = 'f1_score') -> List[Dict[str, Any]]:
+    """
+    Group fold records back into per-combination records, in combination order.
+
+    Returns:
+        list[dict]: One entry per combination with at least one successful fold:
+                    {'combo_idx', 'params', 'folds': [fold records in fold order]}
+    """
+    grouped = []
+    for combo_idx, params in enumerate(param_combinations):
+        folds = [records.get(trial_id_for(params, fold_idx)) for fold_idx in range(1, n_folds + 1)]
+        folds = [fold for fold in folds if fold is not None and fold.get('status') == 'ok' and score_key in fold]
+        if folds:
+            grouped.append({'combo_idx': combo_idx, 'params': params, 'folds': folds})
+    return grouped
@@ -18,7 +18,7 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import DataLoader, Dataset
-from typing import Dict, Any, Optional, Tuple, Union
+from typing import Callable, Dict, Any, Optional, Tuple, Union
 from scipy.sparse import csr_matrix, issparse
 from pathlib import Path
 import time
@@ -498,6 +498,7 @@ def _compute_batch_tp_fp_fn(y_pred_probs: np.ndarray, y_true: np.ndarray, thresh
 def train_ontology_model(X_train: Union[np.ndarray, Path], y_train: csr_matrix,
                         ont_code: str, ont_name: str,
                         validation_split: float = None,
+                        epoch_callback: Optional[Callable[[int, Dict[str, float], Dict[str, float]], bool]] = None,
                         **hyperparams) -> Optional[MLPModelV3]:
     """
     Train MLP v3 model for a specific ontology using sparse labels.
@@ -508,6 +509,10 @@ def train_ontology_model(X_train: Union[np.ndarray, Path], y_train: csr_matrix,
         ont_code: Ontology code ('F', 'P', 'C')
         ont_name: Ontology name ('MFO', 'BPO', 'CCO')
         validation_split: Fraction of data to use for validation
+        epoch_callback: Optional per-epoch report hook, called as
+                        epoch_callback(epoch, train_metrics, val_metrics) after each
+                        validation pass (epoch is 1-based); returning True stops training
+                        (used by the ASHA grid search to prune losing trials)
         **hyperparams: Model hyperparameters
     
     Returns:
@@ -739,6 +744,11 @@ def train_ontology_model(X_train: Union[np.ndarray, Path], y_train: csr_matrix,
             if patience_counter >= params['early_stopping_patience']:
                 print(f"\n      Early stopping triggered after {epoch + 1} epochs")
                 break
+        
+        # External per-epoch report (e.g. successive-halving pruning)
+        if epoch_callback is not None and epoch_callback(epoch + 1, train_metrics, val_metrics):
+            print(f"\n      Training stopped by epoch callback after {epoch + 1} epochs")
+            break
     
     # Restore best model
     if best_model_state is not None:
@@ -17,13 +17,13 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 from torch.utils.data import DataLoader, Dataset
-from typing import Dict, Any, Optional, Tuple, Union
+from typing import Callable, Dict, Any, Optional, Sequence, Tuple, Union
 from scipy.sparse import csr_matrix, issparse
 from pathlib import Path
 import time
 import os
 
-from config.training import DEFAULT_VALIDATION_SPLIT
+from config.training import DEFAULT_VALIDATION_SPLIT, DATALOADER_BATCH_FETCH, DATALOADER_PREFETCH_THREAD_BATCHES
 from config.prediction import BINARY_PREDICTION_THRESHOLD, VALIDATION_METRICS_THRESHOLD
 from models.training_utils import (
     check_ontology_has_terms,
@@ -152,9 +152,13 @@ class SparseDataset(Dataset):
     - Accepts numpy arrays, memmap, or Path to memmap for features
     - Efficient CSR row extraction (no full dense conversion)
     - Memory-efficient for large label spaces
+    - Batch mode: indexing with a sequence of positions (as yielded by a
+      BatchSampler, see utils.dataloader_utils.create_sparse_batch_dataloader)
+      returns a whole batch from one sorted memmap gather and one CSR row slice
     """
     
-    def __init__(self, X: Union[np.ndarray, np.memmap, Path, str], y: Union[csr_matrix, np.ndarray], indices: Optional[np.ndarray] = None, label_smoothing: float = 0.0):
+    def __init__(self, X: Union[np.ndarray, np.memmap, Path, str], y: Union[csr_matrix, np.ndarray], indices: Optional[np.ndarray] = None, label_smoothing: float = 0.0,
+                 sparse_labels: bool = False):
         """
         Initialize dataset.
         
@@ -163,6 +167,8 @@ class SparseDataset(Dataset):
             y: Label matrix (n_samples, n_labels) - scipy sparse CSR matrix or numpy array
             indices: Optional indices to subset the dataset (for train/val split)
             label_smoothing: Label smoothing factor (0.0 = no smoothing)
+            sparse_labels: In batch mode, return labels as a sparse COO tensor (densified on
+                           the device by train_epoch/validate_epoch); ignored with label smoothing
         """
         # Handle memmap path - load lazily
         if isinstance(X, (str, Path)):
@@ -200,26 +206,32 @@ class SparseDataset(Dataset):
         self.y_is_sparse = issparse(y)
         self.n_labels = y.shape[1]
         self.label_smoothing = label_smoothing
+        self.sparse_labels = sparse_labels and self.y_is_sparse and label_smoothing == 0.0
     
     def __len__(self) -> int:
         return len(self.indices)
     
-    def __getitem__(self, idx: int) -> Tuple[torch.Tensor, torch.Tensor]:
+    def _load_features(self) -> None:
+        """Load memmap if needed (lazy loading)."""
+        if self.X_path is not None and self.X is None:
+            from utils.memory_efficient import load_features_memmap
+            self.X = load_features_memmap(self.X_path)
+    
+    def __getitem__(self, idx: Union[int, Sequence[int], np.ndarray]) -> Tuple[torch.Tensor, torch.Tensor]:
         """
-        Get a single sample.
+        Get a single sample, or a whole batch when idx is a sequence of positions.
         
         Args:
-            idx: Index into the dataset
+            idx: Index into the dataset (or list of indices from a BatchSampler)
         
         Returns:
             tuple: (features, labels) as torch tensors
         """
-        actual_idx = self.indices[idx]
+        if not np.isscalar(idx):
+            return self.get_batch(idx)
         
-        # Load memmap if needed (lazy loading)
-        if self.X_path is not None and self.X is None:
-            from utils.memory_efficient import load_features_memmap
-            self.X = load_features_memmap(self.X_path)
+        actual_idx = self.indices[idx]
+        self._load_features()
         
         # Get features (from array or memmap - both support indexing)
         features = self.X[actual_idx].astype(np.float32)
@@ -245,6 +257,49 @@ class SparseDataset(Dataset):
             labels = labels * (1 - self.label_smoothing) + self.label_smoothing / self.n_labels
         
         return torch.from_numpy(features), torch.from_numpy(labels)
+    
+    def get_batch(self, positions: Union[Sequence[int], np.ndarray]) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Get a batch of samples with one gather per array.
+        
+        Feature rows are read in ascending row order (sequential memmap access) and
+        put back in batch order; sparse labels are densified with one CSR row slice.
+        Values are identical to stacking __getitem__ results.
+        
+        Args:
+            positions: Indices into the dataset, in batch order
+        
+        Returns:
+            tuple: (features (batch, n_features), labels (batch, n_labels) dense or sparse COO)
+        """
+        actual_idx = self.indices[np.asarray(positions, dtype=np.int64)]
+        self._load_features()
+        
+        order = np.argsort(actual_idx, kind='stable')
+        features = np.empty((len(actual_idx), self.X.shape[1]), dtype=np.float32)
+        features[order] = self.X[actual_idx[order]]
+        
+        if self.y_is_sparse:
+            if not isinstance(self.y, csr_matrix):
+                self.y = csr_matrix(self.y)
+            rows = self.y[actual_idx]
+            if self.sparse_labels:
+                row_ids = np.repeat(np.arange(len(actual_idx), dtype=np.int64), np.diff(rows.indptr))
+                labels = torch.sparse_coo_tensor(
+                    torch.from_numpy(np.vstack([row_ids, rows.indices.astype(np.int64)])),
+                    torch.from_numpy(rows.data.astype(np.float32)),
+                    size=(len(actual_idx), self.n_labels)
+                )
+                return torch.from_numpy(features), labels
+            labels = rows.toarray().astype(np.float32, copy=False)
+        else:
+            labels = np.asarray(self.y[actual_idx], dtype=np.float32)
+        
+        # Apply label smoothing if enabled
+        if self.label_smoothing > 0.0:
+            labels = labels * (1 - self.label_smoothing) + self.label_smoothing / self.n_labels
+        
+        return torch.from_numpy(features), torch.from_numpy(labels)
 
 
 class MLPModelV3(nn.Module):
@@ -340,6 +395,8 @@ def train_epoch(model: MLPModelV3, dataloader: DataLoader, optimizer: optim.Opti
         # Move to device
         batch_X = batch_X.to(device, non_blocking=True)
         batch_y = batch_y.to(device, non_blocking=True)
+        if batch_y.is_sparse:
+            batch_y = batch_y.to_dense()
         
         optimizer.zero_grad()
         
@@ -424,6 +481,8 @@ def validate_epoch(model: MLPModelV3, dataloader: DataLoader, criterion: nn.Modu
             # Move to device
             batch_X = batch_X.to(device, non_blocking=True)
             batch_y = batch_y.to(device, non_blocking=True)
+            if batch_y.is_sparse:
+                batch_y = batch_y.to_dense()
             
             # Forward pass (mixed precision for consistency, but no gradient scaling needed)
             if scaler is not None:
@@ -497,6 +556,7 @@ def _compute_batch_tp_fp_fn(y_pred_probs: np.ndarray, y_true: np.ndarray, thresh
 def train_ontology_model(X_train: Union[np.ndarray, Path], y_train: csr_matrix,
                         ont_code: str, ont_name: str,
                         validation_split: float = None,
+                        epoch_callback: Optional[Callable[[int, Dict[str, float], Dict[str, float]], bool]] = None,
                         **hyperparams) -> Optional[MLPModelV3]:
     """
     Train MLP v4 model for a specific ontology using sparse labels.
@@ -507,6 +567,10 @@ def train_ontology_model(X_train: Union[np.ndarray, Path], y_train: csr_matrix,
         ont_code: Ontology code ('F', 'P', 'C')
         ont_name: Ontology name ('MFO', 'BPO', 'CCO')
         validation_split: Fraction of data to use for validation
+        epoch_callback: Optional per-epoch report hook, called as
+                        epoch_callback(epoch, train_metrics, val_metrics) after each
+                        validation pass (epoch is 1-based); returning True stops training
+                        (used by the ASHA grid search to prune losing trials)
         **hyperparams: Model hyperparameters
     
     Returns:
@@ -559,7 +623,10 @@ def train_ontology_model(X_train: Union[np.ndarray, Path], y_train: csr_matrix,
         'use_focal_loss': True,  # Focal loss enabled by default in v4
         'focal_alpha': 0.25,
         'focal_gamma': 2.0,
-        'warmup_epochs': 2
+        'warmup_epochs': 2,
+        'batch_fetch': DATALOADER_BATCH_FETCH,  # Fetch whole batches (sorted memmap gather + one CSR slice per batch)
+        'sparse_label_transfer': False,  # Ship labels as sparse COO tensors, densify on device
+        'prefetch_batches': DATALOADER_PREFETCH_THREAD_BATCHES  # Background prefetch thread depth (0 = off)
     }
     
     # Merge with provided hyperparams
@@ -585,8 +652,11 @@ def train_ontology_model(X_train: Union[np.ndarray, Path], y_train: csr_matrix,
     # SparseDataset handles sparse extraction efficiently and memmap paths
     # Apply label smoothing to training set only
     label_smoothing = params.get('label_smoothing', 0.0)
-    train_dataset = SparseDataset(X_train_for_dataset, y_train, train_indices, label_smoothing=label_smoothing)
-    val_dataset = SparseDataset(X_train_for_dataset, y_train, val_indices, label_smoothing=0.0)  # No smoothing for validation
+    sparse_labels = params.get('sparse_label_transfer', False)
+    train_dataset = SparseDataset(X_train_for_dataset, y_train, train_indices, label_smoothing=label_smoothing,
+                                  sparse_labels=sparse_labels)
+    val_dataset = SparseDataset(X_train_for_dataset, y_train, val_indices, label_smoothing=0.0,  # No smoothing for validation
+                                sparse_labels=sparse_labels)
     
     if label_smoothing > 0.0:
         print(f"      Label smoothing enabled: {label_smoothing}")
@@ -595,20 +665,34 @@ def train_ontology_model(X_train: Union[np.ndarray, Path], y_train: csr_matrix,
     # Kaggle has multiprocessing issues, so use num_workers=0
     # Compensate with larger batch size for GPU saturation
     num_workers = 0 if KAGGLE_ENV else 4
-    train_loader = DataLoader(
-        train_dataset,
-        batch_size=params['batch_size'],
-        shuffle=True,
-        num_workers=num_workers,
-        pin_memory=True if device == 'cuda' else False
-    )
-    val_loader = DataLoader(
-        val_dataset,
-        batch_size=params['batch_size'],
-        shuffle=False,
-        num_workers=num_workers,
-        pin_memory=True if device == 'cuda' else False
-    )
+    if params.get('batch_fetch', DATALOADER_BATCH_FETCH):
+        # Whole batches per dataset call (BatchSampler) instead of per-sample fetch + default collate
+        from utils.dataloader_utils import create_sparse_batch_dataloader
+        prefetch_batches = params.get('prefetch_batches', DATALOADER_PREFETCH_THREAD_BATCHES)
+        train_loader = create_sparse_batch_dataloader(
+            train_dataset, params['batch_size'], shuffle=True, num_workers=num_workers,
+            device=device, prefetch_batches=prefetch_batches
+        )
+        val_loader = create_sparse_batch_dataloader(
+            val_dataset, params['batch_size'], shuffle=False, num_workers=num_workers,
+            device=device, prefetch_batches=prefetch_batches
+        )
+        print(f"      Batch fetch enabled (prefetch thread: {prefetch_batches} batches)")
+    else:
+        train_loader = DataLoader(
+            train_dataset,
+            batch_size=params['batch_size'],
+            shuffle=True,
+            num_workers=num_workers,
+            pin_memory=True if device == 'cuda' else False
+        )
+        val_loader = DataLoader(
+            val_dataset,
+            batch_size=params['batch_size'],
+            shuffle=False,
+            num_workers=num_workers,
+            pin_memory=True if device == 'cuda' else False
+        )
     
     # Initialize model
     model = MLPModelV3(
@@ -738,6 +822,11 @@ def train_ontology_model(X_train: Union[np.ndarray, Path], y_train: csr_matrix,
             if patience_counter >= params['early_stopping_patience']:
                 print(f"\n      Early stopping triggered after {epoch + 1} epochs")
                 break
+        
+        # External per-epoch report (e.g. successive-halving pruning)
+        if epoch_callback is not None and epoch_callback(epoch + 1, train_metrics, val_metrics):
+            print(f"\n      Training stopped by epoch callback after {epoch + 1} epochs")
+            break
     
     # Restore best model
     if best_model_state is not None:
@@ -7,8 +7,14 @@ from .xgboost_trainer_v1 import (
     train_ontology_model_xgb as train_ontology_model_v1,
     train_all_ontologies_xgb as train_all_ontologies_v1
 )
+from .xgboost_label_chunks import (
+    LabelChunkedXGBClassifier,
+    train_label_chunked_xgb
+)
 
 __all__ = [
     'train_ontology_model_v1',
-    'train_all_ontologies_v1'
+    'train_all_ontologies_v1',
+    'LabelChunkedXGBClassifier',
+    'train_label_chunked_xgb'
 ]
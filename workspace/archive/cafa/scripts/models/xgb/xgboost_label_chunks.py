@@ -0,0 +1,271 @@
+"""
+Label-chunked XGBoost training for CAFA 6 protein function prediction.
+
+OneVsRestClassifier(XGBClassifier) re-quantizes the same X_train for every GO term
+and its per-label jobs compete with XGBoost's own threads. Here X_train is
+quantile-binned once per ontology (QuantileDMatrix) and reused: labels are trained
+in chunks of XGB_LABEL_CHUNK_SIZE terms, one multi-target booster per chunk
+(native multi-output training, XGBoost >= 2.0), by a fixed number of workers
+sharing a fixed thread budget. Constant label columns are not trained, matching
+the constant predictors of OneVsRestClassifier.
+
+With multi_strategy='one_output_per_tree' each term gets the same trees as its
+own XGBClassifier; 'multi_output_tree' grows vector-leaf trees instead.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import xgboost as xgb
+    XGBOOST_AVAILABLE = True
+except ImportError:
+    XGBOOST_AVAILABLE = False
+    xgb = None
+
+
+# sklearn-API hyperparameter names → native xgb.train names
+_SKLEARN_TO_NATIVE = {
+    'learning_rate': 'eta',
+    'random_state': 'seed',
+    'reg_alpha': 'alpha',
+    'reg_lambda': 'lambda',
+}
+# sklearn-API / deprecated keys handled here rather than passed to xgb.train
+_NON_BOOSTER_KEYS = ('n_estimators', 'n_jobs', 'gpu_id', 'predictor', 'use_label_encoder', 'early_stopping_rounds')
+
+
+def native_multi_target_available() -> bool:
+    """Whether this XGBoost trains multi-target boosters with the hist method (>= 2.0)."""
+    if not XGBOOST_AVAILABLE:
+        return False
+    try:
+        return int(xgb.__version__.split('.')[0]) >= 2
+    except ValueError:
+        return False
+
+
+def to_native_params(params: Dict[str, Any], gpu_id: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    Convert XGBClassifier-style hyperparameters to xgb.train parameters.
+
+    Args:
+        params: Merged trainer hyperparameters (sklearn API names)
+        gpu_id: GPU to train on, or None for CPU
+
+    Returns:
+        tuple: (booster params, number of boosting rounds)
+    """
+    native = {_SKLEARN_TO_NATIVE.get(key, key): value for key, value in params.items()
+              if key not in _NON_BOOSTER_KEYS and value is not None}
+    native.setdefault('objective', 'binary:logistic')
+    if gpu_id is not None:
+        native['tree_method'] = 'hist'
+        native['device'] = f'cuda:{gpu_id}'
+    elif native.get('tree_method') in (None, 'gpu_hist', 'auto'):
+        native['tree_method'] = 'hist'
+    return native, int(params.get('n_estimators', 100))
+
+
+def resolve_thread_budget(n_jobs: Optional[int] = None, workers: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Split the XGBoost thread budget across label-chunk workers.
+
+    Args:
+        n_jobs: Trainer n_jobs (used when XGB_THREAD_BUDGET is None; <= 0 means all cores)
+        workers: Concurrent chunk trainers (default: XGB_LABEL_CHUNK_WORKERS)
+
+    Returns:
+        tuple: (workers, threads per worker)
+    """
+    from config.training import XGB_THREAD_BUDGET, XGB_LABEL_CHUNK_WORKERS
+
+    budget = XGB_THREAD_BUDGET or (n_jobs if n_jobs and n_jobs > 0 else os.cpu_count() or 1)
+    if workers is None:
+        workers = XGB_LABEL_CHUNK_WORKERS
+    if workers is None:
+        # Multi-target boosters already spread over all threads; per-label boosters
+        # are small enough that a few concurrent trainers keep the cores busy
+        workers = 1 if native_multi_target_available() else min(4, budget)
+    workers = max(1, min(workers, budget))
+    return workers, max(1, budget // workers)
+
+
+def _quantized_matrix(X: np.ndarray, max_bin: int, nthread: int, ref=None):
+    """Quantile-binned training matrix; `ref` reuses another matrix's bin cuts."""
+    if hasattr(xgb, 'QuantileDMatrix'):
+        return xgb.QuantileDMatrix(X, max_bin=max_bin, ref=ref, nthread=nthread)
+    return xgb.DMatrix(X, nthread=nthread)
+
+
+def _label_columns(y_train, columns: np.ndarray) -> np.ndarray:
+    """Dense float32 label block for the given columns (dense or scipy.sparse labels)."""
+    block = y_train[:, columns]
+    if hasattr(block, 'toarray'):
+        block = block.toarray()
+    return np.ascontiguousarray(block, dtype=np.float32)
+
+
+class LabelChunkedXGBClassifier:
+    """
+    Multi-label predictor made of per-chunk XGBoost boosters.
+
+    predict_proba returns (n_samples, n_labels) probabilities in label order, like
+    OneVsRestClassifier, from one inplace_predict call per chunk (no DMatrix build).
+    """
+
+    def __init__(self,
+                 n_labels: int,
+                 n_features: int,
+                 chunks: List[Tuple[np.ndarray, Any]],
+                 constant_columns: np.ndarray,
+                 constant_values: np.ndarray,
+                 params: Dict[str, Any],
+                 n_rounds: int):
+        """
+        Args:
+            n_labels: Number of label columns
+            n_features: Number of input features
+            chunks: (label columns, booster) pairs; the booster outputs one score per column
+            constant_columns: Label columns constant in training (not trained)
+            constant_values: Probability predicted for each constant column
+            params: Booster parameters used for training
+            n_rounds: Boosting rounds per booster
+        """
+        self.n_labels = n_labels
+        self.n_features_in_ = n_features
+        self.chunks = chunks
+        self.constant_columns = constant_columns
+        self.constant_values = constant_values
+        self.params = params
+        self.n_rounds = n_rounds
+
+    @property
+    def n_boosters(self) -> int:
+        return len(self.chunks)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            X: Feature matrix (n_samples, n_features)
+
+        Returns:
+            np.ndarray: float32 probabilities (n_samples, n_labels)
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        proba = np.zeros((X.shape[0], self.n_labels), dtype=np.float32)
+        if len(self.constant_columns):
+            proba[:, self.constant_columns] = self.constant_values
+        for columns, booster in self.chunks:
+            proba[:, columns] = booster.inplace_predict(X).reshape(X.shape[0], len(columns))
+        return proba
+
+    def predict(self, X: np.ndarray, threshold: Optional[float] = None) -> np.ndarray:
+        """Binary predictions (n_samples, n_labels) at BINARY_PREDICTION_THRESHOLD."""
+        if threshold is None:
+            from config.prediction import BINARY_PREDICTION_THRESHOLD
+            threshold = BINARY_PREDICTION_THRESHOLD
+        return (self.predict_proba(X) >= threshold).astype(np.int64)
+
+    def __repr__(self) -> str:
+        return (f"LabelChunkedXGBClassifier(n_labels={self.n_labels}, boosters={self.n_boosters}, "
+                f"rounds={self.n_rounds})")
+
+
+def train_label_chunked_xgb(X_train: np.ndarray,
+                            y_train,
+                            params: Dict[str, Any],
+                            gpu_id: Optional[int] = None,
+                            chunk_size: Optional[int] = None,
+                            workers: Optional[int] = None,
+                            multi_strategy: Optional[str] = None) -> LabelChunkedXGBClassifier:
+    """
+    Train one ontology's labels as chunks of multi-target boosters over one quantized matrix.
+
+    Args:
+        X_train: Feature matrix (n_samples, n_features)
+        y_train: Label matrix (n_samples, n_terms), dense or scipy.sparse
+        params: XGBClassifier-style hyperparameters (n_estimators, learning_rate, ...)
+        gpu_id: GPU to train on, or None for CPU
+        chunk_size: Labels per booster (default: XGB_LABEL_CHUNK_SIZE)
+        workers: Concurrent chunk trainers (default: see resolve_thread_budget)
+        multi_strategy: XGBoost multi_strategy (default: XGB_MULTI_STRATEGY)
+
+    Returns:
+        LabelChunkedXGBClassifier
+    """
+    from config.training import XGB_LABEL_CHUNK_SIZE, XGB_MULTI_STRATEGY
+
+    if not XGBOOST_AVAILABLE:
+        raise ImportError("XGBoost not available. Install with: pip install xgboost")
+
+    chunk_size = chunk_size or XGB_LABEL_CHUNK_SIZE
+    native_multi = native_multi_target_available()
+    workers, nthread = resolve_thread_budget(params.get('n_jobs'), workers)
+    booster_params, n_rounds = to_native_params(params, gpu_id)
+    booster_params['nthread'] = nthread
+    if native_multi:
+        booster_params['multi_strategy'] = multi_strategy or XGB_MULTI_STRATEGY
+    max_bin = int(booster_params.get('max_bin', 256))
+
+    n_samples, n_labels = y_train.shape
+    positives = np.asarray(y_train.sum(axis=0)).ravel()
+    constant = (positives == 0) | (positives == n_samples)
+    constant_columns = np.flatnonzero(constant)
+    trained_columns = np.flatnonzero(~constant)
+    if native_multi:
+        column_chunks = [trained_columns[i:i + chunk_size] for i in range(0, len(trained_columns), chunk_size)]
+    else:
+        # No multi-target boosters: one booster per label, scheduled in chunks
+        column_chunks = [trained_columns[i:i + 1] for i in range(len(trained_columns))]
+
+    start_time = time.time()
+    X_opt = np.ascontiguousarray(X_train, dtype=np.float32)
+    matrices = [_quantized_matrix(X_opt, max_bin, nthread * workers)]
+    matrices += [_quantized_matrix(X_opt, max_bin, nthread * workers, ref=matrices[0])
+                 for _ in range(min(workers, len(column_chunks)) - 1)]
+    del X_opt
+    print(f"      🌲 Quantized X once ({max_bin} bins, {time.time() - start_time:.1f}s"
+          + (f", cuts shared by {len(matrices)} worker matrices" if len(matrices) > 1 else "") + "); "
+          f"{len(trained_columns)} labels in {len(column_chunks)} boosters, "
+          f"{len(matrices)} worker(s) × {nthread} threads"
+          + (f", {len(constant_columns)} constant labels skipped" if len(constant_columns) else ""))
+
+    boosters: List[Any] = [None] * len(column_chunks)
+    progress = {'done': 0}
+    progress_lock = threading.Lock()
+    report_every = max(1, len(column_chunks) // 10)
+
+    def _train_worker(worker_idx: int) -> None:
+        dtrain = matrices[worker_idx]
+        for chunk_idx in range(worker_idx, len(column_chunks), len(matrices)):
+            dtrain.set_label(_label_columns(y_train, column_chunks[chunk_idx]))
+            boosters[chunk_idx] = xgb.train(booster_params, dtrain, num_boost_round=n_rounds)
+            with progress_lock:
+                progress['done'] += 1
+                if progress['done'] % report_every == 0 or progress['done'] == len(column_chunks):
+                    print(f"         Boosters {progress['done']}/{len(column_chunks)} "
+                          f"({time.time() - start_time:.1f}s)")
+
+    if len(matrices) == 1:
+        _train_worker(0)
+    else:
+        with ThreadPoolExecutor(max_workers=len(matrices)) as executor:
+            for future in [executor.submit(_train_worker, i) for i in range(len(matrices))]:
+                future.result()
+    del matrices
+
+    return LabelChunkedXGBClassifier(
+        n_labels=n_labels,
+        n_features=X_train.shape[1],
+        chunks=list(zip(column_chunks, boosters)),
+        constant_columns=constant_columns,
+        constant_values=(positives[constant_columns] > 0).astype(np.float32),
+        params=booster_params,
+        n_rounds=n_rounds
+    )
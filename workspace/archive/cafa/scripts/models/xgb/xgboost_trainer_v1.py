@@ -9,7 +9,7 @@ from sklearn.multiclass import OneVsRestClassifier
 from sklearn.metrics import f1_score
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from config.training import DEFAULT_RANDOM_SEED, DEFAULT_N_JOBS
+from config.training import DEFAULT_RANDOM_SEED, DEFAULT_N_JOBS, XGB_TRAINING_ENGINE
 from models.training_utils import (
     check_ontology_has_terms,
     merge_hyperparams,
@@ -28,9 +28,12 @@ except ImportError:
 
 
 def train_ontology_model_xgb(X_train: np.ndarray, y_train: np.ndarray, 
-                            ont_code: str, ont_name: str, gpu_id: Optional[int] = None, **hyperparams) -> Optional[OneVsRestClassifier]:
+                            ont_code: str, ont_name: str, gpu_id: Optional[int] = None, **hyperparams) -> Optional[Any]:
     """
     Train XGBoost model for a specific ontology.
+    With XGB_TRAINING_ENGINE='label_chunked' (default) X_train is quantized once and
+    labels are trained in multi-target chunks (see xgboost_label_chunks); 'ovr' keeps
+    OneVsRestClassifier(XGBClassifier).
     
     Args:
         X_train: Feature matrix (n_samples, n_features)
@@ -41,7 +44,7 @@ def train_ontology_model_xgb(X_train: np.ndarray, y_train: np.ndarray,
         **hyperparams: Model hyperparameters
         
     Returns:
-        trained model object or None if skipped
+        trained model (LabelChunkedXGBClassifier or OneVsRestClassifier) or None if skipped
     """
     log_training_start(ont_name, "XGBoost")
     
@@ -113,6 +116,13 @@ def train_ontology_model_xgb(X_train: np.ndarray, y_train: np.ndarray,
         print(f"      💻 CPU mode for {ont_name}")
     
     def _train_model():
+        if XGB_TRAINING_ENGINE == 'label_chunked':
+            # One quantized matrix per ontology shared by all label chunks
+            from models.xgb.xgboost_label_chunks import train_label_chunked_xgb
+            use_gpu = gpu_available and num_gpus > 0
+            return train_label_chunked_xgb(X_train, y_train, merged_params,
+                                           gpu_id=final_gpu_id if use_gpu else None)
+        
         # Optimize data format for GPU transfer efficiency
         # Convert to float32 and ensure contiguous memory layout
         X_train_opt = np.ascontiguousarray(X_train, dtype=np.float32)
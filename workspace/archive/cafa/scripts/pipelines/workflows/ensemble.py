@@ -9,19 +9,28 @@ from typing import List, Dict, Optional
 import numpy as np
 
 from config import get_model_config, get_all_ontologies, PREDICTION_SETTINGS, ENSEMBLE_GC_COLLECT_INTERVAL, get_extra_output_name
+from config.prediction import COLUMNAR_SUBMISSION_SUFFIX, PREDICTION_PROGRESS_INTERVALS
 from utils.ontology_utils import iterate_ontologies_with_check
 from utils.logging import setup_logging, get_logger
 from prediction.predict_and_submit import load_test_sequences, post_process_submission
+from prediction.columnar_submission import ColumnarSubmissionWriter
+from prediction.prediction_utils import select_top_predictions
+from prediction.prediction_pipeline import (
+    FeatureMatrixCache,
+    feature_config_key,
+    gather_rows,
+    run_prediction_pipeline,
+    report_pipeline_stats
+)
 from prediction.ensemble import (
     ensemble_predictions,
     check_ensemble_compatibility,
     align_model_features
 )
 from pipelines.workflows.workflow_paths import setup_workflow_paths
-from pipelines.workflows.workflow_features import extract_features_for_model, get_feature_cache_key
-from pipelines.workflows.workflow_predictions import write_predictions_to_file
 from utils.model_io import load_model
 from utils.utils_common import cleanup_memory
+from utils.profiling import profile_span
 
 
 logger = get_logger(__name__)
@@ -69,14 +78,17 @@ def run_ensemble_prediction_per_ontology(models_per_ontology: Dict[str, List[str
     pred_settings = PREDICTION_SETTINGS
     BATCH_SIZE = pred_settings['ensemble_batch_size']
     ontologies = get_all_ontologies()
-    temp_submission_path = output_dir / 'temp_ensemble_submission.tsv'
+    temp_submission_path = output_dir / f'temp_ensemble_submission{COLUMNAR_SUBMISSION_SUFFIX}'
     prediction_threshold = pred_settings['ensemble_prediction_threshold']
     max_preds_per_ont = pred_settings['ensemble_max_preds_per_ont']
     
     print(f"\n💾 Processing in batches of {BATCH_SIZE:,} proteins to manage memory...")
     print(f"   Total test proteins: {len(test_proteins):,}")
     
-    with open(temp_submission_path, 'w') as submission_file:
+    # Test features are extracted once per feature configuration and reused across ontologies
+    feature_cache = FeatureMatrixCache(test_seqs, test_proteins)
+    
+    with ColumnarSubmissionWriter(temp_submission_path) as submission_file:
         for ont_code, ont_name in iterate_ontologies_with_check(
             ontologies, 
             models_per_ontology,
@@ -129,115 +141,86 @@ def run_ensemble_prediction_per_ontology(models_per_ontology: Dict[str, List[str
             # Use first model's MLB (should be same across models)
             mlb = loaded_models[0][1]
             
-            # Process in batches
-            n_batches = (len(test_proteins) + BATCH_SIZE - 1) // BATCH_SIZE
-            print(f"   Processing {n_batches} batches...")
-            import time
+            # Full test-set features per feature configuration, shared by every model and ontology
+            from config.features import parse_model_feature_config
+            model_features = []
+            for model, _, config, model_name in loaded_models:
+                feature_type, features = parse_model_feature_config(config)
+                X_all, _, rows = feature_cache.get(feature_type, features)
+                model_features.append((feature_config_key(feature_type, features), X_all, rows))
+            feature_rows = {key: (X_all, rows) for key, X_all, rows in model_features}
             
-            for batch_idx in range(n_batches):
-                batch_start = time.time()
-                start_idx = batch_idx * BATCH_SIZE
-                end_idx = min(start_idx + BATCH_SIZE, len(test_proteins))
-                batch_proteins = test_proteins[start_idx:end_idx]
-                batch_seqs = {pid: test_seqs[pid] for pid in batch_proteins}
-                
-                print(f"      Batch {batch_idx + 1}/{n_batches}: proteins {start_idx:,}-{end_idx:,} ({len(batch_proteins):,} proteins)")
-                
-                # Cache features by feature signature to avoid re-extraction
-                feature_cache = {}
-                
-                # Get predictions from each model for this batch
+            # Only proteins every model has features for
+            present = np.ones(len(test_proteins), dtype=bool)
+            for _, rows in feature_rows.values():
+                present &= rows >= 0
+            positions = np.flatnonzero(present)
+            if len(positions) < len(test_proteins):
+                print(f"   ⚠️  {len(test_proteins) - len(positions):,} proteins have no features, skipping them")
+            
+            n_batches = (len(positions) + BATCH_SIZE - 1) // BATCH_SIZE
+            print(f"   Processing {n_batches} batches ({len(feature_rows)} feature configuration(s) "
+                  f"for {len(loaded_models)} models)...")
+            progress = {'batches': 0, 'predictions': 0}
+            
+            def read_batch(batch_idx):
+                # Gather each feature configuration's rows once for all models
+                batch_positions = positions[batch_idx * BATCH_SIZE:(batch_idx + 1) * BATCH_SIZE]
+                return {key: gather_rows(X_all, rows[batch_positions])
+                        for key, (X_all, rows) in feature_rows.items()}
+            
+            def infer(batch_idx, X_by_key):
+                from utils.model_prediction import predict_with_model
                 batch_predictions = []
-                
-                for model_idx, (model, mlp_model, config, model_name) in enumerate(loaded_models):
+                for (model, _, config, model_name), (key, _, _) in zip(loaded_models, model_features):
                     try:
-                        # Parse feature configuration using centralized utility
-                        from config.features import parse_model_feature_config
-                        feature_type, features = parse_model_feature_config(config)
-                        
-                        # Create cache key based on feature configuration
-                        cache_key = get_feature_cache_key(feature_type, features)
-                        
-                        # Check cache or extract features
-                        if cache_key in feature_cache:
-                            print(f"         Model {model_idx + 1}/{len(loaded_models)} ({model_name}): using cached features")
-                            X_batch = feature_cache[cache_key]
-                        else:
-                            print(f"         Model {model_idx + 1}/{len(loaded_models)} ({model_name}): extracting {feature_type} features...")
-                            feat_start = time.time()
-                            
-                            X_batch = extract_features_for_model(
-                                batch_seqs,
-                                batch_proteins,
-                                config
-                            )
-                            
-                            # Cache features for reuse
-                            feature_cache[cache_key] = X_batch
-                            print(f"         ✓ Features extracted: {X_batch.shape} ({time.time() - feat_start:.1f}s)")
-                        
-                        # Make predictions for batch using unified prediction interface
-                        pred_start = time.time()
-                        from utils.model_prediction import predict_with_model
-                        y_batch = predict_with_model(
-                            model=model,
-                            X=X_batch,
-                            model_config=config
-                        )
-                        print(f"         ✓ Predictions: {y_batch.shape} ({time.time() - pred_start:.1f}s)")
-                        batch_predictions.append(y_batch)
-                        
+                        batch_predictions.append(predict_with_model(model=model, X=X_by_key[key], model_config=config))
                     except Exception as e:
                         logger.exception(f"Failed to predict with {model_name} for batch {batch_idx + 1}")
                         print(f"         ❌ Error with {model_name}: {str(e)[:100]}")
-                        continue
-                
-                # Clear feature cache after batch (keep predictions for ensembling)
-                del feature_cache
-                
                 if not batch_predictions:
-                    print(f"         ⚠️  No predictions for batch, skipping")
-                    continue
-                
-                # Ensemble batch predictions
-                ensemble_start = time.time()
-                if len(batch_predictions) > 1:
-                    batch_ensembled = ensemble_predictions(
-                        batch_predictions,
-                        method=ensemble_method,
-                        weights=weights,
-                        **ensemble_kwargs
+                    print(f"         ⚠️  No predictions for batch {batch_idx + 1}, skipping")
+                    return None
+                if len(batch_predictions) == 1:
+                    return batch_predictions[0]
+                return ensemble_predictions(batch_predictions, method=ensemble_method, weights=weights, **ensemble_kwargs)
+            
+            def postprocess(batch_idx, batch_ensembled):
+                if batch_ensembled is None:
+                    return None
+                return select_top_predictions(np.asarray(batch_ensembled), max_preds_per_ont, prediction_threshold)
+            
+            def write(batch_idx, selection):
+                progress['batches'] += 1
+                predictions_written = 0
+                if selection is not None:
+                    batch_positions = positions[batch_idx * BATCH_SIZE:(batch_idx + 1) * BATCH_SIZE]
+                    row_idx, term_idx, scores = selection
+                    predictions_written = submission_file.write_predictions(
+                        [test_proteins[i] for i in batch_positions], mlb.classes_, row_idx, term_idx, scores
                     )
-                else:
-                    batch_ensembled = batch_predictions[0]
-                print(f"         ✓ Ensembled: {batch_ensembled.shape} ({time.time() - ensemble_start:.1f}s)")
-                
-                # Write batch predictions immediately (free memory)
-                write_start = time.time()
-                predictions_written = write_predictions_to_file(
-                    submission_file,
-                    batch_proteins,
-                    batch_ensembled,
-                    mlb,
-                    prediction_threshold,
-                    max_preds_per_ont
-                )
-                print(f"         ✓ Wrote {predictions_written:,} predictions ({time.time() - write_start:.1f}s)")
-                
-                # Clear batch predictions from memory
-                del batch_predictions, batch_ensembled
+                progress['predictions'] += predictions_written
                 
                 # Force garbage collection periodically
-                if batch_idx % ENSEMBLE_GC_COLLECT_INTERVAL == 0:
+                if progress['batches'] % ENSEMBLE_GC_COLLECT_INTERVAL == 0:
                     cleanup_memory()
-                
-                batch_time = time.time() - batch_start
-                elapsed_hours = batch_time * n_batches / 3600
-                print(f"      ✓ Batch {batch_idx + 1} complete: {batch_time:.1f}s (est. {elapsed_hours:.1f}h total)")
-                submission_file.flush()  # Ensure data is written to disk
+                if progress['batches'] % PREDICTION_PROGRESS_INTERVALS["batch"] == 0 or progress['batches'] == n_batches:
+                    print(f"      Batch {progress['batches']}/{n_batches} complete "
+                          f"({progress['predictions']:,} predictions for this ontology)")
+                return predictions_written
             
+            with profile_span('predict', rows=len(positions), ontology=ont_code, models=len(loaded_models)) as span:
+                stats = run_prediction_pipeline(n_batches, read_batch, infer, postprocess, write)
+                span.set(predictions=stats['rows_written'])
+            submission_file.flush()  # Ensure data is written to disk
+            report_pipeline_stats(stats, title=f"{ont_name} ensemble pipeline")
+            
+            del loaded_models, model_features, feature_rows
+            cleanup_memory()
             print(f"   ✓ {ont_name} ensemble complete")
     
+    feature_cache.clear()
+    
     # Post-process submission
     print(f"\n📝 Post-processing submission...")
     # Use config value if extra_output_name not provided
@@ -7,11 +7,11 @@ import time
 from pathlib import Path
 from typing import List, Optional
 
-from config import PREDICTION_SETTINGS
+from config import PREDICTION_SETTINGS, SUBMISSION_AVERAGING_FAN_OUT
 from config.ensemble import get_available_ensemble_methods
 from utils.logging import setup_logging, get_logger
 from utils.cli_utils import build_ensemble_kwargs
-from pipelines.workflows.submission_averaging import run_submission_averaging
+from pipelines.workflows.submission_averaging import run_submission_averaging, run_submission_averaging_multi
 
 
 logger = get_logger(__name__)
@@ -21,7 +21,8 @@ def run_get_all_averages(submission_files: List[str],
                         weights: Optional[List[float]] = None,
                         power_default: Optional[float] = None,
                         percentile_default: Optional[float] = None,
-                        output_prefix: Optional[str] = None) -> List[str]:
+                        output_prefix: Optional[str] = None,
+                        fan_out: Optional[bool] = None) -> List[str]:
     """
     Generate all 7 ensemble method submissions in one run.
     
@@ -31,6 +32,8 @@ def run_get_all_averages(submission_files: List[str],
         power_default: Default power for power_average method (default: from config)
         percentile_default: Default percentile for percentile method (default: from config)
         output_prefix: Optional prefix for output filenames (default: auto-generated)
+        fan_out: Align the inputs once and feed every method from that pass
+                 (default: SUBMISSION_AVERAGING_FAN_OUT); False runs one full pass per method
         
     Returns:
         List[str]: Paths to all 7 generated submission files
@@ -85,31 +88,62 @@ def run_get_all_averages(submission_files: List[str],
     for i, filepath in enumerate(submission_files, 1):
         logger.info(f"  {i}. {Path(filepath).name}")
     
-    for method_idx, (method_name, method_key, method_kwargs) in enumerate(methods, 1):
-        logger.info(f"\n[{method_idx}/{len(methods)}] Generating {method_name} submission...")
-        logger.info("=" * 60)
-        
-        # Prepare output name
-        output_name = f"{output_prefix}_method_{method_name}.tsv"
-        
-        # Prepare weights for weighted_average
-        method_weights = weights if method_key == 'weighted_average' else None
-        
+    if fan_out is None:
+        fan_out = SUBMISSION_AVERAGING_FAN_OUT
+    
+    if fan_out:
+        # One aligned pass over the inputs; each method writes its own output
+        method_specs = {
+            method_name: {
+                'ensemble_method': method_key,
+                'ensemble_kwargs': method_kwargs,
+                'output_name': f"{output_prefix}_method_{method_name}.tsv",
+            }
+            for method_name, method_key, method_kwargs in methods
+        }
         try:
-            result_path = run_submission_averaging(
+            result_paths = run_submission_averaging_multi(
                 submission_files=submission_files,
-                weights=method_weights,
-                output_name=output_name,
-                ensemble_method=method_key,
-                **method_kwargs
+                method_specs=method_specs,
+                weights=weights
             )
-            output_files.append(result_path)
-            logger.info(f"✓ {method_name} submission generated: {result_path}")
         except Exception as e:
-            logger.error(f"❌ Failed to generate {method_name} submission: {e}")
+            logger.error(f"❌ Failed to generate ensemble submissions: {e}")
             logger.exception("Error details:")
-            # Continue with other methods even if one fails
-            continue
+            result_paths = {}
+        for method_name, _, _ in methods:
+            result_path = result_paths.get(method_name)
+            if result_path is None:
+                logger.error(f"❌ Failed to generate {method_name} submission")
+                continue
+            output_files.append(result_path)
+            logger.info(f"✓ {method_name} submission generated: {result_path}")
+    else:
+        for method_idx, (method_name, method_key, method_kwargs) in enumerate(methods, 1):
+            logger.info(f"\n[{method_idx}/{len(methods)}] Generating {method_name} submission...")
+            logger.info("=" * 60)
+        
+            # Prepare output name
+            output_name = f"{output_prefix}_method_{method_name}.tsv"
+        
+            # Prepare weights for weighted_average
+            method_weights = weights if method_key == 'weighted_average' else None
+        
+            try:
+                result_path = run_submission_averaging(
+                    submission_files=submission_files,
+                    weights=method_weights,
+                    output_name=output_name,
+                    ensemble_method=method_key,
+                    **method_kwargs
+                )
+                output_files.append(result_path)
+                logger.info(f"✓ {method_name} submission generated: {result_path}")
+            except Exception as e:
+                logger.error(f"❌ Failed to generate {method_name} submission: {e}")
+                logger.exception("Error details:")
+                # Continue with other methods even if one fails
+                continue
     
     total_time = time.time() - start_time
     logger.info("\n" + "=" * 60)
@@ -264,7 +264,8 @@ def run_grid_search_pipeline(
                     scoring=gs_config.get('scoring', 'f1_samples'),
                     n_jobs=n_jobs,
                     save_results=True,
-                    output_dir=output_dir
+                    output_dir=output_dir,
+                    resume=resume
                 )
             
             all_results[ont_code] = {
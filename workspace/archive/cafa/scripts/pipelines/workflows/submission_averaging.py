@@ -5,12 +5,14 @@ Combines multiple submission files by averaging their prediction scores.
 
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from utils.logging import setup_logging, get_logger
 from config import get_extra_output_name
+from config.prediction import COLUMNAR_SUBMISSION_SUFFIX
 from prediction.submission_averaging import (
     average_submissions,
+    average_submissions_multi,
     validate_submission_format
 )
 from prediction.submission_merging import merge_submissions_outer
@@ -21,6 +23,66 @@ from pipelines.workflows.workflow_paths import setup_workflow_paths
 logger = get_logger(__name__)
 
 
+def _validate_submission_inputs(submission_files: List[str]) -> List[str]:
+    """
+    Keep the submission files that pass format validation.
+    
+    Returns:
+        list: Valid submission files
+        
+    Raises:
+        ValueError: If no submission file is valid
+    """
+    # Validate input files
+    logger.info(f"Validating {len(submission_files)} submission files...")
+    valid_files = []
+    
+    for i, filepath in enumerate(submission_files, 1):
+        logger.info(f"Validating [{i}/{len(submission_files)}]: {Path(filepath).name}")
+        is_valid, issues = validate_submission_format(filepath)
+        
+        if is_valid:
+            logger.info("      ✓ Valid")
+            valid_files.append(filepath)
+        else:
+            logger.error("      ❌ Invalid submission file:")
+            for issue in issues:
+                    logger.error(f"         - {issue}")
+    
+    if not valid_files:
+        raise ValueError("No valid submission files found")
+    
+    if len(valid_files) < len(submission_files):
+        logger.warning(f"Using {len(valid_files)}/{len(submission_files)} valid files")
+    
+    return valid_files
+
+
+def _align_weights(submission_files: List[str],
+                   valid_files: List[str],
+                   weights: Optional[List[float]]) -> Optional[List[float]]:
+    """
+    Align weights to the valid submission files and normalize them.
+    
+    Returns:
+        list: Normalized weights, or None if no weights were given
+        
+    Raises:
+        ValueError: If the weights can't be aligned or normalized
+    """
+    if weights is None:
+        return None
+    from utils.cli_utils import validate_and_adjust_weights
+    # Adjust weights to match valid files
+    if len(weights) != len(valid_files):
+        logger.warning("Adjusting weights to match valid files")
+        valid_indices = [i for i, f in enumerate(submission_files) if f in valid_files]
+        weights = [weights[i] for i in valid_indices]
+    weights = validate_and_adjust_weights(weights, len(valid_files))
+    logger.info(f"Normalized weights: {weights}")
+    return weights
+
+
 def run_submission_averaging(submission_files: List[str],
                             weights: Optional[List[float]] = None,
                             output_name: Optional[str] = None,
@@ -52,38 +114,8 @@ def run_submission_averaging(submission_files: List[str],
     
     start_time = time.time()
     
-    # Validate input files
-    logger.info(f"Validating {len(submission_files)} submission files...")
-    valid_files = []
-    
-    for i, filepath in enumerate(submission_files, 1):
-        logger.info(f"Validating [{i}/{len(submission_files)}]: {Path(filepath).name}")
-        is_valid, issues = validate_submission_format(filepath)
-        
-        if is_valid:
-            logger.info("      ✓ Valid")
-            valid_files.append(filepath)
-        else:
-            logger.error("      ❌ Invalid submission file:")
-            for issue in issues:
-                    logger.error(f"         - {issue}")
-    
-    if not valid_files:
-        raise ValueError("No valid submission files found")
-    
-    if len(valid_files) < len(submission_files):
-        logger.warning(f"Using {len(valid_files)}/{len(submission_files)} valid files")
-    
-    # Validate weights if provided
-    if weights is not None:
-        from utils.cli_utils import validate_and_adjust_weights
-        # Adjust weights to match valid files
-        if len(weights) != len(valid_files):
-            logger.warning("Adjusting weights to match valid files")
-            valid_indices = [i for i, f in enumerate(submission_files) if f in valid_files]
-            weights = [weights[i] for i in valid_indices]
-        weights = validate_and_adjust_weights(weights, len(valid_files))
-        logger.info(f"Normalized weights: {weights}")
+    valid_files = _validate_submission_inputs(submission_files)
+    weights = _align_weights(submission_files, valid_files, weights)
     
     # Set up output directory
     _, output_dir = setup_workflow_paths(test=False)
@@ -93,7 +125,7 @@ def run_submission_averaging(submission_files: List[str],
         # Use outer merge strategy
         logger.info("Merging 2 submissions using outer merge...")
         prefer = prefer_submission if prefer_submission in ['submission1', 'submission2'] else 'submission2'
-        temp_path = output_dir / 'temp_merged_submission.tsv'
+        temp_path = output_dir / f'temp_merged_submission{COLUMNAR_SUBMISSION_SUFFIX}'
         
         averaged_path = merge_submissions_outer(
             submission1_path=valid_files[0],
@@ -104,7 +136,7 @@ def run_submission_averaging(submission_files: List[str],
     else:
         # Use ensemble/averaging methods
         logger.info(f"Ensembling submissions using method: {ensemble_method}...")
-        temp_path = output_dir / 'temp_averaged_submission.tsv'
+        temp_path = output_dir / f'temp_averaged_submission{COLUMNAR_SUBMISSION_SUFFIX}'
         
         averaged_path = average_submissions(
             submission_files=valid_files,
@@ -132,3 +164,80 @@ def run_submission_averaging(submission_files: List[str],
     
     return str(final_path)
 
+
+def run_submission_averaging_multi(submission_files: List[str],
+                                  method_specs: Dict[str, Dict],
+                                  weights: Optional[List[float]] = None,
+                                  extra_output_name: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    Run the submission averaging workflow for several ensemble methods at once.
+    Inputs are validated and aligned once; every method reduces the same aligned
+    score blocks into its own output, which is then post-processed as usual.
+    Weights are only checked for weighted_average methods, so bad weights fail
+    those methods alone.
+    
+    Args:
+        submission_files: List of paths to submission files
+        method_specs: Method name → {'ensemble_method', 'output_name', optional 'ensemble_kwargs'};
+                      weights are applied to weighted_average methods
+        weights: Optional weights for weighted_average methods
+        extra_output_name: Optional filename for a descriptive copy of submission.tsv
+        
+    Returns:
+        dict: Method name → path to final ensembled submission, or None if that method failed
+    """
+    setup_logging()
+    logger.info("Starting Submission Averaging Workflow (single pass, "
+                f"{len(method_specs)} methods)")
+    logger.info("=" * 60)
+    
+    start_time = time.time()
+    
+    valid_files = _validate_submission_inputs(submission_files)
+    
+    # Set up output directory
+    _, output_dir = setup_workflow_paths(test=False)
+    
+    averaged_specs = {}
+    for method_name, spec in method_specs.items():
+        method_weights = None
+        if spec['ensemble_method'] == 'weighted_average':
+            try:
+                method_weights = _align_weights(submission_files, valid_files, weights)
+            except Exception as e:
+                logger.error(f"❌ {method_name}: invalid weights: {e}")
+                averaged_specs[method_name] = None
+                continue
+        averaged_specs[method_name] = {
+            'ensemble_method': spec['ensemble_method'],
+            'output_path': output_dir / f'temp_averaged_submission_{method_name}{COLUMNAR_SUBMISSION_SUFFIX}',
+            'weights': method_weights,
+            'ensemble_kwargs': spec.get('ensemble_kwargs', {}),
+        }
+    averaged_paths = average_submissions_multi(valid_files, averaged_specs)
+    
+    # Post-process each method's output (propagation, validation, term limits)
+    final_extra_output_name = get_extra_output_name(extra_output_name)
+    final_paths = {}
+    for method_name, averaged_path in averaged_paths.items():
+        if averaged_path is None:
+            final_paths[method_name] = None
+            continue
+        logger.info(f"Post-processing {method_name} submission...")
+        try:
+            final_paths[method_name] = str(post_process_submission(
+                temp_submission_path=averaged_path,
+                output_dir=output_dir,
+                output_name=method_specs[method_name].get('output_name'),
+                extra_output_name=final_extra_output_name
+            ))
+        except Exception as e:
+            logger.error(f"❌ Failed to post-process {method_name} submission: {e}")
+            logger.exception("Error details:")
+            final_paths[method_name] = None
+    
+    total_time = time.time() - start_time
+    logger.info("Submission Averaging Complete!")
+    logger.info(f"Total time: {total_time:.1f}s")
+    
+    return final_paths
@@ -18,10 +18,12 @@ from preprocessing.data_streaming import (
 from config import ONTOLOGY_CODES
 from config.training import LOAD_LABELS_PER_ONTOLOGY, FREE_FEATURES_AFTER_ONTOLOGY
 from utils.logging import get_logger
+from utils.profiling import profiled
 
 logger = get_logger(__name__)
 
 
+@profiled('load_sequences', rows=lambda result: len(result[0]), datatype='train')
 def load_training_data_streaming(data_dir: Path, 
                                 use_streaming: bool = True) -> Tuple[Dict[str, str], pd.DataFrame, pd.DataFrame]:
     """
@@ -118,6 +120,7 @@ def extract_features_streaming(train_seqs: Dict[str, str],
     return X_train, y_train_proteins
 
 
+@profiled('labels', rows=lambda result: sum(y.shape[0] for y in result[1].values()))
 def prepare_labels_streaming(train_terms: pd.DataFrame,
                             y_train_proteins: List[str],
                             ont_codes: List[str],
@@ -12,6 +12,7 @@ from utils.utils_common import cleanup_memory
 from config import get_model_trainer, get_ontology_hyperparams, MODELS_DIR, DATA_INPUT_DIR
 from utils.model_io import save_model, load_model, check_model_exists, save_pytorch_model
 from utils.logging import get_logger
+from utils.profiling import profile_span
 
 logger = get_logger(__name__)
 
@@ -106,10 +107,11 @@ def train_single_ontology_model(X_train: np.ndarray,
     y_ont = y_train_dict[ont_code]
     
     train_ontology_model, _ = get_model_trainer(model_name)
-    model = train_ontology_model(
-        X_train, y_ont, ont_code, ont_name, 
-        **get_ontology_hyperparams(model_name, ont_code)
-    )
+    with profile_span('train', rows=y_ont.shape[0], ontology=ont_code, model=model_name, terms=y_ont.shape[1]):
+        model = train_ontology_model(
+            X_train, y_ont, ont_code, ont_name, 
+            **get_ontology_hyperparams(model_name, ont_code)
+        )
     
     if model is not None:
         # Save model
@@ -178,6 +180,7 @@ def _optimize_threshold(model: Any,
     if y_val_proba is not None:
         pred_settings = PREDICTION_SETTINGS
         threshold_grid = pred_settings.get("threshold_grid", [i/100 for i in range(1, 51)])
+        _report_cpu_inference_accuracy(model, X_val, y_val_true, ia_weights, mlb, threshold_grid, ont_name)
         optimal_threshold, best_f1 = optimize_threshold(
             y_val_proba, y_val_true, ia_weights, mlb, threshold_grid
         )
@@ -187,6 +190,26 @@ def _optimize_threshold(model: Any,
     return None
 
 
+def _report_cpu_inference_accuracy(model: Any,
+                                   X_val: np.ndarray,
+                                   y_val_true: np.ndarray,
+                                   ia_weights: Dict[str, float],
+                                   mlb: Any,
+                                   threshold_grid: list,
+                                   ont_name: str) -> None:
+    """Log the IA-F1 cost of int8 CPU inference on the validation split (only when quantization is enabled)."""
+    from config.prediction import CPU_INFERENCE_ENABLED, CPU_INFERENCE_QUANTIZE
+    from utils.cpu_inference import supports_cpu_inference, accuracy_delta_report, print_accuracy_delta_report
+    
+    if not (CPU_INFERENCE_ENABLED and CPU_INFERENCE_QUANTIZE and supports_cpu_inference(model)):
+        return
+    try:
+        rows = accuracy_delta_report(model, X_val, y_val_true, ia_weights, mlb, threshold_grid)
+        print_accuracy_delta_report(rows, title=f"{ont_name} CPU inference accuracy")
+    except Exception as e:
+        logger.warning(f"   Could not compute CPU inference accuracy report: {e}")
+
+
 def _save_pytorch_model(model: Any,
                        mlb: Any,
                        ont_code: str,
@@ -0,0 +1,175 @@
+"""
+Shared training data for process-based multi-ontology training.
+
+X_train and each ontology's label matrix are published once as .npy files (CSR
+labels as data/indices/indptr) in a temporary directory - /dev/shm when it has
+room, so the pages live in shared memory - and every worker process maps them
+read-only instead of receiving a pickled copy. Workers also get a fixed thread
+budget (BLAS/OpenMP via threadpoolctl, torch intra-op threads, optional CPU
+affinity) so concurrent ontologies do not oversubscribe the machine.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.profiling import peak_rss_mb
+
+_SHM_DIR = Path('/dev/shm')
+_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def _array_nbytes(array: Any) -> int:
+    if hasattr(array, 'indptr'):
+        return array.data.nbytes + array.indices.nbytes + array.indptr.nbytes
+    return int(getattr(array, 'nbytes', 0))
+
+
+def _shared_dir(nbytes: int) -> Path:
+    """Temp directory in /dev/shm when it can hold nbytes (with headroom), else the default temp dir."""
+    shm_ok = False
+    if _SHM_DIR.is_dir() and os.access(_SHM_DIR, os.W_OK):
+        shm_ok = shutil.disk_usage(_SHM_DIR).free > nbytes * 1.2
+    return Path(tempfile.mkdtemp(prefix='parallel_train_', dir=str(_SHM_DIR) if shm_ok else None))
+
+
+def _save_array(array: np.ndarray, path: Path) -> Dict[str, Any]:
+    """Write an array as .npy (chunked, so memmap sources are not materialized)."""
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=array.dtype, shape=array.shape)
+    step = max(1, (64 * 1024 ** 2) // max(1, array[:1].nbytes))
+    for start in range(0, array.shape[0], step):
+        out[start:start + step] = array[start:start + step]
+    out.flush()
+    del out
+    return {'kind': 'npy', 'path': str(path)}
+
+
+def _publish_labels(y: Any, directory: Path, name: str) -> Dict[str, Any]:
+    if hasattr(y, 'tocsr'):
+        y = y.tocsr()
+        spec = {'kind': 'csr', 'shape': tuple(y.shape)}
+        for part in ('data', 'indices', 'indptr'):
+            spec[part] = _save_array(np.asarray(getattr(y, part)), directory / f'{name}_{part}.npy')['path']
+        return spec
+    return _save_array(np.asarray(y), directory / f'{name}.npy')
+
+
+class SharedTrainingData:
+    """
+    Publish X_train and per-ontology labels for worker processes.
+
+    Usage:
+        with SharedTrainingData(X_train, y_train_dict) as shared:
+            spec = shared.spec  # picklable; pass to workers
+            ...                 # in a worker: X, y_dict = attach_training_data(spec, ['F'])
+    """
+
+    def __init__(self, X_train: Union[np.ndarray, Path], y_train_dict: Dict[str, Any]):
+        nbytes = sum(_array_nbytes(y) for y in y_train_dict.values())
+        if not isinstance(X_train, (str, Path)):
+            nbytes += _array_nbytes(X_train)
+        self.directory = _shared_dir(nbytes)
+        self.nbytes = nbytes
+        try:
+            if isinstance(X_train, (str, Path)):
+                # Already a memmap file on disk - workers open it themselves
+                x_spec = {'kind': 'path', 'path': str(X_train)}
+            else:
+                x_spec = _save_array(X_train, self.directory / 'X_train.npy')
+            self.spec = {
+                'X_train': x_spec,
+                'labels': {ont_code: _publish_labels(y, self.directory, f'y_{ont_code}')
+                           for ont_code, y in y_train_dict.items()},
+            }
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def in_shared_memory(self) -> bool:
+        return self.directory.parent == _SHM_DIR
+
+    def close(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> 'SharedTrainingData':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _attach_array(spec: Dict[str, Any]) -> Any:
+    if spec['kind'] == 'path':
+        return Path(spec['path'])
+    if spec['kind'] == 'csr':
+        from scipy.sparse import csr_matrix
+        parts = [np.load(spec[part], mmap_mode='r') for part in ('data', 'indices', 'indptr')]
+        return csr_matrix(tuple(parts), shape=spec['shape'], copy=False)
+    return np.load(spec['path'], mmap_mode='r')
+
+
+def attach_training_data(spec: Dict[str, Any],
+                         ont_codes: Optional[Sequence[str]] = None) -> Tuple[Union[np.ndarray, Path], Dict[str, Any]]:
+    """
+    Map published training data read-only in a worker.
+
+    Args:
+        spec: SharedTrainingData.spec
+        ont_codes: Ontologies whose labels to attach (default: all)
+
+    Returns:
+        tuple: (X_train memmap or memmap path, {ont_code: label matrix})
+    """
+    labels = spec['labels']
+    ont_codes = list(labels) if ont_codes is None else ont_codes
+    return _attach_array(spec['X_train']), {ont_code: _attach_array(labels[ont_code]) for ont_code in ont_codes}
+
+
+def worker_thread_budget(n_workers: int, threads_per_worker: Optional[int] = None) -> Tuple[int, List[List[int]]]:
+    """
+    Threads and CPU sets for concurrent training workers.
+
+    Args:
+        n_workers: Concurrent worker processes
+        threads_per_worker: Fixed threads per worker (default: available CPUs // n_workers)
+
+    Returns:
+        tuple: (threads per worker, per-worker CPU lists; empty lists when CPUs cannot be split)
+    """
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(os.cpu_count() or 1))
+    threads = threads_per_worker or max(1, len(cpus) // max(1, n_workers))
+    if threads * n_workers > len(cpus):
+        return threads, [[] for _ in range(n_workers)]
+    return threads, [cpus[i * threads:(i + 1) * threads] for i in range(n_workers)]
+
+
+def limit_worker_threads(n_threads: int, cpus: Optional[Sequence[int]] = None) -> None:
+    """
+    Apply a worker's thread budget: BLAS/OpenMP pools, torch threads, env vars for children, CPU affinity.
+
+    Args:
+        n_threads: Threads this worker may use
+        cpus: Optional CPU ids to pin the worker to
+    """
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(n_threads)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=n_threads)
+    except ImportError:
+        pass
+    try:
+        import torch
+        torch.set_num_threads(n_threads)
+    except ImportError:
+        pass
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError:
+            pass
@@ -3,6 +3,7 @@ Training workflow orchestrator for CAFA 6 protein function prediction.
 High-level orchestration that delegates to focused modules.
 """
 
+import os
 import time
 import numpy as np
 from pathlib import Path
@@ -327,69 +328,128 @@ def run_train_single_ontology(model_name: str, ont_code: str, mode: Optional[str
     return model_result
 
 
-def run_train_parallel_ontologies(model_name: str, ont_codes: List[str], mode: Optional[str] = None, model_config_override: Optional[Dict] = None) -> Dict[str, Any]:
+class ParallelTrainingResult(dict):
     """
-    Train multiple ontologies in parallel.
-    Each ontology trains on a different thread, allowing better resource utilization.
+    ont_code -> trained model (paths for neural networks, objects for sklearn).
+
+    Attributes:
+        stats: ont_code -> {'ont_name', 'backend', 'seconds', 'peak_rss_mb', 'threads', 'pid', 'error'};
+               peak_rss_mb is per worker process (None with the thread backend, where it is process-wide)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+
+def _train_ontology_process(task: Dict[str, Any]) -> Tuple[str, Any, Dict[str, Any]]:
+    """
+    Process-pool worker: map the shared training data, apply the thread budget, train one ontology.
     
     Args:
-        model_name: Model configuration name
-        ont_codes: List of ontology codes to train (e.g., ['P', 'C'])
-        mode: Model loading/training mode
-        model_config_override: Optional model config dict with overrides (e.g., feature override from CLI)
+        task: ont_code, shared_spec, mlb, model_name, model_config, mode, threads, cpus
         
     Returns:
-        dict: ont_code -> trained model (paths for neural networks, objects for sklearn)
+        tuple: (ont_code, model_result or None, stats)
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    from multiprocessing import cpu_count
-    from utils.model_io import check_model_exists
-    
-    setup_logging()
-    logger.info(f"Starting Parallel Training: {', '.join(ont_codes)}")
-    print("=" * 60)
-    
-    start_time = time.time()
-    mode = mode or 'train_new'
-    logger.info(f"Mode: {mode}")
-    
-    # Get model configuration (use override if provided)
-    if model_config_override:
-        model_config = model_config_override
-    else:
-        model_config = get_model_config(model_name)
-    logger.info(f"Using model: {model_config['description']}")
-    
-    # Data Preparation (shared across all ontologies)
-    logger.info("[STEP 1] Data Preparation (shared)...")
-    prep_start = time.time()
-    
-    train_seqs, X_train, y_train_proteins, mlb_dict, y_train_dict = _prepare_training_data(
-        model_config, ont_codes=ont_codes
+    from pipelines.workflows.training.shared_training_data import (
+        attach_training_data, limit_worker_threads, peak_rss_mb
     )
+    from config import get_ontology_name
     
-    logger.info(f"Data prep time: {time.time() - prep_start:.1f}s")
-    
-    # Validate ontologies
-    valid_ont_codes = _validate_ontologies_for_training(
-        ont_codes, y_train_dict, model_config, mode
-    )
-    
-    if not valid_ont_codes:
-        logger.warning("No ontologies to train in parallel")
-        return {}
-    
-    # Train ontologies in parallel using ThreadPoolExecutor
-    max_workers = min(len(valid_ont_codes), cpu_count())
-    logger.info(f"[STEP 2] Training {len(valid_ont_codes)} ontologies in parallel (workers: {max_workers})...")
+    limit_worker_threads(task['threads'], task['cpus'])
+    setup_logging()
+    ont_code = task['ont_code']
+    ont_name = get_ontology_name(ont_code)
+    stats = {'ont_name': ont_name, 'backend': 'process', 'threads': task['threads'], 'pid': os.getpid(),
+             'error': None}
+    start = time.time()
+    model_result = None
+    try:
+        logger.info(f"[Parallel] Starting {ont_name} ({ont_code}) in process {os.getpid()} "
+                    f"({task['threads']} threads)...")
+        X_train, y_train_dict = attach_training_data(task['shared_spec'], [ont_code])
+        model_result, _ = train_single_ontology_model(
+            X_train=X_train,
+            y_train_dict=y_train_dict,
+            mlb_dict={ont_code: task['mlb']},
+            ont_code=ont_code,
+            ont_name=ont_name,
+            model_name=task['model_name'],
+            model_config=task['model_config'],
+            mode=task['mode'],
+            enable_threshold_opt=False
+        )
+        logger.info(f"[Parallel] ✓ Completed {ont_name} ({ont_code})")
+    except Exception as e:
+        logger.error(f"[Parallel] ❌ Error training {ont_code}: {e}")
+        import traceback
+        traceback.print_exc()
+        stats['error'] = str(e)
+    stats['seconds'] = time.time() - start
+    stats['peak_rss_mb'] = peak_rss_mb()
+    return ont_code, model_result, stats
+
+
+def _train_parallel_processes(valid_ont_codes: List[str],
+                              X_train: Union[np.ndarray, Path],
+                              y_train_dict: Dict[str, Any],
+                              mlb_dict: Dict[str, Any],
+                              model_name: str,
+                              model_config: Dict[str, Any],
+                              mode: str,
+                              max_workers: int) -> ParallelTrainingResult:
+    """Train ontologies in worker processes that map X_train/labels from shared memory."""
+    import multiprocessing
+    from config.training import PARALLEL_ONTOLOGY_THREADS
+    from pipelines.workflows.training.shared_training_data import SharedTrainingData, worker_thread_budget
+    
+    threads, cpu_sets = worker_thread_budget(max_workers, PARALLEL_ONTOLOGY_THREADS)
+    models = ParallelTrainingResult()
+    with SharedTrainingData(X_train, {ont_code: y_train_dict[ont_code] for ont_code in valid_ont_codes}) as shared:
+        logger.info(f"Published training data once ({shared.nbytes / 1024 ** 2:.1f}MB, "
+                    f"{'shared memory' if shared.in_shared_memory else 'memmap'}: {shared.directory}); "
+                    f"{threads} threads per worker")
+        tasks = [{
+            'ont_code': ont_code,
+            'shared_spec': shared.spec,
+            'mlb': mlb_dict[ont_code],
+            'model_name': model_name,
+            'model_config': model_config,
+            'mode': mode,
+            'threads': threads,
+            'cpus': cpu_sets[i % max_workers],
+        } for i, ont_code in enumerate(valid_ont_codes)]
+        
+        # spawn: no inherited CUDA/thread-pool state; one fresh process per ontology so peak RSS is per ontology
+        with multiprocessing.get_context('spawn').Pool(processes=max_workers, maxtasksperchild=1) as pool:
+            for ont_code, model_result, stats in pool.imap_unordered(_train_ontology_process, tasks):
+                models.stats[ont_code] = stats
+                if model_result is not None:
+                    models[ont_code] = model_result
+    return models
+
+
+def _train_parallel_threads(valid_ont_codes: List[str],
+                            X_train: Union[np.ndarray, Path],
+                            y_train_dict: Dict[str, Any],
+                            mlb_dict: Dict[str, Any],
+                            model_name: str,
+                            model_config: Dict[str, Any],
+                            mode: str,
+                            max_workers: int) -> ParallelTrainingResult:
+    """Train ontologies on threads sharing this process's X_train/labels."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     
-    models = {}
-    model_times = {}
+    models = ParallelTrainingResult()
     
     def train_ontology_worker(ont_code: str):
         """Worker function for parallel training."""
         from config import get_ontology_name
         ont_name = get_ontology_name(ont_code)
+        stats = {'ont_name': ont_name, 'backend': 'thread', 'threads': None, 'pid': os.getpid(),
+                 'peak_rss_mb': None, 'error': None}
+        start = time.time()
         
         try:
             logger.info(f"[Parallel] Starting {ont_name} ({ont_code})...")
@@ -404,14 +464,15 @@ def run_train_parallel_ontologies(model_name: str, ont_codes: List[str], mode: O
                 mode=mode,
                 enable_threshold_opt=False
             )
-            model_times[ont_name] = ont_time
             logger.info(f"[Parallel] ✓ Completed {ont_name} ({ont_code})")
-            return (ont_code, model_result)
         except Exception as e:
             logger.error(f"[Parallel] ❌ Error training {ont_code}: {e}")
             import traceback
             traceback.print_exc()
-            return (ont_code, None)
+            model_result = None
+            stats['error'] = str(e)
+        stats['seconds'] = time.time() - start
+        return (ont_code, model_result, stats)
     
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # Submit all tasks
@@ -424,11 +485,89 @@ def run_train_parallel_ontologies(model_name: str, ont_codes: List[str], mode: O
         for future in as_completed(future_to_ont):
             ont_code = future_to_ont[future]
             try:
-                result_ont_code, model_result = future.result()
+                result_ont_code, model_result, stats = future.result()
+                models.stats[result_ont_code] = stats
                 if model_result is not None:
                     models[result_ont_code] = model_result
             except Exception as e:
                 logger.error(f"{ont_code} training failed: {e}")
+    return models
+
+
+def run_train_parallel_ontologies(model_name: str,
+                                  ont_codes: List[str],
+                                  mode: Optional[str] = None,
+                                  model_config_override: Optional[Dict] = None,
+                                  backend: Optional[str] = None) -> ParallelTrainingResult:
+    """
+    Train multiple ontologies in parallel.
+    With the 'process' backend each ontology trains in its own process: X_train and the
+    label matrices are published once in shared memory (memmap) rather than copied per
+    worker, and each worker gets a fixed share of the CPU threads. The 'thread' backend
+    trains on threads in this process.
+    
+    Args:
+        model_name: Model configuration name
+        ont_codes: List of ontology codes to train (e.g., ['P', 'C'])
+        mode: Model loading/training mode
+        model_config_override: Optional model config dict with overrides (e.g., feature override from CLI)
+        backend: 'process' or 'thread' (default: PARALLEL_ONTOLOGY_BACKEND)
+        
+    Returns:
+        ParallelTrainingResult: ont_code -> trained model (paths for neural networks, objects for sklearn),
+                                with per-ontology timing/peak RSS in .stats
+    """
+    from multiprocessing import cpu_count
+    from config.training import PARALLEL_ONTOLOGY_BACKEND
+    
+    setup_logging()
+    logger.info(f"Starting Parallel Training: {', '.join(ont_codes)}")
+    print("=" * 60)
+    
+    start_time = time.time()
+    mode = mode or 'train_new'
+    backend = backend or PARALLEL_ONTOLOGY_BACKEND
+    logger.info(f"Mode: {mode}")
+    
+    # Get model configuration (use override if provided)
+    if model_config_override:
+        model_config = model_config_override
+    else:
+        model_config = get_model_config(model_name)
+    logger.info(f"Using model: {model_config['description']}")
+    
+    # Data Preparation (shared across all ontologies)
+    logger.info("[STEP 1] Data Preparation (shared)...")
+    prep_start = time.time()
+    
+    train_seqs, X_train, y_train_proteins, mlb_dict, y_train_dict = _prepare_training_data(
+        model_config, ont_codes=ont_codes
+    )
+    
+    logger.info(f"Data prep time: {time.time() - prep_start:.1f}s")
+    
+    # Validate ontologies
+    valid_ont_codes = _validate_ontologies_for_training(
+        ont_codes, y_train_dict, model_config, mode
+    )
+    
+    if not valid_ont_codes:
+        logger.warning("No ontologies to train in parallel")
+        return ParallelTrainingResult()
+    
+    max_workers = min(len(valid_ont_codes), cpu_count())
+    logger.info(f"[STEP 2] Training {len(valid_ont_codes)} ontologies in parallel "
+                f"({backend} backend, workers: {max_workers})...")
+    
+    train_parallel = _train_parallel_processes if backend == 'process' else _train_parallel_threads
+    models = train_parallel(valid_ont_codes, X_train, y_train_dict, mlb_dict,
+                            model_name, model_config, mode, max_workers)
+    
+    logger.info("Training Summary:")
+    for ont_code, stats in models.stats.items():
+        peak = f", peak RSS {stats['peak_rss_mb']:.0f}MB" if stats.get('peak_rss_mb') is not None else ""
+        status = f" ❌ {stats['error']}" if stats['error'] else ""
+        logger.info(f"   {stats['ont_name']}: {stats['seconds']:.1f}s{peak}{status}")
     
     total_time = time.time() - start_time
     logger.info("Parallel Training Complete!")
@@ -436,4 +575,3 @@ def run_train_parallel_ontologies(model_name: str, ont_codes: List[str], mode: O
     logger.info(f"Trained {len(models)} models in parallel")
     
     return models
-
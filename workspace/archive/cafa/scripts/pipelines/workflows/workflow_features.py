@@ -1,66 +1,9 @@
 """
-Workflow feature extraction utilities for CAFA 6 protein function prediction.
-Handles feature extraction and feature configuration comparison.
+Workflow feature utilities for CAFA 6 protein function prediction.
+Handles feature configuration comparison and dimension inference.
 """
 
-from typing import Dict, List, Tuple, Optional, Any, Union
-from pathlib import Path
-import numpy as np
-
-from preprocessing.feature_extraction import extract_features
-
-
-def extract_features_for_model(sequences: Dict[str, str],
-                              protein_ids: List[str],
-                              config: Dict) -> np.ndarray:
-    """
-    Extract features for a model configuration.
-    Uses unified feature extraction interface with automatic memory optimization.
-    
-    Args:
-        sequences: Dict mapping protein_id -> sequence
-        protein_ids: List of protein IDs to extract features for
-        config: Model configuration dict
-        
-    Returns:
-        np.ndarray: Feature matrix (n_samples, n_features)
-        
-    Note:
-        For large datasets, this may return a memmap path. The caller should handle
-        both np.ndarray and Path return types, or ensure small batch sizes.
-    """
-    # Use unified extraction interface
-    features_result, _ = extract_features(
-        sequences=sequences,
-        config=config,
-        protein_ids=protein_ids,
-        datatype='test',
-        force_memmap=False  # For prediction batches, prefer arrays (batches are small)
-    )
-    
-    # Handle memmap path (shouldn't happen for small batches, but handle gracefully)
-    if isinstance(features_result, Path):
-        from utils.memory_efficient import load_features_memmap
-        return np.array(load_features_memmap(features_result))
-    
-    return features_result
-
-
-def get_feature_cache_key(feature_type: str, features: Optional[List[str]]) -> Tuple:
-    """
-    Generate cache key for feature extraction.
-    
-    Args:
-        feature_type: Feature type ('fused_embeddings', 'hand_crafted')
-        features: Optional list of feature names
-        
-    Returns:
-        tuple: Cache key for feature extraction
-    """
-    if feature_type == 'fused_embeddings' and features:
-        return ('fused', tuple(sorted(features)))
-    else:
-        return ('handcrafted',)
+from typing import Dict, List, Tuple, Optional, Any
 
 
 def make_hashable_for_comparison(val: Any) -> Any:
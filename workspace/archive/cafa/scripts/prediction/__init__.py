@@ -9,12 +9,33 @@ from .predict_and_submit import (
     post_process_submission
 )
 from .submission_merging import parse_submission_line
+from .columnar_submission import (
+    ColumnarSubmission,
+    ColumnarSubmissionWriter,
+    is_columnar_submission,
+    iter_submission_records,
+    tsv_to_columnar
+)
+from .submission_merge_engine import (
+    AlignedScoreBlock,
+    SubmissionMergeEngine,
+    merge_submission_files,
+    fan_out_submission_files
+)
+from .prediction_pipeline import (
+    FeatureMatrixCache,
+    run_prediction_pipeline,
+    report_pipeline_stats
+)
 from .prediction_utils import (
     format_prediction_score,
     is_valid_score,
     validate_go_term_format,
     cleanup_temp_files,
-    log_progress
+    log_progress,
+    encode_fixed_width_labels,
+    select_top_predictions,
+    render_prediction_lines
 )
 
 __all__ = [
@@ -22,9 +43,24 @@ __all__ = [
     'make_predictions', 
     'post_process_submission',
     'parse_submission_line',
+    'ColumnarSubmission',
+    'ColumnarSubmissionWriter',
+    'is_columnar_submission',
+    'iter_submission_records',
+    'tsv_to_columnar',
+    'AlignedScoreBlock',
+    'SubmissionMergeEngine',
+    'merge_submission_files',
+    'fan_out_submission_files',
+    'FeatureMatrixCache',
+    'run_prediction_pipeline',
+    'report_pipeline_stats',
     'format_prediction_score',
     'is_valid_score',
     'validate_go_term_format',
     'cleanup_temp_files',
-    'log_progress'
+    'log_progress',
+    'encode_fixed_width_labels',
+    'select_top_predictions',
+    'render_prediction_lines'
 ]
@@ -0,0 +1,386 @@
+"""
+Columnar binary intermediate submission format for CAFA 6 protein function prediction.
+
+An intermediate submission is a directory (suffix '.cols') holding:
+    protein_idx.i32  - int32 row -> protein dictionary index
+    term_idx.i32     - int32 row -> term dictionary index
+    score.f32        - float32 score, already rounded to submission precision
+    proteins.txt     - protein ID dictionary (one per line)
+    terms.txt        - GO term dictionary (one per line)
+    manifest.json    - format version, row count and appended chunk sizes
+
+Columns are appended chunk by chunk while predicting and read back with np.memmap,
+so downstream stages never re-parse text; the TSV is rendered once at the end.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from prediction.prediction_utils import (
+    quantize_prediction_scores,
+    encode_fixed_width_labels,
+    render_prediction_lines
+)
+
+COLUMNAR_FORMAT_VERSION = 1
+
+_COLUMNS = {
+    'protein_idx': ('protein_idx.i32', np.int32),
+    'term_idx': ('term_idx.i32', np.int32),
+    'score': ('score.f32', np.float32),
+}
+
+
+def is_columnar_submission(path: Union[str, Path]) -> bool:
+    """Check whether a path is a columnar intermediate submission directory."""
+    path = Path(path)
+    return path.is_dir() and (path / 'manifest.json').exists()
+
+
+def remove_submission(path: Union[str, Path]) -> None:
+    """Remove an intermediate submission (columnar directory or TSV file)."""
+    path = Path(path)
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        os.remove(path)
+
+
+class _LabelDictionary:
+    """Append-only string -> int32 dictionary."""
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def encode(self, labels: Sequence[str]) -> np.ndarray:
+        index = self.index
+        for label in dict.fromkeys(labels):
+            if label not in index:
+                index[label] = len(self.labels)
+                self.labels.append(label)
+        return np.fromiter(map(index.__getitem__, labels), dtype=np.int32, count=len(labels))
+
+
+class ColumnarSubmissionWriter:
+    """
+    Append predictions to a columnar intermediate submission.
+
+    Rows are written in the order they are added (like lines of a TSV). Scores are
+    rounded with format_prediction_score and rows failing is_valid_score are dropped,
+    exactly as a write + parse_submission_line round trip would.
+
+    Usage:
+        with ColumnarSubmissionWriter(output_dir / 'temp_submission.cols') as writer:
+            writer.write_predictions(batch_pids, mlb.classes_, row_idx, term_idx, scores)
+    """
+
+    def __init__(self, path: Union[str, Path], buffer_rows: Optional[int] = None):
+        from config.prediction import COLUMNAR_SUBMISSION_CHUNK_ROWS
+
+        self.path = Path(path)
+        remove_submission(self.path)
+        self.path.mkdir(parents=True)
+        self.buffer_rows = buffer_rows or COLUMNAR_SUBMISSION_CHUNK_ROWS
+        self.n_rows = 0
+        self.chunks: List[int] = []
+        self._proteins = _LabelDictionary()
+        self._terms = _LabelDictionary()
+        self._files = {name: open(self.path / filename, 'wb') for name, (filename, _) in _COLUMNS.items()}
+        self._pending: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._pending_rows = 0
+        self._records: List[Tuple[str, str, float]] = []
+
+    def __enter__(self) -> 'ColumnarSubmissionWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write_predictions(self,
+                          protein_ids: Sequence[str],
+                          terms: Sequence[str],
+                          protein_idx: np.ndarray,
+                          term_idx: np.ndarray,
+                          scores: np.ndarray) -> int:
+        """
+        Append a batch of predictions given as positions into protein_ids / terms.
+
+        Args:
+            protein_ids: Protein IDs of the batch rows
+            terms: Term labels of the prediction columns (e.g., mlb.classes_)
+            protein_idx: Position in protein_ids per prediction
+            term_idx: Position in terms per prediction
+            scores: Raw score per prediction
+
+        Returns:
+            int: Number of rows written (after validity filtering)
+        """
+        if len(scores) == 0:
+            return 0
+        rounded, valid = quantize_prediction_scores(scores)
+        if not valid.all():
+            protein_idx, term_idx, rounded = protein_idx[valid], term_idx[valid], rounded[valid]
+        if len(rounded) == 0:
+            return 0
+
+        used_proteins, protein_positions = np.unique(protein_idx, return_inverse=True)
+        used_terms, term_positions = np.unique(term_idx, return_inverse=True)
+        protein_codes = self._proteins.encode([protein_ids[i] for i in used_proteins.tolist()])
+        term_codes = self._terms.encode([terms[i] for i in used_terms.tolist()])
+        self._append(protein_codes[protein_positions.ravel()], term_codes[term_positions.ravel()], rounded)
+        return len(rounded)
+
+    def add(self, protein_id: str, term: str, score: float) -> None:
+        """Append a single prediction (buffered; use write_predictions for batches)."""
+        self._records.append((protein_id, term, score))
+        if len(self._records) >= self.buffer_rows:
+            self._flush_records()
+
+    def write_records(self, records: Sequence[Tuple[str, str, float]]) -> int:
+        """
+        Append (protein_id, term, score) tuples.
+        
+        Returns:
+            int: Number of rows written (after validity filtering)
+        """
+        if not records:
+            return 0
+        protein_ids = [record[0] for record in records]
+        terms = [record[1] for record in records]
+        scores = np.array([record[2] for record in records], dtype=np.float64)
+        positions = np.arange(len(scores))
+        return self.write_predictions(protein_ids, terms, positions, positions, scores)
+
+    def _flush_records(self) -> None:
+        records, self._records = self._records, []
+        self.write_records(records)
+
+    def _append(self, protein_codes: np.ndarray, term_codes: np.ndarray, scores: np.ndarray) -> None:
+        self._pending.append((protein_codes, term_codes, scores))
+        self._pending_rows += len(scores)
+        if self._pending_rows >= self.buffer_rows:
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        if not self._pending:
+            return
+        for position, name in enumerate(_COLUMNS):
+            dtype = _COLUMNS[name][1]
+            column = np.concatenate([chunk[position] for chunk in self._pending]).astype(dtype, copy=False)
+            self._files[name].write(column.tobytes())
+        self.chunks.append(self._pending_rows)
+        self.n_rows += self._pending_rows
+        self._pending = []
+        self._pending_rows = 0
+
+    def flush(self) -> None:
+        """Write all buffered rows to the column files."""
+        self._flush_records()
+        self._flush_pending()
+        for handle in self._files.values():
+            handle.flush()
+
+    def close(self) -> None:
+        """Flush buffered rows and write the dictionaries and manifest."""
+        if self._files is None:
+            return
+        self._flush_records()
+        self._flush_pending()
+        for handle in self._files.values():
+            handle.close()
+        self._files = None
+
+        for filename, labels in (('proteins.txt', self._proteins.labels), ('terms.txt', self._terms.labels)):
+            with open(self.path / filename, 'w', encoding='utf-8') as f:
+                f.writelines(f"{label}\n" for label in labels)
+        manifest = {
+            'format_version': COLUMNAR_FORMAT_VERSION,
+            'n_rows': self.n_rows,
+            'n_proteins': len(self._proteins.labels),
+            'n_terms': len(self._terms.labels),
+            'chunks': self.chunks,
+        }
+        with open(self.path / 'manifest.json', 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+class ColumnarSubmission:
+    """
+    Read-only view of a columnar intermediate submission.
+
+    Attributes:
+        protein_idx, term_idx, score: np.memmap columns (length n_rows)
+        proteins, terms: Object arrays of dictionary labels
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path / 'manifest.json', 'r') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format_version') != COLUMNAR_FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar submission version: {self.manifest.get('format_version')}")
+        self.n_rows = int(self.manifest['n_rows'])
+
+        for name, (filename, dtype) in _COLUMNS.items():
+            if self.n_rows:
+                column = np.memmap(self.path / filename, dtype=dtype, mode='r', shape=(self.n_rows,))
+            else:
+                column = np.zeros(0, dtype=dtype)
+            setattr(self, name, column)
+
+        self.proteins = self._read_labels('proteins.txt')
+        self.terms = self._read_labels('terms.txt')
+
+    def _read_labels(self, filename: str) -> np.ndarray:
+        with open(self.path / filename, 'r', encoding='utf-8') as f:
+            return np.array(f.read().splitlines(), dtype=object)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def iter_chunks(self, chunk_rows: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Iterate over (protein_idx, term_idx, score) column slices.
+
+        Args:
+            chunk_rows: Rows per slice (default: COLUMNAR_SUBMISSION_CHUNK_ROWS)
+        """
+        from config.prediction import COLUMNAR_SUBMISSION_CHUNK_ROWS
+        chunk_rows = chunk_rows or COLUMNAR_SUBMISSION_CHUNK_ROWS
+        for start in range(0, self.n_rows, chunk_rows):
+            end = min(start + chunk_rows, self.n_rows)
+            yield (np.asarray(self.protein_idx[start:end]),
+                   np.asarray(self.term_idx[start:end]),
+                   np.asarray(self.score[start:end]))
+
+    def iter_records(self, chunk_rows: Optional[int] = None) -> Iterator[Tuple[str, str, float]]:
+        """Iterate over (protein_id, term, score) tuples in row order."""
+        for protein_idx, term_idx, score in self.iter_chunks(chunk_rows):
+            yield from zip(self.proteins[protein_idx].tolist(),
+                           self.terms[term_idx].tolist(),
+                           score.tolist())
+
+    def to_tsv(self, output_path: Union[str, Path]) -> Path:
+        """
+        Render the submission as TSV text (protein, term, score per line).
+
+        Returns:
+            Path: output_path
+        """
+        output_path = Path(output_path)
+        protein_table = encode_fixed_width_labels(self.proteins)
+        term_table = encode_fixed_width_labels(self.terms)
+        with open(output_path, 'w') as f:
+            for protein_idx, term_idx, score in self.iter_chunks():
+                text, _ = render_prediction_lines(protein_table, term_table, protein_idx, term_idx, score)
+                f.write(text)
+        return output_path
+
+
+def tsv_to_columnar(tsv_path: Union[str, Path], output_path: Union[str, Path]) -> Path:
+    """
+    Convert a submission TSV into the columnar format.
+    Invalid lines are skipped, matching parse_submission_line.
+
+    Args:
+        tsv_path: Submission TSV (optionally compressed, see open_text_file)
+        output_path: Columnar submission directory to create
+
+    Returns:
+        Path: output_path
+    """
+    from prediction.submission_merging import parse_submission_line
+    from utils.utils_common import open_text_file
+
+    with ColumnarSubmissionWriter(output_path) as writer, open_text_file(tsv_path, 'r') as f:
+        for lines in iter(lambda: f.readlines(1 << 24), []):
+            writer.write_records([parsed for parsed in map(parse_submission_line, lines) if parsed])
+    return Path(output_path)
+
+
+def iter_submission_records(path: Union[str, Path]) -> Iterator[Tuple[str, str, float]]:
+    """
+    Iterate over (protein_id, term, score) from a columnar submission or a TSV file.
+
+    Args:
+        path: Columnar submission directory or submission TSV
+    """
+    if is_columnar_submission(path):
+        yield from ColumnarSubmission(path).iter_records()
+        return
+
+    from prediction.submission_merging import parse_submission_line
+    from utils.utils_common import open_text_file
+
+    with open_text_file(path, 'r') as f:
+        for line in f:
+            parsed = parse_submission_line(line)
+            if parsed:
+                yield parsed
+
+
+def open_submission_writer(path: Union[str, Path]):
+    """
+    Open a writer for an intermediate submission.
+
+    Paths ending in COLUMNAR_SUBMISSION_SUFFIX get a ColumnarSubmissionWriter; any
+    other path gets a TSV writer exposing the same add()/write_predictions()/close() interface.
+    """
+    from config.prediction import COLUMNAR_SUBMISSION_SUFFIX
+    if Path(path).suffix == COLUMNAR_SUBMISSION_SUFFIX:
+        return ColumnarSubmissionWriter(path)
+    return _TSVSubmissionWriter(path)
+
+
+class _TSVSubmissionWriter:
+    """Line-per-prediction TSV writer with the ColumnarSubmissionWriter add()/write_predictions() interface."""
+
+    def __init__(self, path: Union[str, Path]):
+        from prediction.prediction_utils import format_prediction_score, is_valid_score
+        self._format = format_prediction_score
+        self._is_valid = is_valid_score
+        self.path = Path(path)
+        self.n_rows = 0
+        self._file = open(self.path, 'w', encoding='utf-8')
+
+    def __enter__(self) -> '_TSVSubmissionWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write_predictions(self,
+                          protein_ids: Sequence[str],
+                          terms: Sequence[str],
+                          protein_idx: np.ndarray,
+                          term_idx: np.ndarray,
+                          scores: np.ndarray) -> int:
+        """Write a batch of predictions (see ColumnarSubmissionWriter.write_predictions)."""
+        if len(scores) == 0:
+            return 0
+        used_proteins, protein_positions = np.unique(protein_idx, return_inverse=True)
+        used_terms, term_positions = np.unique(term_idx, return_inverse=True)
+        text, n_lines = render_prediction_lines(
+            encode_fixed_width_labels([protein_ids[i] for i in used_proteins.tolist()]),
+            encode_fixed_width_labels([terms[i] for i in used_terms.tolist()]),
+            protein_positions.ravel(), term_positions.ravel(), scores
+        )
+        self._file.write(text)
+        self.n_rows += n_lines
+        return n_lines
+
+    def add(self, protein_id: str, term: str, score: float) -> None:
+        score_str = self._format(score)
+        if self._is_valid(float(score_str)):
+            self._file.write(f"{protein_id}\t{term}\t{score_str}\n")
+            self.n_rows += 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
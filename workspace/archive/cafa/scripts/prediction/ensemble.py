@@ -11,9 +11,123 @@ from utils.logging import setup_logging, get_logger
 logger = get_logger(__name__)
 
 
+def _validate_ensemble_method(method: str,
+                              n_models: int,
+                              weights: Optional[List[float]],
+                              kwargs: Dict) -> None:
+    """Validate method name and method-specific parameters before any array work."""
+    from config.ensemble import get_available_ensemble_methods
+    available_methods = get_available_ensemble_methods()
+    if method not in available_methods:
+        raise ValueError(
+            f"Unknown ensemble method: {method}. "
+            f"Available: {', '.join(available_methods)}"
+        )
+    
+    if method == 'weighted_average':
+        if weights is None:
+            raise ValueError("weights must be provided for weighted_average method")
+        if len(weights) != n_models:
+            raise ValueError(f"Number of weights ({len(weights)}) must match number of predictions ({n_models})")
+        if not np.isclose(sum(weights), 1.0):
+            raise ValueError(f"Weights must sum to 1.0, got {sum(weights)}")
+    elif method == 'power_average':
+        power = kwargs.get('power', 1.0)
+        if power <= 0:
+            raise ValueError(f"power must be > 0, got {power}")
+    elif method == 'percentile':
+        percentile = kwargs.get('percentile', 75.0)
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"percentile must be between 0 and 100, got {percentile}")
+
+
+def _rank_along_last_axis(values: np.ndarray, dtype: Optional[np.dtype] = None) -> np.ndarray:
+    """
+    1-indexed descending ranks along the last axis (highest value = rank 1).
+    
+    Equivalent to np.argsort(np.argsort(-row)) + 1 for every row, computed for the
+    whole array at once: one argsort, then the inverse permutation is scattered
+    with np.put_along_axis instead of a second argsort.
+    
+    Args:
+        values: Array of shape (..., n_terms)
+        dtype: Rank dtype (default: values.dtype)
+        
+    Returns:
+        np.ndarray: Ranks with the shape of values
+    """
+    dtype = values.dtype if dtype is None else dtype
+    order = np.argsort(-values, axis=-1)
+    ranks = np.empty(values.shape, dtype=dtype)
+    np.put_along_axis(ranks, order, np.arange(1, values.shape[-1] + 1, dtype=dtype), axis=-1)
+    return ranks
+
+
+def _ranks_to_scores(avg_ranks: np.ndarray, n_terms: int) -> np.ndarray:
+    # Convert back to probabilities: normalize ranks to [0, 1] range
+    # Ranks go from 1 to n_terms, so normalize by n_terms
+    return 1.0 - (avg_ranks - 1) / (n_terms - 1) if n_terms > 1 else avg_ranks / n_terms
+
+
+def _ensemble_float32(predictions_list: List[np.ndarray],
+                      method: str,
+                      weights: Optional[List[float]],
+                      **kwargs) -> np.ndarray:
+    """
+    Float32-only ensembling that accumulates model by model instead of stacking.
+    
+    Peak memory is one float32 accumulator plus one per-model temporary, rather than
+    an (n_models, n_samples, n_terms) copy of every input. Only 'percentile' still
+    stacks (in float32), since it needs all models per element at once.
+    """
+    from config.training import EPSILON_SMALL
+    preds = [np.asarray(p, dtype=np.float32) for p in predictions_list]
+    n_models = len(preds)
+    
+    if method == 'percentile':
+        stacked = np.stack(preds, axis=0)
+        return np.percentile(stacked, kwargs.get('percentile', 75.0), axis=0).astype(np.float32, copy=False)
+    
+    if method == 'max':
+        ensembled = preds[0].copy()
+        for p in preds[1:]:
+            np.maximum(ensembled, p, out=ensembled)
+        return ensembled
+    
+    power = kwargs.get('power', 1.0)
+    ensembled = np.zeros(preds[0].shape, dtype=np.float32)
+    for model_idx, p in enumerate(preds):
+        if method == 'average':
+            ensembled += p
+        elif method == 'weighted_average':
+            ensembled += np.float32(weights[model_idx]) * p
+        elif method == 'geometric_mean':
+            ensembled += np.log(p + np.float32(EPSILON_SMALL))
+        elif method == 'rank_average':
+            ensembled += _rank_along_last_axis(p)
+        elif method == 'power_average':
+            clamped = np.clip(p, np.float32(EPSILON_SMALL), np.float32(1.0 - EPSILON_SMALL))
+            ensembled += clamped if power == 1.0 else np.power(clamped, np.float32(power))
+    
+    if method == 'weighted_average':
+        return ensembled
+    ensembled /= np.float32(n_models)
+    if method == 'geometric_mean':
+        np.exp(ensembled, out=ensembled)
+    elif method == 'rank_average':
+        ensembled = _ranks_to_scores(ensembled, ensembled.shape[-1])
+    elif method == 'power_average':
+        if power != 1.0:
+            np.power(ensembled, np.float32(1.0 / power), out=ensembled)
+        np.clip(ensembled, 0.0, 1.0, out=ensembled)
+    return ensembled
+
+
 def ensemble_predictions(predictions_list: List[np.ndarray], 
                         method: str = 'average',
                         weights: Optional[List[float]] = None,
+                        float32_only: Optional[bool] = None,
+                        sample_chunk_size: Optional[int] = None,
                         **kwargs) -> np.ndarray:
     """
     Ensemble predictions from multiple models.
@@ -23,6 +137,10 @@ def ensemble_predictions(predictions_list: List[np.ndarray],
         method: Ensemble method ('average', 'weighted_average', 'max', 'geometric_mean',
                 'rank_average', 'power_average', 'percentile')
         weights: Optional weights for weighted_average (must sum to 1.0)
+        float32_only: Accumulate model by model in float32 instead of stacking all
+                      models (default: ENSEMBLE_FLOAT32_ONLY)
+        sample_chunk_size: Ensemble at most this many samples at a time to bound
+                           temporary memory (default: ENSEMBLE_SAMPLE_CHUNK_SIZE; None = all)
         **kwargs: Additional method-specific parameters:
             - power (float): Power for power_average method (default: 1.0, >1 emphasizes high probs, <1 flattens)
             - percentile (float): Percentile for percentile method (default: 75.0, range 0-100)
@@ -45,6 +163,36 @@ def ensemble_predictions(predictions_list: List[np.ndarray],
                 f"but predictions_list[{i}] has shape {preds.shape}"
             )
     
+    _validate_ensemble_method(method, len(predictions_list), weights, kwargs)
+    
+    from config.ensemble import ENSEMBLE_FLOAT32_ONLY, ENSEMBLE_SAMPLE_CHUNK_SIZE
+    if float32_only is None:
+        float32_only = ENSEMBLE_FLOAT32_ONLY
+    if sample_chunk_size is None:
+        sample_chunk_size = ENSEMBLE_SAMPLE_CHUNK_SIZE
+    
+    n_samples = base_shape[0]
+    if sample_chunk_size and n_samples > sample_chunk_size:
+        # Every method combines each sample independently, so chunks can be ensembled separately
+        ensembled = None
+        for start in range(0, n_samples, sample_chunk_size):
+            end = min(start + sample_chunk_size, n_samples)
+            chunk = ensemble_predictions(
+                [preds[start:end] for preds in predictions_list],
+                method=method,
+                weights=weights,
+                float32_only=float32_only,
+                sample_chunk_size=0,
+                **kwargs
+            )
+            if ensembled is None:
+                ensembled = np.empty((n_samples,) + chunk.shape[1:], dtype=chunk.dtype)
+            ensembled[start:end] = chunk
+        return ensembled
+    
+    if float32_only:
+        return _ensemble_float32(predictions_list, method, weights, **kwargs)
+    
     # Stack predictions for ensemble operations
     stacked = np.stack(predictions_list, axis=0)  # (n_models, n_samples, n_terms)
     
@@ -53,13 +201,6 @@ def ensemble_predictions(predictions_list: List[np.ndarray],
         ensembled = np.mean(stacked, axis=0)
         
     elif method == 'weighted_average':
-        if weights is None:
-            raise ValueError("weights must be provided for weighted_average method")
-        if len(weights) != len(predictions_list):
-            raise ValueError(f"Number of weights ({len(weights)}) must match number of predictions ({len(predictions_list)})")
-        if not np.isclose(sum(weights), 1.0):
-            raise ValueError(f"Weights must sum to 1.0, got {sum(weights)}")
-        
         # Weighted average
         weights_array = np.array(weights).reshape(-1, 1, 1)  # (n_models, 1, 1)
         ensembled = np.sum(stacked * weights_array, axis=0)
@@ -77,31 +218,18 @@ def ensemble_predictions(predictions_list: List[np.ndarray],
     elif method == 'rank_average':
         # Rank averaging: Convert probabilities to ranks, average ranks, convert back
         # Good for handling calibration differences between models
-        n_samples, n_terms = base_shape
-        n_models = len(predictions_list)
-        
-        # Convert each model's predictions to ranks (per sample, across terms)
-        rank_stacked = np.zeros_like(stacked)
-        for model_idx in range(n_models):
-            # For each sample, get ranks of probabilities (high prob = high rank)
-            for sample_idx in range(n_samples):
-                ranks = np.argsort(np.argsort(-stacked[model_idx, sample_idx, :])) + 1  # 1-indexed ranks
-                rank_stacked[model_idx, sample_idx, :] = ranks
+        # Ranks are per sample, across terms (high prob = rank 1), for all models at once
+        rank_stacked = _rank_along_last_axis(stacked)
         
         # Average ranks across models
         avg_ranks = np.mean(rank_stacked, axis=0)
-        
-        # Convert back to probabilities: normalize ranks to [0, 1] range
-        # Ranks go from 1 to n_terms, so normalize by n_terms
-        ensembled = 1.0 - (avg_ranks - 1) / (n_terms - 1) if n_terms > 1 else avg_ranks / n_terms
+        ensembled = _ranks_to_scores(avg_ranks, base_shape[-1])
         
     elif method == 'power_average':
         # Power averaging: Average of probabilities raised to a power
         # power > 1: Emphasizes higher probabilities (more aggressive)
         # power < 1: Flattens probabilities (more conservative)
         power = kwargs.get('power', 1.0)
-        if power <= 0:
-            raise ValueError(f"power must be > 0, got {power}")
         
         # Clamp predictions to [0, 1] before applying power
         from config.training import EPSILON_SMALL
@@ -123,18 +251,7 @@ def ensemble_predictions(predictions_list: List[np.ndarray],
         # Percentile ensembling: Take percentile across model predictions
         # percentile=50 is median, 75 is conservative (reduces outlier influence)
         percentile = kwargs.get('percentile', 75.0)
-        if not 0 <= percentile <= 100:
-            raise ValueError(f"percentile must be between 0 and 100, got {percentile}")
-        
         ensembled = np.percentile(stacked, percentile, axis=0)
-        
-    else:
-        from config.ensemble import get_available_ensemble_methods
-        available_methods = get_available_ensemble_methods()
-        raise ValueError(
-            f"Unknown ensemble method: {method}. "
-            f"Available: {', '.join(available_methods)}"
-        )
     
     return ensembled
 
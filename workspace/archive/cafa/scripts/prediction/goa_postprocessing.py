@@ -9,7 +9,7 @@ import pandas as pd
 import numpy as np
 from collections import defaultdict
 from pathlib import Path
-from typing import Set, Dict, Tuple, Optional
+from typing import Set, Dict, Tuple, Optional, Iterable, Union
 from tqdm.auto import tqdm
 from utils.utils_common import open_text_file
 
@@ -56,17 +56,24 @@ def parse_obo(go_obo_path: str) -> Tuple[Dict[str, set], Dict[str, set]]:
     return parents, children
 
 
-def get_descendants(go_id: str, children_map: Dict[str, set]) -> Set[str]:
+def get_descendants(go_id: str, children_map: Optional[Dict[str, set]] = None,
+                    closure_index=None) -> Set[str]:
     """
     Get all descendants of a GO term (recursive traversal).
     
     Args:
         go_id: GO term ID
         children_map: Dictionary mapping GO terms to their children
+        closure_index: Optional GOClosureIndex (utils.go_closure) for a precomputed lookup
     
     Returns:
         Set of descendant GO term IDs
     """
+    if closure_index is not None:
+        return closure_index.descendants(go_id)
+    if children_map is None:
+        raise ValueError("get_descendants requires children_map or closure_index")
+    
     desc = set()
     stack = [go_id]
     while stack:
@@ -78,16 +85,12 @@ def get_descendants(go_id: str, children_map: Dict[str, set]) -> Set[str]:
     return desc
 
 
-def load_goa_annotations(goa_path: str, version: str = "228") -> pd.DataFrame:
+def resolve_goa_file(goa_path: str, version: str = "228") -> Path:
     """
-    Load GOA annotations from TSV file.
-    
-    Args:
-        goa_path: Base path to GOA annotations directory
-        version: GOA version (default: "228")
+    Locate the GOA annotations file for a version (.tsv, falling back to .csv).
     
-    Returns:
-        DataFrame with columns: protein_id, go_term, qualifier
+    Raises:
+        FileNotFoundError: If neither file exists
     """
     goa_file = Path(goa_path) / f'goa_uniprot_ver{version}.tsv'
     
@@ -100,6 +103,21 @@ def load_goa_annotations(goa_path: str, version: str = "228") -> pd.DataFrame:
             f"GOA annotations file not found: {goa_file}\n"
             f"Expected: {Path(goa_path) / f'goa_uniprot_ver{version}.tsv'}"
         )
+    return goa_file
+
+
+def load_goa_annotations(goa_path: str, version: str = "228") -> pd.DataFrame:
+    """
+    Load GOA annotations from TSV file.
+    
+    Args:
+        goa_path: Base path to GOA annotations directory
+        version: GOA version (default: "228")
+    
+    Returns:
+        DataFrame with columns: protein_id, go_term, qualifier
+    """
+    goa_file = resolve_goa_file(goa_path, version)
     
     print(f"   [INFO] Loading GOA annotations from: {goa_file}")
     
@@ -140,104 +158,356 @@ def extract_negative_annotations(goa_df: pd.DataFrame) -> pd.DataFrame:
     return negative_df
 
 
-def propagate_negative_annotations(goa_annotations_path: str,
-                                  go_obo_path: str,
-                                  output_negative_keys: bool = True) -> Set[str]:
+class NegativeAnnotationIndex:
     """
-    Build set of negative protein-GO pairs from GOA annotations.
+    Compact set of negative (protein, GO term) pairs.
+    
+    Proteins and terms are mapped to ints; each pair is the uint64 key
+    protein_idx * n_terms + term_idx, kept in one sorted array so membership is a
+    vectorized np.searchsorted instead of a Python set of "protein_term" strings.
+    
+    Attributes:
+        proteins: Protein IDs (index = protein code)
+        terms: GO term IDs (index = term code)
+        keys: Sorted unique uint64 pair keys
+        goa_version: GOA release the index was built from
+        obo_checksum: SHA-256 of the OBO used for descendant propagation ('' if none)
+        goa_file_size: Size of the GOA file, to detect a replaced file
+        closure_version: GO_CLOSURE_VERSION of the closure index used for propagation
+    """
+    
+    def __init__(self,
+                 proteins: np.ndarray,
+                 terms: np.ndarray,
+                 keys: np.ndarray,
+                 goa_version: str = '',
+                 obo_checksum: str = '',
+                 goa_file_size: int = -1,
+                 closure_version: int = 1):
+        self.proteins = proteins
+        self.terms = terms
+        self.keys = keys
+        self.goa_version = goa_version
+        self.obo_checksum = obo_checksum
+        self.goa_file_size = goa_file_size
+        self.closure_version = closure_version
+        self._protein_lookup: Optional[pd.Index] = None
+        self._term_lookup: Optional[pd.Index] = None
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    @property
+    def n_terms(self) -> int:
+        return len(self.terms)
+    
+    @classmethod
+    def from_negative_annotations(cls,
+                                  negative_df: pd.DataFrame,
+                                  closure_index=None,
+                                  **metadata) -> 'NegativeAnnotationIndex':
+        """
+        Build the index from negative annotations, propagating each to all descendants.
+        
+        Args:
+            negative_df: DataFrame with protein_id, go_term columns
+            closure_index: Optional GOClosureIndex; terms outside it are kept unpropagated
+            **metadata: goa_version, obo_checksum, goa_file_size, closure_version
+        """
+        protein_codes, proteins = pd.factorize(negative_df['protein_id'], sort=True)
+        protein_codes = protein_codes.astype(np.uint64)
+        go_terms = negative_df['go_term'].tolist()
+        
+        if closure_index is not None:
+            term_codes = closure_index.encode_terms(go_terms)
+            base_terms = closure_index.term_objects.tolist()
+        else:
+            term_codes = np.full(len(go_terms), -1, dtype=np.int64)
+            base_terms = []
+        
+        # Terms unknown to the ontology get codes after the ontology's terms
+        known = term_codes >= 0
+        unknown_codes, unknown_terms = pd.factorize(pd.Series(go_terms, dtype=object)[~known], sort=True)
+        terms = np.array(base_terms + list(unknown_terms), dtype=object)
+        n_terms = np.uint64(len(terms))
+        
+        key_parts = [
+            protein_codes[known] * n_terms + term_codes[known].astype(np.uint64),
+            protein_codes[~known] * n_terms + (unknown_codes + len(base_terms)).astype(np.uint64),
+        ]
+        if closure_index is not None and known.any():
+            descendants, owner = closure_index.gather_descendants(term_codes[known])
+            key_parts.append(protein_codes[known][owner] * n_terms + descendants.astype(np.uint64))
+        
+        keys = np.unique(np.concatenate(key_parts))
+        return cls(np.asarray(proteins, dtype=object), terms, keys, **metadata)
+    
+    def save(self, path: Path) -> Path:
+        """Save the index as .npz (label tables, keys and provenance)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            proteins=self.proteins.astype(str),
+            terms=self.terms.astype(str),
+            keys=self.keys,
+            goa_version=np.array(self.goa_version),
+            obo_checksum=np.array(self.obo_checksum),
+            goa_file_size=np.array(self.goa_file_size, dtype=np.int64),
+            closure_version=np.array(self.closure_version, dtype=np.int64)
+        )
+        return path
+    
+    @classmethod
+    def load(cls, path: Path) -> 'NegativeAnnotationIndex':
+        """Load an index saved with save()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                np.array(data['proteins'].tolist(), dtype=object),
+                np.array(data['terms'].tolist(), dtype=object),
+                data['keys'],
+                str(data['goa_version']),
+                str(data['obo_checksum']),
+                int(data['goa_file_size']),
+                int(data['closure_version']) if 'closure_version' in data.files else 1
+            )
+    
+    def encode(self, proteins: Iterable[str], terms: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Map protein / term labels to index codes (-1 for labels with no negatives)."""
+        if self._protein_lookup is None:
+            self._protein_lookup = pd.Index(self.proteins)
+            self._term_lookup = pd.Index(self.terms)
+        return (self._protein_lookup.get_indexer(pd.Index(proteins, dtype=object)).astype(np.int64, copy=False),
+                self._term_lookup.get_indexer(pd.Index(terms, dtype=object)).astype(np.int64, copy=False))
+    
+    def contains_codes(self, protein_codes: np.ndarray, term_codes: np.ndarray) -> np.ndarray:
+        """Vectorized membership test for code pairs (from encode())."""
+        found = (protein_codes >= 0) & (term_codes >= 0)
+        if len(self.keys) == 0 or not found.any():
+            return np.zeros(len(protein_codes), dtype=bool)
+        query = protein_codes[found].astype(np.uint64) * np.uint64(self.n_terms) + term_codes[found].astype(np.uint64)
+        # Sorted queries make the binary searches walk the key array in order (cache friendly)
+        order = np.argsort(query)
+        query = query[order]
+        positions = np.searchsorted(self.keys, query)
+        positions[positions == len(self.keys)] = 0
+        hits = np.empty(len(query), dtype=bool)
+        hits[order] = self.keys[positions] == query
+        found[found] = hits
+        return found
+    
+    def contains(self, proteins: Iterable[str], terms: Iterable[str]) -> np.ndarray:
+        """Vectorized membership test for aligned protein / term label sequences."""
+        return self.contains_codes(*self.encode(proteins, terms))
+    
+    def to_key_set(self) -> Set[str]:
+        """Expand to the legacy set of 'protein_id_GO:term' strings."""
+        n_terms = np.uint64(self.n_terms)
+        return {f"{p}_{t}" for p, t in zip(self.proteins[(self.keys // n_terms).astype(np.int64)].tolist(),
+                                           self.terms[(self.keys % n_terms).astype(np.int64)].tolist())}
+    
+    @classmethod
+    def from_key_set(cls, negative_keys: Set[str]) -> 'NegativeAnnotationIndex':
+        """Build an index from legacy 'protein_id_GO:term' strings."""
+        pairs = [key.rsplit('_', 1) for key in negative_keys]
+        negative_df = pd.DataFrame(pairs, columns=['protein_id', 'go_term'], dtype=object)
+        return cls.from_negative_annotations(negative_df)
+
+
+def build_negative_index(goa_annotations_path: str,
+                         go_obo_path: str,
+                         version: str = "228",
+                         cache_dir: Optional[Path] = None,
+                         use_disk_cache: bool = True) -> NegativeAnnotationIndex:
+    """
+    Load (or build and persist) the propagated negative annotation index.
+    
+    The index is cached on disk as goa_negatives_ver<version>_<obo checksum>_c<GO_CLOSURE_VERSION>.npz;
+    a cached file whose GOA file size, OBO checksum or closure version does not match is rebuilt.
     
     Logic:
     1. Load GOA annotations with NOT qualifiers
-    2. Parse GO ontology structure
-    3. For each negative annotation, propagate to all descendants
-    4. Return set of 'protein_id_GO:term' keys to filter
+    2. Load the GO closure index
+    3. Propagate each negative annotation to all descendants as integer keys
     
     Args:
         goa_annotations_path: Path to GOA annotations directory
         go_obo_path: Path to go-basic.obo file
-        output_negative_keys: If True, return set of keys; else dict
+        version: GOA version (default: "228")
+        cache_dir: Directory for the persisted index (defaults to GO_CACHE_DIR)
+        use_disk_cache: If False, always build from the GOA file
     
     Returns:
-        set: Negative prediction keys (protein_id_GO:term format)
+        NegativeAnnotationIndex: Negative protein-GO pairs
     """
-    print("\n🔬 Building negative annotation set from GOA...")
-    
-    # Parse ontology
-    print("   [1/3] Parsing GO ontology structure...")
-    parents_map, children_map = parse_obo(go_obo_path)
+    print("\n🔬 Building negative annotation index from GOA...")
+    goa_file = resolve_goa_file(goa_annotations_path, version)
+    goa_file_size = goa_file.stat().st_size
+    
+    obo_checksum = ''
+    if Path(go_obo_path).exists():
+        from utils.go_closure import compute_file_checksum
+        obo_checksum = compute_file_checksum(Path(go_obo_path))
+    
+    from utils.go_closure import GO_CLOSURE_VERSION
+    if cache_dir is None:
+        from config.paths import GO_CACHE_DIR
+        cache_dir = GO_CACHE_DIR
+    cache_path = Path(cache_dir) / (f'goa_negatives_ver{version}_{obo_checksum[:16] or "noobo"}'
+                                    f'_c{GO_CLOSURE_VERSION}.npz')
+    
+    if use_disk_cache and cache_path.exists():
+        try:
+            index = NegativeAnnotationIndex.load(cache_path)
+            if (index.goa_file_size == goa_file_size and index.obo_checksum == obo_checksum
+                    and index.closure_version == GO_CLOSURE_VERSION):
+                print(f"   [✅] Loaded negative index: {len(index):,} protein-GO pairs ({cache_path.name})")
+                return index
+            print(f"   [INFO] Cached negative index is stale, rebuilding: {cache_path.name}")
+        except Exception as e:
+            print(f"   [WARNING] Could not load cached negative index ({e}), rebuilding")
+    
+    # Load GO closure index (parsed once per OBO checksum)
+    print("   [1/3] Loading GO closure index...")
+    closure_index = None
+    if obo_checksum:
+        from utils.go_closure import load_go_closure_index
+        closure_index = load_go_closure_index(Path(go_obo_path))
+    else:
+        print(f"   [WARNING] OBO file not found: {go_obo_path}")
     
     # Load GOA annotations
     print("   [2/3] Loading GOA annotations...")
-    goa_df = load_goa_annotations(goa_annotations_path)
+    goa_df = load_goa_annotations(goa_annotations_path, version)
     
-    # Filter negative annotations (NOT qualifiers)
+    # Filter negative annotations (NOT qualifiers) and propagate to descendants
     print("   [3/3] Extracting and propagating negative annotations...")
     negative_df = extract_negative_annotations(goa_df)
+    del goa_df
+    index = NegativeAnnotationIndex.from_negative_annotations(
+        negative_df, closure_index,
+        goa_version=version, obo_checksum=obo_checksum, goa_file_size=goa_file_size,
+        closure_version=GO_CLOSURE_VERSION
+    )
+    print(f"   [✅] Total unique negative protein-GO pairs: {len(index):,}")
+    
+    if use_disk_cache:
+        try:
+            index.save(cache_path)
+            print(f"   [INFO] Saved negative index: {cache_path}")
+        except OSError as e:
+            print(f"   [WARNING] Could not save negative index ({e}), continuing in-memory")
+    return index
+
+
+def propagate_negative_annotations(goa_annotations_path: str,
+                                  go_obo_path: str,
+                                  output_negative_keys: bool = True) -> Union[Set[str], NegativeAnnotationIndex]:
+    """
+    Build set of negative protein-GO pairs from GOA annotations.
     
-    # Group by protein
-    negative_dict = negative_df.groupby('protein_id')['go_term'].apply(list).to_dict()
-    
-    # Propagate negatives to descendants
-    propagated = {}
-    for protein_id, terms in tqdm(negative_dict.items(), desc="Propagating negatives"):
-        neg_set = set(terms)
-        for term in terms:
-            # Add all descendants
-            neg_set |= get_descendants(term, children_map)
-        propagated[protein_id] = sorted(neg_set)
-    
-    # Convert to prediction keys
-    print("   [4/4] Converting to prediction keys...")
-    negative_keys = set()
-    for protein_id, terms in propagated.items():
-        for term in terms:
-            negative_keys.add(f"{protein_id}_{term}")
-    
-    print(f"   [✅] Total unique negative protein-GO pairs: {len(negative_keys):,}")
-    return negative_keys
+    Args:
+        goa_annotations_path: Path to GOA annotations directory
+        go_obo_path: Path to go-basic.obo file
+        output_negative_keys: If True, return the legacy set of 'protein_id_GO:term'
+                              keys; else the compact NegativeAnnotationIndex
+    
+    Returns:
+        Negative prediction keys (protein_id_GO:term format) or NegativeAnnotationIndex
+    """
+    index = build_negative_index(goa_annotations_path, go_obo_path)
+    return index.to_key_set() if output_negative_keys else index
 
 
 def filter_submission_with_goa(submission_path: str,
-                               negative_keys: Set[str],
+                               negative_keys: Union[NegativeAnnotationIndex, Set[str]],
                                output_path: str) -> str:
     """
     Filter submission file to remove negative annotations.
     
+    Reads the submission in chunks and drops rows with one vectorized membership
+    test per chunk. Columnar submissions are filtered on their dictionary codes
+    and rendered as TSV.
+    
     Args:
-        submission_path: Path to raw submission TSV
-        negative_keys: Set of negative protein_GO keys
-        output_path: Path for filtered submission
+        submission_path: Path to raw submission TSV or columnar submission
+        negative_keys: NegativeAnnotationIndex (or legacy set of protein_GO keys)
+        output_path: Path for filtered submission TSV
     
     Returns:
         Path to filtered submission
     """
-    print(f"\n🔬 Filtering submission with {len(negative_keys):,} negative keys...")
+    from prediction.columnar_submission import is_columnar_submission
+    
+    index = negative_keys
+    if not isinstance(index, NegativeAnnotationIndex):
+        index = NegativeAnnotationIndex.from_key_set(negative_keys)
+    print(f"\n🔬 Filtering submission with {len(index):,} negative keys...")
+    
+    if is_columnar_submission(submission_path):
+        total_count, kept_count = _filter_columnar_with_index(submission_path, index, output_path)
+    else:
+        total_count, kept_count = _filter_tsv_with_index(submission_path, index, output_path)
+    filtered_count = total_count - kept_count
+    
+    print(f"   [✅] Filtered {filtered_count:,} / {total_count:,} predictions")
+    if total_count:
+        print(f"   [✅] Kept {kept_count:,} predictions ({kept_count/total_count*100:.2f}%)")
+    
+    return output_path
+
+
+def _filter_tsv_with_index(submission_path: str,
+                           index: NegativeAnnotationIndex,
+                           output_path: str) -> Tuple[int, int]:
+    """Filter a TSV in line batches; lines without protein/term columns are dropped as before."""
+    from itertools import compress
     
-    filtered_count = 0
     total_count = 0
     kept_count = 0
-    
     with open_text_file(submission_path, 'r') as infile, \
          open(output_path, 'w', encoding='utf-8') as outfile:
         
-        for line in tqdm(infile, desc="Filtering predictions"):
-            total_count += 1
-            parts = line.strip().split('\t')
-            if len(parts) >= 2:
-                protein_id = parts[0]
-                go_term = parts[1]
-                pred_key = f"{protein_id}_{go_term}"
-                
-                if pred_key not in negative_keys:
-                    outfile.write(line)
-                    kept_count += 1
-                else:
-                    filtered_count += 1
-    
-    print(f"   [✅] Filtered {filtered_count:,} / {total_count:,} predictions")
-    print(f"   [✅] Kept {kept_count:,} predictions ({kept_count/total_count*100:.2f}%)")
+        progress = tqdm(desc="Filtering predictions", unit=" lines")
+        for lines in iter(lambda: infile.readlines(1 << 24), []):
+            total_count += len(lines)
+            # partition() tuples (unlike split() lists) are not tracked by the cyclic GC
+            heads = [line.strip().partition('\t') for line in lines]
+            has_key = np.fromiter((head[1] == '\t' for head in heads), dtype=bool, count=len(heads))
+            if not has_key.all():
+                lines = list(compress(lines, has_key))
+                heads = list(compress(heads, has_key))
+            negative = index.contains([head[0] for head in heads],
+                                      [head[2].partition('\t')[0] for head in heads])
+            kept = list(compress(lines, ~negative))
+            outfile.writelines(kept)
+            kept_count += len(kept)
+            progress.update(len(has_key))
+        progress.close()
+    return total_count, kept_count
+
+
+def _filter_columnar_with_index(submission_path: str,
+                                index: NegativeAnnotationIndex,
+                                output_path: str) -> Tuple[int, int]:
+    """Filter a columnar submission chunk by chunk on dictionary codes."""
+    from prediction.columnar_submission import ColumnarSubmission
+    from prediction.prediction_utils import encode_fixed_width_labels, render_prediction_lines
+    
+    submission = ColumnarSubmission(submission_path)
+    protein_codes, term_codes = index.encode(submission.proteins, submission.terms)
+    protein_table = encode_fixed_width_labels(submission.proteins)
+    term_table = encode_fixed_width_labels(submission.terms)
     
-    return output_path
+    kept_count = 0
+    with open(output_path, 'w', encoding='utf-8') as outfile:
+        for protein_idx, term_idx, score in submission.iter_chunks():
+            keep = ~index.contains_codes(protein_codes[protein_idx], term_codes[term_idx])
+            text, n_lines = render_prediction_lines(protein_table, term_table,
+                                                    protein_idx[keep], term_idx[keep], score[keep])
+            outfile.write(text)
+            kept_count += n_lines
+    return len(submission), kept_count
 
 
 def apply_goa_filtering(submission_path: str,
@@ -259,8 +529,8 @@ def apply_goa_filtering(submission_path: str,
     if output_path is None:
         output_path = str(Path(submission_path).with_suffix('')) + '_filtered.tsv'
     
-    # Build negative keys
-    negative_keys = propagate_negative_annotations(
+    # Build (or load the cached) negative index
+    negative_index = build_negative_index(
         goa_annotations_path,
         go_obo_path
     )
@@ -268,9 +538,8 @@ def apply_goa_filtering(submission_path: str,
     # Filter submission
     filtered_path = filter_submission_with_goa(
         submission_path,
-        negative_keys,
+        negative_index,
         output_path
     )
     
     return filtered_path
-
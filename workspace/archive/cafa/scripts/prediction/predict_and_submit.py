@@ -8,14 +8,25 @@ import pandas as pd
 import os
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from Bio import SeqIO
 from preprocessing.feature_engineering import extract_handcrafted_parallel
-from prediction.prediction_utils import format_prediction_score, is_valid_score
-from utils.utils_common import cleanup_memory, open_text_file
-from prediction.submission_merging import parse_submission_line
+from prediction.prediction_utils import (
+    format_prediction_score,
+    select_top_predictions,
+    encode_fixed_width_labels,
+    render_prediction_lines
+)
+from prediction.columnar_submission import (
+    ColumnarSubmissionWriter,
+    iter_submission_records,
+    remove_submission
+)
+from utils.utils_common import cleanup_memory
+from utils.profiling import profiled, profile_span
 
 
+@profiled('load_sequences', rows=lambda result: len(result[1]), datatype='test')
 def load_test_sequences(test_dir):
     """
     Load test sequences from FASTA file.
@@ -28,6 +39,15 @@ def load_test_sequences(test_dir):
     """
     print("\n[7/9] Loading test sequences...")
     
+    from config.features import SEQUENCE_STORE_ENABLED
+    if SEQUENCE_STORE_ENABLED:
+        from preprocessing.sequence_store import get_sequence_store
+        store = get_sequence_store(test_dir / 'testsuperset.fasta')
+        test_seqs = store.to_dict()
+        test_proteins = store.protein_ids()
+        print(f"   ✓ Loaded {len(test_seqs):,} test sequences (sequence store)")
+        return test_seqs, test_proteins
+    
     test_seqs = {}
     test_proteins = []
     
@@ -47,7 +67,7 @@ def make_predictions(models, mlb_dict, test_seqs, test_proteins, output_dir,
                     propagate_predictions=False,
                     per_ontology_feature_configs=None):
     """
-    Make predictions for test sequences and write to temporary file.
+    Make predictions for test sequences and write them to a columnar intermediate submission.
     
     Args:
         models: dict mapping ont_code -> trained model (or path for MLP models)
@@ -58,17 +78,18 @@ def make_predictions(models, mlb_dict, test_seqs, test_proteins, output_dir,
         batch_size: Number of proteins to process at once
         prediction_threshold: Minimum probability threshold
         max_preds_per_ont: Maximum predictions per ontology
-        write_batch_size: Write to disk every N predictions
+        write_batch_size: Append to disk every N predictions
         feature_type: Feature extraction method ('hand_crafted' or 'fused_embeddings') - used if per_ontology_feature_configs is None
         features: List of features to use for fused_embeddings (e.g., ['protbert','esm2','hc']) - used if per_ontology_feature_configs is None
         propagate_predictions: Whether to propagate predictions up the GO hierarchy
         per_ontology_feature_configs: Optional dict mapping ont_code -> (feature_type, features) for mixed feature configs
         
     Returns:
-        str: Path to temporary submission file
+        Path: Path to the temporary columnar submission (see prediction.columnar_submission)
     """
     # Import config for defaults
     from config import PREDICTION_SETTINGS, get_all_ontologies, DATA_INPUT_DIR
+    from config.prediction import COLUMNAR_SUBMISSION_SUFFIX
     
     # Get default settings from config if not provided
     pred_settings = PREDICTION_SETTINGS
@@ -97,54 +118,30 @@ def make_predictions(models, mlb_dict, test_seqs, test_proteins, output_dir,
     
     print("\n[8/9] Making predictions and writing to disk...")
     
+    from config.prediction import PREDICTION_PROGRESS_INTERVALS
+    from prediction.prediction_pipeline import (
+        FeatureMatrixCache,
+        run_prediction_pipeline,
+        merge_pipeline_stats,
+        report_pipeline_stats
+    )
+    
     # Configuration for memory efficiency
     ontologies = get_all_ontologies()
     
-    # Determine if we need per-ontology feature extraction
-    use_per_ontology_features = per_ontology_feature_configs is not None
-    
-    if not use_per_ontology_features:
-        # Extract features once for all test proteins (before ontology loop)
-        # This avoids re-loading embeddings for each batch/ontology
-        # Use unified extraction interface with automatic memory optimization
+    # Features are extracted once per feature configuration and reused by every ontology
+    # that shares it; memmapped matrices stay on disk and batches are sliced by the reader
+    feature_cache = FeatureMatrixCache(test_seqs, test_proteins)
+    if per_ontology_feature_configs is None:
         print("   Extracting features for all test proteins...")
-        from preprocessing.feature_extraction import extract_features
-        from pathlib import Path
-        
-        # Build config dict for unified interface
-        if feature_type == 'fused_embeddings':
-            if not features:
-                raise ValueError("Features list is required for fused_embeddings during prediction")
-            extraction_config = {'feature_type': feature_type, 'features': features}
-        else:
-            extraction_config = {'feature_type': feature_type}
-        
-        X_test_result, aligned_test_proteins = extract_features(
-            sequences=test_seqs,
-            config=extraction_config,
-            protein_ids=test_proteins,
-            datatype='test',
-            force_memmap=None  # Auto-detect - may return memmap for large test sets
-        )
-        
-        # Handle memmap path (load into array for prediction)
-        if isinstance(X_test_result, Path):
-            from utils.memory_efficient import load_features_memmap
-            X_test_all = np.array(load_features_memmap(X_test_result))
-            print(f"   ✓ Loaded features from memmap: {X_test_result}")
-        else:
-            X_test_all = X_test_result
-        
-        # Create mapping from aligned protein IDs to indices
-        protein_to_idx = {pid: idx for idx, pid in enumerate(aligned_test_proteins)}
-        print(f"   ✓ Extracted features for {len(aligned_test_proteins):,} proteins (shape: {X_test_all.shape})")
     
-    # Temporary file path
-    temp_submission_path = output_dir / 'temp_submission.tsv'
+    # Temporary columnar submission path
+    temp_submission_path = output_dir / f'temp_submission{COLUMNAR_SUBMISSION_SUFFIX}'
     total_predictions_written = 0
+    pipeline_stats = []
     
-    # Open file for writing (will overwrite if exists)
-    with open(temp_submission_path, 'w') as submission_file:
+    # Open columnar writer (will overwrite if exists)
+    with ColumnarSubmissionWriter(temp_submission_path, buffer_rows=write_batch_size) as submission_writer:
         
         for ont_code, ont_name in ontologies.items():
             if ont_code not in models:
@@ -152,53 +149,27 @@ def make_predictions(models, mlb_dict, test_seqs, test_proteins, output_dir,
             
             print(f"   Predicting {ont_name}...")
             
-            # Extract features per ontology if needed
-            if use_per_ontology_features:
+            if per_ontology_feature_configs is not None:
                 ont_feature_type, ont_features = per_ontology_feature_configs[ont_code]
-                print(f"      Extracting features: {ont_feature_type} {ont_features if ont_features else ''}")
-                
-                from preprocessing.feature_extraction import extract_features
-                from pathlib import Path
-                
-                # Build config dict for this ontology
-                if ont_feature_type == 'fused_embeddings':
-                    if not ont_features:
-                        raise ValueError(f"Features list is required for fused_embeddings for {ont_code}")
-                    extraction_config = {'feature_type': ont_feature_type, 'features': ont_features}
-                else:
-                    extraction_config = {'feature_type': ont_feature_type}
-                
-                X_test_result, aligned_test_proteins = extract_features(
-                    sequences=test_seqs,
-                    config=extraction_config,
-                    protein_ids=test_proteins,
-                    datatype='test',
-                    force_memmap=None
-                )
-                
-                # Handle memmap path (load into array for prediction)
-                if isinstance(X_test_result, Path):
-                    from utils.memory_efficient import load_features_memmap
-                    X_test_all = np.array(load_features_memmap(X_test_result))
-                else:
-                    X_test_all = X_test_result
-                
-                protein_to_idx = {pid: idx for idx, pid in enumerate(aligned_test_proteins)}
-                print(f"      ✓ Extracted features: {len(aligned_test_proteins):,} proteins (shape: {X_test_all.shape})")
+                if ont_feature_type == 'fused_embeddings' and not ont_features:
+                    raise ValueError(f"Features list is required for fused_embeddings for {ont_code}")
+                print(f"      Features: {ont_feature_type} {ont_features if ont_features else ''}")
+            else:
+                ont_feature_type, ont_features = feature_type, features
+            X_test_all, aligned_test_proteins, _ = feature_cache.get(ont_feature_type, ont_features)
             
             model_data = models[ont_code]
             mlb = mlb_dict[ont_code]
-            n_terms = len(mlb.classes_)
             
             # Handle both on-disk paths and in-memory models
             is_pytorch_model = False
+            device = None
             if isinstance(model_data, str):
                 # It's a path to a saved model
                 print(f"      Loading MLP model from disk: {model_data}")
                 from utils.model_io import load_model as load_pytorch_model
                 from models.nn import MLPModel
                 from utils.gpu_utils import get_device
-                import torch
                 
                 device = get_device()
                 model, metadata = load_pytorch_model(model_data, model_class=MLPModel, device=device)
@@ -224,111 +195,69 @@ def make_predictions(models, mlb_dict, test_seqs, test_proteins, output_dir,
             
             # GPU wrapping now handled by prepare_model_for_inference() in utils/model_prediction.py
             # No need to wrap here - predict_with_model() handles it automatically
+            model_config = None
+            if is_pytorch_model:
+                # Model config for temperature scaling
+                if hasattr(model, 'hyperparams'):
+                    model_config = {'hyperparams': getattr(model, 'hyperparams', {})}
+                else:
+                    model_config = {'hyperparams': {'temperature_scaling': 1.5}}
+            
+            # Compile the GO propagation plan once per ontology (reused by every batch)
+            propagation_plan = None
+            if propagate_predictions and parents_map:
+                from utils.go_utils import get_propagation_plan
+                propagation_plan = get_propagation_plan(parents_map, list(mlb.classes_))
+                print(f"      Propagation plan: {propagation_plan.n_edges:,} edges in {len(propagation_plan.levels)} levels")
             
-            # Process in batches using pre-extracted features
-            # Use aligned_test_proteins for batching (some proteins may have been filtered during feature extraction)
-            n_batches = (len(aligned_test_proteins) + batch_size - 1) // batch_size
-            ont_predictions = 0
-            batch_buffer = []
+            # Batches follow aligned_test_proteins (some proteins may have been filtered during feature extraction)
+            n_proteins = len(aligned_test_proteins)
+            n_batches = (n_proteins + batch_size - 1) // batch_size
+            progress = {'batches': 0, 'predictions': 0}
             
-            for batch_idx in range(n_batches):
+            def read_batch(batch_idx):
+                # Contiguous slice: a memmap only pages in this batch
                 start_idx = batch_idx * batch_size
-                end_idx = min((batch_idx + 1) * batch_size, len(aligned_test_proteins))
-                batch_protein_indices = list(range(start_idx, end_idx))
-                batch_pids = [aligned_test_proteins[idx] for idx in batch_protein_indices]
-                
-                # Get pre-extracted features for this batch
-                X_batch = X_test_all[batch_protein_indices]
-                proteins_to_process = batch_pids
-                
-                # Get predictions for this batch using unified prediction interface
+                return np.asarray(X_test_all[start_idx:start_idx + batch_size])
+            
+            def infer(batch_idx, X_batch):
                 if is_pytorch_model:
-                    # Get model config for temperature scaling
-                    # model_data could be a path or model object, get config from metadata if available
-                    model_config = {}
-                    if hasattr(model, 'hyperparams'):
-                        # Try to get config from model metadata
-                        model_config = {'hyperparams': getattr(model, 'hyperparams', {})}
-                    else:
-                        # Default config
-                        model_config = {'hyperparams': {'temperature_scaling': 1.5}}
-                    
                     from utils.model_prediction import predict_with_model
-                    y_pred_proba = predict_with_model(
-                        model=model,
-                        X=X_batch,
-                        model_config=model_config,
-                        device=device
-                    )
-                    
-                    # Clean up GPU memory after each batch using centralized utility
-                    from utils.gpu_utils import cleanup_gpu_memory
-                    cleanup_gpu_memory()
-                else:
-                    # Use sklearn model
-                    y_pred_proba = model.predict_proba(X_batch)
-                
-                # Propagate predictions up GO graph if enabled
-                if propagate_predictions and parents_map:
-                    from utils.go_utils import propagate_predictions_batch
-                    from config.prediction import PREDICTION_SETTINGS
-                    pred_settings = PREDICTION_SETTINGS
-                    iterations = pred_settings.get("prediction_propagation_iterations", 3)
-                    
-                    y_pred_proba = propagate_predictions_batch(
-                        y_pred_proba, parents_map, list(mlb.classes_), iterations=iterations
-                    )
-                
-                # Process each protein in the batch
-                # Use proteins_to_process which matches the dimensions of X_batch and y_pred_proba
-                for i, pid in enumerate(proteins_to_process):
-                    probs = y_pred_proba[i]
-                    
-                    # Get top predictions
-                    top_indices = np.argsort(probs)[-max_preds_per_ont:][::-1]
-                    
-                    for idx in top_indices:
-                        prob = probs[idx]
-                        
-                        # Only include predictions above threshold
-                        if prob > prediction_threshold:
-                            term = mlb.classes_[idx]
-                            prob_str = format_prediction_score(prob)
-                            
-                            # Ensure probability is in valid range (0, 1.000]
-                            prob_float = float(prob_str)
-                            if is_valid_score(prob_float):
-                                batch_buffer.append(f"{pid}\t{term}\t{prob_str}\n")
-                                ont_predictions += 1
-                
-                # CRITICAL: Delete large prediction matrix immediately after processing
-                # For large ontologies (350k terms), this can be several GB per batch
-                del y_pred_proba
-                del X_batch
-                cleanup_memory()
-                
-                # Write buffer to disk periodically
-                if len(batch_buffer) >= write_batch_size:
-                    submission_file.writelines(batch_buffer)
-                    total_predictions_written += len(batch_buffer)
-                    batch_buffer = []
-                
-                # Progress update
-                from config.prediction import PREDICTION_PROGRESS_INTERVALS
-                if (batch_idx + 1) % PREDICTION_PROGRESS_INTERVALS["batch"] == 0 or (batch_idx + 1) == n_batches:
-                    print(f"      Batch {batch_idx+1}/{n_batches} complete "
-                          f"({end_idx:,}/{len(test_proteins):,} proteins, "
-                          f"{ont_predictions:,} predictions for this ontology)")
+                    return predict_with_model(model=model, X=X_batch, model_config=model_config, device=device)
+                return model.predict_proba(X_batch)
             
-            # Write remaining buffer for this ontology
-            if batch_buffer:
-                submission_file.writelines(batch_buffer)
-                total_predictions_written += len(batch_buffer)
-                batch_buffer = []
+            def postprocess(batch_idx, y_pred_proba):
+                # Propagate predictions up GO graph, then select top predictions above threshold
+                y_pred_proba = np.asarray(y_pred_proba)
+                if propagation_plan is not None:
+                    y_pred_proba = propagation_plan.apply(y_pred_proba)
+                return select_top_predictions(y_pred_proba, max_preds_per_ont, prediction_threshold)
+            
+            def write(batch_idx, selection):
+                start_idx = batch_idx * batch_size
+                end_idx = min(start_idx + batch_size, n_proteins)
+                row_idx, term_idx, scores = selection
+                n_written = submission_writer.write_predictions(
+                    aligned_test_proteins[start_idx:end_idx], mlb.classes_, row_idx, term_idx, scores
+                )
+                progress['batches'] += 1
+                progress['predictions'] += n_written
+                if progress['batches'] % PREDICTION_PROGRESS_INTERVALS["batch"] == 0 or progress['batches'] == n_batches:
+                    print(f"      Batch {progress['batches']}/{n_batches} complete "
+                          f"({end_idx:,}/{len(test_proteins):,} proteins, "
+                          f"{progress['predictions']:,} predictions for this ontology)")
+                return n_written
             
-            print(f"      ✓ {ont_name} complete: {ont_predictions:,} predictions written")
+            with profile_span('predict', rows=n_proteins, ontology=ont_code) as span:
+                stats = run_prediction_pipeline(n_batches, read_batch, infer, postprocess, write)
+                span.set(predictions=stats['rows_written'])
+            pipeline_stats.append(stats)
+            total_predictions_written += stats['rows_written']
+            print(f"      ✓ {ont_name} complete: {stats['rows_written']:,} predictions written "
+                  f"({stats['seconds']:.1f}s)")
             
             # Clean up GPU and CPU memory after each ontology (for PyTorch models)
+            del model, X_test_all
             if is_pytorch_model:
                 from utils.gpu_utils import cleanup_gpu_memory
                 cleanup_gpu_memory()
@@ -337,84 +266,57 @@ def make_predictions(models, mlb_dict, test_seqs, test_proteins, output_dir,
             cleanup_memory()
     
     print(f"   ✓ Total predictions written: {total_predictions_written:,}")
+    report_pipeline_stats(merge_pipeline_stats(pipeline_stats))
     
-    # Final cleanup: free feature matrix after all ontologies are done
-    del X_test_all
+    # Final cleanup: free feature matrices after all ontologies are done
+    feature_cache.clear()
     cleanup_memory()
     
     return temp_submission_path
 
 
-def post_process_submission(temp_submission_path, output_dir, output_name=None,
-                           apply_goa_filter: bool = False,
-                           extra_output_name: Optional[str] = None):
+def _cap_submission_heap(temp_submission_path, final_submission_path, max_preds_per_protein) -> List[int]:
     """
-    Post-process submission file to enforce 1500 term limit per protein.
-    Uses memory-efficient chunked processing to avoid loading all predictions into RAM.
-    Optionally applies GOA negative propagation filtering.
+    Keep the top predictions per protein with a Python min-heap per protein and write them.
     
-    Args:
-        temp_submission_path: Path to temporary submission file
-        output_dir: Path to output directory
-        output_name: Optional custom output filename (default: 'submission.tsv')
-        apply_goa_filter: If True, apply GOA negative propagation filtering
-        extra_output_name: Optional filename for a descriptive copy of submission.tsv
-        
     Returns:
-        str: Path to final submission file
+        list: Number of predictions written per protein (in output order)
     """
     import heapq
     from collections import defaultdict
     
-    print("\n[9/9] Post-processing submission file...")
-    print("   Enforcing 1500 terms per protein limit...")
-    
-    if output_name is None:
-        output_name = 'submission.tsv'
-    final_submission_path = output_dir / output_name
-    
     # Memory-efficient approach: group predictions by protein
     # Use heap to keep only top 1500 per protein during accumulation
     print("   Reading and grouping predictions by protein...")
-    from collections import defaultdict
-    import heapq
-    
     protein_predictions = defaultdict(list)  # protein -> heap of (score, term) tuples (min-heap for top-k)
     line_count = 0
-    from config.prediction import MAX_PREDICTIONS_PER_PROTEIN
-    max_preds_per_protein = MAX_PREDICTIONS_PER_PROTEIN
     
-    with open_text_file(temp_submission_path, 'r') as temp_file:
-        for line in temp_file:
-            parsed = parse_submission_line(line)
-            if parsed:
-                protein, term, score = parsed
-                line_count += 1
-                    
-                # Use min-heap to keep only top 1500 predictions per protein
-                # Min-heap stores (score, term), with smallest score at root
-                # When full, we replace the smallest (root) if current score is larger
-                if len(protein_predictions[protein]) < max_preds_per_protein:
-                    heapq.heappush(protein_predictions[protein], (score, term))
-                else:
-                    # If heap is full, check if current score is larger than smallest
-                    # heap[0] is the smallest element (root of min-heap)
-                    min_score, _ = protein_predictions[protein][0]
-                    if score > min_score:
-                        heapq.heapreplace(protein_predictions[protein], (score, term))
-                
-                # Periodic cleanup and progress
-                from config.prediction import PREDICTION_PROGRESS_INTERVALS
-                if line_count % PREDICTION_PROGRESS_INTERVALS["large_file"] == 0:
-                    cleanup_memory()
-                    print(f"      Processed {line_count:,} predictions...")
+    for protein, term, score in iter_submission_records(temp_submission_path):
+        line_count += 1
+            
+        # Use min-heap to keep only top 1500 predictions per protein
+        # Min-heap stores (score, term), with smallest score at root
+        # When full, we replace the smallest (root) if current score is larger
+        if len(protein_predictions[protein]) < max_preds_per_protein:
+            heapq.heappush(protein_predictions[protein], (score, term))
+        else:
+            # If heap is full, check if current score is larger than smallest
+            # heap[0] is the smallest element (root of min-heap)
+            min_score, _ = protein_predictions[protein][0]
+            if score > min_score:
+                heapq.heapreplace(protein_predictions[protein], (score, term))
+        
+        # Periodic cleanup and progress
+        from config.prediction import PREDICTION_PROGRESS_INTERVALS
+        if line_count % PREDICTION_PROGRESS_INTERVALS["large_file"] == 0:
+            cleanup_memory()
+            print(f"      Processed {line_count:,} predictions...")
     
     print(f"   Loaded {line_count:,} predictions for {len(protein_predictions):,} proteins")
     
     # Convert heaps to sorted lists and write to file
     print("   Sorting and writing top predictions per protein...")
-    final_count = 0
-    processed_proteins = 0
+    preds_per_protein = []
     
     with open(final_submission_path, 'w') as final_file:
         for protein, preds in protein_predictions.items():
@@ -424,12 +326,11 @@ def post_process_submission(temp_submission_path, output_dir, output_name=None,
             for score, term in sorted_preds:
                 score_str = format_prediction_score(score)
                 final_file.write(f"{protein}\t{term}\t{score_str}\n")
-                final_count += 1
+            preds_per_protein.append(len(sorted_preds))
             
-            processed_proteins += 1
             from config.prediction import PREDICTION_PROGRESS_INTERVALS
-            if processed_proteins % PREDICTION_PROGRESS_INTERVALS["proteins"] == 0:
-                print(f"      Processed {processed_proteins:,} proteins...")
+            if len(preds_per_protein) % PREDICTION_PROGRESS_INTERVALS["proteins"] == 0:
+                print(f"      Processed {len(preds_per_protein):,} proteins...")
                 # Periodic cleanup
                 cleanup_memory()
     
@@ -437,13 +338,202 @@ def post_process_submission(temp_submission_path, output_dir, output_name=None,
     del protein_predictions
     cleanup_memory()
     
+    return preds_per_protein
+
+
+def _prune_to_protein_top_k(protein_idx: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Find rows that can still be in their protein's top-k.
+    
+    A row is dropped only if its protein already has k rows scoring at least as high
+    and its score is below the protein's k-th best score; rows tied with the k-th best
+    score are all kept. Dropping such rows never changes what the per-protein
+    min-heap keeps.
+    
+    Returns:
+        np.ndarray: Positions of kept rows, in their original (arrival) order
+    """
+    order = np.lexsort((-scores, protein_idx))
+    sorted_proteins = protein_idx[order]
+    starts = np.flatnonzero(np.r_[True, sorted_proteins[1:] != sorted_proteins[:-1]])
+    counts = np.diff(np.r_[starts, len(order)])
+    over = counts > k
+    if not over.any():
+        return np.arange(len(order))
+    
+    cutoff = np.full(len(starts), -np.inf, dtype=np.float64)
+    cutoff[over] = scores[order[starts[over] + k - 1]]
+    keep = scores[order] >= np.repeat(cutoff, counts)
+    return np.sort(order[keep])
+
+
+def _cap_submission_vectorized(temp_submission_path, final_submission_path,
+                               max_preds_per_protein, work_dir) -> np.ndarray:
+    """
+    Keep the top predictions per protein with integer-coded arrays and write them.
+    
+    Reads the columnar submission in chunks, prunes rows that cannot reach a protein's
+    top-k whenever the buffered rows outgrow the budget, then does one grouped sort.
+    Output (rows, order and tie handling) matches _cap_submission_heap: only proteins
+    with ties at their k-th score replay the heap over their remaining rows.
+    
+    Returns:
+        np.ndarray: Number of predictions written per protein (in output order)
+    """
+    import heapq
+    from config.prediction import COLUMNAR_SUBMISSION_CHUNK_ROWS, COLUMNAR_SUBMISSION_SUFFIX
+    from prediction.columnar_submission import ColumnarSubmission, is_columnar_submission, tsv_to_columnar
+    
+    converted_path = None
+    if not is_columnar_submission(temp_submission_path):
+        print("   Converting submission to columnar format...")
+        converted_path = Path(work_dir) / f'temp_post_process{COLUMNAR_SUBMISSION_SUFFIX}'
+        tsv_to_columnar(temp_submission_path, converted_path)
+        temp_submission_path = converted_path
+    
+    submission = ColumnarSubmission(temp_submission_path)
+    k = max_preds_per_protein
+    print(f"   Reading {len(submission):,} predictions in chunks...")
+    
+    def prune(parts):
+        protein_idx = np.concatenate([part[0] for part in parts])
+        term_idx = np.concatenate([part[1] for part in parts])
+        scores = np.concatenate([part[2] for part in parts])
+        keep = _prune_to_protein_top_k(protein_idx, scores, k)
+        return protein_idx[keep], term_idx[keep], scores[keep]
+    
+    first_seen = np.full(len(submission.proteins), -1, dtype=np.int64)
+    parts = []
+    buffered_rows = 0
+    budget = 4 * COLUMNAR_SUBMISSION_CHUNK_ROWS
+    rows_read = 0
+    
+    for protein_idx, term_idx, scores in submission.iter_chunks():
+        # First appearance of each protein fixes its position in the output
+        unique_proteins, first_rows = np.unique(protein_idx, return_index=True)
+        unseen = first_seen[unique_proteins] < 0
+        first_seen[unique_proteins[unseen]] = rows_read + first_rows[unseen]
+        rows_read += len(scores)
+        
+        parts.append((protein_idx, term_idx, scores))
+        buffered_rows += len(scores)
+        if buffered_rows > budget:
+            parts = [prune(parts)]
+            buffered_rows = len(parts[0][2])
+            budget = max(budget, 2 * buffered_rows)
+    
+    present = np.flatnonzero(first_seen >= 0)
+    print(f"   Loaded {rows_read:,} predictions for {len(present):,} proteins")
+    print("   Sorting and writing top predictions per protein...")
+    
+    if parts:
+        protein_idx, term_idx, scores = prune(parts)
+    else:
+        protein_idx = term_idx = np.zeros(0, dtype=np.int32)
+        scores = np.zeros(0, dtype=np.float32)
+    del parts
+    
+    # Rows left above k belong to proteins tied at their k-th score: replay the heap on those
+    counts = np.bincount(protein_idx, minlength=len(submission.proteins))
+    tied_proteins = np.flatnonzero(counts > k)
+    if len(tied_proteins):
+        is_tied = np.isin(protein_idx, tied_proteins)
+        tied_rows = np.flatnonzero(is_tied)
+        heaps = {}
+        for row, protein, term, score in zip(tied_rows.tolist(), protein_idx[tied_rows].tolist(),
+                                             submission.terms[term_idx[tied_rows]].tolist(),
+                                             scores[tied_rows].tolist()):
+            heap = heaps.setdefault(protein, [])
+            if len(heap) < k:
+                heapq.heappush(heap, (score, term, row))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, term, row))
+        kept_rows = np.array([row for heap in heaps.values() for _, _, row in heap], dtype=np.int64)
+        keep = ~is_tied
+        keep[kept_rows] = True
+        protein_idx, term_idx, scores = protein_idx[keep], term_idx[keep], scores[keep]
+    
+    # Proteins in first-appearance order, then score descending, then term descending
+    protein_rank = np.empty(len(submission.proteins), dtype=np.int64)
+    protein_rank[present[np.argsort(first_seen[present])]] = np.arange(len(present))
+    term_rank = np.empty(len(submission.terms), dtype=np.int64)
+    term_rank[np.argsort(submission.terms)] = np.arange(len(submission.terms))
+    order = np.lexsort((-term_rank[term_idx], -scores, protein_rank[protein_idx]))
+    protein_idx, term_idx, scores = protein_idx[order], term_idx[order], scores[order]
+    
+    protein_table = encode_fixed_width_labels(submission.proteins)
+    term_table = encode_fixed_width_labels(submission.terms)
+    with open(final_submission_path, 'w') as final_file:
+        for start in range(0, len(scores), COLUMNAR_SUBMISSION_CHUNK_ROWS):
+            end = start + COLUMNAR_SUBMISSION_CHUNK_ROWS
+            text, _ = render_prediction_lines(protein_table, term_table,
+                                              protein_idx[start:end], term_idx[start:end], scores[start:end])
+            final_file.write(text)
+    
+    preds_per_protein = np.bincount(protein_rank[protein_idx], minlength=len(present))
+    
+    del submission
+    if converted_path is not None:
+        remove_submission(converted_path)
+    
+    return preds_per_protein
+
+
+def post_process_submission(temp_submission_path, output_dir, output_name=None,
+                           apply_goa_filter: bool = False,
+                           extra_output_name: Optional[str] = None,
+                           mode: Optional[str] = None):
+    """
+    Post-process submission file to enforce 1500 term limit per protein.
+    Uses memory-efficient chunked processing to avoid loading all predictions into RAM.
+    Optionally applies GOA negative propagation filtering.
+    
+    Args:
+        temp_submission_path: Path to temporary submission (columnar directory or TSV file)
+        output_dir: Path to output directory
+        output_name: Optional custom output filename (default: 'submission.tsv')
+        apply_goa_filter: If True, apply GOA negative propagation filtering
+        extra_output_name: Optional filename for a descriptive copy of submission.tsv
+        mode: Per-protein cap implementation, 'vectorized' (grouped top-k over integer-coded
+              arrays) or 'heap' (Python heap per protein); defaults to
+              PREDICTION_SETTINGS["post_process_mode"]
+        
+    Returns:
+        str: Path to final submission file
+    """
+    print("\n[9/9] Post-processing submission file...")
+    print("   Enforcing 1500 terms per protein limit...")
+    
+    if output_name is None:
+        output_name = 'submission.tsv'
+    final_submission_path = output_dir / output_name
+    
+    from config.prediction import MAX_PREDICTIONS_PER_PROTEIN, PREDICTION_SETTINGS
+    max_preds_per_protein = MAX_PREDICTIONS_PER_PROTEIN
+    if mode is None:
+        mode = PREDICTION_SETTINGS.get("post_process_mode", "vectorized")
+    
+    with profile_span('post_process', mode=mode) as span:
+        if mode == 'vectorized':
+            preds_per_protein = _cap_submission_vectorized(
+                temp_submission_path, final_submission_path, max_preds_per_protein, output_dir
+            )
+        elif mode == 'heap':
+            preds_per_protein = _cap_submission_heap(
+                temp_submission_path, final_submission_path, max_preds_per_protein
+            )
+        else:
+            raise ValueError(f"Unknown post-processing mode: {mode} (expected 'vectorized' or 'heap')")
+        
+        final_count = int(np.sum(preds_per_protein))
+        span.add_rows(final_count)
     print(f"   ✓ Final submission saved to {final_submission_path}")
     print(f"   ✓ Total predictions in submission: {final_count:,}")
-    print(f"   ✓ Proteins with predictions: {processed_proteins:,}")
+    print(f"   ✓ Proteins with predictions: {len(preds_per_protein):,}")
     
-    # Remove temporary file
+    # Remove temporary submission
     if os.path.exists(temp_submission_path):
-        os.remove(temp_submission_path)
+        remove_submission(temp_submission_path)
         print("   ✓ Temporary file cleaned up")
     
     # Display sample and statistics (memory-efficient)
@@ -453,20 +543,13 @@ def post_process_submission(temp_submission_path, output_dir, output_name=None,
     print("\n   Sample predictions:")
     print(sample_df.to_string(index=False))
     
-    # Calculate statistics (streaming approach)
-    print("\n   Calculating statistics...")
-    protein_counts = {}
-    with open_text_file(final_submission_path, 'r') as f:
-        for line in f:
-            protein = line.split('\t')[0]
-            protein_counts[protein] = protein_counts.get(protein, 0) + 1
-    
-    preds_per_protein = list(protein_counts.values())
-    print(f"\n   Prediction statistics:")
-    print(f"      Mean predictions per protein: {np.mean(preds_per_protein):.1f}")
-    print(f"      Median predictions per protein: {np.median(preds_per_protein):.0f}")
-    print(f"      Max predictions per protein: {max(preds_per_protein)}")
-    print(f"      Min predictions per protein: {min(preds_per_protein)}")
+    # Statistics come from the per-protein counts collected while writing
+    if len(preds_per_protein):
+        print(f"\n   Prediction statistics:")
+        print(f"      Mean predictions per protein: {np.mean(preds_per_protein):.1f}")
+        print(f"      Median predictions per protein: {np.median(preds_per_protein):.0f}")
+        print(f"      Max predictions per protein: {max(preds_per_protein)}")
+        print(f"      Min predictions per protein: {min(preds_per_protein)}")
     
     # Apply GOA negative propagation filtering if requested
     if apply_goa_filter:
@@ -486,12 +569,13 @@ def post_process_submission(temp_submission_path, output_dir, output_name=None,
                 print(f"   ⚠️  Warning: GOA annotations not found at {goa_annotations_path}, skipping GOA filtering")
             else:
                 # Apply filtering
-                filtered_path = apply_goa_filtering(
-                    str(final_submission_path),
-                    str(goa_annotations_path),
-                    str(go_obo_path),
-                    str(final_submission_path.with_suffix('')) + '_filtered.tsv'
-                )
+                with profile_span('goa_filter', rows=final_count):
+                    filtered_path = apply_goa_filtering(
+                        str(final_submission_path),
+                        str(goa_annotations_path),
+                        str(go_obo_path),
+                        str(final_submission_path.with_suffix('')) + '_filtered.tsv'
+                    )
                 
                 # Replace original with filtered version
                 import shutil
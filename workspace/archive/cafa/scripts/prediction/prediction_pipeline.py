@@ -0,0 +1,359 @@
+"""
+Staged producer/consumer prediction pipeline for CAFA 6 protein function prediction.
+
+Batch prediction runs as four overlapping stages connected by bounded queues:
+
+    reader (thread)  -> inference (caller thread) -> post-processing (thread pool) -> writer (thread)
+    gather features     model forward pass           GO propagation + top-k          columnar append
+
+The reader prefetches feature batches (memmap slices) while the model runs,
+post-processing of batch i overlaps inference of batch i+1, and the writer
+appends results in batch order. Inference stays on the calling thread so
+PyTorch/GPU models are only touched from one thread. Each stage records busy
+and wait time; report_pipeline_stats prints per-stage utilization so the
+bottleneck is visible.
+
+FeatureMatrixCache extracts test features once per feature configuration and
+serves them to every ontology/model that uses that configuration.
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_DONE = object()
+
+
+class _StageError:
+    """Carries an exception from a producer thread to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _StageClock:
+    """Busy/wait seconds and item count for one stage (thread-safe for pool workers)."""
+
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.busy = 0.0
+        self.wait = 0.0
+        self.items = 0
+        self._lock = threading.Lock()
+
+    def add(self, busy: float = 0.0, wait: float = 0.0, items: int = 0) -> None:
+        with self._lock:
+            self.busy += busy
+            self.wait += wait
+            self.items += items
+
+
+def _timed_get(q: queue.Queue, clock: _StageClock) -> Any:
+    start = time.perf_counter()
+    item = q.get()
+    clock.add(wait=time.perf_counter() - start)
+    return item
+
+
+def _timed_put(q: queue.Queue, item: Any, clock: _StageClock) -> None:
+    start = time.perf_counter()
+    q.put(item)
+    clock.add(wait=time.perf_counter() - start)
+
+
+def run_prediction_pipeline(n_batches: int,
+                            read_batch: Callable[[int], Any],
+                            infer: Callable[[int, Any], Any],
+                            postprocess: Callable[[int, Any], Any],
+                            write: Callable[[int, Any], int],
+                            prefetch_batches: Optional[int] = None,
+                            postprocess_workers: Optional[int] = None,
+                            queue_batches: Optional[int] = None,
+                            enabled: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Run read -> infer -> postprocess -> write over n_batches with overlapping stages.
+
+    Args:
+        n_batches: Number of batches
+        read_batch: batch_idx -> model input (e.g. feature rows gathered from a memmap)
+        infer: (batch_idx, model input) -> predictions; runs on the calling thread
+        postprocess: (batch_idx, predictions) -> write payload; runs on the post-processing pool
+        write: (batch_idx, payload) -> rows written; runs on the writer thread in batch order
+        prefetch_batches: Read-ahead depth (default: PREDICTION_PIPELINE_PREFETCH_BATCHES)
+        postprocess_workers: Post-processing threads (default: PREDICTION_PIPELINE_POSTPROCESS_WORKERS)
+        queue_batches: Max batches between inference and the writer (default: PREDICTION_PIPELINE_QUEUE_BATCHES)
+        enabled: False runs the stages one after another on the calling thread
+                 (default: PREDICTION_PIPELINE_ENABLED)
+
+    Returns:
+        dict: seconds, batches, rows_written, stages -> {busy, wait, items, workers, utilization}
+
+    Raises:
+        Exception: The first error raised by any stage (remaining stages are stopped)
+    """
+    from config.prediction import (
+        PREDICTION_PIPELINE_ENABLED,
+        PREDICTION_PIPELINE_PREFETCH_BATCHES,
+        PREDICTION_PIPELINE_POSTPROCESS_WORKERS,
+        PREDICTION_PIPELINE_QUEUE_BATCHES
+    )
+
+    if enabled is None:
+        enabled = PREDICTION_PIPELINE_ENABLED
+    prefetch_batches = max(1, prefetch_batches or PREDICTION_PIPELINE_PREFETCH_BATCHES)
+    postprocess_workers = max(1, postprocess_workers or PREDICTION_PIPELINE_POSTPROCESS_WORKERS)
+    queue_batches = max(1, queue_batches or PREDICTION_PIPELINE_QUEUE_BATCHES)
+
+    if not enabled:
+        return _run_sequential(n_batches, read_batch, infer, postprocess, write)
+
+    clocks = OrderedDict([
+        ('read', _StageClock()),
+        ('inference', _StageClock()),
+        ('postprocess', _StageClock(postprocess_workers)),
+        ('write', _StageClock()),
+    ])
+    read_queue: queue.Queue = queue.Queue(maxsize=prefetch_batches)
+    write_queue: queue.Queue = queue.Queue(maxsize=queue_batches)
+    stop = threading.Event()
+    writer_state = {'rows': 0, 'error': None}
+
+    def _reader() -> None:
+        try:
+            for batch_idx in range(n_batches):
+                if stop.is_set():
+                    return
+                start = time.perf_counter()
+                item = read_batch(batch_idx)
+                clocks['read'].add(busy=time.perf_counter() - start, items=1)
+                _timed_put(read_queue, (batch_idx, item), clocks['read'])
+        except BaseException as e:
+            read_queue.put(_StageError(e))
+            return
+        read_queue.put(_DONE)
+
+    def _postprocess(batch_idx: int, predictions: Any) -> Any:
+        start = time.perf_counter()
+        payload = postprocess(batch_idx, predictions)
+        clocks['postprocess'].add(busy=time.perf_counter() - start, items=1)
+        return payload
+
+    def _writer() -> None:
+        while True:
+            entry = _timed_get(write_queue, clocks['write'])
+            if entry is _DONE:
+                return
+            batch_idx, future = entry
+            if writer_state['error'] is not None:
+                continue  # drain so the producer never blocks
+            try:
+                payload = future.result()
+                start = time.perf_counter()
+                writer_state['rows'] += write(batch_idx, payload)
+                clocks['write'].add(busy=time.perf_counter() - start, items=1)
+            except BaseException as e:
+                writer_state['error'] = e
+                stop.set()
+
+    start_time = time.perf_counter()
+    reader_thread = threading.Thread(target=_reader, name='prediction-reader', daemon=True)
+    writer_thread = threading.Thread(target=_writer, name='prediction-writer', daemon=True)
+    reader_thread.start()
+    writer_thread.start()
+    error: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=postprocess_workers, thread_name_prefix='prediction-post') as pool:
+        try:
+            while not stop.is_set():
+                entry = _timed_get(read_queue, clocks['inference'])
+                if entry is _DONE:
+                    break
+                if isinstance(entry, _StageError):
+                    raise entry.error
+                batch_idx, item = entry
+                start = time.perf_counter()
+                predictions = infer(batch_idx, item)
+                del item
+                clocks['inference'].add(busy=time.perf_counter() - start, items=1)
+                _timed_put(write_queue, (batch_idx, pool.submit(_postprocess, batch_idx, predictions)),
+                           clocks['inference'])
+                del predictions
+        except BaseException as e:
+            error = e
+            stop.set()
+        finally:
+            write_queue.put(_DONE)
+            writer_thread.join()
+            # Unblock the reader if it is waiting on a full queue
+            while reader_thread.is_alive():
+                try:
+                    read_queue.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+    error = error or writer_state['error']
+    if error is not None:
+        raise error
+    return _pipeline_stats(clocks, time.perf_counter() - start_time, n_batches, writer_state['rows'])
+
+
+def _run_sequential(n_batches: int, read_batch: Callable, infer: Callable,
+                    postprocess: Callable, write: Callable) -> Dict[str, Any]:
+    """Same stages without overlap (PREDICTION_PIPELINE_ENABLED = False); timed the same way."""
+    clocks = OrderedDict((name, _StageClock()) for name in ('read', 'inference', 'postprocess', 'write'))
+    rows = 0
+    start_time = time.perf_counter()
+    for batch_idx in range(n_batches):
+        stage_start = time.perf_counter()
+        item = read_batch(batch_idx)
+        clocks['read'].add(busy=time.perf_counter() - stage_start, items=1)
+        stage_start = time.perf_counter()
+        predictions = infer(batch_idx, item)
+        del item
+        clocks['inference'].add(busy=time.perf_counter() - stage_start, items=1)
+        stage_start = time.perf_counter()
+        payload = postprocess(batch_idx, predictions)
+        del predictions
+        clocks['postprocess'].add(busy=time.perf_counter() - stage_start, items=1)
+        stage_start = time.perf_counter()
+        rows += write(batch_idx, payload)
+        clocks['write'].add(busy=time.perf_counter() - stage_start, items=1)
+    return _pipeline_stats(clocks, time.perf_counter() - start_time, n_batches, rows)
+
+
+def _pipeline_stats(clocks: 'OrderedDict[str, _StageClock]', elapsed: float,
+                    n_batches: int, rows_written: int) -> Dict[str, Any]:
+    stages = OrderedDict()
+    for name, clock in clocks.items():
+        stages[name] = {
+            'busy': clock.busy,
+            'wait': clock.wait,
+            'items': clock.items,
+            'workers': clock.workers,
+            'utilization': clock.busy / (elapsed * clock.workers) if elapsed > 0 else 0.0,
+        }
+    return {'seconds': elapsed, 'batches': n_batches, 'rows_written': rows_written, 'stages': stages}
+
+
+def merge_pipeline_stats(stats_list: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Sum several run_prediction_pipeline results (e.g. one per ontology) into one."""
+    if not stats_list:
+        return None
+    elapsed = sum(s['seconds'] for s in stats_list)
+    stages = OrderedDict()
+    for name in stats_list[0]['stages']:
+        workers = stats_list[0]['stages'][name]['workers']
+        busy = sum(s['stages'][name]['busy'] for s in stats_list)
+        stages[name] = {
+            'busy': busy,
+            'wait': sum(s['stages'][name]['wait'] for s in stats_list),
+            'items': sum(s['stages'][name]['items'] for s in stats_list),
+            'workers': workers,
+            'utilization': busy / (elapsed * workers) if elapsed > 0 else 0.0,
+        }
+    return {'seconds': elapsed, 'batches': sum(s['batches'] for s in stats_list),
+            'rows_written': sum(s['rows_written'] for s in stats_list), 'stages': stages}
+
+
+def report_pipeline_stats(stats: Optional[Dict[str, Any]], title: str = "Prediction pipeline") -> None:
+    """Print per-stage busy/wait time and utilization; the busiest stage is the bottleneck."""
+    if not stats:
+        return
+    bottleneck = max(stats['stages'], key=lambda name: stats['stages'][name]['utilization'])
+    print(f"   📊 {title}: {stats['batches']} batches, {stats['rows_written']:,} rows in {stats['seconds']:.1f}s")
+    for name, stage in stats['stages'].items():
+        workers = f" x{stage['workers']}" if stage['workers'] > 1 else ""
+        marker = "  ← bottleneck" if name == bottleneck else ""
+        print(f"      {name + workers:<16} busy {stage['busy']:7.1f}s  wait {stage['wait']:7.1f}s  "
+              f"utilization {stage['utilization']:6.1%}{marker}")
+
+
+def feature_config_key(feature_type: str, features: Optional[Sequence[str]]) -> Tuple:
+    """Cache key for a feature configuration (feature order is kept: it fixes the column layout)."""
+    if feature_type == 'fused_embeddings':
+        return (feature_type, tuple(features or ()))
+    return (feature_type,)
+
+
+class FeatureMatrixCache:
+    """
+    Test feature matrices extracted once per feature configuration.
+
+    Matrices from the feature store stay memory-mapped; rows for a batch of proteins
+    are gathered on demand (by the pipeline reader), so several ontologies or models
+    with the same configuration share one extraction and one mapping.
+    """
+
+    def __init__(self, sequences: Dict[str, str], protein_ids: List[str]):
+        """
+        Args:
+            sequences: protein_id -> sequence
+            protein_ids: Proteins to extract (order defines batch positions)
+        """
+        self.sequences = sequences
+        self.protein_ids = protein_ids
+        self._entries: Dict[Tuple, Tuple[Any, List[str], np.ndarray]] = {}
+
+    def get(self, feature_type: str, features: Optional[Sequence[str]] = None) -> Tuple[Any, List[str], np.ndarray]:
+        """
+        Args:
+            feature_type: 'hand_crafted' or 'fused_embeddings'
+            features: Feature list for fused_embeddings
+
+        Returns:
+            tuple: (X (array or memmap), aligned protein IDs, row of each protein_ids entry or -1)
+        """
+        key = feature_config_key(feature_type, features)
+        if key in self._entries:
+            print(f"      ✓ Reusing extracted features: {feature_type} {list(features) if features else ''}")
+            return self._entries[key]
+
+        from preprocessing.feature_extraction import extract_features
+
+        if feature_type == 'fused_embeddings':
+            if not features:
+                raise ValueError("Features list is required for fused_embeddings during prediction")
+            extraction_config = {'feature_type': feature_type, 'features': list(features)}
+        else:
+            extraction_config = {'feature_type': feature_type}
+
+        X_result, aligned_ids = extract_features(
+            sequences=self.sequences,
+            config=extraction_config,
+            protein_ids=self.protein_ids,
+            datatype='test',
+            force_memmap=None  # Auto-detect - may return memmap for large test sets
+        )
+        if isinstance(X_result, Path):
+            from utils.memory_efficient import load_features_memmap
+            X_result = load_features_memmap(X_result)
+        aligned_ids = list(aligned_ids)
+        row_of = {pid: i for i, pid in enumerate(aligned_ids)}
+        rows = np.fromiter((row_of.get(pid, -1) for pid in self.protein_ids), dtype=np.int64,
+                           count=len(self.protein_ids))
+        print(f"      ✓ Extracted features: {len(aligned_ids):,} proteins (shape: {X_result.shape})")
+        self._entries[key] = (X_result, aligned_ids, rows)
+        return self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def gather_rows(X: Any, rows: np.ndarray) -> np.ndarray:
+    """
+    Gather feature rows (memmap-friendly: contiguous runs are sliced, others read in sorted order).
+    Rows of -1 are zero-filled.
+    """
+    rows = np.asarray(rows)
+    if len(rows) and rows[0] >= 0 and np.all(np.diff(rows) == 1):
+        return np.asarray(X[rows[0]:rows[-1] + 1])
+    out = np.zeros((len(rows), X.shape[1]), dtype=X.dtype)
+    valid = np.flatnonzero(rows >= 0)
+    if len(valid):
+        order = valid[np.argsort(rows[valid], kind='stable')]
+        out[order] = X[rows[order]]
+    return out
@@ -3,9 +3,11 @@ Shared utility functions for prediction package.
 Consolidates duplicate code patterns across prediction modules.
 """
 
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Sequence
 from pathlib import Path
 
+import numpy as np
+
 
 def format_prediction_score(score: float) -> str:
     """
@@ -33,6 +35,160 @@ def is_valid_score(score: float) -> bool:
     return 0 < score <= 1.0
 
 
+def encode_fixed_width_labels(labels: Sequence[str]) -> np.ndarray:
+    """
+    Encode string labels as a zero-padded byte table for bulk line rendering.
+    
+    Args:
+        labels: Protein IDs, GO terms or score strings
+        
+    Returns:
+        np.ndarray: uint8 array of shape (n_labels, max_label_bytes)
+    """
+    if len(labels) == 0:
+        return np.zeros((0, 1), dtype=np.uint8)
+    encoded = np.array([str(label).encode('utf-8') for label in labels], dtype=bytes)
+    return encoded.view(np.uint8).reshape(len(encoded), -1)
+
+
+def select_top_predictions(y_pred_proba: np.ndarray,
+                           max_preds: int,
+                           threshold: float,
+                           row_chunk_size: int = 256) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Select each row's top-k predictions above a threshold for a whole batch.
+    
+    Equivalent to taking np.argsort(probs)[-max_preds:][::-1] per row and keeping
+    scores > threshold, but uses np.partition to find each row's k-th largest score
+    and a vectorized mask instead of a full sort per protein. Results are ordered by
+    row, then score descending, then term index descending (the stable-sort order).
+    
+    Args:
+        y_pred_proba: Prediction probabilities, shape (n_rows, n_terms)
+        max_preds: Maximum predictions per row (<= 0 keeps every term)
+        threshold: Minimum probability (exclusive)
+        row_chunk_size: Rows partitioned at once (bounds the temporary copy)
+        
+    Returns:
+        tuple: (row_idx, term_idx, scores) of the selected predictions
+    """
+    n_rows, n_terms = y_pred_proba.shape
+    k = n_terms if max_preds <= 0 else min(max_preds, n_terms)
+    
+    row_parts, term_parts = [], []
+    for start in range(0, n_rows, row_chunk_size):
+        chunk = y_pred_proba[start:start + row_chunk_size]
+        mask = chunk > threshold
+        if k < n_terms:
+            kth_largest = np.partition(chunk, n_terms - k, axis=1)[:, n_terms - k]
+            mask &= chunk >= kth_largest[:, None]
+        rows, terms = np.nonzero(mask)
+        row_parts.append(rows + start)
+        term_parts.append(terms)
+    
+    row_idx = np.concatenate(row_parts) if row_parts else np.zeros(0, dtype=np.intp)
+    term_idx = np.concatenate(term_parts) if term_parts else np.zeros(0, dtype=np.intp)
+    scores = y_pred_proba[row_idx, term_idx]
+    
+    order = np.lexsort((-term_idx, -scores, row_idx))
+    row_idx, term_idx, scores = row_idx[order], term_idx[order], scores[order]
+    
+    # Ties at the k-th score can leave more than k candidates in a row
+    if len(row_idx) and k < n_terms:
+        row_starts = np.searchsorted(row_idx, np.arange(n_rows))
+        keep = (np.arange(len(row_idx)) - row_starts[row_idx]) < k
+        row_idx, term_idx, scores = row_idx[keep], term_idx[keep], scores[keep]
+    
+    return row_idx, term_idx, scores
+
+
+def _format_unique_scores(scores: np.ndarray) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Format each distinct score once with format_prediction_score.
+    
+    Returns:
+        tuple: (score_strings, codes mapping each score to its string, validity per string)
+    """
+    unique_scores, score_codes = np.unique(np.asarray(scores).ravel(), return_inverse=True)
+    score_strings = [format_prediction_score(float(score)) for score in unique_scores]
+    valid_codes = np.array([is_valid_score(float(score_str)) for score_str in score_strings], dtype=bool)
+    return score_strings, score_codes.ravel(), valid_codes
+
+
+def quantize_prediction_scores(scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Round scores to their submission precision, as if written and re-parsed as text.
+    
+    Args:
+        scores: Raw prediction scores
+        
+    Returns:
+        tuple: (float32 scores equal to float(format_prediction_score(score)),
+                mask of scores that pass is_valid_score after rounding)
+    """
+    if len(scores) == 0:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=bool)
+    score_strings, score_codes, valid_codes = _format_unique_scores(scores)
+    rounded = np.array([float(score_str) for score_str in score_strings], dtype=np.float32)
+    return rounded[score_codes], valid_codes[score_codes]
+
+
+def render_prediction_lines(protein_table: np.ndarray,
+                            term_table: np.ndarray,
+                            protein_idx: np.ndarray,
+                            term_idx: np.ndarray,
+                            scores: np.ndarray,
+                            chunk_size: int = 1000000) -> Tuple[str, int]:
+    """
+    Render (protein, term, score) triples as submission TSV text in bulk.
+    
+    Scores are formatted once per unique value with format_prediction_score and
+    dropped when the formatted value fails is_valid_score, so the text matches
+    the per-line f"{protein}\t{term}\t{score_str}\n" output byte for byte.
+    Each line is assembled in a preallocated zero-padded byte row and the padding
+    is squeezed out afterwards.
+    
+    Args:
+        protein_table: Fixed-width protein labels (encode_fixed_width_labels)
+        term_table: Fixed-width term labels (encode_fixed_width_labels)
+        protein_idx: Row into protein_table per prediction
+        term_idx: Row into term_table per prediction
+        scores: Score per prediction
+        chunk_size: Lines assembled per buffer
+        
+    Returns:
+        tuple: (text, number_of_lines)
+    """
+    if len(scores) == 0:
+        return '', 0
+    
+    score_strings, score_codes, valid_codes = _format_unique_scores(scores)
+    score_table = encode_fixed_width_labels(score_strings)
+    
+    keep = valid_codes[score_codes]
+    if not keep.all():
+        protein_idx, term_idx, score_codes = protein_idx[keep], term_idx[keep], score_codes[keep]
+    
+    protein_width, term_width, score_width = protein_table.shape[1], term_table.shape[1], score_table.shape[1]
+    term_col = protein_width + 1
+    score_col = term_col + term_width + 1
+    line_width = score_col + score_width + 1
+    
+    pieces = []
+    for start in range(0, len(score_codes), chunk_size):
+        end = min(start + chunk_size, len(score_codes))
+        lines = np.empty((end - start, line_width), dtype=np.uint8)
+        lines[:, :protein_width] = protein_table[protein_idx[start:end]]
+        lines[:, protein_width] = ord('\t')
+        lines[:, term_col:term_col + term_width] = term_table[term_idx[start:end]]
+        lines[:, score_col - 1] = ord('\t')
+        lines[:, score_col:line_width - 1] = score_table[score_codes[start:end]]
+        lines[:, line_width - 1] = ord('\n')
+        pieces.append(lines[lines != 0].tobytes().decode('utf-8'))
+    
+    return ''.join(pieces), len(score_codes)
+
+
 def validate_go_term_format(term: str) -> Tuple[bool, Optional[str]]:
     """
     Validate GO term format.
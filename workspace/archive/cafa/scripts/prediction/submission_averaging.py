@@ -12,6 +12,7 @@ from utils.logging import setup_logging, get_logger
 from utils.utils_common import open_text_file
 from prediction.ensemble import ensemble_predictions
 from prediction.prediction_utils import is_valid_score, validate_go_term_format, cleanup_temp_files
+from prediction.columnar_submission import is_columnar_submission, ColumnarSubmission
 
 logger = get_logger(__name__)
 
@@ -21,7 +22,7 @@ def load_submission(filepath: str) -> Dict[Tuple[str, str], float]:
     Load submission file into dictionary format.
     
     Args:
-        filepath: Path to submission.tsv file
+        filepath: Path to submission.tsv file or columnar submission directory
         
     Returns:
         dict: {(protein_id, term): score}
@@ -37,7 +38,13 @@ def load_submission(filepath: str) -> Dict[Tuple[str, str], float]:
     setup_logging()
     logger.info(f"Loading: {filepath.name}")
     
-    from prediction.prediction_utils import parse_submission_line
+    from prediction.submission_merging import parse_submission_line
+    
+    if is_columnar_submission(filepath):
+        predictions = {(protein_id, term): score
+                       for protein_id, term, score in ColumnarSubmission(filepath).iter_records()}
+        logger.info(f"      ✓ Loaded {len(predictions):,} predictions")
+        return predictions
     
     predictions = {}
     
@@ -71,6 +78,66 @@ def load_submission(filepath: str) -> Dict[Tuple[str, str], float]:
     return predictions
 
 
+def _resolve_weights(weights: Optional[List[float]], n_files: int) -> List[float]:
+    """Default to equal weights; otherwise check count and sum for weighted_average."""
+    if weights is None:
+        weights = [1.0 / n_files] * n_files
+        logger.info(f"Using equal weights: {weights}")
+        return weights
+    if len(weights) != n_files:
+        raise ValueError(
+            f"Number of weights ({len(weights)}) must match number of submission files ({n_files})"
+        )
+    if not np.isclose(sum(weights), 1.0):
+        raise ValueError(f"Weights must sum to 1.0, got {sum(weights)}")
+    logger.info(f"Weights: {weights}")
+    return weights
+
+
+def make_ensemble_combiner(ensemble_method: str,
+                           n_files: int,
+                           weights: Optional[List[float]] = None,
+                           **ensemble_kwargs):
+    """
+    Build a merge-engine combine function applying one ensemble method.
+
+    Args:
+        ensemble_method: Ensemble method (see average_submissions)
+        n_files: Number of aligned inputs
+        weights: Optional weights for weighted_average (must sum to 1.0)
+        **ensemble_kwargs: Method-specific parameters (power, percentile)
+
+    Returns:
+        callable: AlignedScoreBlock -> (combined scores, mask of keys to write)
+
+    Raises:
+        ValueError: If weights are invalid
+    """
+    from config.prediction import SUBMISSION_ENSEMBLE_BLOCK_ROWS
+
+    ensemble_kwargs_final = ensemble_kwargs.copy()
+    if ensemble_method == 'weighted_average':
+        ensemble_kwargs_final['weights'] = _resolve_weights(weights, n_files)
+
+    def combine(block):
+        # Each key is ensembled on its own (1 sample x 1 term) as before; keys are
+        # stacked along the sample axis so one call covers a whole slice of keys
+        n_keys = block.scores.shape[1]
+        combined = np.empty(n_keys, dtype=np.float64)
+        for start in range(0, n_keys, SUBMISSION_ENSEMBLE_BLOCK_ROWS):
+            end = min(start + SUBMISSION_ENSEMBLE_BLOCK_ROWS, n_keys)
+            prediction_vectors = [file_scores[start:end, None] for file_scores in block.scores]
+            ensembled = ensemble_predictions(
+                predictions_list=prediction_vectors,
+                method=ensemble_method,
+                **ensemble_kwargs_final
+            )
+            combined[start:end] = ensembled.ravel()
+        return combined, combined > 0
+
+    return combine
+
+
 def average_submissions(submission_files: List[str],
                        weights: Optional[List[float]] = None,
                        output_path: Optional[str] = None,
@@ -78,12 +145,14 @@ def average_submissions(submission_files: List[str],
                        **ensemble_kwargs) -> str:
     """
     Combine multiple submission files using various ensemble methods.
-    Memory-efficient streaming implementation for large files.
+    Inputs are aligned on (protein, term) by the in-memory k-way merge engine
+    (see submission_merge_engine) and ensembled in vectorized blocks.
     
     Args:
         submission_files: List of paths to submission files
         weights: Optional weights for weighted_average (must sum to 1.0)
-        output_path: Optional output path (default: temp_averaged_submission.tsv)
+        output_path: Optional output path (default: temp_averaged_submission.tsv);
+                     a COLUMNAR_SUBMISSION_SUFFIX path is written as a columnar submission
         ensemble_method: Ensemble method ('average', 'weighted_average', 'max', 
                        'geometric_mean', 'rank_average', 'power_average', 'percentile')
         **ensemble_kwargs: Additional method-specific parameters:
@@ -96,10 +165,7 @@ def average_submissions(submission_files: List[str],
     Raises:
         ValueError: If weights are invalid or files have incompatible format
     """
-    import tempfile
-    import heapq
-    from prediction.submission_merging import _sort_file_external, parse_submission_line
-    from prediction.prediction_utils import format_prediction_score, is_valid_score, validate_go_term_format, cleanup_temp_files
+    from prediction.submission_merge_engine import merge_submission_files
     
     if not submission_files:
         raise ValueError("submission_files cannot be empty")
@@ -111,172 +177,94 @@ def average_submissions(submission_files: List[str],
     setup_logging()
     logger.info(f"Ensembling {len(submission_files)} submission files using method: {ensemble_method}")
     
-    # Validate weights for weighted_average
-    if ensemble_method == 'weighted_average':
-        if weights is None:
-            # Default to equal weights
-            weights = [1.0 / len(submission_files)] * len(submission_files)
-            logger.info(f"Using equal weights: {weights}")
-        else:
-            if len(weights) != len(submission_files):
-                raise ValueError(
-                    f"Number of weights ({len(weights)}) must match number of submission files ({len(submission_files)})"
-                )
-            if not np.isclose(sum(weights), 1.0):
-                raise ValueError(f"Weights must sum to 1.0, got {sum(weights)}")
-            logger.info(f"Weights: {weights}")
-    
     # For 2 files, use merge (handled by workflow)
-    # For 3+ files, use sorted streaming with grouping
     if len(submission_files) == 2:
-        # Fallback to old method for 2 files (shouldn't happen, but handle it)
         logger.warning("2 files detected - consider using merge method instead")
     
-    # Sort all files externally
-    logger.info("Sorting submission files...")
-    sorted_files = []
-    temp_files = []
+    combine = make_ensemble_combiner(ensemble_method, len(submission_files), weights, **ensemble_kwargs)
     
-    try:
-        for i, filepath in enumerate(submission_files):
-            temp_sorted = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.tsv')
-            temp_sorted_path = temp_sorted.name
-            temp_sorted.close()
-            temp_files.append(temp_sorted_path)
-            
-            logger.info(f"   Sorting file {i+1}/{len(submission_files)}...")
-            _sort_file_external(filepath, temp_sorted_path)
-            sorted_files.append(temp_sorted_path)
-        
-        # Stream through all sorted files simultaneously and group by (protein_id, term)
-        logger.info("Streaming through sorted files and computing ensemble...")
-        
-        # Open all sorted files
-        file_handles = [open_text_file(f, 'r') for f in sorted_files]
-        file_iters = [iter(f) for f in file_handles]
-        
-        # Initialize heap with first line from each file
-        heap = []
-        for file_idx, file_iter in enumerate(file_iters):
-            try:
-                line = next(file_iter).strip()
-                if line:
-                    data = parse_submission_line(line)
-                    if data:
-                        protein_id, term, score = data
-                        heapq.heappush(heap, ((protein_id, term), file_idx, score, line))
-            except StopIteration:
-                pass
-        
-        # Group by (protein_id, term) and compute ensemble
-        from config.prediction import PREDICTION_PROGRESS_INTERVALS
-        current_key = None
-        current_scores_by_file = {}  # file_idx -> score
-        total_written = 0
-        
-        # Set output path
-        if output_path is None:
-            output_path = 'temp_averaged_submission.tsv'
-        output_path = Path(output_path)
-        
-        with open(output_path, 'w') as out_file:
-            while heap:
-                (protein_id, term), file_idx, score, line = heapq.heappop(heap)
-                key = (protein_id, term)
-                
-                if current_key is None:
-                    current_key = key
-                    current_scores_by_file = {}
-                
-                if key == current_key:
-                    # Same key - collect score (keep highest if duplicate from same file)
-                    if file_idx not in current_scores_by_file:
-                        current_scores_by_file[file_idx] = score
-                    else:
-                        # If same file has multiple entries for same key, keep max
-                        current_scores_by_file[file_idx] = max(current_scores_by_file[file_idx], score)
-                else:
-                    # New key - process previous group
-                    if current_scores_by_file:
-                        # Build prediction matrix for this group
-                        # Shape: (1, 1) since we're processing one (protein, term) at a time
-                        prediction_vectors = []
-                        for i in range(len(submission_files)):
-                            if i in current_scores_by_file:
-                                prediction_vectors.append(np.array([[current_scores_by_file[i]]], dtype=np.float32))
-                            else:
-                                prediction_vectors.append(np.array([[0.0]], dtype=np.float32))
-                        
-                        # Prepare kwargs for ensemble_predictions
-                        ensemble_kwargs_final = ensemble_kwargs.copy()
-                        if ensemble_method == 'weighted_average':
-                            ensemble_kwargs_final['weights'] = weights
-                        
-                        # Compute ensemble
-                        ensembled = ensemble_predictions(
-                            predictions_list=prediction_vectors,
-                            method=ensemble_method,
-                            **ensemble_kwargs_final
-                        )
-                        
-                        # Write if score > 0
-                        final_score = ensembled.flat[0]
-                        if final_score > 0:
-                            out_file.write(f"{current_key[0]}\t{current_key[1]}\t{format_prediction_score(final_score)}\n")
-                            total_written += 1
-                            if total_written % PREDICTION_PROGRESS_INTERVALS["predictions"] == 0:
-                                logger.info(f"      Processed {total_written:,} predictions...")
-                    
-                    # Start new group
-                    current_key = key
-                    current_scores_by_file = {file_idx: score}
-                
-                # Get next line from this file
-                try:
-                    next_line = next(file_iters[file_idx]).strip()
-                    if next_line:
-                        next_data = parse_submission_line(next_line)
-                        if next_data:
-                            next_protein_id, next_term, next_score = next_data
-                            heapq.heappush(heap, ((next_protein_id, next_term), file_idx, next_score, next_line))
-                except StopIteration:
-                    pass
-            
-            # Process last group
-            if current_scores_by_file:
-                prediction_vectors = []
-                for i in range(len(submission_files)):
-                    if i in current_scores_by_file:
-                        prediction_vectors.append(np.array([[current_scores_by_file[i]]], dtype=np.float32))
-                    else:
-                        prediction_vectors.append(np.array([[0.0]], dtype=np.float32))
-                
-                ensemble_kwargs_final = ensemble_kwargs.copy()
-                if ensemble_method == 'weighted_average':
-                    ensemble_kwargs_final['weights'] = weights
-                
-                ensembled = ensemble_predictions(
-                    predictions_list=prediction_vectors,
-                    method=ensemble_method,
-                    **ensemble_kwargs_final
-                )
-                
-                final_score = ensembled.flat[0]
-                if final_score > 0:
-                    out_file.write(f"{current_key[0]}\t{current_key[1]}\t{final_score:.3g}\n")
-                    total_written += 1
-        
-        # Close file handles
-        for f in file_handles:
-            f.close()
+    # Set output path
+    if output_path is None:
+        output_path = 'temp_averaged_submission.tsv'
+    output_path = Path(output_path)
+    
+    logger.info("Aligning submissions and computing ensemble...")
+    stats = merge_submission_files(submission_files, output_path, combine, log=logger.info)
+    logger.info(f"✓ Wrote {stats['rows_written']:,} ensembled predictions")
+    
+    return str(output_path)
+
+
+def average_submissions_multi(submission_files: List[str],
+                              method_specs: Dict[str, Dict]) -> Dict[str, Optional[str]]:
+    """
+    Write several ensemble methods from one aligned pass over the inputs.
+    Each block of aligned scores is read once and reduced by every method,
+    each into its own output, so input I/O and alignment are paid once.
+    
+    Args:
+        submission_files: List of paths to submission files
+        method_specs: Output name → {'output_path', 'ensemble_method',
+                      optional 'weights', optional 'ensemble_kwargs'}, or None for
+                      a method that already failed (its result is None)
         
-        logger.info(f"✓ Wrote {total_written:,} ensembled predictions")
+    Returns:
+        dict: Output name → path to its ensembled submission, or None if that method failed
         
-    finally:
-        # Clean up temp files
-        cleanup_temp_files([Path(f) for f in temp_files])
+    Raises:
+        ValueError: If submission_files is empty
+    """
+    from prediction.submission_merge_engine import fan_out_submission_files
     
-    return str(output_path)
+    if not submission_files:
+        raise ValueError("submission_files cannot be empty")
+    
+    if len(submission_files) == 1:
+        # Every method reduces to the input itself; each output gets its own copy
+        # so post-processing (which removes its input) can run once per method
+        print("   ⚠️  Only one submission file provided, copying as-is")
+        import shutil
+        source = Path(submission_files[0])
+        for spec in method_specs.values():
+            if spec is None:
+                continue
+            if source.is_dir():
+                shutil.copytree(source, spec['output_path'], dirs_exist_ok=True)
+            else:
+                shutil.copyfile(source, spec['output_path'])
+        return {name: str(spec['output_path']) if spec is not None else None
+                for name, spec in method_specs.items()}
+    
+    setup_logging()
+    logger.info(f"Ensembling {len(submission_files)} submission files using methods: "
+                f"{', '.join(spec['ensemble_method'] for spec in method_specs.values() if spec is not None)}")
+    
+    outputs = {}
+    results = {}
+    for name, spec in method_specs.items():
+        if spec is None:
+            results[name] = None
+            continue
+        try:
+            combine = make_ensemble_combiner(spec['ensemble_method'], len(submission_files),
+                                             spec.get('weights'), **spec.get('ensemble_kwargs', {}))
+        except ValueError as e:
+            logger.error(f"❌ {name}: {e}")
+            results[name] = None
+            continue
+        outputs[name] = (Path(spec['output_path']), combine)
+    
+    if outputs:
+        logger.info("Aligning submissions once and computing all ensembles...")
+        stats = fan_out_submission_files(submission_files, outputs, log=logger.info)
+        for name, (output_path, _) in outputs.items():
+            if stats[name]['error'] is None:
+                logger.info(f"✓ {name}: wrote {stats[name]['rows_written']:,} ensembled predictions")
+                results[name] = str(output_path)
+            else:
+                results[name] = None
+    
+    return {name: results[name] for name in method_specs}
 
 
 def validate_submission_format(filepath: str) -> Tuple[bool, List[str]]:
@@ -285,7 +273,7 @@ def validate_submission_format(filepath: str) -> Tuple[bool, List[str]]:
     Memory-efficient: only reads sample lines, doesn't load entire file.
     
     Args:
-        filepath: Path to submission file
+        filepath: Path to submission file or columnar submission directory
         
     Returns:
         tuple: (is_valid: bool, issues: List[str])
@@ -303,6 +291,18 @@ def validate_submission_format(filepath: str) -> Tuple[bool, List[str]]:
         line_count = 0
         valid_predictions = 0
         
+        if is_columnar_submission(filepath):
+            submission = ColumnarSubmission(filepath)
+            if len(submission) == 0:
+                issues.append("File contains no predictions")
+                return False, issues
+            for term in submission.terms[np.unique(submission.term_idx[:sample_size])]:
+                is_valid_term, term_error = validate_go_term_format(term)
+                if not is_valid_term:
+                    issues.append(f"Invalid GO term: {term_error}")
+                    return False, issues
+            return True, []
+        
         with open_text_file(filepath, 'r') as f:
             for line_num, line in enumerate(f, 1):
                 line = line.strip()
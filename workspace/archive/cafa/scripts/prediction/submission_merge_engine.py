@@ -0,0 +1,270 @@
+"""
+K-way submission merge engine for CAFA 6 protein function prediction.
+
+Aligns N submissions on their (protein, term) keys without sorting text files:
+each input is read as columnar arrays (TSV inputs are converted once), labels are
+mapped into global dictionaries ordered by string value, and every row gets an
+integer key protein_code * n_terms + term_code. Keys are sorted in memory one
+protein range at a time (sized to a row budget), producing aligned score vectors
+that ensemble methods can combine in vectorized blocks. Output order is
+(protein_id, term), the order of the former external sort + heap merge.
+"""
+
+import shutil
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from prediction.columnar_submission import (
+    ColumnarSubmission,
+    is_columnar_submission,
+    open_submission_writer,
+    remove_submission,
+    tsv_to_columnar
+)
+
+
+class AlignedScoreBlock(NamedTuple):
+    """
+    Scores of all inputs for a run of consecutive (protein, term) keys.
+
+    Attributes:
+        protein_idx: Index into SubmissionMergeEngine.proteins per key
+        term_idx: Index into SubmissionMergeEngine.terms per key
+        scores: float32 (n_inputs, n_keys); 0.0 where an input has no prediction
+        present: bool (n_inputs, n_keys); True where an input has a prediction
+    """
+    protein_idx: np.ndarray
+    term_idx: np.ndarray
+    scores: np.ndarray
+    present: np.ndarray
+
+
+def _map_labels(local_labels: np.ndarray, code: Dict[str, int]) -> np.ndarray:
+    return np.fromiter(map(code.__getitem__, local_labels), dtype=np.int64, count=len(local_labels))
+
+
+class SubmissionMergeEngine:
+    """
+    Align several submissions (TSV files or columnar directories) on (protein, term).
+
+    Duplicate keys within one input keep their maximum score, matching the previous
+    streaming merge. Use as a context manager so temporary conversions are removed.
+
+    Usage:
+        with SubmissionMergeEngine(paths) as engine:
+            for block in engine.iter_blocks():
+                combined = block.scores.max(axis=0)
+    """
+
+    def __init__(self,
+                 submission_paths: Sequence[Union[str, Path]],
+                 budget_rows: Optional[int] = None,
+                 work_dir: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            submission_paths: Input submissions
+            budget_rows: Max input rows aligned in memory at once
+                         (default: SUBMISSION_MERGE_BUDGET_ROWS)
+            work_dir: Directory for converted TSV inputs (default: a new temp directory)
+        """
+        from config.prediction import SUBMISSION_MERGE_BUDGET_ROWS
+
+        self.budget_rows = budget_rows or SUBMISSION_MERGE_BUDGET_ROWS
+        self._owns_work_dir = work_dir is None
+        self.work_dir = Path(tempfile.mkdtemp(prefix='submission_merge_')) if work_dir is None else Path(work_dir)
+        self._converted: List[Path] = []
+
+        try:
+            self.inputs = [self._open_input(i, path) for i, path in enumerate(submission_paths)]
+        except Exception:
+            self.close()
+            raise
+
+        self.proteins = np.array(sorted(set().union(*(sub.proteins.tolist() for sub in self.inputs))), dtype=object)
+        self.terms = np.array(sorted(set().union(*(sub.terms.tolist() for sub in self.inputs))), dtype=object)
+        protein_code = {label: i for i, label in enumerate(self.proteins.tolist())}
+        term_code = {label: i for i, label in enumerate(self.terms.tolist())}
+        self._protein_maps = [_map_labels(sub.proteins, protein_code) for sub in self.inputs]
+        self._term_maps = [_map_labels(sub.terms, term_code) for sub in self.inputs]
+        self.n_rows_in = sum(len(sub) for sub in self.inputs)
+
+    def __enter__(self) -> 'SubmissionMergeEngine':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _open_input(self, position: int, path: Union[str, Path]) -> ColumnarSubmission:
+        if is_columnar_submission(path):
+            return ColumnarSubmission(path)
+        from config.prediction import COLUMNAR_SUBMISSION_SUFFIX
+        converted = self.work_dir / f"merge_input_{position}{COLUMNAR_SUBMISSION_SUFFIX}"
+        self._converted.append(converted)
+        return ColumnarSubmission(tsv_to_columnar(path, converted))
+
+    def _protein_blocks(self) -> List[Tuple[int, int]]:
+        """Split the global protein range into consecutive blocks of at most budget_rows input rows."""
+        counts = np.zeros(len(self.proteins), dtype=np.int64)
+        for sub, protein_map in zip(self.inputs, self._protein_maps):
+            for protein_idx, _, _ in sub.iter_chunks():
+                counts += np.bincount(protein_map[protein_idx], minlength=len(counts))
+
+        cumulative = np.cumsum(counts)
+        blocks = []
+        start, consumed = 0, 0
+        while start < len(counts):
+            # A single protein larger than the budget still forms its own block
+            end = max(int(np.searchsorted(cumulative, consumed + self.budget_rows, side='right')), start + 1)
+            blocks.append((start, end))
+            consumed = int(cumulative[end - 1])
+            start = end
+        return blocks
+
+    def _input_keys(self, position: int, protein_range: Tuple[int, int], whole: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted unique keys of one input within a protein range, with the max score per key."""
+        sub = self.inputs[position]
+        protein_map, term_map = self._protein_maps[position], self._term_maps[position]
+        n_terms = len(self.terms)
+        keys, scores = [], []
+        for protein_idx, term_idx, score in sub.iter_chunks():
+            protein_codes = protein_map[protein_idx]
+            term_codes = term_map[term_idx]
+            if not whole:
+                in_range = (protein_codes >= protein_range[0]) & (protein_codes < protein_range[1])
+                protein_codes, term_codes, score = protein_codes[in_range], term_codes[in_range], score[in_range]
+            keys.append(protein_codes * n_terms + term_codes)
+            scores.append(score)
+        if not keys:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        keys = np.concatenate(keys)
+        scores = np.concatenate(scores)
+        if len(keys) == 0:
+            return keys, scores
+        order = np.argsort(keys, kind='stable')
+        keys, scores = keys[order], scores[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        return keys[starts], np.maximum.reduceat(scores, starts)
+
+    def iter_blocks(self) -> Iterator[AlignedScoreBlock]:
+        """Yield aligned score blocks in (protein_id, term) order."""
+        n_terms = len(self.terms)
+        protein_blocks = self._protein_blocks()
+        whole = len(protein_blocks) == 1
+        for protein_range in protein_blocks:
+            per_input = [self._input_keys(i, protein_range, whole) for i in range(len(self.inputs))]
+            keys = np.unique(np.concatenate([input_keys for input_keys, _ in per_input]))
+            if len(keys) == 0:
+                continue
+            scores = np.zeros((len(self.inputs), len(keys)), dtype=np.float32)
+            present = np.zeros((len(self.inputs), len(keys)), dtype=bool)
+            for i, (input_keys, input_scores) in enumerate(per_input):
+                positions = np.searchsorted(keys, input_keys)
+                scores[i, positions] = input_scores
+                present[i, positions] = True
+            yield AlignedScoreBlock(keys // n_terms, keys % n_terms, scores, present)
+
+    def close(self) -> None:
+        """Drop input views and remove temporary conversions."""
+        self.inputs = []
+        if self._owns_work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+        else:
+            for converted in self._converted:
+                shutil.rmtree(converted, ignore_errors=True)
+
+
+def merge_submission_files(submission_paths: Sequence[Union[str, Path]],
+                           output_path: Union[str, Path],
+                           combine: Callable[[AlignedScoreBlock], Tuple[np.ndarray, np.ndarray]],
+                           budget_rows: Optional[int] = None,
+                           log: Callable[[str], None] = print) -> Dict[str, float]:
+    """
+    Combine aligned submissions block by block and write the result.
+
+    Args:
+        submission_paths: Input submissions (TSV files or columnar directories)
+        output_path: Output submission; a COLUMNAR_SUBMISSION_SUFFIX path is written columnar
+        combine: Maps an AlignedScoreBlock to (scores per key, mask of keys to write)
+        budget_rows: Max input rows aligned in memory at once
+        log: Progress/report sink (print or logger.info)
+
+    Returns:
+        dict: rows_in, keys, rows_written, seconds, rows_per_sec
+    """
+    stats = fan_out_submission_files(submission_paths, {'merged': (output_path, combine)}, budget_rows,
+                                     log=log, raise_errors=True)
+    return stats['merged']
+
+
+def fan_out_submission_files(submission_paths: Sequence[Union[str, Path]],
+                             outputs: Dict[str, Tuple[Union[str, Path], Callable[[AlignedScoreBlock], Tuple[np.ndarray, np.ndarray]]]],
+                             budget_rows: Optional[int] = None,
+                             log: Callable[[str], None] = print,
+                             raise_errors: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    One alignment pass over the inputs feeding several combiners, each with its own writer.
+
+    Every aligned block is read (and TSV inputs converted) once and passed to each
+    combine function in turn, so reading and alignment cost scales with the number
+    of inputs, not inputs x outputs.
+
+    Args:
+        submission_paths: Input submissions (TSV files or columnar directories)
+        outputs: Name → (output path, combine function), see merge_submission_files
+        budget_rows: Max input rows aligned in memory at once
+        log: Progress/report sink (print or logger.info)
+        raise_errors: Re-raise a failing combine/write; otherwise that output is
+                      dropped (partial file removed) and the others continue
+
+    Returns:
+        dict: Name → rows_in, keys, rows_written, seconds (whole pass), rows_per_sec,
+              combine_seconds (this output's combine + write time), error (None or message)
+    """
+    start_time = time.time()
+    stats = {name: {'keys': 0, 'rows_written': 0, 'combine_seconds': 0.0, 'error': None} for name in outputs}
+    with SubmissionMergeEngine(submission_paths, budget_rows) as engine, ExitStack() as writers_stack:
+        writers = {name: writers_stack.enter_context(open_submission_writer(path))
+                   for name, (path, _) in outputs.items()}
+        n_rows_in = engine.n_rows_in
+        log(f"   Aligning {len(submission_paths)} submissions: {n_rows_in:,} rows, "
+            f"{len(engine.proteins):,} proteins, {len(engine.terms):,} terms"
+            + (f" → {len(outputs)} outputs" if len(outputs) > 1 else ""))
+        for block in engine.iter_blocks():
+            for name, (_, combine) in outputs.items():
+                if stats[name]['error'] is not None:
+                    continue
+                combine_start = time.perf_counter()
+                try:
+                    combined, keep = combine(block)
+                    stats[name]['rows_written'] += writers[name].write_predictions(
+                        engine.proteins, engine.terms, block.protein_idx[keep], block.term_idx[keep], combined[keep]
+                    )
+                except Exception as e:
+                    if raise_errors:
+                        raise
+                    stats[name]['error'] = f"{type(e).__name__}: {e}"
+                    log(f"   ❌ {name} failed, dropping its output: {stats[name]['error']}")
+                    continue
+                stats[name]['keys'] += len(combined)
+                stats[name]['combine_seconds'] += time.perf_counter() - combine_start
+
+    elapsed = time.time() - start_time
+    rows_per_sec = n_rows_in / elapsed if elapsed > 0 else float('inf')
+    for name, (path, _) in outputs.items():
+        stats[name].update({'rows_in': n_rows_in, 'seconds': elapsed, 'rows_per_sec': rows_per_sec})
+        if stats[name]['error'] is not None:
+            remove_submission(path)
+        elif len(outputs) > 1:
+            log(f"      {name}: wrote {stats[name]['rows_written']:,} rows "
+                f"(combine + write {stats[name]['combine_seconds']:.1f}s)")
+    n_keys = max((s['keys'] for s in stats.values()), default=0)
+    rows_written = sum(s['rows_written'] for s in stats.values())
+    log(f"   ✓ Merged {n_rows_in:,} rows into {n_keys:,} keys, wrote {rows_written:,} "
+        f"in {elapsed:.1f}s ({rows_per_sec:,.0f} rows/sec)")
+    return stats
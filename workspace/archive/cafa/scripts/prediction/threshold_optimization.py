@@ -1,12 +1,14 @@
 """
 Threshold optimization for CAFA 6 protein function prediction.
 Uses IA-weighted F1 score to find optimal prediction threshold on validation set.
+The whole threshold grid is evaluated in a single pass over the predictions, either
+as one global threshold or as one threshold per term.
 """
 
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 from sklearn.preprocessing import MultiLabelBinarizer
 
 
@@ -24,24 +26,18 @@ def load_ia_weights(ia_file_path: Path) -> Dict[str, float]:
         print(f"   ⚠️  Warning: IA file not found at {ia_file_path}, returning empty dict")
         return {}
     
-    ia_weights = {}
     try:
         df = pd.read_csv(ia_file_path, sep='\t', header=None, names=['go', 'ia'], dtype=str)
         
-        for _, row in df.iterrows():
-            go_id = row['go']
-            ia_str = row['ia']
-            
-            # Try to parse as float, handle comma decimal separator
-            try:
-                ia_weights[go_id] = float(ia_str)
-            except ValueError:
-                try:
-                    # Try replacing comma with dot
-                    ia_weights[go_id] = float(ia_str.replace(',', '.'))
-                except ValueError:
-                    # Default to 0.0 if parsing fails
-                    ia_weights[go_id] = 0.0
+        # Parse as float; retry unparseable values with comma decimal separator, else 0.0
+        ia_strings = df['ia'].str.strip()
+        ia_values = pd.to_numeric(ia_strings, errors='coerce')
+        unparsed = ia_values.isna() & ia_strings.notna()
+        if unparsed.any():
+            ia_values[unparsed] = pd.to_numeric(
+                ia_strings[unparsed].str.replace(',', '.', regex=False), errors='coerce'
+            ).fillna(0.0)
+        ia_weights = dict(zip(df['go'].tolist(), ia_values.astype(float).tolist()))
         
         print(f"   ✓ Loaded {len(ia_weights):,} IA weights")
     except Exception as e:
@@ -51,6 +47,11 @@ def load_ia_weights(ia_file_path: Path) -> Dict[str, float]:
     return ia_weights
 
 
+def ia_weight_vector(ia_weights: Dict[str, float], classes) -> np.ndarray:
+    """IA weight per class in classes order (1.0 for terms missing from ia_weights)."""
+    return np.array([ia_weights.get(c, 1.0) for c in classes], dtype=float)
+
+
 def compute_ia_weighted_f1(y_true: np.ndarray,
                           y_pred_binary: np.ndarray,
                           ia_weights: Dict[str, float],
@@ -81,8 +82,7 @@ def compute_ia_weighted_f1(y_true: np.ndarray,
     f1 = 2 * prec * rec / (prec + rec + eps)
     
     # Get weights for each class (term)
-    classes = mlb.classes_
-    weights = np.array([ia_weights.get(c, 1.0) for c in classes], dtype=float)
+    weights = ia_weight_vector(ia_weights, mlb.classes_)
     
     # Compute weighted averages
     weighted_f1 = (f1 * weights).sum() / (weights.sum() + eps)
@@ -92,17 +92,132 @@ def compute_ia_weighted_f1(y_true: np.ndarray,
     return weighted_prec, weighted_rec, weighted_f1
 
 
+def threshold_sweep_counts(y_val_proba: np.ndarray,
+                           y_val_true,
+                           thresholds: Sequence[float],
+                           row_chunk_size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-term TP and predicted-positive counts at every threshold in one pass.
+    
+    Each score is placed once into the sorted threshold grid (np.searchsorted) and
+    counted per (term, bin), for all samples and for the true positives; reverse
+    cumulative sums over the bins then give, for every threshold t, how many scores
+    per term are >= t. Cost is one read of y_val_proba regardless of grid size,
+    instead of one binarized matrix and three boolean passes per threshold.
+    
+    Args:
+        y_val_proba: Prediction probabilities, shape (n_samples, n_classes)
+        y_val_true: True binary labels, dense array or scipy.sparse matrix (n_samples, n_classes)
+        thresholds: Threshold values (any order; compared like y_val_proba >= t)
+        row_chunk_size: Rows binned at a time (default: ~16M elements per chunk)
+        
+    Returns:
+        tuple: (tp, predicted_positive) each (n_thresholds, n_classes) in thresholds order,
+               and positives (n_classes,)
+    """
+    import scipy.sparse as sp
+    
+    n_samples, n_classes = y_val_proba.shape
+    # Same precision as the comparison y_val_proba >= threshold (Python floats are cast to the array dtype)
+    grid_dtype = y_val_proba.dtype if np.issubdtype(y_val_proba.dtype, np.floating) else np.float64
+    grid = np.asarray(thresholds, dtype=grid_dtype)
+    order = np.argsort(grid, kind='stable')
+    sorted_grid = grid[order]
+    n_bins = len(grid) + 1
+    
+    if row_chunk_size is None:
+        row_chunk_size = max(1, (1 << 24) // max(n_classes, 1))
+    
+    is_sparse = sp.issparse(y_val_true)
+    if is_sparse:
+        y_val_true = sp.csr_matrix(y_val_true)
+    
+    all_counts = np.zeros(n_classes * n_bins, dtype=np.int64)
+    positive_counts = np.zeros(n_classes * n_bins, dtype=np.int64)
+    class_offsets = np.arange(n_classes, dtype=np.int64) * n_bins
+    
+    for start in range(0, n_samples, row_chunk_size):
+        end = min(start + row_chunk_size, n_samples)
+        proba_chunk = np.asarray(y_val_proba[start:end])
+        # bins = number of thresholds <= score, i.e. score >= sorted_grid[k] for every k < bins
+        bins = np.searchsorted(sorted_grid, proba_chunk, side='right')
+        all_counts += np.bincount((bins + class_offsets).ravel(), minlength=len(all_counts))
+        
+        if is_sparse:
+            true_chunk = y_val_true[start:end].tocoo()
+            is_positive = true_chunk.data == 1
+            rows, cols = true_chunk.row[is_positive], true_chunk.col[is_positive]
+        else:
+            rows, cols = np.nonzero(np.asarray(y_val_true[start:end]) == 1)
+        positive_counts += np.bincount(bins[rows, cols] + class_offsets[cols], minlength=len(positive_counts))
+    
+    all_counts = all_counts.reshape(n_classes, n_bins)
+    positive_counts = positive_counts.reshape(n_classes, n_bins)
+    positives = positive_counts.sum(axis=1)
+    
+    # Reverse cumulative sum over bins: at_least[:, b] = scores with bins >= b
+    at_least_all = np.cumsum(all_counts[:, ::-1], axis=1)[:, ::-1]
+    at_least_pos = np.cumsum(positive_counts[:, ::-1], axis=1)[:, ::-1]
+    
+    # Sorted threshold k is passed by scores with bins >= k + 1
+    tp = np.empty((len(grid), n_classes), dtype=np.int64)
+    predicted_positive = np.empty((len(grid), n_classes), dtype=np.int64)
+    tp[order] = at_least_pos[:, 1:].T
+    predicted_positive[order] = at_least_all[:, 1:].T
+    return tp, predicted_positive, positives
+
+
+def _per_term_scores(tp: np.ndarray,
+                     predicted_positive: np.ndarray,
+                     positives: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-term precision, recall and F1 from sweep counts (same formulas as compute_ia_weighted_f1)."""
+    from config.training import EPSILON_TINY
+    eps = EPSILON_TINY
+    
+    tp = tp.astype(float)
+    fp = predicted_positive - tp
+    fn = positives - tp
+    prec = tp / (tp + fp + eps)
+    rec = tp / (tp + fn + eps)
+    f1 = 2 * prec * rec / (prec + rec + eps)
+    return prec, rec, f1
+
+
+def sweep_ia_weighted_f1(y_val_proba: np.ndarray,
+                         y_val_true,
+                         ia_weights: Dict[str, float],
+                         mlb: MultiLabelBinarizer,
+                         thresholds: Sequence[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    IA-weighted precision, recall and F1 for every threshold in one pass.
+    
+    Returns:
+        tuple: (weighted_precision, weighted_recall, weighted_f1), each (n_thresholds,)
+               and equal to compute_ia_weighted_f1 at y_val_proba >= threshold
+    """
+    from config.training import EPSILON_TINY
+    eps = EPSILON_TINY
+    
+    prec, rec, f1 = _per_term_scores(*threshold_sweep_counts(y_val_proba, y_val_true, thresholds))
+    weights = ia_weight_vector(ia_weights, mlb.classes_)
+    weighted_f1 = (f1 * weights).sum(axis=1) / (weights.sum() + eps)
+    weighted_prec = (prec * weights).sum(axis=1) / (weights.sum() + eps)
+    weighted_rec = (rec * weights).sum(axis=1) / (weights.sum() + eps)
+    return weighted_prec, weighted_rec, weighted_f1
+
+
 def optimize_threshold(y_val_proba: np.ndarray,
-                      y_val_true: np.ndarray,
+                      y_val_true,
                       ia_weights: Dict[str, float],
                       mlb: MultiLabelBinarizer,
                       threshold_grid: List[float]) -> Tuple[float, float]:
     """
     Find optimal threshold by searching threshold grid and maximizing IA-weighted F1.
+    All grid values are scored in a single pass (see threshold_sweep_counts).
     
     Args:
         y_val_proba: Validation prediction probabilities, shape (n_samples, n_classes)
-        y_val_true: True binary labels, shape (n_samples, n_classes)
+        y_val_true: True binary labels, shape (n_samples, n_classes) (dense or scipy.sparse)
         ia_weights: Dictionary mapping GO term ID to IA weight
         mlb: MultiLabelBinarizer with classes_ attribute
         threshold_grid: List of threshold values to search (e.g., [0.01, 0.02, ..., 0.50])
@@ -116,13 +231,8 @@ def optimize_threshold(y_val_proba: np.ndarray,
     
     print(f"   Searching {len(threshold_grid)} threshold values...")
     
-    for threshold in threshold_grid:
-        # Binarize predictions at this threshold
-        y_pred_binary = (y_val_proba >= threshold).astype(int)
-        
-        # Compute IA-weighted F1
-        _, _, f1 = compute_ia_weighted_f1(y_val_true, y_pred_binary, ia_weights, mlb)
-        
+    _, _, f1_per_threshold = sweep_ia_weighted_f1(y_val_proba, y_val_true, ia_weights, mlb, threshold_grid)
+    for threshold, f1 in zip(threshold_grid, f1_per_threshold.tolist()):
         if f1 > best_f1:
             best_f1 = f1
             best_threshold = threshold
@@ -131,3 +241,50 @@ def optimize_threshold(y_val_proba: np.ndarray,
     
     return best_threshold, best_f1
 
+
+def optimize_per_term_thresholds(y_val_proba: np.ndarray,
+                                 y_val_true,
+                                 ia_weights: Dict[str, float],
+                                 mlb: MultiLabelBinarizer,
+                                 threshold_grid: List[float],
+                                 min_positives: int = 1) -> Tuple[np.ndarray, float]:
+    """
+    Choose one threshold per term from the grid, maximizing each term's F1.
+    
+    IA-weighted F1 is a weighted sum of per-term F1, so per-term maxima also maximize
+    it. Terms with fewer than min_positives validation positives keep the best global
+    threshold, since their F1 curve carries no signal.
+    
+    Args:
+        y_val_proba: Validation prediction probabilities, shape (n_samples, n_classes)
+        y_val_true: True binary labels (dense or scipy.sparse)
+        ia_weights: Dictionary mapping GO term ID to IA weight
+        mlb: MultiLabelBinarizer with classes_ attribute
+        threshold_grid: Threshold values to choose from
+        min_positives: Minimum positives for a term to get its own threshold
+        
+    Returns:
+        tuple: (thresholds per class in mlb.classes_ order, IA-weighted F1 with those thresholds)
+    """
+    from config.training import EPSILON_TINY
+    eps = EPSILON_TINY
+    
+    print(f"   Searching {len(threshold_grid)} threshold values per term...")
+    
+    tp, predicted_positive, positives = threshold_sweep_counts(y_val_proba, y_val_true, threshold_grid)
+    _, _, f1 = _per_term_scores(tp, predicted_positive, positives)
+    weights = ia_weight_vector(ia_weights, mlb.classes_)
+    grid = np.asarray(threshold_grid, dtype=float)
+    
+    # Global fallback: first grid value with the best weighted F1
+    global_best = int(np.argmax((f1 * weights).sum(axis=1)))
+    best_per_term = np.argmax(f1, axis=0)  # First maximum in grid order
+    best_per_term[positives < min_positives] = global_best
+    
+    thresholds = grid[best_per_term]
+    term_f1 = f1[best_per_term, np.arange(f1.shape[1])]
+    weighted_f1 = float((term_f1 * weights).sum() / (weights.sum() + eps))
+    
+    print(f"   ✓ Per-term thresholds: median {np.median(thresholds):.3f}, "
+          f"IA-weighted F1: {weighted_f1:.6f} (global best {grid[global_best]:.3f})")
+    return thresholds, weighted_f1
@@ -8,7 +8,6 @@ import pandas as pd
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 from Bio import SeqIO
-from sklearn.preprocessing import MultiLabelBinarizer
 from preprocessing.feature_engineering import extract_sequence_features, extract_handcrafted_parallel
 from config import PROGRESS_INDICATOR_INTERVAL
 
@@ -33,13 +32,18 @@ def load_training_data(data_dir: Path) -> Tuple[Dict[str, str], pd.DataFrame, pd
                                      names=['protein', 'taxon'])
         
         # Load training sequences
+        from preprocessing.data_streaming import open_train_sequence_store
         train_seqs = {}
         target_proteins = set(train_terms['protein'].unique())
+        store = open_train_sequence_store(data_dir)
         
-        for rec in SeqIO.parse(data_dir / 'train_sequences.fasta', 'fasta'):
-            pid = rec.id.split('|')[1] if '|' in rec.id else rec.id
-            if pid in target_proteins:
-                train_seqs[pid] = str(rec.seq)
+        if store is not None:
+            train_seqs = store.to_dict(store.dict_order_indices(list(target_proteins)))
+        else:
+            for rec in SeqIO.parse(data_dir / 'train_sequences.fasta', 'fasta'):
+                pid = rec.id.split('|')[1] if '|' in rec.id else rec.id
+                if pid in target_proteins:
+                    train_seqs[pid] = str(rec.seq)
         
         print(f"   ✓ Loaded {len(train_seqs):,} training sequences")
         return train_seqs, train_terms, train_taxonomy
@@ -121,7 +125,7 @@ def prepare_ontology_labels(train_terms, y_train_proteins, ont_codes: List[str],
     print(f"\n[5/9] Preparing labels for ontologies: {ont_codes}")
     
     from config import get_all_ontologies, get_ontology_name, DATA_INPUT_DIR
-    from collections import Counter
+    from preprocessing.label_cache import load_ontology_labels
     
     # Import training config values
     from config.training import PROPAGATE_TRAIN_LABELS, TOP_K_LABELS
@@ -136,14 +140,14 @@ def prepare_ontology_labels(train_terms, y_train_proteins, ont_codes: List[str],
     mlb_dict = {}
     y_train_dict = {}
     
-    # Load OBO file once if label propagation is enabled
-    parents_map = None
+    # Load GO closure index once if label propagation is enabled
+    closure_index = None
     if propagate_labels:
-        from utils.go_utils import parse_obo_file, propagate_labels_up
+        from utils.go_closure import load_go_closure_index
         obo_path = DATA_INPUT_DIR / 'Train' / 'go-basic.obo'
         if obo_path.exists():
             print("   Loading GO ontology for label propagation...")
-            parents_map, _ = parse_obo_file(obo_path)
+            closure_index = load_go_closure_index(obo_path)
         else:
             print(f"   ⚠️  Warning: OBO file not found at {obo_path}, skipping label propagation")
             propagate_labels = False
@@ -155,40 +159,13 @@ def prepare_ontology_labels(train_terms, y_train_proteins, ont_codes: List[str],
         ont_name = get_ontology_name(ont_code)
         print(f"   Processing {ont_name}...")
         
-        # Filter terms for this ontology
-        ont_terms = train_terms[train_terms['ontology'] == ont_code]
-        
-        # Create protein-to-terms mapping
-        protein_terms = ont_terms.groupby('protein')['term'].apply(list).to_dict()
-        
-        # Propagate labels up GO graph if enabled
-        if propagate_labels and parents_map:
-            print(f"      Propagating {ont_name} labels up GO graph...")
-            protein_terms = propagate_labels_up(protein_terms, parents_map)
-        
-        # Top-K label selection: select most frequent terms
-        if top_k_labels is not None and top_k_labels > 0:
-            # Count term frequencies
-            all_term_counts = Counter()
-            for terms in protein_terms.values():
-                all_term_counts.update(terms)
-            
-            # Select top-K most frequent terms
-            top_terms = set([term for term, _ in all_term_counts.most_common(top_k_labels)])
-            print(f"      Restricting to top-{top_k_labels} most frequent GO terms ({len(top_terms)} unique)")
-            
-            # Filter protein labels to only include selected terms
-            filtered_protein_terms = {}
-            for pid, terms in protein_terms.items():
-                filtered_protein_terms[pid] = [t for t in terms if t in top_terms]
-            protein_terms = filtered_protein_terms
-        
-        # Align with training order
-        labels_list = [protein_terms.get(pid, []) for pid in y_train_proteins]
-        
-        # Binarize labels - keep sparse to save memory
-        mlb = MultiLabelBinarizer(sparse_output=True)
-        y_ont = mlb.fit_transform(labels_list)
+        # Cached per (train_terms, OBO, ontology, propagate, top-K); built from integer codes on a miss
+        mlb, y_ont = load_ontology_labels(
+            train_terms, y_train_proteins, ont_code,
+            propagate_labels=propagate_labels and closure_index is not None,
+            top_k_labels=top_k_labels,
+            closure_index=closure_index
+        )
         
         mlb_dict[ont_code] = mlb
         y_train_dict[ont_code] = y_ont
@@ -10,8 +10,16 @@ from typing import Dict, List, Tuple, Generator, Optional
 from Bio import SeqIO
 from sklearn.preprocessing import MultiLabelBinarizer
 
-from config.paths import DATA_INPUT_DIR
 from config.features import BATCH_SIZE_CONFIG
+from preprocessing.sequence_store import SequenceStore, get_sequence_store, load_target_indices
+
+
+def open_train_sequence_store(data_dir: Path) -> Optional[SequenceStore]:
+    """Packed store for train_sequences.fasta (built on first use), or None when disabled."""
+    from config.features import SEQUENCE_STORE_ENABLED
+    if not SEQUENCE_STORE_ENABLED:
+        return None
+    return get_sequence_store(data_dir / 'train_sequences.fasta')
 
 
 def stream_sequences(data_dir: Path, chunk_size: Optional[int] = None) -> Generator[Dict[str, str], None, None]:
@@ -28,6 +36,18 @@ def stream_sequences(data_dir: Path, chunk_size: Optional[int] = None) -> Genera
     if chunk_size is None:
         chunk_size = BATCH_SIZE_CONFIG["data_loading"]["sequence_chunk_size"]
     
+    store = open_train_sequence_store(data_dir)
+    if store is not None:
+        # Packed store: target indices are cached, chunks decode only the sequences they yield
+        target_indices = load_target_indices(store, data_dir / 'train_terms.tsv')
+        print(f"   Streaming sequences in chunks of {chunk_size:,} (sequence store)...")
+        chunk_count = 0
+        for chunk_count, current_chunk in enumerate(store.iter_chunks(chunk_size, target_indices), 1):
+            print(f"      Yielding chunk {chunk_count} ({len(current_chunk):,} sequences)...")
+            yield current_chunk
+        print(f"   ✓ Streamed {chunk_count} chunks of sequences")
+        return
+    
     # Load training terms to get target proteins
     train_terms = pd.read_csv(data_dir / 'train_terms.tsv', sep='\t', 
                               names=['protein', 'term', 'ontology'])
@@ -103,7 +123,6 @@ def stream_labels(train_terms: pd.DataFrame,
     """
     from config import get_ontology_name
     from config.training import PROPAGATE_TRAIN_LABELS, TOP_K_LABELS
-    from collections import Counter
     
     # Use config defaults if not provided
     if propagate_labels is None:
@@ -114,43 +133,10 @@ def stream_labels(train_terms: pd.DataFrame,
     ont_name = get_ontology_name(ont_code)
     print(f"   Loading labels for {ont_name} ({ont_code})...")
     
-    # Filter terms for this ontology
-    ont_terms = train_terms[train_terms['ontology'] == ont_code]
-    
-    # Create protein-to-terms mapping
-    protein_terms = ont_terms.groupby('protein')['term'].apply(list).to_dict()
-    
-    # Propagate labels up GO graph if enabled
-    if propagate_labels:
-        from utils.go_utils import parse_obo_file, propagate_labels_up
-        obo_path = DATA_INPUT_DIR / 'Train' / 'go-basic.obo'
-        if obo_path.exists():
-            print(f"      Propagating {ont_name} labels up GO graph...")
-            parents_map, _ = parse_obo_file(obo_path)
-            protein_terms = propagate_labels_up(protein_terms, parents_map)
-        else:
-            print(f"      ⚠️  Warning: OBO file not found at {obo_path}, skipping label propagation")
-    
-    # Top-K label selection
-    if top_k_labels is not None and top_k_labels > 0:
-        all_term_counts = Counter()
-        for terms in protein_terms.values():
-            all_term_counts.update(terms)
-        
-        top_terms = set([term for term, _ in all_term_counts.most_common(top_k_labels)])
-        print(f"      Restricting to top-{top_k_labels} most frequent GO terms ({len(top_terms)} unique)")
-        
-        filtered_protein_terms = {}
-        for pid, terms in protein_terms.items():
-            filtered_protein_terms[pid] = [t for t in terms if t in top_terms]
-        protein_terms = filtered_protein_terms
-    
-    # Align with training order
-    labels_list = [protein_terms.get(pid, []) for pid in y_train_proteins]
-    
-    # Binarize labels - keep sparse to save memory
-    mlb = MultiLabelBinarizer(sparse_output=True)
-    y_ont = mlb.fit_transform(labels_list)
+    # Cached per (train_terms, OBO, ontology, propagate, top-K); built from integer codes on a miss
+    from preprocessing.label_cache import load_ontology_labels
+    mlb, y_ont = load_ontology_labels(train_terms, y_train_proteins, ont_code,
+                                      propagate_labels=propagate_labels, top_k_labels=top_k_labels)
     
     print(f"      {ont_name}: {y_ont.shape[1]} unique terms")
     
@@ -170,6 +156,12 @@ def get_all_sequences_dict(data_dir: Path) -> Dict[str, str]:
     """
     print("   Loading all sequences into memory (consider using stream_sequences() for large datasets)...")
     
+    store = open_train_sequence_store(data_dir)
+    if store is not None:
+        train_seqs = store.to_dict(load_target_indices(store, data_dir / 'train_terms.tsv'))
+        print(f"   ✓ Loaded {len(train_seqs):,} training sequences (sequence store)")
+        return train_seqs
+    
     train_terms = pd.read_csv(data_dir / 'train_terms.tsv', sep='\t', 
                               names=['protein', 'term', 'ontology'])
     target_proteins = set(train_terms['protein'].unique())
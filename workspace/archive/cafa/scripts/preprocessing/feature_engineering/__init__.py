@@ -4,9 +4,20 @@ Supports multiple feature extraction methods.
 """
 
 # Import handcrafted features as default
-from .handcrafted import extract_sequence_features, extract_handcrafted_parallel
+from .handcrafted import (
+    extract_sequence_features,
+    extract_sequence_features_batch,
+    extract_handcrafted_parallel,
+    encode_sequences
+)
 
 # Import embedding module (functions accessible via embeddings.*)
 from . import embeddings
 
-__all__ = ['extract_sequence_features', 'extract_handcrafted_parallel', 'embeddings']
+__all__ = [
+    'extract_sequence_features',
+    'extract_sequence_features_batch',
+    'extract_handcrafted_parallel',
+    'encode_sequences',
+    'embeddings'
+]
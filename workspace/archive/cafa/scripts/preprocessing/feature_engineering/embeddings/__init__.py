@@ -8,10 +8,18 @@ from .embeddings_v1 import (
     load_embedding_data,
     align_embeddings
 )
+from .embedding_store import (
+    EmbeddingStore,
+    get_embedding_store,
+    convert_embeddings
+)
 
 __all__ = [
     'load_embedding_data',
-    'align_embeddings'
+    'align_embeddings',
+    'EmbeddingStore',
+    'get_embedding_store',
+    'convert_embeddings'
 ]
 
 # Future versions can be imported explicitly:
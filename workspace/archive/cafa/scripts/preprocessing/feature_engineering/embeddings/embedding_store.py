@@ -0,0 +1,393 @@
+"""
+Memory-mapped embedding store for CAFA 6 protein function prediction.
+
+Each embedding source (.npy pair, T5 .qs or .rds) is converted once into:
+    embeddings.npy      - row-major float32 or float16 matrix (np.load mmap_mode='r'), source row order
+    ids.npy             - protein IDs as loaded from the source, source row order
+    keys.npy            - lookup keys (UniProt 'sp|ID|NAME' → ID) as byte strings, source row order
+    sorted_keys.npy     - keys sorted, with sorted_index.npy (row of each sorted key)
+    key_hashes.npy      - 64-bit FNV-1a key hashes sorted, with hash_index.npy (row of each hash)
+    store.json          - source files size/mtime, dtype, shape and counts (staleness check)
+
+Lookups hash the query IDs and binary-search the precomputed hash table (fixed-width
+uint64 compares), verify the hit against keys.npy and fall back to the sorted key table
+on a hash collision. Alignment to target IDs is a chunked gather that writes straight
+into a caller-provided (memmap) buffer, so no aligned copy of the source is materialized.
+
+EmbeddingStore.from_arrays() builds the same index in memory over any (embeddings, ids)
+pair, e.g. combined embeddings or structured features.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+STORE_FORMAT_VERSION = 1
+META_FILENAME = 'store.json'
+_FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+_FNV_PRIME = np.uint64(0x100000001b3)
+_CONVERT_ROWS = 16384
+
+
+def normalize_protein_id(protein_id: str) -> str:
+    """Lookup key of a protein ID (UniProt 'sp|Q8VY15|NAME' → 'Q8VY15')."""
+    if '|' in protein_id:
+        parts = protein_id.split('|')
+        if len(parts) >= 2:
+            return parts[1]
+    return protein_id
+
+
+def _as_str_array(ids: Sequence) -> np.ndarray:
+    ids = np.asarray(ids)
+    if ids.dtype.kind == 'S':
+        return np.char.decode(ids, 'utf-8')
+    return ids.astype(str)
+
+
+def _encode_keys(ids: Sequence, normalize: bool) -> np.ndarray:
+    """Fixed-width byte-string keys for IDs."""
+    ids = _as_str_array(ids)
+    if normalize and len(ids) and np.char.find(ids, '|').max() >= 0:
+        ids = np.array([normalize_protein_id(pid) for pid in ids.tolist()], dtype=str)
+    if len(ids) == 0:
+        return np.zeros(0, dtype='S1')
+    return np.char.encode(ids, 'utf-8')
+
+
+def hash_keys(keys: np.ndarray) -> np.ndarray:
+    """64-bit FNV-1a hash of each byte-string key (independent of the array's fixed width)."""
+    keys = np.ascontiguousarray(keys)
+    n = len(keys)
+    hashes = np.full(n, _FNV_OFFSET, dtype=np.uint64)
+    if n == 0:
+        return hashes
+    width = keys.dtype.itemsize
+    codes = keys.view(np.uint8).reshape(n, width)
+    lengths = np.char.str_len(keys)
+    for column in range(width):
+        mixed = (hashes ^ codes[:, column]) * _FNV_PRIME
+        hashes = np.where(column < lengths, mixed, hashes)
+    return hashes
+
+
+def _build_index(keys: np.ndarray) -> Dict[str, np.ndarray]:
+    """Sorted key table and sorted hash table (stable, so duplicates keep row order)."""
+    sorted_index = np.argsort(keys, kind='stable').astype(np.int64)
+    hashes = hash_keys(keys)
+    hash_index = np.argsort(hashes, kind='stable').astype(np.int64)
+    return {
+        'keys': keys,
+        'sorted_keys': keys[sorted_index],
+        'sorted_index': sorted_index,
+        'key_hashes': hashes[hash_index],
+        'hash_index': hash_index,
+    }
+
+
+class EmbeddingStore:
+    """Embedding matrix (memmap or array) with a vectorized ID index."""
+
+    def __init__(self,
+                 embeddings: np.ndarray,
+                 ids: np.ndarray,
+                 index: Dict[str, np.ndarray],
+                 meta: Optional[Dict] = None,
+                 store_dir: Optional[Path] = None):
+        self.embeddings = embeddings
+        self.ids = ids
+        self.meta = meta or {}
+        self.store_dir = store_dir
+        self._keys = index['keys']
+        self._sorted_keys = index['sorted_keys']
+        self._sorted_index = index['sorted_index']
+        self._key_hashes = index['key_hashes']
+        self._hash_index = index['hash_index']
+
+    @classmethod
+    def open(cls, store_dir: Union[str, Path]) -> 'EmbeddingStore':
+        """Map a converted store (read-only)."""
+        store_dir = Path(store_dir)
+        with open(store_dir / META_FILENAME, 'r') as f:
+            meta = json.load(f)
+        index = {name: np.load(store_dir / f'{name}.npy', mmap_mode='r')
+                 for name in ('keys', 'sorted_keys', 'sorted_index', 'key_hashes', 'hash_index')}
+        return cls(np.load(store_dir / 'embeddings.npy', mmap_mode='r'), np.load(store_dir / 'ids.npy'),
+                   index, meta, store_dir)
+
+    @classmethod
+    def from_arrays(cls, embeddings: np.ndarray, ids: Sequence, normalize: bool = True) -> 'EmbeddingStore':
+        """
+        In-memory index over an existing (embeddings, ids) pair; embeddings are not copied.
+
+        Args:
+            embeddings: (n_proteins, dim) array or memmap
+            ids: Protein ID per row
+            normalize: Key on the UniProt accession ('sp|ID|NAME' → ID) instead of the raw ID
+        """
+        return cls(embeddings, np.asarray(ids), _build_index(_encode_keys(ids, normalize)))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def dim(self) -> int:
+        return int(self.embeddings.shape[1]) if self.embeddings.ndim > 1 else 0
+
+    def indices_of(self, protein_ids: Sequence) -> np.ndarray:
+        """
+        Row per protein ID (-1 when absent); duplicate IDs resolve to their last row,
+        like a dict built over the source rows.
+        """
+        n_queries = len(protein_ids)
+        if n_queries == 0 or len(self) == 0:
+            return np.full(n_queries, -1, dtype=np.int64)
+        query = _encode_keys(protein_ids, normalize=False)
+        query_hashes = hash_keys(query)
+        last = len(self) - 1
+
+        positions = np.clip(np.searchsorted(self._key_hashes, query_hashes, side='right') - 1, 0, last)
+        rows = np.asarray(self._hash_index)[positions]
+        hash_hit = np.asarray(self._key_hashes)[positions] == query_hashes
+        found = hash_hit & (np.asarray(self._keys)[rows] == query)
+
+        collided = np.flatnonzero(hash_hit & ~found)
+        if len(collided):
+            # Another key shares the hash: resolve these through the sorted key table
+            sub_query = query[collided]
+            sub_positions = np.clip(np.searchsorted(self._sorted_keys, sub_query, side='right') - 1, 0, last)
+            sub_found = np.asarray(self._sorted_keys)[sub_positions] == sub_query
+            rows[collided] = np.asarray(self._sorted_index)[sub_positions]
+            found[collided] = sub_found
+        return np.where(found, rows, -1)
+
+    def gather_into(self,
+                    rows: np.ndarray,
+                    out: np.ndarray,
+                    col_offset: int = 0,
+                    chunk_rows: Optional[int] = None) -> np.ndarray:
+        """
+        Write embeddings of rows into out[:, col_offset:col_offset + dim], casting to out's dtype.
+
+        Rows are read chunk by chunk in ascending order (sequential memmap access);
+        rows of -1 (missing proteins) are zero-filled.
+
+        Args:
+            rows: Store row per output row (len(rows) == len(out))
+            out: Destination array or memmap (e.g. a slice of the fused feature memmap)
+            col_offset: First destination column
+            chunk_rows: Rows gathered per read (default: EMBEDDING_STORE_GATHER_ROWS)
+
+        Returns:
+            np.ndarray: out
+        """
+        if chunk_rows is None:
+            from config.features import EMBEDDING_STORE_GATHER_ROWS
+            chunk_rows = EMBEDDING_STORE_GATHER_ROWS
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) != len(out):
+            raise ValueError(f"rows ({len(rows)}) and out ({len(out)}) lengths differ")
+        col_end = col_offset + self.dim
+        for start in range(0, len(rows), chunk_rows):
+            end = min(start + chunk_rows, len(rows))
+            chunk = rows[start:end]
+            dest = out[start:end, col_offset:col_end]
+            present = chunk >= 0
+            if not present.all():
+                dest[~present] = 0
+            order = np.flatnonzero(present)
+            order = order[np.argsort(chunk[order], kind='stable')]
+            dest[order] = self.embeddings[chunk[order]]
+        return out
+
+    def align(self, target_ids: Sequence, dtype: Optional[np.dtype] = None) -> Tuple[np.ndarray, List]:
+        """
+        Embeddings of target_ids that are present, in target order.
+
+        Returns:
+            (aligned_embeddings, aligned_ids); aligned_embeddings is a new array of dtype
+            (default: the store dtype)
+        """
+        rows = self.indices_of(target_ids)
+        present = np.flatnonzero(rows >= 0)
+        aligned = np.empty((len(present), self.dim), dtype=dtype or self.embeddings.dtype)
+        self.gather_into(rows[present], aligned)
+        return aligned, [target_ids[i] for i in present]
+
+
+def build_embedding_store(embeddings: np.ndarray,
+                          ids: Sequence,
+                          store_dir: Union[str, Path],
+                          dtype: Union[str, np.dtype] = 'float32',
+                          meta: Optional[Dict] = None) -> Path:
+    """
+    Convert an (embeddings, ids) pair into a store directory.
+
+    Rows are copied in chunks (memmapped sources are never fully loaded) and cast to dtype.
+    Written to a temporary directory and renamed into place, so readers never see a partial store.
+
+    Args:
+        embeddings: (n_proteins, dim) source array or memmap
+        ids: Protein ID per row
+        store_dir: Destination directory (replaced if it exists)
+        dtype: 'float32' or 'float16'
+        meta: Extra metadata for store.json (e.g. source file signatures)
+
+    Returns:
+        Path: store_dir
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float16):
+        raise ValueError(f"Embedding store dtype must be float32 or float16, got {dtype}")
+    if len(ids) != len(embeddings):
+        raise ValueError(f"{len(ids)} IDs for {len(embeddings)} embedding rows")
+    store_dir = Path(store_dir)
+    store_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = store_dir.parent / f".tmp_{store_dir.name}_{uuid.uuid4().hex[:8]}"
+    tmp_dir.mkdir()
+
+    shape = (len(embeddings), int(embeddings.shape[1]) if embeddings.ndim > 1 else 0)
+    try:
+        out = np.lib.format.open_memmap(tmp_dir / 'embeddings.npy', mode='w+', dtype=dtype, shape=shape)
+        for start in range(0, shape[0], _CONVERT_ROWS):
+            end = min(start + _CONVERT_ROWS, shape[0])
+            out[start:end] = embeddings[start:end]
+        out.flush()
+        del out
+
+        str_ids = _as_str_array(ids)
+        np.save(tmp_dir / 'ids.npy', str_ids)
+        index = _build_index(_encode_keys(str_ids, normalize=True))
+        for name, array in index.items():
+            np.save(tmp_dir / f'{name}.npy', array)
+        with open(tmp_dir / META_FILENAME, 'w') as f:
+            json.dump({**(meta or {}), 'format_version': STORE_FORMAT_VERSION, 'dtype': dtype.name,
+                       'source_dtype': np.dtype(embeddings.dtype).name, 'shape': list(shape),
+                       'n_unique_ids': int(len(np.unique(index['keys'])))}, f, indent=2)
+
+        if store_dir.exists():
+            shutil.rmtree(store_dir, ignore_errors=True)
+        os.replace(tmp_dir, store_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    size_mb = shape[0] * shape[1] * dtype.itemsize / (1024 * 1024)
+    print(f"   ✓ Embedding store: {shape[0]:,} × {shape[1]} {dtype.name} ({size_mb:.1f}MB) → {store_dir}")
+    return store_dir
+
+
+def _source_signature(source_files: Sequence[Path]) -> List[Dict[str, Union[str, int, float]]]:
+    return [{'path': str(Path(p).resolve()), 'size': Path(p).stat().st_size, 'mtime': Path(p).stat().st_mtime}
+            for p in source_files]
+
+
+def embedding_store_dir(embedding_type: str,
+                        datatype: str,
+                        source_files: Sequence[Path],
+                        dtype: str,
+                        root: Optional[Union[str, Path]] = None) -> Path:
+    """Store directory for one embedding source (one store per source files and dtype)."""
+    if root is None:
+        from config.paths import EMBEDDING_STORE_DIR
+        root = EMBEDDING_STORE_DIR
+    path_hash = hashlib.sha1('|'.join(str(Path(p).resolve()) for p in source_files).encode()).hexdigest()[:12]
+    return Path(root) / f"{embedding_type}_{datatype}_{dtype}_{path_hash}"
+
+
+def get_embedding_store(embedding_type: str,
+                        datatype: str = 'train',
+                        base_path: Optional[Path] = None,
+                        root: Optional[Union[str, Path]] = None,
+                        dtype: Optional[str] = None,
+                        build: bool = True) -> Optional[EmbeddingStore]:
+    """
+    Open the store for an embedding type, converting the source when missing or stale.
+
+    Args:
+        embedding_type: Embedding type as accepted by load_embedding_data
+        datatype: 'train' or 'test'
+        base_path: Optional source directory override
+        root: Store root (default: EMBEDDING_STORE_DIR)
+        dtype: Stored dtype, 'float32' or 'float16' (default: EMBEDDING_STORE_DTYPE)
+        build: Convert the source when no current store exists
+
+    Returns:
+        EmbeddingStore, or None when the source files do not exist (or no current store and build is False)
+    """
+    from preprocessing.feature_engineering.embeddings.embeddings_v1 import (
+        load_embedding_data, resolve_embedding_source
+    )
+
+    if dtype is None:
+        from config.features import EMBEDDING_STORE_DTYPE
+        dtype = EMBEDDING_STORE_DTYPE
+    embedding_type, source_format, source_files, _, _ = resolve_embedding_source(embedding_type, datatype, base_path)
+    if not all(Path(p).exists() for p in source_files):
+        return None
+
+    store_dir = embedding_store_dir(embedding_type, datatype, source_files, dtype, root)
+    meta_path = store_dir / META_FILENAME
+    if meta_path.exists():
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        if meta.get('format_version') == STORE_FORMAT_VERSION and meta.get('sources') == _source_signature(source_files):
+            return EmbeddingStore.open(store_dir)
+        print(f"   ⚠️  Embedding store for {embedding_type} {datatype} is stale (source changed), rebuilding...")
+    if not build:
+        return None
+
+    print(f"   📦 Converting {embedding_type} {datatype} embeddings ({source_format}) to embedding store...")
+    embeds, ids = load_embedding_data(embedding_type, datatype, use_memmap=True, base_path=base_path, use_store=False)
+    build_embedding_store(embeds, ids, store_dir, dtype, meta={
+        'embedding_type': embedding_type, 'datatype': datatype, 'source_format': source_format,
+        'sources': _source_signature(source_files),
+    })
+    del embeds
+    return EmbeddingStore.open(store_dir)
+
+
+def open_embedding_source(embedding_type: str,
+                          datatype: str = 'train',
+                          base_path: Optional[Path] = None) -> EmbeddingStore:
+    """
+    Indexed embeddings for an embedding type: the converted store when EMBEDDING_STORE_ENABLED,
+    otherwise an in-memory index over the memory-mapped source.
+    """
+    from config.features import EMBEDDING_STORE_ENABLED
+
+    if EMBEDDING_STORE_ENABLED:
+        store = get_embedding_store(embedding_type, datatype, base_path)
+        if store is not None:
+            return store
+    from preprocessing.feature_engineering.embeddings.embeddings_v1 import load_embedding_data
+    embeds, ids = load_embedding_data(embedding_type, datatype, use_memmap=True, base_path=base_path, use_store=False)
+    return EmbeddingStore.from_arrays(embeds, ids)
+
+
+def convert_embeddings(embedding_types: Optional[Sequence[str]] = None,
+                       datatypes: Sequence[str] = ('train', 'test'),
+                       dtype: Optional[str] = None) -> Dict[Tuple[str, str], Optional[Path]]:
+    """
+    Convert embedding sources ahead of training (default: every type in EMBEDDING_PATHS).
+
+    Returns:
+        dict: (embedding_type, datatype) → store directory, None where the source is missing
+    """
+    from config.features import is_valid_embedding_type
+
+    if embedding_types is None:
+        from config.paths import EMBEDDING_PATHS
+        embedding_types = [t for t in EMBEDDING_PATHS if is_valid_embedding_type(t)]
+    converted = {}
+    for embedding_type in embedding_types:
+        for datatype in datatypes:
+            store = get_embedding_store(embedding_type, datatype, dtype=dtype)
+            converted[(embedding_type, datatype)] = store.store_dir if store is not None else None
+    return converted
@@ -227,30 +227,25 @@ def check_embedding_structure(embedding_type: str,
     return result
 
 
-def load_embedding_data(embedding_type: str, 
-                       datatype: str = 'train',
-                       use_memmap: bool = None,
-                       base_path: Optional[Path] = None) -> tuple:
+def resolve_embedding_source(embedding_type: str,
+                             datatype: str = 'train',
+                             base_path: Optional[Path] = None) -> tuple:
     """
-    Load embeddings from numpy files using config paths.
-    Supports both full array loading and memory-mapped loading.
-    Converts to float32 to save memory (50% reduction vs float64).
-    
-    Special handling for T5 embeddings which are stored as .rds files (R data format).
-    Supports new consolidated embedding structure with shared ID files.
+    Locate the source files of an embedding type without loading them.
     
     Args:
-        embedding_type: Embedding type (e.g., 'protbert', 'esm2', 'esm2_15b', 'ankh_large', etc.)
+        embedding_type: Embedding type (legacy 'esm2' is mapped to 'esm2_650m')
         datatype: 'train' or 'test'
-        use_memmap: If True, load as memmap; if False, load full array; if None, use config default
         base_path: Optional base path override
         
     Returns:
-        (embeddings_array_or_memmap, ids_array) - embeddings as np.ndarray or np.memmap, ids as array
+        (embedding_type, source_format, source_files, checked_paths, base_path)
+        - source_format: 'qs', 'rds' or 'npy'
+        - source_files: [qs_path], [rds_path] or [ids_path, embeddings_path] (npy files may not exist)
+        - checked_paths: (structure_type, ids_path, embeddings_path) candidates, for error messages
     """
     from config.paths import EMBEDDING_PATHS, CAFA6_EMBEDDINGS_DIR
     from config.features import is_valid_embedding_type
-    from config.training import USE_MEMORY_MAPPED_EMBEDDINGS
     
     # Convert legacy 'esm2' to 'esm2_650m' BEFORE validation
     # This ensures we always use the new structure paths
@@ -267,21 +262,17 @@ def load_embedding_data(embedding_type: str,
             raise ValueError(f"Embedding type '{embedding_type}' not found in EMBEDDING_PATHS")
         base_path = EMBEDDING_PATHS[embedding_type]
     
-    # Use config default if not specified
-    if use_memmap is None:
-        use_memmap = USE_MEMORY_MAPPED_EMBEDDINGS
-    
     # Special handling for T5 embeddings (stored as .qs or .rds files)
     if embedding_type in ['t5', 'prot_t5_xl']:
         # Try .qs files first (more reliable, compressed format)
         qs_path = base_path / f'T5_{datatype}_features.qs'
         if qs_path.exists():
-            return _load_t5_qs(qs_path, datatype, use_memmap)
+            return embedding_type, 'qs', [qs_path], [], base_path
         
         # Fallback to .rds files
         rds_path = base_path / f'CAFA5_{datatype}_t5embeds.rds'
         if rds_path.exists():
-            return _load_t5_rds(rds_path, datatype, use_memmap)
+            return embedding_type, 'rds', [rds_path], [], base_path
     
     # Check for new consolidated embedding structure (shared ID files)
     # New structure: train.npy/test.npy + shared train_sequences_ids.npy/testsuperset_ids.npy
@@ -336,6 +327,65 @@ def load_embedding_data(embedding_type: str,
         embeddings_path = base_path / f'{datatype}_embeddings.npy'
         checked_paths.append(("legacy", ids_path, embeddings_path))
     
+    return embedding_type, 'npy', [ids_path, embeddings_path], checked_paths, base_path
+
+
+def load_embedding_data(embedding_type: str, 
+                       datatype: str = 'train',
+                       use_memmap: bool = None,
+                       base_path: Optional[Path] = None,
+                       use_store: Optional[bool] = None) -> tuple:
+    """
+    Load embeddings from numpy files using config paths.
+    Supports both full array loading and memory-mapped loading.
+    Converts to float32 to save memory (50% reduction vs float64).
+    
+    Special handling for T5 embeddings which are stored as .rds files (R data format).
+    Supports new consolidated embedding structure with shared ID files.
+    
+    Memory-mapped loads are served from the embedding store (converted once from any of
+    the source formats, see embedding_store.py) when EMBEDDING_STORE_ENABLED.
+    
+    Args:
+        embedding_type: Embedding type (e.g., 'protbert', 'esm2', 'esm2_15b', 'ankh_large', etc.)
+        datatype: 'train' or 'test'
+        use_memmap: If True, load as memmap; if False, load full array; if None, use config default
+        base_path: Optional base path override
+        use_store: Load through the embedding store; if None, EMBEDDING_STORE_ENABLED and use_memmap
+        
+    Returns:
+        (embeddings_array_or_memmap, ids_array) - embeddings as np.ndarray or np.memmap, ids as array
+    """
+    from config.paths import CAFA6_EMBEDDINGS_DIR
+    from config.training import USE_MEMORY_MAPPED_EMBEDDINGS
+    
+    embedding_type, source_format, source_files, checked_paths, base_path = resolve_embedding_source(
+        embedding_type, datatype, base_path
+    )
+    
+    # Use config default if not specified
+    if use_memmap is None:
+        use_memmap = USE_MEMORY_MAPPED_EMBEDDINGS
+    
+    if use_store is None:
+        from config.features import EMBEDDING_STORE_ENABLED
+        use_store = EMBEDDING_STORE_ENABLED and use_memmap
+    if use_store:
+        from .embedding_store import get_embedding_store
+        store = get_embedding_store(embedding_type, datatype, base_path)
+        if store is not None:
+            print(f"   Loaded {embedding_type} {datatype} from embedding store: {store.embeddings.shape} "
+                  f"(dtype: {store.embeddings.dtype})")
+            return store.embeddings, store.ids
+    
+    if source_format == 'qs':
+        return _load_t5_qs(source_files[0], datatype, use_memmap)
+    if source_format == 'rds':
+        return _load_t5_rds(source_files[0], datatype, use_memmap)
+    ids_path, embeddings_path = source_files
+    new_structure_embeddings = ['esm2_15b', 'esm2_3b', 'esm2_650m', 'esm1b_650m', 
+                                'ankh_large', 'ankh3_large', 'protbert', 'prot_t5_xl']
+    
     try:
         # Load IDs (small, can load into memory)
         if not ids_path.exists():
@@ -657,28 +707,23 @@ def align_embeddings(embeds: np.ndarray, embed_ids: List[str], target_ids: List[
         - aligned_embeddings: numpy array in target order
         - aligned_ids: list of IDs that were successfully aligned
     """
-    # Create lookup dictionary
-    id_to_idx = {str(pid): i for i, pid in enumerate(embed_ids)}
-    
-    # Pre-allocate indices for faster alignment (avoids list appends)
-    aligned_indices = []
-    aligned_ids = []
-    missing_ids = []
-    
-    for pid in target_ids:
-        pid_str = str(pid)
-        if pid_str in id_to_idx:
-            aligned_indices.append(id_to_idx[pid_str])
-            aligned_ids.append(pid)
-        else:
-            missing_ids.append(pid)
-    
-    if missing_ids:
-        print(f"   [WARNING] {len(missing_ids)} proteins not found in embeddings (will be skipped)")
-    
-    # Use advanced indexing to create aligned array (more memory efficient)
-    if aligned_indices:
-        aligned_array = embeds[aligned_indices].copy()  # Copy to ensure contiguous memory
+    from .embedding_store import EmbeddingStore
+    
+    # Vectorized hash lookup (exact IDs) and a chunked gather into one preallocated array
+    index = EmbeddingStore.from_arrays(embeds, embed_ids, normalize=False)
+    rows = index.indices_of(target_ids)
+    present = np.flatnonzero(rows >= 0)
+    aligned_ids = [target_ids[i] for i in present]
+    
+    n_missing = len(target_ids) - len(present)
+    if n_missing:
+        print(f"   [WARNING] {n_missing} proteins not found in embeddings (will be skipped)")
+    
+    if len(present) and embeds.ndim == 2:
+        aligned_array = np.empty((len(present), embeds.shape[1]), dtype=embeds.dtype)
+        index.gather_into(rows[present], aligned_array)
+    elif len(present):
+        aligned_array = np.asarray(embeds[rows[present]])
     else:
         aligned_array = np.array([])
     
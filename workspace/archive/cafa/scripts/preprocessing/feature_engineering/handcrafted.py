@@ -8,6 +8,7 @@ from collections import Counter
 from typing import Dict, List, Tuple
 import warnings
 import os
+import sys
 from concurrent.futures import ThreadPoolExecutor
 warnings.filterwarnings('ignore')
 
@@ -38,6 +39,21 @@ AA_GROUPS = {
     'small': set('ACDGNPSTV')
 }
 
+# Residue alphabet used for integer encoding (code 20 = any other character)
+AMINO_ACIDS = 'ACDEFGHIKLMNPQRSTVWY'
+UNKNOWN_RESIDUE_CODE = len(AMINO_ACIDS)
+N_RESIDUE_CODES = len(AMINO_ACIDS) + 1
+
+# Fixed k-mer vocabularies of extract_sequence_features (order defines columns)
+TOP_DIPEPTIDES = ['AL', 'LA', 'LE', 'EA', 'AA', 'AS', 'SA', 'EL', 'LL', 'AE',
+                  'SE', 'ES', 'GA', 'AG', 'VA', 'AV', 'LV', 'VL', 'LS', 'SL']
+TOP_TRIPEPTIDES = ['ALA', 'LEA', 'EAL', 'LAL', 'AAA', 'LLE', 'ELE',
+                   'ALE', 'GAL', 'ASA']
+
+# Width of extract_sequence_features output for non-empty sequences
+# (nominally 90; the CTD block yields 17 values, so the realised width is 86)
+HANDCRAFTED_FEATURE_DIM = 86
+
 
 def calculate_physicochemical_properties(seq: str) -> np.ndarray:
     """
@@ -164,15 +180,11 @@ def extract_sequence_features(seq):
     
     # 5. Di-peptide features (top 20 most common)
     dipeptides = extract_kmer_features(seq, k=2)
-    top_dipeptides = ['AL', 'LA', 'LE', 'EA', 'AA', 'AS', 'SA', 'EL', 'LL', 'AE',
-                      'SE', 'ES', 'GA', 'AG', 'VA', 'AV', 'LV', 'VL', 'LS', 'SL']
-    dipeptide_freq = np.array([dipeptides.get(dp, 0) for dp in top_dipeptides])
+    dipeptide_freq = np.array([dipeptides.get(dp, 0) for dp in TOP_DIPEPTIDES])
     
     # 6. Tri-peptide features (top 10 most common)
     tripeptides = extract_kmer_features(seq, k=3)
-    top_tripeptides = ['ALA', 'LEA', 'EAL', 'LAL', 'AAA', 'LLE', 'ELE', 
-                       'ALE', 'GAL', 'ASA']
-    tripeptide_freq = np.array([tripeptides.get(tp, 0) for tp in top_tripeptides])
+    tripeptide_freq = np.array([tripeptides.get(tp, 0) for tp in TOP_TRIPEPTIDES])
     
     # 7. Sequence position features (6 features)
     n_term = seq[:30] if len(seq) > 30 else seq
@@ -208,26 +220,442 @@ def extract_sequence_features(seq):
     return features
 
 
+def _build_residue_lookup() -> np.ndarray:
+    """Byte -> residue code table (standard amino acids 0-19, anything else 20)."""
+    lookup = np.full(256, UNKNOWN_RESIDUE_CODE, dtype=np.uint8)
+    for code, aa in enumerate(AMINO_ACIDS):
+        lookup[ord(aa)] = code
+    return lookup
+
+
+def _residue_mask(residues) -> np.ndarray:
+    """Boolean membership mask over residue codes for a set of amino acids."""
+    mask = np.zeros(N_RESIDUE_CODES, dtype=bool)
+    for aa in residues:
+        mask[AMINO_ACIDS.index(aa)] = True
+    return mask
+
+
+def _kmer_column_lookup(kmers: List[str]) -> np.ndarray:
+    """Map encoded k-mer (base-21 integer) -> output column, -1 if not tracked."""
+    k = len(kmers[0])
+    lookup = np.full(N_RESIDUE_CODES ** k, -1, dtype=np.int64)
+    for col, kmer in enumerate(kmers):
+        code = 0
+        for aa in kmer:
+            code = code * N_RESIDUE_CODES + AMINO_ACIDS.index(aa)
+        lookup[code] = col
+    return lookup
+
+
+_RESIDUE_LOOKUP = _build_residue_lookup()
+_AA_WEIGHT_VECTOR = np.array([AA_WEIGHTS[aa] for aa in AMINO_ACIDS])
+_HYDROPATHY_VECTOR = np.array([HYDROPATHY_VALUES[aa] for aa in AMINO_ACIDS])
+_HYDROPHOBIC_MASK = _residue_mask('AILMFWYV')
+_CHARGED_MASK = _residue_mask('DEKRH')
+_POLAR_MASK = _residue_mask('STNQ')
+_AROMATIC_MASK = _residue_mask('FWY')
+_POSITIVE_MASK = _residue_mask('RKH')
+_NEGATIVE_MASK = _residue_mask('DE')
+_CTD_GROUP_MASKS = [_residue_mask(sorted(group)) for group in AA_GROUPS.values()]
+_DIPEPTIDE_COLUMNS = _kmer_column_lookup(TOP_DIPEPTIDES)
+_TRIPEPTIDE_COLUMNS = _kmer_column_lookup(TOP_TRIPEPTIDES)
+
+
+def encode_sequences(sequences: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack sequences into a single uint8 residue-code array with offsets.
+    
+    Args:
+        sequences: List of amino acid sequence strings (ASCII)
+        
+    Returns:
+        tuple: (residues, offsets)
+            - residues: uint8 array of residue codes (0-19 = AMINO_ACIDS, 20 = other)
+            - offsets: int64 array of length n+1; sequence i is residues[offsets[i]:offsets[i+1]]
+            
+    Raises:
+        UnicodeEncodeError: If a sequence contains non-ASCII characters
+    """
+    lengths = np.fromiter((len(seq) for seq in sequences), dtype=np.int64, count=len(sequences))
+    offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    raw = np.frombuffer(''.join(sequences).encode('ascii'), dtype=np.uint8)
+    return _RESIDUE_LOOKUP[raw], offsets
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, valid: np.ndarray = None) -> np.ndarray:
+    """Elementwise numerator / denominator, 0.0 where not valid."""
+    if valid is None:
+        valid = denominator > 0
+    out = np.zeros(np.broadcast(numerator, denominator).shape, dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=valid)
+    return out
+
+
+def _sum_in_order(terms: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """
+    Row-wise sum of terms taken in the given column order, mirroring builtin sum().
+    
+    Python >= 3.12 sums floats with Neumaier compensation, so the same algorithm is
+    applied there to stay bit-identical with the per-sequence path.
+    """
+    ordered = np.take_along_axis(terms, order, axis=1)
+    total = ordered[:, 0].copy()
+    if sys.version_info < (3, 12):
+        for j in range(1, ordered.shape[1]):
+            total += ordered[:, j]
+        return total
+    
+    compensation = np.zeros_like(total)
+    for j in range(1, ordered.shape[1]):
+        x = ordered[:, j]
+        t = total + x
+        compensation += np.where(np.abs(total) >= np.abs(x), (total - t) + x, (x - t) + total)
+        total = t
+    apply = (compensation != 0) & np.isfinite(compensation)
+    total[apply] += compensation[apply]
+    return total
+
+
+def _prefix_counts(member: np.ndarray) -> np.ndarray:
+    """Prefix sums of a per-residue boolean (length total+1) so window counts are prefix[hi] - prefix[lo]."""
+    prefix = np.zeros(len(member) + 1, dtype=np.int64)
+    np.cumsum(member, out=prefix[1:])
+    return prefix
+
+
+def _extract_features_encoded(residues: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Compute the handcrafted features for non-empty encoded sequences.
+    Column order and arithmetic mirror extract_sequence_features exactly.
+    """
+    n = len(offsets) - 1
+    starts = offsets[:-1]
+    ends = offsets[1:]
+    lengths = ends - starts
+    total = len(residues)
+    seq_index = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    
+    # Residue counts per sequence (n, 21)
+    counts = np.bincount(seq_index * N_RESIDUE_CODES + residues,
+                         minlength=n * N_RESIDUE_CODES).reshape(n, N_RESIDUE_CODES)
+    
+    def group_count(mask):
+        return counts[:, mask].sum(axis=1)
+    
+    # 1. Amino acid composition (20)
+    aa_freq = counts[:, :UNKNOWN_RESIDUE_CODE] / lengths[:, None]
+    
+    # 2. Basic properties (5)
+    hydrophobic = group_count(_HYDROPHOBIC_MASK) / lengths
+    charged = group_count(_CHARGED_MASK) / lengths
+    polar = group_count(_POLAR_MASK) / lengths
+    aromatic = group_count(_AROMATIC_MASK) / lengths
+    
+    # 3. Physicochemical properties (8) - Counter sums run in first-appearance order
+    standard = residues < UNKNOWN_RESIDUE_CODE
+    keys = seq_index[standard] * UNKNOWN_RESIDUE_CODE + residues[standard]
+    unique_keys, first_index = np.unique(keys, return_index=True)
+    first_seen = np.full(n * UNKNOWN_RESIDUE_CODE, np.iinfo(np.int64).max, dtype=np.int64)
+    first_seen[unique_keys] = first_index
+    order = np.argsort(first_seen.reshape(n, UNKNOWN_RESIDUE_CODE), axis=1, kind='stable')
+    
+    aa_counts = counts[:, :UNKNOWN_RESIDUE_CODE]
+    mol_weight = _sum_in_order(aa_counts * _AA_WEIGHT_VECTOR, order)
+    gravy = _sum_in_order(aa_counts * _HYDROPATHY_VECTOR, order) / lengths
+    code = {aa: i for i, aa in enumerate(AMINO_ACIDS)}
+    aliphatic = (counts[:, code['A']] + 2.9 * counts[:, code['V']] +
+                 3.9 * (counts[:, code['I']] + counts[:, code['L']])) / lengths
+    instability = group_count(_CHARGED_MASK) / lengths * 100
+    positive = group_count(_POSITIVE_MASK) / lengths
+    negative = group_count(_NEGATIVE_MASK) / lengths
+    
+    # 4. CTD features (21)
+    pair_valid = np.ones(max(total - 1, 0), dtype=bool)
+    boundaries = ends[:-1]
+    boundaries = boundaries[(boundaries > 0) & (boundaries < total)]
+    pair_valid[boundaries - 1] = False
+    
+    ctd_columns = [group_count(mask) / lengths for mask in _CTD_GROUP_MASKS]
+    for mask in _CTD_GROUP_MASKS[:3]:
+        member = mask[residues]
+        changes = _prefix_counts((member[1:] != member[:-1]) & pair_valid)
+        transitions = changes[ends - 1] - changes[starts]
+        ctd_columns.append(_ratio(transitions, lengths - 1, lengths > 1))
+    for mask in _CTD_GROUP_MASKS[:2]:
+        positions = np.flatnonzero(mask[residues])
+        local = positions - starts[seq_index[positions]]
+        group_counts = group_count(mask)
+        group_starts = np.cumsum(group_counts) - group_counts
+        present = group_counts > 0
+        for pick in (group_starts, group_starts + group_counts // 2, group_starts + group_counts - 1):
+            values = np.zeros(n, dtype=np.int64)
+            values[present] = local[pick[present]]
+            ctd_columns.append(values / lengths)
+    
+    # 5-6. Di-/tri-peptide frequencies of the tracked k-mers (20 + 10)
+    codes = residues.astype(np.int64)
+    pair_codes = codes[:-1] * N_RESIDUE_CODES + codes[1:]
+    pair_cols = _DIPEPTIDE_COLUMNS[pair_codes]
+    keep = (pair_cols >= 0) & pair_valid
+    dipeptide_counts = np.bincount(seq_index[:-1][keep] * len(TOP_DIPEPTIDES) + pair_cols[keep],
+                                   minlength=n * len(TOP_DIPEPTIDES)).reshape(n, -1)
+    dipeptide_freq = _ratio(dipeptide_counts, (lengths - 1)[:, None], (lengths >= 2)[:, None])
+    
+    triple_valid = pair_valid[:-1] & pair_valid[1:]
+    triple_codes = pair_codes[:-1] * N_RESIDUE_CODES + codes[2:]
+    triple_cols = _TRIPEPTIDE_COLUMNS[triple_codes]
+    keep = (triple_cols >= 0) & triple_valid
+    tripeptide_counts = np.bincount(seq_index[:-2][keep] * len(TOP_TRIPEPTIDES) + triple_cols[keep],
+                                    minlength=n * len(TOP_TRIPEPTIDES)).reshape(n, -1)
+    tripeptide_freq = _ratio(tripeptide_counts, (lengths - 2)[:, None], (lengths >= 3)[:, None])
+    
+    # 7. Terminal window features (6)
+    window = np.minimum(lengths, 30)
+    hydrophobic_prefix = _prefix_counts(_HYDROPHOBIC_MASK[residues])
+    charged_prefix = _prefix_counts(_CHARGED_MASK[residues])
+    
+    def window_count(prefix, lo, hi):
+        return prefix[hi] - prefix[lo]
+    
+    has_mid = lengths > 60
+    mid_lo = np.where(has_mid, starts + 30, starts)
+    mid_hi = np.where(has_mid, ends - 30, starts)
+    mid_hydrophobic = np.where(has_mid,
+                               _ratio(window_count(hydrophobic_prefix, mid_lo, mid_hi), lengths - 60, has_mid),
+                               hydrophobic)
+    mid_charged = np.where(has_mid,
+                           _ratio(window_count(charged_prefix, mid_lo, mid_hi), lengths - 60, has_mid),
+                           charged)
+    
+    return np.column_stack([
+        aa_freq,                                                              # 20
+        np.log1p(lengths), hydrophobic, charged, polar, aromatic,             # 5
+        np.log1p(mol_weight), aliphatic, instability, positive,              # 8
+        negative, positive - negative, gravy, aromatic,
+        np.column_stack(ctd_columns),                                         # 17
+        dipeptide_freq,                                                       # 20
+        tripeptide_freq,                                                      # 10
+        window_count(hydrophobic_prefix, starts, starts + window) / window,   # 6
+        window_count(charged_prefix, starts, starts + window) / window,
+        window_count(hydrophobic_prefix, ends - window, ends) / window,
+        window_count(charged_prefix, ends - window, ends) / window,
+        mid_hydrophobic,
+        mid_charged
+    ])
+
+
+def extract_sequence_features_batch(sequences: List[str]) -> np.ndarray:
+    """
+    Vectorized batch version of extract_sequence_features.
+    Encodes the batch into one packed residue array and computes every feature group
+    with NumPy over sequence offsets. Output is bit-identical to stacking
+    extract_sequence_features(seq) for each sequence; empty sequences give an
+    all-zero row of the same width.
+    
+    Args:
+        sequences: List of amino acid sequence strings
+        
+    Returns:
+        np.ndarray: Feature matrix (n_sequences, HANDCRAFTED_FEATURE_DIM) as float64
+    """
+    features = np.zeros((len(sequences), HANDCRAFTED_FEATURE_DIM))
+    nonempty = [i for i, seq in enumerate(sequences) if seq]
+    if not nonempty:
+        return features
+    
+    batch = [sequences[i] for i in nonempty]
+    try:
+        residues, offsets = encode_sequences(batch)
+    except UnicodeEncodeError:
+        # Non-ASCII residues: per-character semantics need the scalar path
+        features[nonempty] = [extract_sequence_features(seq) for seq in batch]
+        return features
+    
+    features[nonempty] = _extract_features_encoded(residues, offsets)
+    return features
+
+
+# Per-process views onto the shared buffers of the process-pool engine
+_SHARD_STATE = {}
+
+
+def _init_shard_worker(residues_name: str, offsets_name: str, output_name: str,
+                       n_bytes: int, n_proteins: int, batch_size: int) -> None:
+    """Process-pool initializer: attach shared sequence/output buffers once per worker."""
+    from multiprocessing import shared_memory
+    
+    residues_shm = shared_memory.SharedMemory(name=residues_name)
+    offsets_shm = shared_memory.SharedMemory(name=offsets_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    _SHARD_STATE.update({
+        'shm': (residues_shm, offsets_shm, output_shm),
+        'residues': np.ndarray((n_bytes,), dtype=np.uint8, buffer=residues_shm.buf),
+        'offsets': np.ndarray((n_proteins + 1,), dtype=np.int64, buffer=offsets_shm.buf),
+        'output': np.ndarray((n_proteins, HANDCRAFTED_FEATURE_DIM), dtype=np.float32, buffer=output_shm.buf),
+        'batch_size': batch_size
+    })
+
+
+def _extract_shard(shard_index: int, start: int, end: int) -> Dict:
+    """Extract features for rows [start, end) and write them into the shared output matrix."""
+    import time
+    
+    shard_start = time.perf_counter()
+    residues = _SHARD_STATE['residues']
+    offsets = _SHARD_STATE['offsets']
+    output = _SHARD_STATE['output']
+    batch_size = _SHARD_STATE['batch_size']
+    
+    for batch_start in range(start, end, batch_size):
+        batch_end = min(batch_start + batch_size, end)
+        lo = offsets[batch_start]
+        block = residues[lo:offsets[batch_end]].tobytes()
+        sequences = [
+            block[offsets[i] - lo:offsets[i + 1] - lo].decode('utf-8')
+            for i in range(batch_start, batch_end)
+        ]
+        output[batch_start:batch_end] = extract_sequence_features_batch(sequences)
+    
+    return {
+        'shard': shard_index,
+        'start': start,
+        'end': end,
+        'seconds': time.perf_counter() - shard_start,
+        'pid': os.getpid()
+    }
+
+
+def _extract_handcrafted_processes(train_seqs: Dict[str, str],
+                                   protein_ids: List[str],
+                                   max_workers: int,
+                                   batch_size: int,
+                                   shard_size: int) -> np.ndarray:
+    """
+    Process-pool handcrafted extraction with shared-memory input and output.
+    
+    Sequences are packed once into a shared byte buffer with offsets, so tasks only
+    carry (shard, start, end); each worker writes its row range straight into a
+    shared float32 output matrix. Per-shard timings are printed on completion.
+    """
+    import time
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from multiprocessing import shared_memory
+    
+    n_proteins = len(protein_ids)
+    encoded = [train_seqs[pid].encode('utf-8') if train_seqs[pid] else b'' for pid in protein_ids]
+    offsets = np.zeros(n_proteins + 1, dtype=np.int64)
+    np.cumsum([len(seq) for seq in encoded], out=offsets[1:])
+    n_bytes = int(offsets[-1])
+    
+    # SharedMemory rejects zero-sized segments
+    residues_shm = shared_memory.SharedMemory(create=True, size=max(n_bytes, 1))
+    offsets_shm = shared_memory.SharedMemory(create=True, size=offsets.nbytes)
+    output_shm = shared_memory.SharedMemory(
+        create=True, size=max(n_proteins * HANDCRAFTED_FEATURE_DIM * 4, 1)
+    )
+    
+    try:
+        np.ndarray((n_bytes,), dtype=np.uint8, buffer=residues_shm.buf)[:] = np.frombuffer(
+            b''.join(encoded), dtype=np.uint8
+        )
+        del encoded
+        np.ndarray(offsets.shape, dtype=np.int64, buffer=offsets_shm.buf)[:] = offsets
+        
+        shards = [
+            (shard_index, start, min(start + shard_size, n_proteins))
+            for shard_index, start in enumerate(range(0, n_proteins, shard_size))
+        ]
+        print(f"   Extracting handcrafted features in {len(shards)} shards "
+              f"({shard_size:,} proteins/shard, {max_workers} processes)...")
+        
+        wall_start = time.perf_counter()
+        timings = []
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_shard_worker,
+            initargs=(residues_shm.name, offsets_shm.name, output_shm.name,
+                      n_bytes, n_proteins, batch_size)
+        ) as executor:
+            futures = [executor.submit(_extract_shard, *shard) for shard in shards]
+            for future in as_completed(futures):
+                timings.append(future.result())
+        wall_seconds = time.perf_counter() - wall_start
+        
+        for timing in sorted(timings, key=lambda t: t['shard']):
+            n_rows = timing['end'] - timing['start']
+            rate = n_rows / timing['seconds'] if timing['seconds'] > 0 else float('inf')
+            print(f"      Shard {timing['shard'] + 1}/{len(shards)}: rows {timing['start']:,}-{timing['end']:,} "
+                  f"in {timing['seconds']:.2f}s ({rate:,.0f} proteins/s, pid {timing['pid']})")
+        print(f"   ✓ {n_proteins:,} proteins in {wall_seconds:.2f}s "
+              f"({n_proteins / max(wall_seconds, 1e-9):,.0f} proteins/s)")
+        
+        return np.ndarray(
+            (n_proteins, HANDCRAFTED_FEATURE_DIM), dtype=np.float32, buffer=output_shm.buf
+        ).copy()
+    finally:
+        for shm in (residues_shm, offsets_shm, output_shm):
+            shm.close()
+            shm.unlink()
+
+
 def extract_handcrafted_parallel(train_seqs: Dict[str, str], 
                                  protein_ids: List[str],
-                                 max_workers: int = None) -> np.ndarray:
+                                 max_workers: int = None,
+                                 engine: str = None,
+                                 batch_size: int = None,
+                                 shard_size: int = None) -> np.ndarray:
     """
-    Extract handcrafted features for multiple proteins in parallel.
-    Consolidates the ThreadPoolExecutor pattern used across preprocessing modules.
+    Extract handcrafted features for multiple proteins.
+    Consolidates the feature extraction pattern used across preprocessing modules.
+    
+    Engines (BATCH_SIZE_CONFIG["feature_extraction"]["engine"] or --feature-engine):
+    - 'batch': vectorized NumPy engine over packed residue arrays (default)
+    - 'threads': per-sequence extraction on a ThreadPoolExecutor (legacy path)
+    - 'processes': batch engine sharded by row range over a process pool,
+      writing into a shared-memory output matrix
     
     Args:
         train_seqs: Dict mapping protein_id -> sequence
         protein_ids: List of protein IDs to extract features for
-        max_workers: Maximum number of worker threads (defaults to config)
+        max_workers: Maximum number of worker threads/processes (defaults to config)
+        engine: 'batch', 'threads' or 'processes' (defaults to config)
+        batch_size: Sequences per vectorized call (defaults to config)
+        shard_size: Proteins per process-pool shard (defaults to config)
         
     Returns:
         np.ndarray: Feature matrix (n_samples, n_features) as float32
     """
     from config.training import FEATURE_EXTRACTION_MAX_WORKERS
+    from config.features import BATCH_SIZE_CONFIG
     
+    extraction_config = BATCH_SIZE_CONFIG["feature_extraction"]
+    if engine is None:
+        engine = extraction_config["engine"]
+    if batch_size is None:
+        batch_size = extraction_config["batch_size"]
     if max_workers is None:
         max_workers = min(FEATURE_EXTRACTION_MAX_WORKERS, os.cpu_count() or 1)
     
+    if engine == 'processes':
+        if shard_size is None:
+            shard_size = extraction_config["shard_size"]
+        return _extract_handcrafted_processes(train_seqs, protein_ids, max_workers, batch_size, shard_size)
+    
+    if engine == 'batch':
+        features = np.empty((len(protein_ids), HANDCRAFTED_FEATURE_DIM), dtype=np.float32)
+        for start in range(0, len(protein_ids), batch_size):
+            batch_ids = protein_ids[start:start + batch_size]
+            features[start:start + len(batch_ids)] = extract_sequence_features_batch(
+                [train_seqs[pid] for pid in batch_ids]
+            )
+        return features
+    elif engine != 'threads':
+        raise ValueError(
+            f"Unknown handcrafted feature engine: {engine}. Available: ['batch', 'threads', 'processes']"
+        )
+    
     def extract_features_for_protein(pid):
         return extract_sequence_features(train_seqs[pid])
     
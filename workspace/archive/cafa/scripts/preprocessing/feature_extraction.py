@@ -12,7 +12,6 @@ from config.features import (
     parse_model_feature_config,
     get_embedding_feature_types,
     HANDCRAFTED_FEATURE_KEY,
-    INDIVIDUAL_FEATURES,
     BATCH_SIZE_CONFIG,
     FEATURE_EXTRACTION_MEMORY_THRESHOLD_MB
 )
@@ -22,9 +21,11 @@ from preprocessing.feature_engineering.embeddings import align_embeddings
 from preprocessing.feature_streaming import extract_features_batch
 from utils.memory_efficient import should_use_memmap, estimate_memory_usage, save_features_memmap_with_metadata
 from utils.utils_common import cleanup_memory
+from utils.profiling import profiled
 from config.paths import DATA_OUTPUT_DIR
 
 
+@profiled('extract_features', rows=lambda result: len(result[1]))
 def extract_features(sequences: Dict[str, str],
                     config: Dict,
                     protein_ids: Optional[List[str]] = None,
@@ -69,7 +70,52 @@ def extract_features(sequences: Dict[str, str],
     if not target_ids:
         raise ValueError("No sequences to extract features from")
     
-    # Route to appropriate extraction method
+    # Consult the persistent feature store before any extraction work
+    from config.features import FEATURE_STORE_ENABLED
+    if FEATURE_STORE_ENABLED:
+        from preprocessing.feature_store import get_feature_store, sequences_fingerprint, feature_store_key
+        store = get_feature_store()
+        store_key, key_components = feature_store_key(
+            sequences_fingerprint(sequences, target_ids), feature_type, features, datatype
+        )
+        cached = store.get(store_key)
+        if cached is not None:
+            return _load_stored_features(cached[0], force_memmap), cached[1]
+        
+        features_result, aligned_ids = _extract_by_type(
+            sequences, feature_type, features, datatype, target_ids, force_memmap, chunk_size
+        )
+        try:
+            store.put(store_key, key_components, features_result, aligned_ids)
+        except (OSError, ValueError) as e:
+            # A full or read-only disk must not fail extraction
+            print(f"   ⚠️  Could not save features to feature store: {e}")
+        return features_result, aligned_ids
+    
+    return _extract_by_type(sequences, feature_type, features, datatype, target_ids, force_memmap, chunk_size)
+
+
+def _load_stored_features(features_path: Path, force_memmap: Optional[bool]) -> Union[np.ndarray, Path]:
+    """
+    Return a feature store entry the way a fresh extraction would: the memmap-able
+    path for large matrices (or force_memmap=True), otherwise an in-memory array.
+    """
+    stored = np.load(features_path, mmap_mode='r')
+    size_mb = stored.size * 4 / (1024 * 1024)
+    use_path = force_memmap if force_memmap is not None else size_mb >= FEATURE_EXTRACTION_MEMORY_THRESHOLD_MB
+    if use_path:
+        return features_path
+    return np.array(stored)
+
+
+def _extract_by_type(sequences: Dict[str, str],
+                     feature_type: str,
+                     features: Optional[List[str]],
+                     datatype: str,
+                     target_ids: List[str],
+                     force_memmap: Optional[bool],
+                     chunk_size: Optional[int]) -> Tuple[Union[np.ndarray, Path], List[str]]:
+    """Route to the extraction method for a parsed feature configuration."""
     if feature_type == 'fused_embeddings' and features:
         # Fused embeddings: always use chunked extraction (memory-efficient)
         return _extract_fused_features(
@@ -109,9 +155,14 @@ def _extract_fused_features(sequences: Dict[str, str],
                            chunk_size: Optional[int]) -> Tuple[Union[np.ndarray, Path], List[str]]:
     """
     Extract fused features using chunked extraction (memory-efficient).
-    Always uses chunked extraction to avoid loading full embedding arrays.
-    Writes chunks directly to memmap file to avoid accumulating all chunks in memory.
+    Embeddings are gathered chunk by chunk from indexed (memory-mapped) sources straight
+    into their column block of the output, which is a memmap file for large datasets;
+    full embedding arrays and aligned copies are never built.
+    Column blocks follow FUSED_FEATURE_LAYOUT (see config/features.py).
     """
+    from config.features import FUSED_FEATURE_LAYOUT
+    from preprocessing.feature_engineering.embeddings.embedding_store import EmbeddingStore, open_embedding_source
+    
     if chunk_size is None:
         chunk_size = BATCH_SIZE_CONFIG["data_loading"]["embedding_chunk_size"]
     
@@ -127,8 +178,9 @@ def _extract_fused_features(sequences: Dict[str, str],
     
     # Separate structured features (taxonomy, ppi, top_terms)
     structured_feature_types = ['taxonomy', 'taxonomy_highlevel', 'taxonomy_top500', 'ppi', 'top_terms']
-    structured_features = [f for f in features if f in structured_feature_types]
     
+    # Indexed embedding sources; the combined matrix stands in for the embedding features
+    embedding_sources: Dict[str, EmbeddingStore] = {}
     if embedding_only_features:
         from preprocessing.feature_engineering.embeddings.embeddings_v1 import load_combined_embeddings
         combined_result = load_combined_embeddings(
@@ -139,114 +191,62 @@ def _extract_fused_features(sequences: Dict[str, str],
         
         if combined_result is not None:
             print(f"   ✓ Using preprocessed combined embeddings: {embedding_only_features}")
-            combined_embeds, combined_ids = combined_result
-            
-            # If only embeddings (no handcrafted), return combined directly
-            if HANDCRAFTED_FEATURE_KEY not in features:
-                # Align to target_ids
-                from preprocessing.feature_engineering.embeddings.embeddings_v1 import align_embeddings
-                aligned_embeds, aligned_ids = align_embeddings(combined_embeds, combined_ids, target_ids)
-                
-                if force_memmap:
-                    # Save as memmap if requested
-                    memmap_dir = DATA_OUTPUT_DIR / 'memmap_cache'
-                    memmap_dir.mkdir(parents=True, exist_ok=True)
-                    memmap_path = memmap_dir / f'combined_embeddings_{datatype}_{len(aligned_ids)}.npy'
-                    memmap = np.memmap(memmap_path, dtype=np.float32, mode='w+', shape=aligned_embeds.shape)
-                    memmap[:] = aligned_embeds
-                    return memmap_path, aligned_ids
-                else:
-                    return aligned_embeds, aligned_ids
-            else:
-                # Has handcrafted features - will need to combine with HC later
-                # Store combined embeddings for later use
-                embedding_data = {'combined': (combined_embeds, combined_ids)}
-                id_sets = [set(str(pid) for pid in combined_ids)]
-                print(f"   ✓ Using preprocessed combined embeddings, will add handcrafted features")
+            embedding_sources['combined'] = EmbeddingStore.from_arrays(*combined_result)
         else:
             # Fall back to individual loading
             print(f"   Combined embeddings not found, loading individual embeddings...")
-            embedding_data = {}
-            id_sets = []
-            
             for feat in embedding_only_features:
                 print(f"   Loading embedding: {feat} (memory-mapped)...")
-                embeds_memmap, ids = load_embeddings_memmap(feat, datatype)
-                embedding_data[feat] = (embeds_memmap, ids)
-                # Normalize IDs: extract accession from full UniProt format (sp|Q8VY15|NAME → Q8VY15)
-                normalized_ids = []
-                for pid in ids:
-                    pid_str = str(pid)
-                    if '|' in pid_str:
-                        # Format: sp|Q8VY15|RBM25_ARATH → extract Q8VY15
-                        parts = pid_str.split('|')
-                        if len(parts) >= 2:
-                            normalized_ids.append(parts[1])
-                        else:
-                            normalized_ids.append(pid_str)
-                    else:
-                        normalized_ids.append(pid_str)
-                id_set = set(normalized_ids)
-                id_sets.append(id_set)
-                print(f"      Loaded {len(id_set):,} protein IDs (sample: {list(id_set)[:3] if len(id_set) > 0 else []})")
-    else:
-        # No embeddings, only handcrafted
-        embedding_data = {}
-        id_sets = []
+                embedding_sources[feat] = open_embedding_source(feat, datatype)
+                print(f"      Indexed {len(embedding_sources[feat]):,} protein IDs")
     
-    # Step 1: Find common protein IDs using set intersection (NO dense arrays)
-    # This replaces align_embeddings() which was creating ~3GB of dense arrays
-    if id_sets:
-        # First, find intersection of embedding IDs only (for diagnostics)
-        embedding_intersection = set.intersection(*id_sets) if len(id_sets) > 1 else id_sets[0]
-        print(f"   Intersection of {len(id_sets)} embedding types: {len(embedding_intersection):,} proteins")
-        
-        # Include target_ids in intersection to ensure we only keep proteins that exist in both
-        # embeddings AND sequences
-        target_id_set = set(str(pid) for pid in target_ids)
-        print(f"   Sequence IDs: {len(target_id_set):,} proteins (sample: {list(target_id_set)[:3] if len(target_id_set) > 0 else []})")
-        
-        all_id_sets = id_sets + [target_id_set]
-        common_id_set = set.intersection(*all_id_sets)
-        # Convert back to list maintaining order from target_ids
-        common_ids = [pid for pid in target_ids if str(pid) in common_id_set]
-        print(f"   Found {len(common_ids):,} common proteins across {len(id_sets)} embedding types and sequences")
+    # Step 1: Find common protein IDs with one vectorized index lookup per source (no dense arrays)
+    source_rows = {name: source.indices_of(target_ids) for name, source in embedding_sources.items()}
+    if source_rows:
+        present = np.logical_and.reduce([rows >= 0 for rows in source_rows.values()])
+        common_positions = np.flatnonzero(present)
+        common_ids = [target_ids[i] for i in common_positions]
+        for name, rows in source_rows.items():
+            print(f"      {name}: {int((rows >= 0).sum()):,}/{len(target_ids):,} sequence IDs found")
+        source_rows = {name: rows[common_positions] for name, rows in source_rows.items()}
+        print(f"   Found {len(common_ids):,} common proteins across {len(embedding_sources)} embedding sources and sequences")
         
         if len(common_ids) == 0:
-            # Diagnostic: check if embedding intersection exists but doesn't match sequences
-            if len(embedding_intersection) > 0:
-                print(f"   [WARNING] Embeddings have {len(embedding_intersection):,} common proteins, but none match sequence IDs")
-                # Check overlap
-                overlap = embedding_intersection & target_id_set
-                print(f"   [WARNING] Overlap between embedding IDs and sequence IDs: {len(overlap):,} proteins")
-                if len(overlap) == 0 and len(embedding_intersection) > 0 and len(target_id_set) > 0:
-                    # Show sample IDs to help debug format mismatch
-                    emb_sample = list(embedding_intersection)[:3]
-                    seq_sample = list(target_id_set)[:3]
-                    print(f"   [DEBUG] Sample embedding IDs: {emb_sample}")
-                    print(f"   [DEBUG] Sample sequence IDs: {seq_sample}")
+            # Show sample IDs to help debug format mismatch
+            for name, source in embedding_sources.items():
+                print(f"   [DEBUG] Sample {name} embedding IDs: {[str(pid) for pid in source.ids[:3]]}")
+            print(f"   [DEBUG] Sample sequence IDs: {list(target_ids[:3])}")
     else:
-        common_ids = target_ids
+        common_ids = list(target_ids)
     
-    # Step 2: Calculate total feature dimension upfront (before chunk loop)
-    total_feature_dim = 0
-    part_dims = []
+    # Step 2: Column layout. Handcrafted and structured dimensions come from the first chunk
+    # (more reliable than config); structured features are loaded and indexed once.
+    # Combined embeddings: 'legacy' repeats the block for every non-hc feature when hc is
+    # fused (the block alone otherwise), 'compact' writes it once at the first embedding
+    compact = FUSED_FEATURE_LAYOUT == 'compact'
+    using_combined = 'combined' in embedding_sources
+    combined_once = compact or HANDCRAFTED_FEATURE_KEY not in features
+    first_chunk_ids = common_ids[:min(chunk_size, len(common_ids))]
+    structured_sources: Dict[str, EmbeddingStore] = {}
+    first_chunk_parts: Dict[str, np.ndarray] = {}
+    parts = []  # (name, kind, dim)
     for feat in features:
-        if feat == HANDCRAFTED_FEATURE_KEY:
-            # HANDCRAFTED_FEATURE_KEY is 'hc'
-            dim = INDIVIDUAL_FEATURES.get('hc', {}).get('dimensions', 90)
-            label = 'handcrafted'
-        elif feat in INDIVIDUAL_FEATURES:
-            dim = INDIVIDUAL_FEATURES[feat]['dimensions']
-            label = feat
+        if using_combined and (feat in embedding_types or (not compact and feat != HANDCRAFTED_FEATURE_KEY)):
+            if not (combined_once and any(part[0] == 'combined' for part in parts)):
+                parts.append(('combined', 'embedding', embedding_sources['combined'].dim))
+        elif feat in embedding_types:
+            parts.append((feat, 'embedding', embedding_sources[feat].dim))
+        elif feat == HANDCRAFTED_FEATURE_KEY:
+            first_chunk_parts[feat] = _fused_handcrafted_chunk(sequences, first_chunk_ids)
+            parts.append((feat, 'handcrafted', first_chunk_parts[feat].shape[1]))
+        elif feat in structured_feature_types:
+            structured_sources[feat] = _load_structured_source(feat, datatype)
+            parts.append((feat, 'structured', structured_sources[feat].dim))
         else:
-            dim = 0
-            label = feat
-        
-        total_feature_dim += dim
-        part_dims.append(f"{label}({dim})")
+            raise ValueError(f"Unknown feature in fused extraction: {feat}")
     
-    dims = ' + '.join(part_dims)
+    total_feature_dim = sum(dim for _, _, dim in parts)
+    dims = ' + '.join(f"{'handcrafted' if name == HANDCRAFTED_FEATURE_KEY else name}({dim})" for name, _, dim in parts)
     print(f"   Total feature dimension: {total_feature_dim} = {dims}")
     
     # Step 3: Determine memmap usage upfront (before chunk loop)
@@ -258,312 +258,111 @@ def _extract_fused_features(sequences: Dict[str, str],
     
     print(f"   Estimated feature matrix size: {estimated_size_mb:.1f}MB ({len(common_ids):,} × {total_feature_dim})")
     
-    # Step 4: Build ID-to-index mappings once per embedding type (outside chunk loop)
-    # Helper function to normalize ID (extract accession from full UniProt format)
-    def normalize_protein_id(pid: str) -> str:
-        """Normalize protein ID: sp|Q8VY15|NAME → Q8VY15"""
-        if '|' in pid:
-            parts = pid.split('|')
-            if len(parts) >= 2:
-                return parts[1]
-        return pid
-    
-    id_mappings = {}
-    using_combined = 'combined' in embedding_data
-    
-    if using_combined:
-        # Using preprocessed combined embeddings
-        combined_embeds, combined_ids = embedding_data['combined']
-        id_mappings['combined'] = {normalize_protein_id(str(pid)): i for i, pid in enumerate(combined_ids)}
-    else:
-        # Using individual embeddings
-        for feat in features:
-            if feat in embedding_types:
-                embeds_memmap, ids = embedding_data[feat]
-                id_mappings[feat] = {normalize_protein_id(str(pid)): i for i, pid in enumerate(ids)}
-    
-    # Step 5: Process chunks - write directly to memmap if needed (never accumulate)
-    all_protein_ids = []
-    
+    # Step 4: Allocate the output once - memmap file for large datasets, array otherwise
+    import json
     if save_as_memmap:
-        # Process first chunk to get actual feature dimension (more reliable than config)
-        # This ensures memmap shape matches actual feature dimensions
-        first_chunk_ids = common_ids[:min(chunk_size, len(common_ids))]
-        first_chunk_feature_parts = []
-        
-        for feat in features:
-            if feat in embedding_types or (using_combined and feat not in [HANDCRAFTED_FEATURE_KEY]):
-                if using_combined:
-                    # Use combined embeddings
-                    combined_embeds, combined_ids = embedding_data['combined']
-                    id_to_idx = id_mappings['combined']
-                    chunk_indices = [id_to_idx[str(pid)] for pid in first_chunk_ids if str(pid) in id_to_idx]
-                    
-                    if chunk_indices:
-                        chunk_embeds = combined_embeds[chunk_indices].copy()
-                        first_chunk_feature_parts.append(chunk_embeds.astype(np.float32))
-                    else:
-                        raise ValueError(f"No embeddings found for first chunk proteins")
-                else:
-                    # Use individual embeddings
-                    embeds_memmap, ids = embedding_data[feat]
-                    id_to_idx = id_mappings[feat]
-                    chunk_indices = [id_to_idx[str(pid)] for pid in first_chunk_ids if str(pid) in id_to_idx]
-                    
-                    if chunk_indices:
-                        chunk_embeds = embeds_memmap[chunk_indices].copy()
-                        first_chunk_feature_parts.append(chunk_embeds.astype(np.float32))
-                    else:
-                        raise ValueError(f"No embeddings found for first chunk proteins")
-                    
-            elif feat == HANDCRAFTED_FEATURE_KEY:
-                chunk_seqs = {pid: sequences[pid] for pid in first_chunk_ids if pid in sequences}
-                hc_features = extract_features_batch(chunk_seqs, first_chunk_ids, 'hand_crafted')
-                first_chunk_feature_parts.append(hc_features)
-            elif feat in structured_features:
-                # Load structured features (taxonomy, ppi, top_terms)
-                from preprocessing.feature_engineering.structured_features import (
-                    load_taxonomy_features, load_ppi_features, load_top_terms_features,
-                    align_structured_features
-                )
-                
-                if feat.startswith('taxonomy'):
-                    taxonomy_level = feat.replace('taxonomy', '').replace('_', '') or 'default'
-                    struct_features, struct_ids = load_taxonomy_features(datatype, taxonomy_level)
-                elif feat == 'ppi':
-                    struct_features, struct_ids = load_ppi_features(datatype)
-                elif feat == 'top_terms':
-                    struct_features, struct_ids = load_top_terms_features(datatype)
-                else:
-                    raise ValueError(f"Unknown structured feature: {feat}")
-                
-                # Align to chunk IDs
-                aligned_features, aligned_ids = align_structured_features(
-                    struct_features, struct_ids, first_chunk_ids
-                )
-                first_chunk_feature_parts.append(aligned_features.astype(np.float32))
-            else:
-                raise ValueError(f"Unknown feature in fused extraction: {feat}")
-        
-        # Get actual feature dimension from first chunk
-        first_chunk_features = np.hstack(first_chunk_feature_parts)
-        actual_feature_dim = first_chunk_features.shape[1]
-        
-        if actual_feature_dim != total_feature_dim:
-            print(f"   ⚠️  Feature dimension mismatch: calculated {total_feature_dim}, actual {actual_feature_dim}")
-            print(f"   Using actual dimension: {actual_feature_dim}")
-            total_feature_dim = actual_feature_dim
-        
-        # Create memmap file with actual shape
-        # Check if memmap file already exists and can be reused
         memmap_dir = DATA_OUTPUT_DIR / 'memmap_cache'
         memmap_dir.mkdir(parents=True, exist_ok=True)
         memmap_path = memmap_dir / f'fused_features_{datatype}_{len(common_ids)}.npy'
         metadata_path = memmap_path.with_suffix('.npy.meta')
         
         # Check if existing memmap file matches our requirements
-        reuse_existing = False
         if memmap_path.exists() and metadata_path.exists():
             try:
-                import json
                 with open(metadata_path, 'r') as f:
                     existing_metadata = json.load(f)
                 existing_shape = tuple(existing_metadata['shape'])
                 if existing_shape == (len(common_ids), total_feature_dim):
                     print(f"   ♻️  Reusing existing memmap file: {memmap_path}")
-                    reuse_existing = True
-                else:
-                    print(f"   ⚠️  Existing memmap shape mismatch: {existing_shape} vs ({len(common_ids)}, {total_feature_dim}) - creating new file")
+                    print(f"   ✓ Skipping feature extraction - memmap file already exists and matches")
+                    return memmap_path, list(common_ids)
+                print(f"   ⚠️  Existing memmap shape mismatch: {existing_shape} vs ({len(common_ids)}, {total_feature_dim}) - creating new file")
             except Exception as e:
                 print(f"   ⚠️  Could not read existing memmap metadata: {e} - creating new file")
         
-        if reuse_existing:
-            # File already exists and matches - skip extraction, just return the path
-            print(f"   ✓ Skipping feature extraction - memmap file already exists and matches")
-            # Still need to build all_protein_ids list for return value
-            all_protein_ids = common_ids.copy()
-            # Clean up first chunk memory since we're not using it
-            del first_chunk_features, first_chunk_feature_parts
-            cleanup_memory()
-        else:
-            # Create new memmap file
-            memmap = np.memmap(memmap_path, dtype=np.float32, mode='w+', 
-                              shape=(len(common_ids), total_feature_dim))
-            print(f"   💾 Created memmap file: {memmap_path} (shape: {memmap.shape})")
-            
-            # Write first chunk to memmap
-            memmap[0:len(first_chunk_ids), :] = first_chunk_features
-            all_protein_ids.extend(first_chunk_ids)
-            
-            # Free first chunk memory
-            del first_chunk_features, first_chunk_feature_parts
-            cleanup_memory()
-            
-            # Process remaining chunks and write directly to memmap
-            total_chunks = (len(common_ids) + chunk_size - 1) // chunk_size
-            print(f"   Processing {len(common_ids):,} proteins in {total_chunks} chunks (writing directly to memmap)...")
-            print(f"      Processed chunk 1/{total_chunks} ({len(first_chunk_ids):,} proteins)")
-            
-            for chunk_idx in range(chunk_size, len(common_ids), chunk_size):
-                chunk_ids = common_ids[chunk_idx:chunk_idx+chunk_size]
-                chunk_start = chunk_idx
-                chunk_end = min(chunk_idx + chunk_size, len(common_ids))
-                chunk_feature_parts = []
-                
-                # Extract each feature type for this chunk
-                for feat in features:
-                    if feat in embedding_types or (using_combined and feat not in [HANDCRAFTED_FEATURE_KEY]):
-                        if using_combined:
-                            # Use combined embeddings
-                            combined_embeds, combined_ids = embedding_data['combined']
-                            id_to_idx = id_mappings['combined']
-                            chunk_indices = [id_to_idx[str(pid)] for pid in chunk_ids if str(pid) in id_to_idx]
-                            
-                            if chunk_indices:
-                                chunk_embeds = combined_embeds[chunk_indices].copy()
-                                chunk_feature_parts.append(chunk_embeds.astype(np.float32))
-                            else:
-                                raise ValueError(f"No embeddings found for chunk proteins")
-                        else:
-                            # Use individual embeddings
-                            embeds_memmap, ids = embedding_data[feat]
-                            id_to_idx = id_mappings[feat]
-                            chunk_indices = [id_to_idx[str(pid)] for pid in chunk_ids if str(pid) in id_to_idx]
-                            
-                            if chunk_indices:
-                                chunk_embeds = embeds_memmap[chunk_indices].copy()
-                                chunk_feature_parts.append(chunk_embeds.astype(np.float32))
-                            else:
-                                raise ValueError(f"No embeddings found for chunk proteins")
-                            
-                    elif feat == HANDCRAFTED_FEATURE_KEY:
-                        # Extract handcrafted features for this chunk
-                        chunk_seqs = {pid: sequences[pid] for pid in chunk_ids if pid in sequences}
-                        hc_features = extract_features_batch(chunk_seqs, chunk_ids, 'hand_crafted')
-                        chunk_feature_parts.append(hc_features)
-                    else:
-                        raise ValueError(f"Unknown feature in fused extraction: {feat}")
-                
-                # Concatenate features for this chunk
-                chunk_features = np.hstack(chunk_feature_parts)
-                
-                # Write directly to memmap at correct offset (never accumulate)
-                memmap[chunk_start:chunk_end, :] = chunk_features
-                all_protein_ids.extend(chunk_ids)
-                
-                chunk_num = (chunk_idx // chunk_size) + 1  # +1 because first chunk was already processed
-                print(f"      Processed chunk {chunk_num}/{total_chunks} ({len(chunk_ids):,} proteins)")
-                
-                # Free chunk memory immediately
-                del chunk_features, chunk_feature_parts
-                cleanup_memory()
-            
-            # Flush memmap to disk
-            memmap.flush()
-            del memmap
-        
-        # Save metadata
-        import json
-        metadata_path = memmap_path.with_suffix('.npy.meta')
-        metadata = {
-            'shape': [len(common_ids), total_feature_dim],
-            'dtype': 'float32',
-            'size_mb': estimated_size_mb
-        }
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f)
-        
-        print(f"   💾 Saved features as memmap: {memmap_path} ({len(common_ids):,} × {total_feature_dim}, {estimated_size_mb:.1f}MB)")
-        
-        # Clean up embedding data
-        del embedding_data, id_mappings
-        cleanup_memory()
-        
-        return memmap_path, all_protein_ids
-    
+        output = np.memmap(memmap_path, dtype=np.float32, mode='w+', shape=(len(common_ids), total_feature_dim))
+        print(f"   💾 Created memmap file: {memmap_path} (shape: {output.shape})")
     else:
-        # Small dataset - accumulate chunks (only for small datasets)
-        all_features = []
-        total_chunks = (len(common_ids) + chunk_size - 1) // chunk_size
-        print(f"   Processing {len(common_ids):,} proteins in {total_chunks} chunks (small dataset - accumulating)...")
-        
-        for chunk_idx in range(0, len(common_ids), chunk_size):
-            chunk_ids = common_ids[chunk_idx:chunk_idx+chunk_size]
-            chunk_feature_parts = []
-            
-            # Extract each feature type for this chunk
-            for feat in features:
-                if feat in embedding_types or (using_combined and feat not in [HANDCRAFTED_FEATURE_KEY]):
-                    if using_combined:
-                        # Use combined embeddings
-                        combined_embeds, combined_ids = embedding_data['combined']
-                        id_to_idx = id_mappings['combined']
-                        chunk_indices = [id_to_idx[str(pid)] for pid in chunk_ids if str(pid) in id_to_idx]
-                        
-                        if chunk_indices:
-                            chunk_embeds = combined_embeds[chunk_indices].copy()
-                            chunk_feature_parts.append(chunk_embeds.astype(np.float32))
-                        else:
-                            raise ValueError(f"No embeddings found for chunk proteins")
-                    else:
-                        # Use individual embeddings
-                        embeds_memmap, ids = embedding_data[feat]
-                        id_to_idx = id_mappings[feat]
-                        chunk_indices = [id_to_idx[str(pid)] for pid in chunk_ids if str(pid) in id_to_idx]
-                        
-                        if chunk_indices:
-                            chunk_embeds = embeds_memmap[chunk_indices].copy()
-                            chunk_feature_parts.append(chunk_embeds.astype(np.float32))
-                        else:
-                            raise ValueError(f"No embeddings found for chunk proteins")
-                        
-                elif feat == HANDCRAFTED_FEATURE_KEY:
-                    chunk_seqs = {pid: sequences[pid] for pid in chunk_ids if pid in sequences}
-                    hc_features = extract_features_batch(chunk_seqs, chunk_ids, 'hand_crafted')
-                    chunk_feature_parts.append(hc_features)
-                elif feat in structured_features:
-                    # Load structured features (taxonomy, ppi, top_terms)
-                    from preprocessing.feature_engineering.structured_features import (
-                        load_taxonomy_features, load_ppi_features, load_top_terms_features,
-                        align_structured_features
-                    )
-                    
-                    if feat.startswith('taxonomy'):
-                        taxonomy_level = feat.replace('taxonomy', '').replace('_', '') or 'default'
-                        struct_features, struct_ids = load_taxonomy_features(datatype, taxonomy_level)
-                    elif feat == 'ppi':
-                        struct_features, struct_ids = load_ppi_features(datatype)
-                    elif feat == 'top_terms':
-                        struct_features, struct_ids = load_top_terms_features(datatype)
-                    else:
-                        raise ValueError(f"Unknown structured feature: {feat}")
-                    
-                    # Align to chunk IDs
-                    aligned_features, aligned_ids = align_structured_features(
-                        struct_features, struct_ids, chunk_ids
-                    )
-                    chunk_feature_parts.append(aligned_features.astype(np.float32))
+        output = np.empty((len(common_ids), total_feature_dim), dtype=np.float32)
+    
+    # Step 5: Fill chunk by chunk - each part writes into its own column block of the output
+    total_chunks = (len(common_ids) + chunk_size - 1) // chunk_size
+    destination = 'writing directly to memmap' if save_as_memmap else 'small dataset - in memory'
+    print(f"   Processing {len(common_ids):,} proteins in {total_chunks} chunks ({destination})...")
+    
+    for chunk_start in range(0, len(common_ids), chunk_size):
+        chunk_end = min(chunk_start + chunk_size, len(common_ids))
+        chunk_ids = common_ids[chunk_start:chunk_end]
+        chunk_out = output[chunk_start:chunk_end]
+        col_offset = 0
+        for name, kind, dim in parts:
+            if kind == 'embedding':
+                embedding_sources[name].gather_into(source_rows[name][chunk_start:chunk_end], chunk_out, col_offset)
+            elif kind == 'handcrafted':
+                if chunk_start == 0:
+                    chunk_out[:, col_offset:col_offset + dim] = first_chunk_parts.pop(name)
                 else:
-                    raise ValueError(f"Unknown feature in fused extraction: {feat}")
-            
-            chunk_features = np.hstack(chunk_feature_parts)
-            all_features.append(chunk_features)
-            all_protein_ids.extend(chunk_ids)
-            
-            print(f"      Processed chunk {chunk_idx//chunk_size + 1}/{total_chunks} ({len(chunk_ids):,} proteins)")
-            
-            del chunk_features, chunk_feature_parts
-            cleanup_memory()
-        
-        # Stack all chunks (only for small datasets)
-        X_fused = np.vstack(all_features)
-        print(f"   Fused features: {X_fused.shape} = {dims}")
+                    chunk_out[:, col_offset:col_offset + dim] = _fused_handcrafted_chunk(sequences, chunk_ids)
+            else:
+                struct_rows = structured_sources[name].indices_of(chunk_ids)
+                n_missing = int((struct_rows < 0).sum())
+                if n_missing and not compact:
+                    raise ValueError(f"{name} features missing for {n_missing} proteins "
+                                     f"(the 'compact' FUSED_FEATURE_LAYOUT zero-fills them)")
+                # Proteins without structured features are zero-filled
+                structured_sources[name].gather_into(struct_rows, chunk_out, col_offset)
+            col_offset += dim
         
-        # Clean up
-        del embedding_data, id_mappings, all_features
+        print(f"      Processed chunk {chunk_start // chunk_size + 1}/{total_chunks} ({len(chunk_ids):,} proteins)")
         cleanup_memory()
-        
-        return X_fused, all_protein_ids
+    
+    del embedding_sources, structured_sources, source_rows
+    cleanup_memory()
+    
+    if not save_as_memmap:
+        print(f"   Fused features: {output.shape} = {dims}")
+        return output, list(common_ids)
+    
+    # Flush memmap to disk
+    output.flush()
+    del output
+    
+    # Save metadata
+    metadata = {
+        'shape': [len(common_ids), total_feature_dim],
+        'dtype': 'float32',
+        'size_mb': estimated_size_mb
+    }
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f)
+    
+    print(f"   💾 Saved features as memmap: {memmap_path} ({len(common_ids):,} × {total_feature_dim}, {estimated_size_mb:.1f}MB)")
+    return memmap_path, list(common_ids)
+
+
+def _fused_handcrafted_chunk(sequences: Dict[str, str], chunk_ids: List[str]) -> np.ndarray:
+    """Handcrafted features of one fused chunk."""
+    chunk_seqs = {pid: sequences[pid] for pid in chunk_ids if pid in sequences}
+    return extract_features_batch(chunk_seqs, chunk_ids, 'hand_crafted')
+
+
+def _load_structured_source(feat: str, datatype: str):
+    """Structured features (taxonomy, ppi, top_terms) indexed by protein ID."""
+    from preprocessing.feature_engineering.embeddings.embedding_store import EmbeddingStore
+    from preprocessing.feature_engineering.structured_features import (
+        load_taxonomy_features, load_ppi_features, load_top_terms_features
+    )
+    
+    if feat.startswith('taxonomy'):
+        taxonomy_level = feat.replace('taxonomy', '').replace('_', '') or 'default'
+        struct_features, struct_ids = load_taxonomy_features(datatype, taxonomy_level)
+    elif feat == 'ppi':
+        struct_features, struct_ids = load_ppi_features(datatype)
+    elif feat == 'top_terms':
+        struct_features, struct_ids = load_top_terms_features(datatype)
+    else:
+        raise ValueError(f"Unknown structured feature: {feat}")
+    return EmbeddingStore.from_arrays(struct_features, struct_ids, normalize=False)
 
 
 def _extract_handcrafted_features(sequences: Dict[str, str],
@@ -0,0 +1,242 @@
+"""
+Persistent content-addressed feature store for CAFA 6 protein function prediction.
+
+Aligned feature matrices produced by extract_features are saved once per
+(sequence content, feature type, feature list, datatype, fused layout, FEATURE_CODE_VERSION) and
+reused by later runs (train_all, grid search, predict_from_saved) instead of
+re-extracting handcrafted features or re-aligning fused embeddings.
+
+Each entry is a directory named by its key:
+    features.npy        - float32 matrix in .npy format (np.load(..., mmap_mode='r'))
+    features.npy.meta   - shape/dtype sidecar read by existing memmap helpers
+    ids.txt             - aligned protein IDs, one per line (row order)
+    entry.json          - key components; its mtime is the LRU access time
+Entries beyond the FEATURE_STORE_MAX_GB budget are evicted least recently used first,
+except entries whose paths this process has been handed (they may still be memory-mapped).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+FEATURES_FILENAME = 'features.npy'
+IDS_FILENAME = 'ids.txt'
+ENTRY_FILENAME = 'entry.json'
+_COPY_CHUNK_ROWS = 8192
+
+
+def sequences_fingerprint(sequences: Dict[str, str], protein_ids: Sequence[str]) -> str:
+    """
+    SHA-256 over (protein_id, sequence) pairs in row order.
+
+    Content-based rather than file-based: the same proteins read from a different
+    FASTA copy share entries, while any edit to an ID, a sequence or the order does not.
+
+    Args:
+        sequences: Dict mapping protein_id -> sequence
+        protein_ids: Proteins to fingerprint, in extraction order
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    batch = []
+    for pid in protein_ids:
+        batch.append(f"{pid}\t{sequences.get(pid, '')}\n")
+        if len(batch) >= 10000:
+            digest.update(''.join(batch).encode())
+            batch = []
+    digest.update(''.join(batch).encode())
+    return digest.hexdigest()
+
+
+def feature_store_key(sequence_hash: str,
+                      feature_type: str,
+                      features: Optional[Sequence[str]],
+                      datatype: str,
+                      code_version: Optional[int] = None) -> Tuple[str, Dict]:
+    """
+    Build the store key for one extraction.
+
+    Feature order is kept (it determines column order of the fused matrix).
+
+    Returns:
+        tuple: (hex key, key components dict)
+    """
+    from config.features import EMBEDDING_STORE_ENABLED, EMBEDDING_STORE_DTYPE, FUSED_FEATURE_LAYOUT
+    if code_version is None:
+        from config.features import FEATURE_CODE_VERSION
+        code_version = FEATURE_CODE_VERSION
+    components = {
+        'sequence_hash': sequence_hash,
+        'feature_type': feature_type,
+        'features': list(features) if features else [],
+        'datatype': datatype,
+        'code_version': code_version,
+        'fused_layout': FUSED_FEATURE_LAYOUT if feature_type == 'fused_embeddings' else None,
+        # float16 stores change embedding values
+        'embedding_dtype': EMBEDDING_STORE_DTYPE if EMBEDDING_STORE_ENABLED else 'source',
+    }
+    key = hashlib.sha256(json.dumps(components, sort_keys=True).encode()).hexdigest()[:32]
+    return key, components
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+
+class FeatureStore:
+    """
+    On-disk LRU store of aligned feature matrices.
+
+    Safe to share between sequential runs; entries are written to a temporary
+    directory and renamed into place, so readers never see partial entries.
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            root: Store directory (default: FEATURE_STORE_DIR)
+            max_bytes: Disk budget in bytes (default: FEATURE_STORE_MAX_GB)
+        """
+        from config.paths import FEATURE_STORE_DIR
+        from config.features import FEATURE_STORE_MAX_GB
+        from config.training import GB_TO_BYTES
+
+        self.root = Path(root) if root is not None else FEATURE_STORE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else int(FEATURE_STORE_MAX_GB * GB_TO_BYTES)
+        self.hits = 0
+        self.misses = 0
+        # Keys whose features.npy path get/put returned; callers may still map them
+        self._handed_out: Set[str] = set()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key
+
+    def _counts(self) -> str:
+        return f"hits: {self.hits}, misses: {self.misses}"
+
+    def get(self, key: str) -> Optional[Tuple[Path, List[str]]]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Returns:
+            tuple: (path to features.npy, aligned protein IDs) or None on a miss
+        """
+        entry_dir = self._entry_dir(key)
+        features_path = entry_dir / FEATURES_FILENAME
+        ids_path = entry_dir / IDS_FILENAME
+        if not (features_path.exists() and ids_path.exists() and (entry_dir / ENTRY_FILENAME).exists()):
+            self.misses += 1
+            print(f"   🗄️  Feature store miss: {key} ({self._counts()})")
+            return None
+
+        with open(ids_path, 'r') as f:
+            protein_ids = f.read().splitlines()
+        os.utime(entry_dir / ENTRY_FILENAME)
+        self._handed_out.add(key)
+        self.hits += 1
+        print(f"   🗄️  Feature store hit: {key} ({len(protein_ids):,} proteins, {self._counts()})")
+        return features_path, protein_ids
+
+    def put(self, key: str, components: Dict, features: Union[np.ndarray, Path], protein_ids: Sequence[str]) -> Path:
+        """
+        Save an aligned matrix (array, memmap, or raw memmap path) and evict LRU entries over budget.
+
+        Returns:
+            Path: Path to the stored features.npy
+        """
+        if isinstance(features, (str, Path)):
+            from utils.memory_efficient import load_features_memmap
+            features = load_features_memmap(features)
+        if len(protein_ids) != features.shape[0]:
+            raise ValueError(f"Feature rows ({features.shape[0]:,}) do not match protein IDs ({len(protein_ids):,})")
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.root / f".tmp_{key}_{uuid.uuid4().hex[:8]}"
+        tmp_dir.mkdir()
+        try:
+            stored = np.lib.format.open_memmap(tmp_dir / FEATURES_FILENAME, mode='w+',
+                                               dtype=np.float32, shape=features.shape)
+            for start in range(0, features.shape[0], _COPY_CHUNK_ROWS):
+                stored[start:start + _COPY_CHUNK_ROWS] = features[start:start + _COPY_CHUNK_ROWS]
+            stored.flush()
+            del stored
+
+            size_mb = features.size * 4 / (1024 * 1024)
+            with open(tmp_dir / f"{FEATURES_FILENAME}.meta", 'w') as f:
+                json.dump({'shape': list(features.shape), 'dtype': 'float32', 'size_mb': size_mb, 'format': 'npy'}, f)
+            with open(tmp_dir / IDS_FILENAME, 'w') as f:
+                f.write(''.join(f"{pid}\n" for pid in protein_ids))
+            with open(tmp_dir / ENTRY_FILENAME, 'w') as f:
+                json.dump({**components, 'key': key, 'shape': list(features.shape), 'created': time.time()}, f, indent=2)
+
+            entry_dir = self._entry_dir(key)
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        print(f"   🗄️  Feature store saved: {key} ({features.shape[0]:,} × {features.shape[1]}, {size_mb:.1f}MB)")
+        self._handed_out.add(key)
+        self.evict(keep=key)
+        return entry_dir / FEATURES_FILENAME
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        """All complete entries as (last access time, size in bytes, directory), oldest first."""
+        if not self.root.exists():
+            return []
+        entries = []
+        for entry_dir in self.root.iterdir():
+            entry_file = entry_dir / ENTRY_FILENAME
+            if entry_dir.is_dir() and not entry_dir.name.startswith('.') and entry_file.exists():
+                entries.append((entry_file.stat().st_mtime, _dir_size(entry_dir), entry_dir))
+        return sorted(entries)
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Remove least recently used entries until the store fits its budget.
+
+        Entries this store has handed out (by get or put) are never evicted, so paths
+        returned earlier in the process stay loadable; the store may then stay over budget.
+
+        Args:
+            keep: Additional key that is never evicted
+
+        Returns:
+            int: Number of entries removed
+        """
+        protected = self._handed_out | ({keep} if keep else set())
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            if entry_dir.name in protected:
+                continue
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+            print(f"   🗄️  Feature store evicted: {entry_dir.name} ({size / (1024 * 1024):.1f}MB)")
+        return removed
+
+
+_default_store: Optional[FeatureStore] = None
+
+
+def get_feature_store() -> FeatureStore:
+    """Process-wide store (hit/miss counts accumulate across extract_features calls)."""
+    global _default_store
+    if _default_store is None:
+        _default_store = FeatureStore()
+    return _default_store
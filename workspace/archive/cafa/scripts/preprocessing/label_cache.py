@@ -0,0 +1,290 @@
+"""
+Per-ontology label matrix cache for CAFA 6 protein function prediction.
+
+The (optionally propagated, top-K restricted) label matrix of one ontology is built
+once from integer-coded train_terms columns and saved as .npz:
+    proteins        - sorted protein IDs (CSR rows; the groupby('protein') order)
+    classes         - sorted GO terms (CSR columns; the MultiLabelBinarizer order)
+    indptr, indices - CSR structure (all values are 1)
+    key             - JSON of the cache key components
+
+keyed by (train_terms content hash, OBO checksum, closure builder version, ontology,
+propagate flag, top-K).
+Loading selects and reorders rows for the requested protein order with one hash
+lookup and drops classes no selected protein has, giving the same (mlb, y_ont)
+as fitting a MultiLabelBinarizer on the per-protein term lists.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.preprocessing import MultiLabelBinarizer
+
+LABEL_CACHE_FORMAT_VERSION = 1
+
+# In-process OBO checksums: (resolved path, mtime_ns, size) -> sha256
+_OBO_CHECKSUMS: Dict[Tuple[str, int, int], str] = {}
+# In-process train_terms hashes: id(DataFrame) -> (weakref, n_rows, sha256)
+_TRAIN_TERMS_HASHES: Dict[int, Tuple['weakref.ref', int, str]] = {}
+
+
+def train_terms_hash(train_terms: pd.DataFrame) -> str:
+    """
+    Content hash of the protein/term/ontology columns (row order included).
+
+    Memoized per DataFrame object and length, so the per-ontology calls of one run hash it once.
+    """
+    memo = _TRAIN_TERMS_HASHES.get(id(train_terms))
+    if memo is not None and memo[0]() is train_terms and memo[1] == len(train_terms):
+        return memo[2]
+    row_hashes = pd.util.hash_pandas_object(train_terms[['protein', 'term', 'ontology']], index=False)
+    digest = hashlib.sha256(row_hashes.to_numpy().tobytes()).hexdigest()
+    _TRAIN_TERMS_HASHES[id(train_terms)] = (weakref.ref(train_terms), len(train_terms), digest)
+    return digest
+
+
+def _obo_checksum(obo_path: Path) -> str:
+    from utils.go_closure import compute_file_checksum
+
+    stat = obo_path.stat()
+    memo_key = (str(obo_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _OBO_CHECKSUMS:
+        _OBO_CHECKSUMS[memo_key] = compute_file_checksum(obo_path)
+    return _OBO_CHECKSUMS[memo_key]
+
+
+def label_cache_key(terms_hash: str,
+                    obo_hash: Optional[str],
+                    ont_code: str,
+                    propagate_labels: bool,
+                    top_k_labels: Optional[int]) -> Tuple[str, Dict]:
+    """
+    Cache key for one label matrix.
+
+    Returns:
+        tuple: (hex key, key components dict)
+    """
+    from utils.go_closure import GO_CLOSURE_VERSION
+
+    components = {
+        'train_terms_hash': terms_hash,
+        'obo_hash': obo_hash if propagate_labels else None,
+        'closure_version': GO_CLOSURE_VERSION if propagate_labels else None,
+        'ontology': ont_code,
+        'propagate_labels': bool(propagate_labels),
+        'top_k_labels': int(top_k_labels) if top_k_labels else None,
+        'format_version': LABEL_CACHE_FORMAT_VERSION,
+    }
+    key = hashlib.sha256(json.dumps(components, sort_keys=True).encode()).hexdigest()[:32]
+    return key, components
+
+
+def build_label_csr(train_terms: pd.DataFrame,
+                    ont_code: str,
+                    closure_index=None,
+                    top_k_labels: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Label CSR of all proteins annotated in one ontology, from integer-coded columns.
+
+    Matches the groupby(list) → propagate_labels_up → Counter top-K → MultiLabelBinarizer
+    path: duplicate annotations count towards top-K unless propagated (propagation
+    deduplicates), and top-K ties keep the first-seen term.
+
+    Args:
+        train_terms: DataFrame with protein, term, ontology columns
+        ont_code: Ontology code ('F', 'P', 'C')
+        closure_index: GOClosureIndex to propagate labels up the GO graph (None = no propagation)
+        top_k_labels: Keep only the K most frequent terms
+
+    Returns:
+        dict: proteins, classes, indptr, indices arrays
+    """
+    from utils.go_closure import _gather_csr_rows
+
+    ont_terms = train_terms[train_terms['ontology'] == ont_code]
+    protein_codes, proteins = pd.factorize(ont_terms['protein'], sort=True)
+    term_codes, terms = pd.factorize(ont_terms['term'], sort=True)
+    proteins = np.asarray(proteins, dtype=str)
+    vocab = np.asarray(terms, dtype=str)
+
+    # Group pairs by protein, keeping file order within a protein (groupby order); NaN codes are -1
+    valid = np.flatnonzero((protein_codes >= 0) & (term_codes >= 0))
+    order = valid[np.argsort(protein_codes[valid], kind='stable')]
+    pair_proteins = protein_codes[order].astype(np.int64)
+    pair_terms = term_codes[order].astype(np.int64)
+
+    if closure_index is not None and len(pair_terms):
+        # Ancestors of terms known to the ontology; unknown terms are kept as they are
+        closure_codes = closure_index.encode_terms(vocab.tolist())[pair_terms]
+        known = closure_codes >= 0
+        ancestors, owner = _gather_csr_rows(closure_index.ancestor_indptr, closure_index.ancestor_indices,
+                                            closure_codes[known])
+        ancestor_codes = np.unique(ancestors)
+        ancestor_terms = np.asarray(closure_index.terms[ancestor_codes], dtype=str)
+        merged_vocab = np.union1d(vocab, ancestor_terms)
+        ancestor_vocab = np.searchsorted(merged_vocab, ancestor_terms)[np.searchsorted(ancestor_codes, ancestors)]
+        pair_terms = np.concatenate([np.searchsorted(merged_vocab, vocab)[pair_terms], ancestor_vocab])
+        pair_proteins = np.concatenate([pair_proteins, pair_proteins[known][owner]])
+        vocab = merged_vocab
+        # Propagated term lists are deduplicated and sorted per protein
+        keys = np.unique(pair_proteins * len(vocab) + pair_terms)
+        pair_proteins, pair_terms = keys // len(vocab), keys % len(vocab)
+
+    if top_k_labels is not None and top_k_labels > 0 and len(pair_terms):
+        counts = np.bincount(pair_terms, minlength=len(vocab))
+        seen_terms, first_seen = np.unique(pair_terms, return_index=True)
+        # Counter.most_common: count descending, ties in insertion (first-seen) order
+        ranked = seen_terms[np.lexsort((first_seen, -counts[seen_terms]))]
+        selected = np.zeros(len(vocab), dtype=bool)
+        selected[ranked[:top_k_labels]] = True
+        keep = selected[pair_terms]
+        pair_proteins, pair_terms = pair_proteins[keep], pair_terms[keep]
+        print(f"      Restricting to top-{top_k_labels} most frequent GO terms ({int(selected.sum())} unique)")
+
+    # Deduplicated CSR with sorted column indices; classes are terms with at least one label
+    keys = np.unique(pair_proteins * max(len(vocab), 1) + pair_terms)
+    pair_proteins, pair_terms = keys // max(len(vocab), 1), keys % max(len(vocab), 1)
+    used_terms = np.unique(pair_terms)
+    indptr = np.zeros(len(proteins) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pair_proteins, minlength=len(proteins)), out=indptr[1:])
+    return {
+        'proteins': proteins,
+        'classes': vocab[used_terms],
+        'indptr': indptr,
+        'indices': np.searchsorted(used_terms, pair_terms).astype(np.int32),
+    }
+
+
+def labels_for_proteins(label_csr: Dict[str, np.ndarray],
+                        y_train_proteins: Sequence[str]) -> Tuple[MultiLabelBinarizer, sp.csr_matrix]:
+    """
+    (mlb, y_ont) for proteins in training order; unannotated proteins get empty rows.
+    """
+    from utils.go_closure import _gather_csr_rows
+
+    proteins = label_csr['proteins']
+    classes = label_csr['classes']
+    positions = pd.Index(proteins).get_indexer(list(y_train_proteins))
+    found = positions >= 0
+
+    rows = positions[found]
+    indices, _ = _gather_csr_rows(label_csr['indptr'], label_csr['indices'], rows)
+    lengths = np.zeros(len(positions), dtype=np.int64)
+    lengths[found] = label_csr['indptr'][rows + 1] - label_csr['indptr'][rows]
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+
+    # The binarizer only knows classes some selected protein has
+    used = np.unique(indices)
+    if len(used) < len(classes):
+        indices = np.searchsorted(used, indices)
+        classes = classes[used]
+
+    y_ont = sp.csr_matrix((np.ones(len(indices), dtype=np.int64), indices.astype(np.int32), indptr),
+                          shape=(len(positions), len(classes)))
+    mlb = MultiLabelBinarizer(sparse_output=True)
+    mlb.fit([classes.tolist()])
+    return mlb, y_ont
+
+
+def label_cache_path(key: str, ont_code: str, cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    if cache_dir is None:
+        from config.paths import LABEL_CACHE_DIR
+        cache_dir = LABEL_CACHE_DIR
+    return Path(cache_dir) / f"labels_{ont_code}_{key}.npz"
+
+
+def _save_label_csr(path: Path, label_csr: Dict[str, np.ndarray], components: Dict) -> None:
+    """Write via a temporary file and rename, so readers never see a partial cache file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".tmp_{uuid.uuid4().hex[:8]}_{path.name}")
+    try:
+        np.savez(tmp_path, key=np.array(json.dumps(components, sort_keys=True)), **label_csr)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _load_label_csr(path: Path, components: Dict) -> Optional[Dict[str, np.ndarray]]:
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if json.loads(str(data['key'])) != json.loads(json.dumps(components, sort_keys=True)):
+                return None
+            return {name: data[name] for name in ('proteins', 'classes', 'indptr', 'indices')}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"      ⚠️  Could not read label cache {path.name} ({e}), rebuilding")
+        return None
+
+
+def load_ontology_labels(train_terms: pd.DataFrame,
+                         y_train_proteins: List[str],
+                         ont_code: str,
+                         propagate_labels: bool = False,
+                         top_k_labels: Optional[int] = None,
+                         closure_index=None,
+                         use_cache: Optional[bool] = None,
+                         cache_dir: Optional[Union[str, Path]] = None) -> Tuple[MultiLabelBinarizer, sp.csr_matrix]:
+    """
+    Label matrix of one ontology, from the label cache when train_terms and the OBO are unchanged.
+
+    Args:
+        train_terms: DataFrame with protein, term, ontology columns
+        y_train_proteins: Protein IDs in training order (matrix rows)
+        ont_code: Ontology code ('F', 'P', 'C')
+        propagate_labels: Propagate labels up the GO graph (skipped with a warning when the OBO is missing)
+        top_k_labels: Restrict to the K most frequent terms
+        closure_index: Preloaded GOClosureIndex (loaded from the OBO on a cache miss otherwise)
+        use_cache: Read/write the cache (default: LABEL_CACHE_ENABLED)
+        cache_dir: Cache directory (default: LABEL_CACHE_DIR)
+
+    Returns:
+        tuple: (mlb, y_ont) - fitted MultiLabelBinarizer and sparse label matrix
+    """
+    from config.paths import DATA_INPUT_DIR
+
+    if use_cache is None:
+        from config.training import LABEL_CACHE_ENABLED
+        use_cache = LABEL_CACHE_ENABLED
+
+    obo_path = DATA_INPUT_DIR / 'Train' / 'go-basic.obo'
+    if propagate_labels and closure_index is None and not obo_path.exists():
+        print(f"      ⚠️  Warning: OBO file not found at {obo_path}, skipping label propagation")
+        propagate_labels = False
+
+    cache_path = components = None
+    if use_cache:
+        obo_hash = None
+        if propagate_labels:
+            obo_hash = closure_index.obo_checksum if closure_index is not None and closure_index.obo_checksum \
+                else _obo_checksum(obo_path)
+        key, components = label_cache_key(train_terms_hash(train_terms), obo_hash, ont_code,
+                                          propagate_labels, top_k_labels)
+        cache_path = label_cache_path(key, ont_code, cache_dir)
+        if cache_path.exists():
+            label_csr = _load_label_csr(cache_path, components)
+            if label_csr is not None:
+                print(f"      🗃️  Label cache hit: {cache_path.name}")
+                return labels_for_proteins(label_csr, y_train_proteins)
+
+    if propagate_labels and closure_index is None:
+        from utils.go_closure import load_go_closure_index
+        closure_index = load_go_closure_index(obo_path)
+    if propagate_labels:
+        print(f"      Propagating {ont_code} labels up GO graph (label cache miss)...")
+    label_csr = build_label_csr(train_terms, ont_code, closure_index if propagate_labels else None, top_k_labels)
+
+    if cache_path is not None:
+        try:
+            _save_label_csr(cache_path, label_csr, components)
+        except OSError as e:
+            # A full or read-only disk must not fail label loading
+            print(f"      ⚠️  Could not save label cache: {e}")
+    return labels_for_proteins(label_csr, y_train_proteins)
@@ -0,0 +1,286 @@
+"""
+Packed memory-mapped sequence store for CAFA 6 protein function prediction.
+
+A FASTA file is converted once into:
+    residues.bin        - uint8 residue bytes of all records, concatenated in file order
+    offsets.npy         - int64 (n_records + 1,) record boundaries into residues.bin
+    ids.npy             - fixed-width byte-string protein IDs in file order
+    sorted_ids.npy      - the same IDs sorted (vectorized exact lookup by binary search)
+    sorted_index.npy    - int64 record index of each sorted ID
+    store.json          - source FASTA path/size/mtime and counts (staleness check)
+
+Later loads map these files instead of parsing the FASTA with Bio.SeqIO:
+record slices are zero-copy views into residues.bin, ID lookups are one
+np.searchsorted over the sorted table, and chunked iteration only decodes the
+sequences it yields.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+STORE_FORMAT_VERSION = 1
+RESIDUES_FILENAME = 'residues.bin'
+META_FILENAME = 'store.json'
+_WRITE_BUFFER_BYTES = 64 * 1024 * 1024
+
+
+def fasta_record_id(header: str) -> str:
+    """Protein ID from a FASTA header line, as the SeqIO loaders derive it (UniProt 'sp|ID|NAME' → ID)."""
+    record_id = header[1:].split(None, 1)[0] if len(header) > 1 else ''
+    return record_id.split('|')[1] if '|' in record_id else record_id
+
+
+def _source_signature(fasta_path: Path) -> Dict[str, Union[str, int, float]]:
+    stat = fasta_path.stat()
+    return {'fasta_path': str(fasta_path.resolve()), 'fasta_size': stat.st_size, 'fasta_mtime': stat.st_mtime}
+
+
+def build_sequence_store(fasta_path: Union[str, Path], store_dir: Union[str, Path]) -> Path:
+    """
+    Convert a FASTA file into a packed sequence store (one streaming pass).
+
+    Written to a temporary directory and renamed into place, so readers never see a partial store.
+
+    Args:
+        fasta_path: Source FASTA
+        store_dir: Destination directory (replaced if it exists)
+
+    Returns:
+        Path: store_dir
+    """
+    fasta_path = Path(fasta_path)
+    store_dir = Path(store_dir)
+    store_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = store_dir.parent / f".tmp_{store_dir.name}_{uuid.uuid4().hex[:8]}"
+    tmp_dir.mkdir()
+
+    print(f"   📦 Building sequence store for {fasta_path.name}...")
+    ids: List[str] = []
+    offsets: List[int] = [0]
+    try:
+        total = 0
+        pending: List[bytes] = []
+        pending_bytes = 0
+        with open(fasta_path, 'rb') as fasta, open(tmp_dir / RESIDUES_FILENAME, 'wb') as out:
+            for line in fasta:
+                if line.startswith(b'>'):
+                    if ids:
+                        offsets.append(total)
+                    ids.append(fasta_record_id(line.decode().rstrip()))
+                    continue
+                residues = line.strip().replace(b' ', b'')
+                if residues and ids:
+                    pending.append(residues)
+                    pending_bytes += len(residues)
+                    total += len(residues)
+                    if pending_bytes >= _WRITE_BUFFER_BYTES:
+                        out.write(b''.join(pending))
+                        pending, pending_bytes = [], 0
+            out.write(b''.join(pending))
+        if ids:
+            offsets.append(total)
+
+        id_width = max((len(pid) for pid in ids), default=1)
+        id_table = np.array(ids, dtype=f'S{max(id_width, 1)}')
+        sorted_index = np.argsort(id_table, kind='stable').astype(np.int64)
+        np.save(tmp_dir / 'offsets.npy', np.asarray(offsets, dtype=np.int64))
+        np.save(tmp_dir / 'ids.npy', id_table)
+        np.save(tmp_dir / 'sorted_ids.npy', id_table[sorted_index])
+        np.save(tmp_dir / 'sorted_index.npy', sorted_index)
+        with open(tmp_dir / META_FILENAME, 'w') as f:
+            json.dump({**_source_signature(fasta_path), 'format_version': STORE_FORMAT_VERSION,
+                       'n_sequences': len(ids), 'n_residues': total}, f, indent=2)
+
+        if store_dir.exists():
+            shutil.rmtree(store_dir, ignore_errors=True)
+        os.replace(tmp_dir, store_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    print(f"   ✓ Sequence store: {len(ids):,} sequences, {total / (1024 * 1024):.1f}MB residues → {store_dir}")
+    return store_dir
+
+
+class SequenceStore:
+    """Read-only view over a packed sequence store."""
+
+    def __init__(self, store_dir: Union[str, Path]):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / META_FILENAME, 'r') as f:
+            self.meta = json.load(f)
+        self.offsets = np.load(self.store_dir / 'offsets.npy', mmap_mode='r')
+        self.ids = np.load(self.store_dir / 'ids.npy', mmap_mode='r')
+        self._sorted_ids = np.load(self.store_dir / 'sorted_ids.npy', mmap_mode='r')
+        self._sorted_index = np.load(self.store_dir / 'sorted_index.npy', mmap_mode='r')
+        n_residues = int(self.offsets[-1]) if len(self.offsets) else 0
+        # np.memmap cannot map an empty file
+        self.residues = (np.memmap(self.store_dir / RESIDUES_FILENAME, dtype=np.uint8, mode='r')
+                         if n_residues else np.zeros(0, dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, protein_id: str) -> bool:
+        return self.index_of(protein_id) >= 0
+
+    def protein_ids(self, indices: Optional[np.ndarray] = None) -> List[str]:
+        """Protein IDs in file order (or for the given record indices)."""
+        table = self.ids if indices is None else self.ids[indices]
+        return np.char.decode(np.asarray(table), 'ascii').tolist()
+
+    def indices_of(self, protein_ids: Sequence[str], occurrence: str = 'last') -> np.ndarray:
+        """
+        Record index per protein ID (-1 when absent), one vectorized binary search.
+
+        Args:
+            protein_ids: IDs to look up
+            occurrence: Record returned for duplicate IDs - 'last' (the value a dict built
+                        from the FASTA keeps) or 'first' (where that dict key is positioned)
+        """
+        if len(protein_ids) == 0 or len(self) == 0:
+            return np.full(len(protein_ids), -1, dtype=np.int64)
+        query_str = np.asarray(protein_ids, dtype=str)
+        # Casting to the fixed-width table dtype truncates; longer IDs cannot be in the store
+        fits = np.char.str_len(query_str) <= self._sorted_ids.dtype.itemsize
+        query = query_str.astype(self._sorted_ids.dtype)
+        if occurrence == 'last':
+            positions = np.searchsorted(self._sorted_ids, query, side='right') - 1
+        else:
+            positions = np.searchsorted(self._sorted_ids, query, side='left')
+        positions = np.clip(positions, 0, len(self) - 1)
+        found = fits & (self._sorted_ids[positions] == query)
+        return np.where(found, self._sorted_index[positions], -1)
+
+    def dict_order_indices(self, protein_ids: Sequence[str]) -> np.ndarray:
+        """
+        Record indices of the given IDs that are present, ordered like a dict built by
+        scanning the FASTA (key at its first record, sequence from its last record).
+        """
+        protein_ids = list(dict.fromkeys(protein_ids))
+        last = self.indices_of(protein_ids, occurrence='last')
+        first = self.indices_of(protein_ids, occurrence='first')
+        present = last >= 0
+        return last[present][np.argsort(first[present], kind='stable')].astype(np.int64)
+
+    def index_of(self, protein_id: str) -> int:
+        return int(self.indices_of([protein_id])[0])
+
+    def residue_range(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zero-copy residues of records [start, stop).
+
+        Returns:
+            tuple: (uint8 view of the concatenated residues, offsets rebased to the view (stop - start + 1,))
+        """
+        bounds = np.asarray(self.offsets[start:stop + 1])
+        return self.residues[bounds[0]:bounds[-1]], bounds - bounds[0]
+
+    def residues_of(self, index: int) -> np.ndarray:
+        """Zero-copy uint8 view of one record."""
+        return self.residues[self.offsets[index]:self.offsets[index + 1]]
+
+    def sequence(self, index: int) -> str:
+        return self.residues_of(index).tobytes().decode('ascii')
+
+    def get(self, protein_id: str, default: Optional[str] = None) -> Optional[str]:
+        index = self.index_of(protein_id)
+        return self.sequence(index) if index >= 0 else default
+
+    def _decode(self, indices: np.ndarray) -> Dict[str, str]:
+        """protein_id -> sequence for record indices (in the given order)."""
+        offsets = self.offsets
+        residues = self.residues
+        return {
+            pid: residues[offsets[i]:offsets[i + 1]].tobytes().decode('ascii')
+            for pid, i in zip(self.protein_ids(indices), indices.tolist())
+        }
+
+    def iter_chunks(self, chunk_size: int, indices: Optional[np.ndarray] = None) -> Iterator[Dict[str, str]]:
+        """
+        Yield protein_id -> sequence dicts of up to chunk_size records.
+
+        Args:
+            chunk_size: Records per chunk
+            indices: Record indices to include, in order (default: all records in file order)
+        """
+        if indices is None:
+            indices = np.arange(len(self), dtype=np.int64)
+        for start in range(0, len(indices), chunk_size):
+            yield self._decode(np.asarray(indices[start:start + chunk_size]))
+
+    def to_dict(self, indices: Optional[np.ndarray] = None) -> Dict[str, str]:
+        """protein_id -> sequence (all records, or the given record indices)."""
+        if indices is None:
+            indices = np.arange(len(self), dtype=np.int64)
+        return self._decode(np.asarray(indices))
+
+
+def sequence_store_dir(fasta_path: Union[str, Path], root: Optional[Union[str, Path]] = None) -> Path:
+    """Store directory for a FASTA path (one store per source file)."""
+    if root is None:
+        from config.paths import SEQUENCE_STORE_DIR
+        root = SEQUENCE_STORE_DIR
+    fasta_path = Path(fasta_path)
+    path_hash = hashlib.sha1(str(fasta_path.resolve()).encode()).hexdigest()[:12]
+    return Path(root) / f"{fasta_path.stem}_{path_hash}"
+
+
+def get_sequence_store(fasta_path: Union[str, Path],
+                       root: Optional[Union[str, Path]] = None,
+                       build: bool = True) -> Optional[SequenceStore]:
+    """
+    Open the store for a FASTA file, (re)building it when missing or stale.
+
+    Args:
+        fasta_path: Source FASTA
+        root: Store root (default: SEQUENCE_STORE_DIR)
+        build: Convert the FASTA when no current store exists
+
+    Returns:
+        SequenceStore, or None when no current store exists and build is False
+    """
+    fasta_path = Path(fasta_path)
+    store_dir = sequence_store_dir(fasta_path, root)
+    meta_path = store_dir / META_FILENAME
+    if meta_path.exists():
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        signature = _source_signature(fasta_path)
+        if meta.get('format_version') == STORE_FORMAT_VERSION and all(meta.get(k) == v for k, v in signature.items()):
+            return SequenceStore(store_dir)
+        print(f"   ⚠️  Sequence store for {fasta_path.name} is stale (FASTA changed), rebuilding...")
+    if not build:
+        return None
+    build_sequence_store(fasta_path, store_dir)
+    return SequenceStore(store_dir)
+
+
+def load_target_indices(store: SequenceStore, train_terms_path: Union[str, Path]) -> np.ndarray:
+    """
+    Store record indices (file order) of proteins annotated in train_terms.tsv.
+
+    Cached next to the store per train_terms.tsv size/mtime, so train_terms.tsv is
+    read (protein column only) once instead of on every load.
+    """
+    train_terms_path = Path(train_terms_path)
+    stat = train_terms_path.stat()
+    cache_key = hashlib.sha1(f"{train_terms_path.resolve()}|{stat.st_size}|{stat.st_mtime}".encode()).hexdigest()[:12]
+    cache_path = store.store_dir / f"targets_{cache_key}.npy"
+    if cache_path.exists():
+        return np.load(cache_path)
+
+    import pandas as pd
+    proteins = pd.read_csv(train_terms_path, sep='\t', names=['protein', 'term', 'ontology'],
+                           usecols=['protein'])['protein'].unique()
+    # Same order and duplicate handling as the SeqIO loaders' dicts
+    record_indices = store.dict_order_indices(list(proteins))
+    np.save(cache_path, record_indices)
+    return record_indices
@@ -13,7 +13,7 @@ scripts_dir = str(Path(__file__).parent)
 if scripts_dir not in sys.path:
     sys.path.insert(0, scripts_dir)
 
-from config import get_model_config, get_pipeline_config, MODEL_CONFIGS, PIPELINE_CONFIGS, get_ontology_name, ONTOLOGY_CODES, get_ontology_hyperparams
+from config import get_model_config, get_pipeline_config, MODEL_CONFIGS, PIPELINE_CONFIGS, get_ontology_name, ONTOLOGY_CODES, get_ontology_hyperparams, BATCH_SIZE_CONFIG
 from pipelines.pipeline_orchestrator import (
     run_full_pipeline,
     run_train_all, 
@@ -23,6 +23,7 @@ from pipelines.pipeline_orchestrator import (
     run_grid_search_pipeline
 )
 from utils.model_io import list_saved_models, get_model_summary
+from utils.profiling import start_run_profile, stop_run_profile, print_run_profile_summary
 from utils.cli_utils import (
     parse_model_specs_from_args, 
     validate_pipeline_args,
@@ -60,6 +61,9 @@ def main():
 
         # List saved models
         python scripts/run.py --list-models
+
+        # Per-stage timing/memory profile (add --cprofile for cProfile dumps per stage)
+        python scripts/run.py --pipeline train_only --model xgboost_v1 --profile
         """
     )
     
@@ -116,6 +120,13 @@ def main():
              'Examples: --features default, --features protbert,esm2,hc, --features esm2'
     )
     
+    parser.add_argument(
+        '--feature-engine',
+        choices=['batch', 'threads', 'processes'],
+        help='Handcrafted feature extraction engine (default: BATCH_SIZE_CONFIG["feature_extraction"]["engine"]). '
+             '"processes" shards proteins over a process pool with shared-memory output.'
+    )
+    
     # Ensemble options
     parser.add_argument(
         '--models',
@@ -261,6 +272,23 @@ def main():
         help='Disable GOA negative propagation filtering'
     )
     
+    # Run profiling
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record per-stage wall/CPU time, peak RSS and rows to a JSONL run profile and print a summary table'
+    )
+    parser.add_argument(
+        '--profile-output',
+        type=str,
+        help='Path of the JSONL run profile (default: <output dir>/profiles/<pipeline>_<timestamp>.jsonl); implies --profile'
+    )
+    parser.add_argument(
+        '--cprofile',
+        action='store_true',
+        help='With --profile, also run each top-level stage under cProfile (.prof files next to the profile)'
+    )
+    
     args = parser.parse_args()
     
     # Handle utility commands
@@ -292,6 +320,10 @@ def main():
     # Validate arguments using CLI utilities
     validate_pipeline_args(args, parser)
     
+    # Feature extraction engine override (read by extract_handcrafted_parallel at call time)
+    if args.feature_engine:
+        BATCH_SIZE_CONFIG["feature_extraction"]["engine"] = args.feature_engine
+    
     # Parse model specs if needed for prediction pipeline
     if args.pipeline == 'predict_from_saved':
         model_specs = parse_model_specs_from_args(args)
@@ -322,6 +354,12 @@ def main():
     
     start_time = time.time()
     
+    run_profile = None
+    if args.profile or args.profile_output or args.cprofile:
+        run_profile = start_run_profile(args.profile_output, cprofile=args.cprofile,
+                                        pipeline=args.pipeline, model=args.model, ontology=args.ontology)
+        print(f"📊 Profiling stages to {run_profile.path}")
+    
     try:
         if args.pipeline == 'full_pipeline':
             result = run_full_pipeline(args.model, args.output, mode=args.mode, model_config_override=model_config if (args.model and args.features) else None)
@@ -453,10 +491,21 @@ def main():
         import traceback
         print("\n📋 Full traceback:")
         traceback.print_exc()
+        _finish_run_profile(run_profile, status='failed', error=str(e))
         sys.exit(1)
     
     total_time = time.time() - start_time
     print(f"\n⏱️  Total execution time: {total_time:.1f}s")
+    _finish_run_profile(run_profile, status='ok')
+
+
+def _finish_run_profile(run_profile, **fields):
+    """Close the run profile (if profiling) and print its per-stage summary."""
+    if run_profile is None:
+        return
+    run_profile.finish(**fields)
+    stop_run_profile()
+    print_run_profile_summary(run_profile.path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,2 @@
+# tests/__init__.py
+# Unit tests for CAFA 6 scripts (run from the scripts directory: python -m pytest tests)
@@ -0,0 +1,62 @@
+"""
+Tests for the fused feature column layout.
+
+Usage:
+    python -m pytest tests/test_feature_extraction.py
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+
+from preprocessing import feature_extraction
+
+PROTEINS = ['P1', 'P2', 'P3']
+# Combined embeddings stored in a different row order than the target proteins
+COMBINED_IDS = np.array(['P3', 'P1', 'P2'])
+COMBINED = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+
+def fake_handcrafted_chunk(sequences, chunk_ids):
+    return np.array([[100.0 + int(pid[1:])] for pid in chunk_ids], dtype=np.float32)
+
+
+class TestFusedFeatureLayout(unittest.TestCase):
+    def _extract(self, features, layout):
+        with mock.patch('config.features.FUSED_FEATURE_LAYOUT', layout), \
+             mock.patch('preprocessing.feature_engineering.embeddings.embeddings_v1.load_combined_embeddings',
+                        return_value=(COMBINED, COMBINED_IDS)), \
+             mock.patch.object(feature_extraction, '_fused_handcrafted_chunk', fake_handcrafted_chunk), \
+             mock.patch.object(feature_extraction, 'cleanup_memory', lambda: None):
+            X, ids = feature_extraction._extract_fused_features(
+                {pid: 'MKV' for pid in PROTEINS}, features, 'test', PROTEINS, force_memmap=False, chunk_size=2
+            )
+        self.assertEqual(ids, PROTEINS)
+        return X
+
+    def test_legacy_repeats_combined_block_per_embedding_feature(self):
+        X = self._extract(['protbert', 'esm2', 'hc'], 'legacy')
+        combined = COMBINED[[1, 2, 0]]
+        hc = np.array([[101.0], [102.0], [103.0]], dtype=np.float32)
+        np.testing.assert_array_equal(X, np.hstack([combined, combined, hc]))
+
+    def test_legacy_without_hc_is_combined_block(self):
+        X = self._extract(['protbert', 'esm2'], 'legacy')
+        np.testing.assert_array_equal(X, COMBINED[[1, 2, 0]])
+
+    def test_compact_writes_combined_block_once(self):
+        X = self._extract(['protbert', 'esm2', 'hc'], 'compact')
+        self.assertEqual(X.shape, (3, COMBINED.shape[1] + 1))
+        np.testing.assert_array_equal(X[:, :COMBINED.shape[1]], COMBINED[[1, 2, 0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Tests for feature store LRU eviction.
+
+Usage:
+    python -m pytest tests/test_feature_store.py
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+
+from preprocessing.feature_store import FeatureStore
+from utils.memory_efficient import load_features_memmap
+
+
+def matrix(value: float) -> np.ndarray:
+    return np.full((4, 64), value, dtype=np.float32)
+
+
+class TestFeatureStoreEviction(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        # Room for about one entry, so every put evicts older ones
+        self.max_bytes = 1500
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _seed(self, keys):
+        seeding_store = FeatureStore(self.root, max_bytes=10 ** 9)
+        for i, key in enumerate(keys):
+            seeding_store.put(key, {}, matrix(i), [f"P{j}" for j in range(4)])
+
+    def test_entries_handed_out_by_get_survive_eviction(self):
+        self._seed(['a', 'b'])
+        store = FeatureStore(self.root, max_bytes=self.max_bytes)
+        path, _ = store.get('a')
+        store.put('c', {}, matrix(2), [f"P{j}" for j in range(4)])
+
+        np.testing.assert_array_equal(load_features_memmap(path), matrix(0))
+        self.assertIsNone(store.get('b'))
+
+    def test_entries_written_by_put_survive_later_puts(self):
+        store = FeatureStore(self.root, max_bytes=self.max_bytes)
+        first = store.put('a', {}, matrix(0), [f"P{j}" for j in range(4)])
+        store.put('b', {}, matrix(1), [f"P{j}" for j in range(4)])
+
+        np.testing.assert_array_equal(load_features_memmap(first), matrix(0))
+
+    def test_other_processes_entries_are_evicted(self):
+        self._seed(['a', 'b'])
+        store = FeatureStore(self.root, max_bytes=self.max_bytes)
+        store.put('c', {}, matrix(2), [f"P{j}" for j in range(4)])
+
+        self.assertEqual([entry_dir.name for _, _, entry_dir in store.entries()], ['c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Tests for OBO parsing direction and the persisted GO closure index.
+
+Usage:
+    python -m pytest tests/test_go_closure.py
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+from utils import go_utils
+from utils.go_closure import GO_CLOSURE_VERSION, GOClosureIndex, load_go_closure_index
+
+# root <- child (is_a) <- grandchild (is_a); part <- child (part_of);
+# regulator regulates root (not a hierarchy edge)
+TINY_OBO = """format-version: 1.2
+
+[Term]
+id: GO:0000001
+name: root
+namespace: molecular_function
+
+[Term]
+id: GO:0000002
+name: child
+namespace: molecular_function
+is_a: GO:0000001 ! root
+
+[Term]
+id: GO:0000003
+name: grandchild
+namespace: molecular_function
+is_a: GO:0000002 ! child
+
+[Term]
+id: GO:0000004
+name: part
+namespace: molecular_function
+relationship: part_of GO:0000002 ! child
+
+[Term]
+id: GO:0000005
+name: regulator
+namespace: molecular_function
+relationship: regulates GO:0000001 ! root
+"""
+
+
+def write_tiny_obo(directory: Path) -> Path:
+    obo_path = Path(directory) / 'go-basic.obo'
+    obo_path.write_text(TINY_OBO)
+    return obo_path
+
+
+class ParseOboDirectionTest(unittest.TestCase):
+    """parse_obo_file maps terms to their parents (is_a / part_of), with and without obonet."""
+
+    EXPECTED_PARENTS = {
+        'GO:0000002': {'GO:0000001'},
+        'GO:0000003': {'GO:0000002'},
+        'GO:0000004': {'GO:0000002'},
+    }
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.obo_path = write_tiny_obo(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_manual_parser(self):
+        with mock.patch.object(go_utils, 'OBNET_AVAILABLE', False):
+            parents_map, children_map = go_utils.parse_obo_file(self.obo_path)
+        self.assertEqual(parents_map, self.EXPECTED_PARENTS)
+        self.assertEqual(children_map['GO:0000001'], {'GO:0000002'})
+
+    @unittest.skipUnless(go_utils.OBNET_AVAILABLE, "obonet not installed")
+    def test_obonet_parser(self):
+        parents_map, children_map = go_utils.parse_obo_file(self.obo_path)
+        self.assertEqual(parents_map, self.EXPECTED_PARENTS)
+        self.assertEqual(children_map['GO:0000002'], {'GO:0000003', 'GO:0000004'})
+
+
+class GOClosureIndexTest(unittest.TestCase):
+    """Ancestors run towards the root, descendants towards the leaves."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.obo_path = write_tiny_obo(self.tmp.name)
+        self.cache_dir = Path(self.tmp.name) / 'cache'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _check_direction(self, index: GOClosureIndex):
+        self.assertEqual(index.descendants('GO:0000001'), {'GO:0000002', 'GO:0000003', 'GO:0000004'})
+        self.assertEqual(index.ancestors('GO:0000003'), {'GO:0000001', 'GO:0000002'})
+        self.assertEqual(index.ancestors('GO:0000001'), set())
+        self.assertEqual(index.descendants('GO:0000003'), set())
+
+        codes = index.encode_terms(['GO:0000002', 'GO:0000003'])
+        gathered, owner = index.gather_descendants(codes)
+        self.assertEqual(set(index.term_objects[gathered[owner == 0]]), {'GO:0000003', 'GO:0000004'})
+        self.assertEqual(len(gathered[owner == 1]), 0)
+
+    def test_load_builds_correct_direction(self):
+        index = load_go_closure_index(self.obo_path, cache_dir=self.cache_dir, use_disk_cache=False)
+        self._check_direction(index)
+
+    def test_disk_cache_round_trip(self):
+        index = GOClosureIndex.from_parents_map(go_utils.parse_obo_file(self.obo_path)[0])
+        path = index.save(self.cache_dir / 'index.npz')
+        loaded = GOClosureIndex.load(path)
+        self.assertEqual(loaded.version, GO_CLOSURE_VERSION)
+        self._check_direction(loaded)
+
+    def test_stale_version_is_rebuilt(self):
+        from utils import go_closure
+        from utils.go_closure import compute_file_checksum
+
+        checksum = compute_file_checksum(self.obo_path)
+        # An inverted index saved by an older builder under the current cache name
+        parents_map, _ = go_utils.parse_obo_file(self.obo_path)
+        children_as_parents = {}
+        for term, parents in parents_map.items():
+            for parent in parents:
+                children_as_parents.setdefault(parent, set()).add(term)
+        stale = GOClosureIndex.from_parents_map(children_as_parents, obo_checksum=checksum)
+        stale.version = GO_CLOSURE_VERSION - 1
+        stale.save(self.cache_dir / f'go_closure_v{GO_CLOSURE_VERSION}_{checksum[:16]}.npz')
+
+        go_closure._CLOSURE_INDEX_CACHE.clear()
+        self._check_direction(load_go_closure_index(self.obo_path, cache_dir=self.cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for GOA negative annotation propagation and its on-disk cache.
+
+Usage:
+    python -m pytest tests/test_goa_postprocessing.py
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+from prediction.goa_postprocessing import NegativeAnnotationIndex, build_negative_index
+from tests.test_go_closure import write_tiny_obo
+from utils import go_closure
+from utils.go_closure import GO_CLOSURE_VERSION
+
+# P1 is NOT annotated to the middle term: it and its descendants are negative, its parent is not
+GOA_TSV = """protein_id\tgo_term\tqualifier
+P1\tGO:0000002\tNOT|enables
+P1\tGO:0000001\tenables
+P2\tGO:0000003\tNOT|enables
+"""
+
+
+class NegativeIndexDirectionTest(unittest.TestCase):
+    """NOT annotations propagate to descendants (is_a / part_of), never to ancestors."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.obo_path = write_tiny_obo(self.tmp.name)
+        self.goa_dir = Path(self.tmp.name) / 'goa'
+        self.goa_dir.mkdir()
+        (self.goa_dir / 'goa_uniprot_ver228.tsv').write_text(GOA_TSV)
+        self.cache_dir = Path(self.tmp.name) / 'cache'
+        go_closure._CLOSURE_INDEX_CACHE.clear()
+        # Keep the closure index cache inside the temp dir
+        self.go_cache_patch = mock.patch('config.paths.GO_CACHE_DIR', self.cache_dir)
+        self.go_cache_patch.start()
+
+    def tearDown(self):
+        self.go_cache_patch.stop()
+        go_closure._CLOSURE_INDEX_CACHE.clear()
+        self.tmp.cleanup()
+
+    def _build(self) -> NegativeAnnotationIndex:
+        return build_negative_index(str(self.goa_dir), str(self.obo_path), cache_dir=self.cache_dir)
+
+    def _check_pairs(self, index: NegativeAnnotationIndex):
+        proteins = ['P1', 'P1', 'P1', 'P1', 'P2', 'P2', 'P2']
+        terms = ['GO:0000001', 'GO:0000002', 'GO:0000003', 'GO:0000004', 'GO:0000001', 'GO:0000002', 'GO:0000003']
+        self.assertEqual(index.contains(proteins, terms).tolist(),
+                         [False, True, True, True, False, False, True])
+        self.assertEqual(len(index), 4)
+
+    def test_propagates_to_descendants(self):
+        index = self._build()
+        self.assertEqual(index.closure_version, GO_CLOSURE_VERSION)
+        self._check_pairs(index)
+
+    def test_cached_index_round_trip(self):
+        self._build()
+        self._check_pairs(self._build())
+
+    def test_index_from_older_closure_version_is_rebuilt(self):
+        index = self._build()
+        cache_files = list(self.cache_dir.glob('goa_negatives_*.npz'))
+        self.assertEqual(len(cache_files), 1)
+        # Same file name and provenance, but propagated with an older (inverted) closure index
+        stale = NegativeAnnotationIndex(index.proteins, index.terms, index.keys[:1], index.goa_version,
+                                        index.obo_checksum, index.goa_file_size,
+                                        closure_version=GO_CLOSURE_VERSION - 1)
+        stale.save(cache_files[0])
+        self._check_pairs(self._build())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Tests for the parallel grid search trial log and its resume handling.
+
+Usage:
+    python -m pytest tests/test_parallel_executor.py
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+
+from grid_search.parallel_executor import TrialCheckpoint, build_trials, run_parallel_trials
+
+
+def constant_trial(X, y, params, train_indices, val_indices):
+    """Trial stub: scores the parameter value without training anything."""
+    return {'f1_score': float(params['alpha'])}
+
+
+class TestParallelTrialResume(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self._tmp.name)
+        self.checkpoint = TrialCheckpoint(self.output_dir, 'stub', 'F', {'param_grid': {'alpha': [0.1, 0.2]}})
+        self.trials = build_trials([{'alpha': 0.1}, {'alpha': 0.2}],
+                                   [(np.arange(4), np.arange(4, 6))])
+        self.X = np.zeros((6, 3), dtype=np.float32)
+        self.y = np.zeros((6, 2), dtype=np.float32)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, resume):
+        return run_parallel_trials(constant_trial, self.trials, self.X, self.y, self.checkpoint,
+                                   n_workers=1, threads_per_worker=1, log=lambda message: None,
+                                   resume=resume)
+
+    def _seed_log(self, trial_ids):
+        for trial_id in trial_ids:
+            self.checkpoint.append({'trial_id': trial_id, 'status': 'ok', 'f1_score': -1.0})
+
+    def test_resume_skips_finished_trials(self):
+        self._seed_log(trial.trial_id for trial in self.trials)
+        records = self._run(resume=True)
+        self.assertEqual({record['f1_score'] for record in records.values()}, {-1.0})
+        self.assertFalse(self.checkpoint.path.with_name(self.checkpoint.path.name + '.prev').exists())
+
+    def test_no_resume_rotates_log_and_reruns(self):
+        self._seed_log(trial.trial_id for trial in self.trials)
+        records = self._run(resume=False)
+
+        self.assertEqual(sorted(record['f1_score'] for record in records.values()), [0.1, 0.2])
+        self.assertEqual(len(self.checkpoint.load()), len(self.trials))
+        rotated = self.checkpoint.path.with_name(self.checkpoint.path.name + '.prev')
+        self.assertTrue(rotated.exists())
+        self.assertEqual(len(rotated.read_text().splitlines()), len(self.trials))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for batch fetching from SparseDataset and the batch DataLoader.
+
+Usage:
+    python -m pytest tests/test_sparse_batch_loader.py
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+import numpy as np
+import torch
+from scipy.sparse import csr_matrix, random as sparse_random
+
+from config.training import DATALOADER_LARGE_LABEL_SPACE_THRESHOLD
+from models.nn.mlp_trainer_v4 import SparseDataset
+from utils.dataloader_utils import create_sparse_batch_dataloader
+
+# Unsorted, with a repeat: get_batch sorts rows for the gather and must restore batch order
+POSITIONS = [7, 2, 9, 0, 2, 5]
+
+
+class TestSparseDatasetBatch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.standard_normal((20, 6)).astype(np.float32)
+        self.y = csr_matrix(sparse_random(20, 30, density=0.2, format='csr', random_state=0, dtype=np.float32))
+        self.indices = rng.permutation(20)[:12]
+
+    def assert_batch_matches_items(self, dataset):
+        X_batch, y_batch = dataset.get_batch(POSITIONS)
+        items = [dataset[i] for i in POSITIONS]
+        torch.testing.assert_close(X_batch, torch.stack([features for features, _ in items]))
+        torch.testing.assert_close(y_batch, torch.stack([labels for _, labels in items]))
+
+    def test_sparse_labels(self):
+        self.assert_batch_matches_items(SparseDataset(self.X, self.y, indices=self.indices))
+
+    def test_dense_labels_with_smoothing(self):
+        self.assert_batch_matches_items(SparseDataset(self.X, self.y.toarray(), indices=self.indices,
+                                                      label_smoothing=0.1))
+
+    def test_memmap_features(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'X.npy'
+            np.save(path, self.X)
+            self.assert_batch_matches_items(SparseDataset(path, self.y, indices=self.indices))
+
+    def test_sparse_label_tensor(self):
+        dataset = SparseDataset(self.X, self.y, indices=self.indices, sparse_labels=True)
+        _, y_batch = dataset.get_batch(POSITIONS)
+        expected = torch.stack([dataset[i][1] for i in POSITIONS])
+        torch.testing.assert_close(y_batch.to_dense(), expected)
+
+
+class TestSparseBatchDataloader(unittest.TestCase):
+    def _dataset(self, n_labels):
+        X = np.zeros((8, 3), dtype=np.float32)
+        return SparseDataset(X, csr_matrix((8, n_labels), dtype=np.float32))
+
+    def test_batches_cover_dataset_in_order(self):
+        dataset = self._dataset(5)
+        dataset.X = np.arange(24, dtype=np.float32).reshape(8, 3)
+        loader = create_sparse_batch_dataloader(dataset, batch_size=3, shuffle=False, prefetch_batches=0)
+        X_all = torch.cat([X_batch for X_batch, _ in loader])
+        torch.testing.assert_close(X_all, torch.from_numpy(dataset.X))
+
+    def test_persistent_workers_follow_label_space(self):
+        small = create_sparse_batch_dataloader(self._dataset(5), batch_size=4, num_workers=2, prefetch_batches=0)
+        large = create_sparse_batch_dataloader(self._dataset(DATALOADER_LARGE_LABEL_SPACE_THRESHOLD + 1),
+                                               batch_size=4, num_workers=2, prefetch_batches=0)
+        self.assertTrue(small.persistent_workers)
+        self.assertFalse(large.persistent_workers)
+
+
+if __name__ == '__main__':
+    unittest.main()
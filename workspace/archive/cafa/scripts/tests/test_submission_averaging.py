@@ -0,0 +1,63 @@
+"""
+Tests for the single-pass multi-method submission averaging workflow.
+
+Usage:
+    python -m pytest tests/test_submission_averaging.py
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add scripts directory to path for imports
+scripts_dir = str(Path(__file__).parent.parent)
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+from pipelines.workflows import submission_averaging as workflow
+
+SUBMISSIONS = [
+    "P1\tGO:0000001\t0.500\nP1\tGO:0000002\t0.250\nP2\tGO:0000001\t0.100\n",
+    "P1\tGO:0000001\t0.300\nP2\tGO:0000001\t0.700\n",
+]
+METHOD_SPECS = {
+    'average': {'ensemble_method': 'average', 'output_name': 'average.tsv'},
+    'weighted_average': {'ensemble_method': 'weighted_average', 'output_name': 'weighted.tsv'},
+    'max': {'ensemble_method': 'max', 'output_name': 'max.tsv'},
+}
+
+
+class TestSubmissionAveragingMulti(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self._tmp.name)
+        self.submission_files = []
+        for i, content in enumerate(SUBMISSIONS, 1):
+            path = self.work_dir / f'submission{i}.tsv'
+            path.write_text(content)
+            self.submission_files.append(str(path))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, weights):
+        with mock.patch.object(workflow, 'setup_workflow_paths', return_value=(self.work_dir, self.work_dir)), \
+             mock.patch.object(workflow, 'post_process_submission',
+                               side_effect=lambda temp_submission_path, **kwargs: temp_submission_path):
+            return workflow.run_submission_averaging_multi(self.submission_files, METHOD_SPECS, weights=weights)
+
+    def test_bad_weights_fail_only_weighted_average(self):
+        paths = self._run(weights=[0.0, 0.0])
+        self.assertIsNone(paths['weighted_average'])
+        self.assertIsNotNone(paths['average'])
+        self.assertIsNotNone(paths['max'])
+
+    def test_valid_weights_run_every_method(self):
+        paths = self._run(weights=[3.0, 1.0])
+        self.assertTrue(all(path is not None for path in paths.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
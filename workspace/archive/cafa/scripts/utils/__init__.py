@@ -9,6 +9,11 @@ from .model_io import (
     list_saved_models
 )
 
+from .model_registry import (
+    ModelRegistry,
+    get_model_registry
+)
+
 from .gpu_utils import (
     get_gpu_info,
     check_gpu_available,
@@ -22,8 +27,16 @@ from .model_prediction import (
     predict_with_model
 )
 
+from .cpu_inference import (
+    CPUInferenceEngine,
+    get_cpu_inference_engine,
+    accuracy_delta_report
+)
+
 from .dataloader_utils import (
-    create_training_dataloader
+    create_training_dataloader,
+    create_sparse_batch_dataloader,
+    PrefetchLoader
 )
 
 from .utils_common import (
@@ -61,11 +74,22 @@ from .ontology_utils import (
     get_ontology_codes_and_names
 )
 
+from .profiling import (
+    profile_span,
+    profiled,
+    start_run_profile,
+    stop_run_profile,
+    get_run_profile,
+    print_run_profile_summary
+)
+
 __all__ = [
     # Model I/O
     'save_model',
     'load_model',
     'list_saved_models',
+    'ModelRegistry',
+    'get_model_registry',
     
     # GPU utilities
     'get_gpu_info',
@@ -78,8 +102,15 @@ __all__ = [
     # Model prediction
     'predict_with_model',
     
+    # CPU inference engine
+    'CPUInferenceEngine',
+    'get_cpu_inference_engine',
+    'accuracy_delta_report',
+    
     # DataLoader utilities
     'create_training_dataloader',
+    'create_sparse_batch_dataloader',
+    'PrefetchLoader',
     
     # Common utilities
     'is_kaggle_environment',
@@ -111,5 +142,13 @@ __all__ = [
     'iterate_ontologies_with_check',
     'get_ontology_name_safe',
     'filter_ontologies_with_data',
-    'get_ontology_codes_and_names'
+    'get_ontology_codes_and_names',
+    
+    # Run profiling
+    'profile_span',
+    'profiled',
+    'start_run_profile',
+    'stop_run_profile',
+    'get_run_profile',
+    'print_run_profile_summary'
 ]
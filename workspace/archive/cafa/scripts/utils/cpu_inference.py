@@ -0,0 +1,250 @@
+"""
+CPU inference engine for MLP models (MLPModel v1, MLPModelV3 v3/v4).
+
+Prepares a trained model once for CPU-only prediction boxes:
+- BatchNorm folded into the preceding Linear (eval statistics), Dropout dropped
+- optional dynamic int8 quantization of the Linear layers
+- a fixed intra-op thread count while predicting
+- logits → sigmoid written straight into a preallocated float32/float16 buffer
+  (no per-batch numpy copies or final np.vstack)
+
+predict_with_model() routes CPU PyTorch inference here (CPU_INFERENCE_ENABLED);
+accuracy_delta_report() compares IA-F1 of the eager and engine outputs on a validation split.
+"""
+
+import copy
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+# Engines built by get_cpu_inference_engine, keyed by source model
+_ENGINE_CACHE: 'weakref.WeakKeyDictionary[nn.Module, CPUInferenceEngine]' = weakref.WeakKeyDictionary()
+
+
+def _unwrap(model: nn.Module) -> nn.Module:
+    """Strip DataParallel wrapping."""
+    return model.module if hasattr(model, 'module') else model
+
+
+def fold_batchnorm(model: nn.Module) -> nn.Sequential:
+    """
+    Copy of model.network with each Linear → BatchNorm1d pair fused into one Linear.
+
+    Uses the BatchNorm running statistics (eval mode), so outputs match model.eval()
+    up to float rounding. Dropout layers (identity in eval) are removed.
+
+    Args:
+        model: MLP with a `network` nn.Sequential (or an nn.Sequential itself)
+
+    Returns:
+        nn.Sequential: Folded network in eval mode on CPU
+
+    Raises:
+        ValueError: If the model has no sequential network to fold
+    """
+    from torch.nn.utils.fusion import fuse_linear_bn_eval
+
+    model = _unwrap(model)
+    network = model if isinstance(model, nn.Sequential) else getattr(model, 'network', None)
+    if not isinstance(network, nn.Sequential):
+        raise ValueError(f"Cannot fold {type(model).__name__}: expected a 'network' nn.Sequential")
+
+    layers = [copy.deepcopy(layer).cpu().eval() for layer in network if not isinstance(layer, nn.Dropout)]
+    folded = []
+    for layer in layers:
+        if isinstance(layer, nn.BatchNorm1d) and folded and isinstance(folded[-1], nn.Linear):
+            folded[-1] = fuse_linear_bn_eval(folded[-1], layer)
+        else:
+            folded.append(layer)
+    return nn.Sequential(*folded).eval()
+
+
+def quantize_linear_int8(network: nn.Module) -> nn.Module:
+    """Dynamic int8 quantization of Linear weights (activations quantized per batch at runtime)."""
+    return torch.ao.quantization.quantize_dynamic(network, {nn.Linear}, dtype=torch.qint8)
+
+
+@contextmanager
+def intra_op_threads(num_threads: Optional[int]) -> Iterator[None]:
+    """Temporarily set torch intra-op threads (None leaves the current setting)."""
+    if not num_threads:
+        yield
+        return
+    previous = torch.get_num_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
+class CPUInferenceEngine:
+    """BatchNorm-folded (optionally int8) MLP predicting into a preallocated buffer."""
+
+    def __init__(self,
+                 model: nn.Module,
+                 quantize: Optional[bool] = None,
+                 num_threads: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 output_dtype: Optional[Union[str, np.dtype]] = None):
+        """
+        Args:
+            model: Trained MLPModel / MLPModelV3 (DataParallel is unwrapped)
+            quantize: Dynamic int8 Linear layers (default: CPU_INFERENCE_QUANTIZE)
+            num_threads: Intra-op threads while predicting (default: CPU_INFERENCE_NUM_THREADS, None = torch default)
+            batch_size: Rows per forward pass (default: nn_inference batch size)
+            output_dtype: 'float32' or 'float16' (default: CPU_INFERENCE_OUTPUT_DTYPE)
+        """
+        from config.prediction import CPU_INFERENCE_QUANTIZE, CPU_INFERENCE_NUM_THREADS, CPU_INFERENCE_OUTPUT_DTYPE
+
+        self.quantize = CPU_INFERENCE_QUANTIZE if quantize is None else quantize
+        self.num_threads = CPU_INFERENCE_NUM_THREADS if num_threads is None else num_threads
+        if batch_size is None:
+            from config.features import get_batch_size
+            batch_size = get_batch_size("nn_inference")
+        self.batch_size = batch_size
+        self.output_dtype = np.dtype(output_dtype or CPU_INFERENCE_OUTPUT_DTYPE)
+        if self.output_dtype not in (np.float32, np.float16):
+            raise ValueError(f"output_dtype must be float32 or float16, got {self.output_dtype}")
+
+        network = fold_batchnorm(model)
+        linears = [layer for layer in network if isinstance(layer, nn.Linear)]
+        self.input_dim = linears[0].in_features
+        self.output_dim = linears[-1].out_features
+        self.network = quantize_linear_int8(network) if self.quantize else network
+        self._signature = None  # Set by get_cpu_inference_engine (cache validity)
+
+    def describe(self) -> str:
+        return (f"{'int8' if self.quantize else 'fp32'} folded MLP, {self.num_threads or torch.get_num_threads()} threads, "
+                f"batch {self.batch_size}, {self.output_dtype.name} output")
+
+    def predict(self,
+                X: Union[np.ndarray, np.memmap],
+                out: Optional[np.ndarray] = None,
+                use_sigmoid: bool = True) -> np.ndarray:
+        """
+        Predict all rows of X.
+
+        Args:
+            X: Features (n_samples, input_dim); memmaps are read batch by batch
+            out: Optional preallocated C-contiguous (n_samples, output_dim) buffer of the engine's output dtype
+            use_sigmoid: Apply sigmoid (probabilities) instead of returning logits
+
+        Returns:
+            np.ndarray: out (filled in place)
+        """
+        n_samples = X.shape[0]
+        if out is None:
+            out = np.empty((n_samples, self.output_dim), dtype=self.output_dtype)
+        elif out.shape != (n_samples, self.output_dim) or out.dtype != self.output_dtype or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a C-contiguous {self.output_dtype.name} array of shape "
+                             f"{(n_samples, self.output_dim)}, got {out.dtype} {out.shape}")
+
+        out_tensor = torch.from_numpy(out)
+        with intra_op_threads(self.num_threads), torch.inference_mode():
+            for start in range(0, n_samples, self.batch_size):
+                end = min(start + self.batch_size, n_samples)
+                batch = torch.from_numpy(np.ascontiguousarray(X[start:end], dtype=np.float32))
+                logits = self.network(batch)
+                if use_sigmoid:
+                    logits.sigmoid_()
+                # copy_ casts to float16 when requested; no intermediate numpy array per batch
+                out_tensor[start:end].copy_(logits)
+        return out
+
+
+def supports_cpu_inference(model: Any) -> bool:
+    """True for PyTorch MLPs with a foldable `network` nn.Sequential."""
+    return isinstance(_unwrap(model), nn.Module) and isinstance(getattr(_unwrap(model), 'network', None), nn.Sequential)
+
+
+def get_cpu_inference_engine(model: nn.Module, **engine_kwargs: Any) -> CPUInferenceEngine:
+    """
+    Engine for model, built once and reused across prediction batches.
+
+    Rebuilt when the model's parameters were updated in place since the engine was built
+    (tracked through the parameter/buffer version counters) or when engine_kwargs differ.
+    """
+    source = _unwrap(model)
+    tensors = list(source.parameters()) + list(source.buffers())  # buffers: BatchNorm running statistics
+    signature = (tuple(t._version for t in tensors), tuple(sorted(engine_kwargs.items())))
+    cached = _ENGINE_CACHE.get(source)
+    if cached is not None and cached._signature == signature:
+        return cached
+    engine = CPUInferenceEngine(source, **engine_kwargs)
+    engine._signature = signature
+    _ENGINE_CACHE[source] = engine
+    print(f"   ⚙️  CPU inference engine: {engine.describe()}")
+    return engine
+
+
+def accuracy_delta_report(model: nn.Module,
+                          X_val: np.ndarray,
+                          y_val_true: Any,
+                          ia_weights: Dict[str, float],
+                          mlb: Any,
+                          threshold_grid: Optional[Sequence[float]] = None,
+                          engines: Optional[Dict[str, CPUInferenceEngine]] = None,
+                          batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    IA-weighted F1 of the eager model vs CPU engines on a validation split.
+
+    Args:
+        model: Trained PyTorch MLP (reference: eager fp32 predict_pytorch_full on CPU)
+        X_val: Validation features
+        y_val_true: Validation labels (dense or sparse, mlb.classes_ columns)
+        ia_weights: GO term → IA weight
+        mlb: Fitted MultiLabelBinarizer
+        threshold_grid: Thresholds to sweep (default: PREDICTION_SETTINGS['threshold_grid'])
+        engines: Name → engine (default: folded fp32 and folded int8)
+        batch_size: Eager batch size (default: nn_inference batch size)
+
+    Returns:
+        list[dict]: One row per method: best_f1, best_threshold, f1_delta (vs eager), max_abs_diff
+    """
+    from prediction.threshold_optimization import sweep_ia_weighted_f1
+    from utils.model_prediction import predict_pytorch_full
+
+    if threshold_grid is None:
+        from config.prediction import PREDICTION_SETTINGS
+        threshold_grid = PREDICTION_SETTINGS["threshold_grid"]
+    if batch_size is None:
+        from config.features import get_batch_size
+        batch_size = get_batch_size("nn_inference")
+    if engines is None:
+        engines = {
+            'folded fp32': CPUInferenceEngine(model, quantize=False, batch_size=batch_size, output_dtype='float32'),
+            'folded int8': CPUInferenceEngine(model, quantize=True, batch_size=batch_size, output_dtype='float32'),
+        }
+
+    eager_model = copy.deepcopy(_unwrap(model)).cpu()
+    reference = predict_pytorch_full(eager_model, X_val, device=torch.device('cpu'), batch_size=batch_size)
+    outputs = {'eager fp32': reference}
+    outputs.update({name: engine.predict(X_val) for name, engine in engines.items()})
+
+    rows = []
+    reference_f1 = None
+    for name, proba in outputs.items():
+        f1_scores = sweep_ia_weighted_f1(proba, y_val_true, ia_weights, mlb, threshold_grid)[2]
+        best = int(np.argmax(f1_scores))
+        reference_f1 = float(f1_scores[best]) if reference_f1 is None else reference_f1
+        rows.append({
+            'method': name,
+            'best_f1': float(f1_scores[best]),
+            'best_threshold': float(threshold_grid[best]),
+            'f1_delta': float(f1_scores[best]) - reference_f1,
+            'max_abs_diff': float(np.max(np.abs(proba.astype(np.float32) - reference))) if proba.size else 0.0,
+        })
+    return rows
+
+
+def print_accuracy_delta_report(rows: List[Dict[str, Any]], title: str = "CPU inference accuracy") -> None:
+    """Log accuracy_delta_report rows."""
+    print(f"   📏 {title} (IA-F1 on validation split):")
+    for row in rows:
+        print(f"      {row['method']:<14} F1 {row['best_f1']:.6f} @ {row['best_threshold']:.2f} "
+              f"(Δ {row['f1_delta']:+.6f}, max |Δp| {row['max_abs_diff']:.2e})")
@@ -4,9 +4,11 @@ Consolidates DataLoader creation logic from MLP v1 and v2 trainers.
 """
 
 import numpy as np
+import queue
+import threading
 import torch
-from torch.utils.data import DataLoader, TensorDataset
-from typing import Union, Optional
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler, TensorDataset
+from typing import Any, Iterator, Union, Optional
 import os
 from pathlib import Path
 from scipy.sparse import spmatrix
@@ -29,6 +31,7 @@ from config.training import (
     DATALOADER_MAX_WORKERS_VERY_LARGE_LABELS,
     DATALOADER_VERY_LARGE_LABEL_SPACE_THRESHOLD,
     DATALOADER_DISABLE_PERSISTENT_FOR_LARGE_LABELS,
+    DATALOADER_PREFETCH_THREAD_BATCHES,
     FLOAT32_BYTES,
     MB_TO_BYTES
 )
@@ -168,6 +171,28 @@ def create_training_dataloader(X: np.ndarray,
     return dataloader
 
 
+def resolve_persistent_workers(num_workers: int, n_labels: int) -> bool:
+    """
+    Whether DataLoader workers should persist between epochs.
+    
+    For large label spaces, persistent_workers is disabled to free memory between epochs:
+    persistent workers keep the dataset in memory, which multiplies memory usage.
+    
+    Args:
+        num_workers: DataLoader worker processes
+        n_labels: Label space size
+        
+    Returns:
+        bool: persistent_workers setting
+    """
+    if num_workers <= 0:
+        return False
+    if DATALOADER_DISABLE_PERSISTENT_FOR_LARGE_LABELS and n_labels > DATALOADER_LARGE_LABEL_SPACE_THRESHOLD:
+        print(f"      💾 Disabling persistent_workers for large label space to free memory between epochs")
+        return False
+    return True
+
+
 def create_streaming_dataloader(X: Union[np.ndarray, np.memmap, str, Path],
                                y: Union[np.ndarray, spmatrix],
                                batch_size: Optional[int] = None,
@@ -281,12 +306,7 @@ def create_streaming_dataloader(X: Union[np.ndarray, np.memmap, str, Path],
     # Pin memory for fast CPU→GPU transfer
     pin_memory = (device_str == 'cuda')
     
-    # For large label spaces, disable persistent_workers to free memory between epochs
-    # Persistent workers keep dataset in memory, which multiplies memory usage
-    use_persistent_workers = True if num_workers > 0 else False
-    if DATALOADER_DISABLE_PERSISTENT_FOR_LARGE_LABELS and n_labels > DATALOADER_LARGE_LABEL_SPACE_THRESHOLD:
-        use_persistent_workers = False
-        print(f"      💾 Disabling persistent_workers for large label space to free memory between epochs")
+    use_persistent_workers = resolve_persistent_workers(num_workers, n_labels)
     
     # Estimate total memory before creating DataLoader
     # Each worker copies the entire dataset object (sparse matrix + indices + overhead)
@@ -339,3 +359,115 @@ def create_streaming_dataloader(X: Union[np.ndarray, np.memmap, str, Path],
     
     return dataloader
 
+
+class PrefetchLoader:
+    """
+    Wrap a DataLoader with a background thread that prepares batches ahead of the consumer.
+    
+    The thread iterates the wrapped loader (running dataset fetches and, optionally,
+    pinning tensors) while the training loop works on the current batch. Useful with
+    num_workers=0 (Kaggle), where fetching otherwise serializes with the GPU step.
+    Exceptions raised in the thread are re-raised in the consumer.
+    """
+    
+    _END = object()
+    
+    def __init__(self, loader: DataLoader, depth: int = 2, pin_memory: bool = False):
+        """
+        Args:
+            loader: DataLoader (or any re-iterable batch source) to wrap
+            depth: Number of batches prepared ahead
+            pin_memory: Pin dense tensors of each batch (for non_blocking CUDA copies)
+        """
+        self.loader = loader
+        self.depth = max(1, depth)
+        self.pin_memory = pin_memory
+    
+    def __len__(self) -> int:
+        return len(self.loader)
+    
+    def _pin(self, batch: Any) -> Any:
+        if isinstance(batch, torch.Tensor):
+            return batch if batch.is_sparse else batch.pin_memory()
+        if isinstance(batch, (list, tuple)):
+            return type(batch)(self._pin(item) for item in batch)
+        return batch
+    
+    def __iter__(self) -> Iterator[Any]:
+        batches: queue.Queue = queue.Queue(maxsize=self.depth)
+        stop = threading.Event()
+        
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce() -> None:
+            try:
+                for batch in self.loader:
+                    if not put(self._pin(batch) if self.pin_memory else batch):
+                        return
+                put(self._END)
+            except BaseException as exc:  # forwarded to the consumer
+                put(exc)
+        
+        thread = threading.Thread(target=produce, name='batch-prefetch', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is self._END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Consumer finished or stopped early: release the producer
+            stop.set()
+            thread.join()
+
+
+def create_sparse_batch_dataloader(dataset: Dataset,
+                                   batch_size: int,
+                                   shuffle: bool = True,
+                                   num_workers: int = 0,
+                                   device: Union[str, torch.device] = 'cpu',
+                                   prefetch_batches: int = DATALOADER_PREFETCH_THREAD_BATCHES) -> Union[DataLoader, PrefetchLoader]:
+    """
+    Create a DataLoader that fetches whole batches from a batch-capable dataset.
+    
+    A BatchSampler hands each dataset call a list of indices, so SparseDataset
+    (models.nn.mlp_trainer_v4) gathers features and labels once per batch instead of
+    once per sample, and default per-sample collation is skipped (batch_size=None).
+    Shuffling draws the same permutation as DataLoader(shuffle=True) for a given seed.
+    
+    Args:
+        dataset: Dataset whose __getitem__ accepts a list of indices
+        batch_size: Samples per batch
+        shuffle: Shuffle samples each epoch
+        num_workers: DataLoader worker processes
+        device: Training device (pinning is enabled for CUDA)
+        prefetch_batches: Batches prepared ahead by a background thread (0 = no thread)
+    
+    Returns:
+        DataLoader, or PrefetchLoader wrapping it when prefetch_batches > 0
+    """
+    pin_memory = device_to_string(device) == 'cuda'
+    sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+    loader = DataLoader(
+        dataset,
+        sampler=BatchSampler(sampler, batch_size=batch_size, drop_last=False),
+        batch_size=None,
+        num_workers=num_workers,
+        # The prefetch thread pins instead, so pinning overlaps with compute
+        pin_memory=pin_memory and prefetch_batches <= 0,
+        # Same large-label-space rule as create_streaming_dataloader (n_labels from SparseDataset)
+        persistent_workers=resolve_persistent_workers(num_workers, getattr(dataset, 'n_labels', 0))
+    )
+    if prefetch_batches > 0:
+        return PrefetchLoader(loader, depth=prefetch_batches, pin_memory=pin_memory)
+    return loader
@@ -0,0 +1,329 @@
+"""
+Precomputed GO closure index for CAFA 6 protein function prediction.
+Stores every term's ancestors and descendants as CSR integer arrays over a stable
+term -> int mapping (sorted term IDs), persisted to disk with the OBO checksum so the
+OBO file is parsed and walked once instead of per protein/term/ontology call.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Set, List, Tuple, Optional, Iterable
+
+import numpy as np
+
+# Bump when the index is built differently (cached go_closure_v<N>_*.npz files of
+# other versions are ignored). v2: parents from obonet edges were inverted in v1.
+GO_CLOSURE_VERSION = 2
+
+# In-process cache: (resolved OBO path, mtime_ns, size) -> GOClosureIndex
+_CLOSURE_INDEX_CACHE: Dict[Tuple[str, int, int], 'GOClosureIndex'] = {}
+
+
+def compute_file_checksum(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hex digest of a file, reading in chunks.
+    
+    Args:
+        path: File to hash
+        chunk_size: Read size in bytes
+        
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _gather_csr_rows(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gather the concatenated CSR rows for an array of row ids.
+    
+    Returns:
+        tuple: (values, owner) - gathered column indices and the position in `rows` each came from
+    """
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    owner = np.repeat(np.arange(len(rows), dtype=np.int64), lengths)
+    if len(owner) == 0:
+        return indices[:0], owner
+    first = np.cumsum(lengths) - lengths
+    positions = starts[owner] + (np.arange(len(owner), dtype=np.int64) - first[owner])
+    return indices[positions], owner
+
+
+class GOClosureIndex:
+    """
+    Transitive closure of the GO DAG as CSR arrays.
+    
+    Attributes:
+        terms: Sorted array of GO term IDs (index = stable term id)
+        ancestor_indptr, ancestor_indices: CSR rows of strict ancestors per term
+        descendant_indptr, descendant_indices: CSR rows of strict descendants per term
+        obo_checksum: SHA-256 of the OBO file the index was built from
+        version: GO_CLOSURE_VERSION of the code that built the index
+    """
+    
+    def __init__(self,
+                 terms: np.ndarray,
+                 ancestor_indptr: np.ndarray,
+                 ancestor_indices: np.ndarray,
+                 descendant_indptr: np.ndarray,
+                 descendant_indices: np.ndarray,
+                 obo_checksum: str = '',
+                 version: int = GO_CLOSURE_VERSION):
+        self.terms = terms
+        self.ancestor_indptr = ancestor_indptr
+        self.ancestor_indices = ancestor_indices
+        self.descendant_indptr = descendant_indptr
+        self.descendant_indices = descendant_indices
+        self.obo_checksum = obo_checksum
+        self.version = version
+        # Object array shares the Python strings, so fancy indexing does not copy them
+        self.term_objects = np.array(terms.tolist(), dtype=object)
+        self.term_to_idx = {term: i for i, term in enumerate(self.term_objects)}
+    
+    @property
+    def n_terms(self) -> int:
+        return len(self.terms)
+    
+    @classmethod
+    def from_parents_map(cls, parents_map: Dict[str, Set[str]], obo_checksum: str = '') -> 'GOClosureIndex':
+        """
+        Build the closure from a parents map (term -> set of direct parents).
+        Ancestor sets are accumulated in topological order (parents before children).
+        """
+        all_terms = set(parents_map.keys())
+        for parents in parents_map.values():
+            all_terms |= set(parents)
+        terms = np.array(sorted(all_terms))
+        term_to_idx = {term: i for i, term in enumerate(terms.tolist())}
+        n_terms = len(terms)
+        
+        parents_idx = [[] for _ in range(n_terms)]
+        children_idx = [[] for _ in range(n_terms)]
+        for child, parents in parents_map.items():
+            child_idx = term_to_idx[child]
+            for parent in parents:
+                parent_idx = term_to_idx[parent]
+                parents_idx[child_idx].append(parent_idx)
+                children_idx[parent_idx].append(child_idx)
+        
+        # Kahn's algorithm from the roots downwards
+        pending = [len(p) for p in parents_idx]
+        queue = [i for i in range(n_terms) if pending[i] == 0]
+        ancestors: List[Optional[Set[int]]] = [None] * n_terms
+        while queue:
+            node = queue.pop()
+            node_ancestors = set()
+            for parent in parents_idx[node]:
+                node_ancestors.add(parent)
+                node_ancestors |= ancestors[parent]
+            ancestors[node] = node_ancestors
+            for child in children_idx[node]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    queue.append(child)
+        
+        # Terms on cycles (malformed OBO) fall back to a stack walk
+        for node in range(n_terms):
+            if ancestors[node] is None:
+                found = set()
+                stack = [node]
+                while stack:
+                    for parent in parents_idx[stack.pop()]:
+                        if parent not in found:
+                            found.add(parent)
+                            stack.append(parent)
+                found.discard(node)
+                ancestors[node] = found
+        
+        ancestor_indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum([len(a) for a in ancestors], out=ancestor_indptr[1:])
+        ancestor_indices = np.fromiter(
+            (a for node_ancestors in ancestors for a in sorted(node_ancestors)),
+            dtype=np.int32, count=int(ancestor_indptr[-1])
+        )
+        
+        # Descendants are the transpose of the ancestor relation
+        owners = np.repeat(np.arange(n_terms, dtype=np.int32), np.diff(ancestor_indptr))
+        order = np.lexsort((owners, ancestor_indices))
+        descendant_indices = owners[order]
+        descendant_indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ancestor_indices, minlength=n_terms), out=descendant_indptr[1:])
+        
+        return cls(terms, ancestor_indptr, ancestor_indices,
+                   descendant_indptr, descendant_indices, obo_checksum)
+    
+    def save(self, path: Path) -> Path:
+        """Save the index as .npz (term table, CSR arrays, OBO checksum and builder version)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            terms=self.terms,
+            ancestor_indptr=self.ancestor_indptr,
+            ancestor_indices=self.ancestor_indices,
+            descendant_indptr=self.descendant_indptr,
+            descendant_indices=self.descendant_indices,
+            obo_checksum=np.array(self.obo_checksum),
+            version=np.array(self.version)
+        )
+        return path
+    
+    @classmethod
+    def load(cls, path: Path) -> 'GOClosureIndex':
+        """Load an index saved with save()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data['terms'],
+                data['ancestor_indptr'],
+                data['ancestor_indices'],
+                data['descendant_indptr'],
+                data['descendant_indices'],
+                str(data['obo_checksum']),
+                int(data['version']) if 'version' in data.files else 1
+            )
+    
+    def encode_terms(self, terms: Iterable[str]) -> np.ndarray:
+        """Map term IDs to stable ints (-1 for terms not in the ontology)."""
+        lookup = self.term_to_idx
+        return np.fromiter((lookup.get(t, -1) for t in terms), dtype=np.int64)
+    
+    def ancestors(self, go_id: str) -> Set[str]:
+        """All strict ancestors of a term (empty set if unknown)."""
+        idx = self.term_to_idx.get(go_id)
+        if idx is None:
+            return set()
+        return set(self.term_objects[self.ancestor_indices[self.ancestor_indptr[idx]:self.ancestor_indptr[idx + 1]]])
+    
+    def descendants(self, go_id: str) -> Set[str]:
+        """All strict descendants of a term (empty set if unknown)."""
+        idx = self.term_to_idx.get(go_id)
+        if idx is None:
+            return set()
+        return set(self.term_objects[self.descendant_indices[self.descendant_indptr[idx]:self.descendant_indptr[idx + 1]]])
+    
+    def gather_descendants(self, term_codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Strict descendants of many term codes at once.
+        
+        Returns:
+            tuple: (descendant codes, position in term_codes each descendant belongs to)
+        """
+        return _gather_csr_rows(self.descendant_indptr, self.descendant_indices, term_codes)
+    
+    def propagate_up(self, protein_terms_dict: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Add all ancestors to each protein's terms (sorted lists, same as propagate_labels_up)."""
+        return self._propagate(protein_terms_dict, self.ancestor_indptr, self.ancestor_indices)
+    
+    def propagate_down(self, protein_terms_dict: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Add all descendants to each protein's terms (sorted lists)."""
+        return self._propagate(protein_terms_dict, self.descendant_indptr, self.descendant_indices)
+    
+    def _propagate(self,
+                   protein_terms_dict: Dict[str, List[str]],
+                   indptr: np.ndarray,
+                   indices: np.ndarray) -> Dict[str, List[str]]:
+        """
+        Vectorized closure expansion for many proteins at once.
+        Known terms are expanded with one CSR gather and deduplicated by sorting
+        (protein, term) keys once; term ids sort like term strings.
+        """
+        protein_ids = list(protein_terms_dict.keys())
+        term_lists = [protein_terms_dict[pid] for pid in protein_ids]
+        counts = np.fromiter((len(t) for t in term_lists), dtype=np.int64, count=len(term_lists))
+        owner = np.repeat(np.arange(len(protein_ids), dtype=np.int64), counts)
+        flat_terms = [t for terms in term_lists for t in terms]
+        codes = self.encode_terms(flat_terms)
+        
+        known = codes >= 0
+        gathered, gathered_owner = _gather_csr_rows(indptr, indices, codes[known])
+        all_owner = np.concatenate([owner[known], owner[known][gathered_owner]])
+        all_codes = np.concatenate([codes[known], gathered.astype(np.int64)])
+        keys = all_owner * self.n_terms + all_codes
+        keys.sort()
+        if len(keys) > 1:
+            keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+        
+        key_owner = keys // self.n_terms
+        bounds = np.searchsorted(key_owner, np.arange(len(protein_ids) + 1)).tolist()
+        term_strings = self.term_objects[keys % self.n_terms].tolist()
+        
+        # Proteins with terms outside the ontology keep them (merged in string order)
+        unknown = {}
+        for pos in np.flatnonzero(~known).tolist():
+            unknown.setdefault(int(owner[pos]), set()).add(flat_terms[pos])
+        
+        propagated = {}
+        for i, pid in enumerate(protein_ids):
+            expanded = term_strings[bounds[i]:bounds[i + 1]]
+            if i in unknown:
+                expanded = sorted(set(expanded) | unknown[i])
+            propagated[pid] = expanded
+        return propagated
+
+
+def load_go_closure_index(obo_path: Path,
+                          cache_dir: Optional[Path] = None,
+                          use_disk_cache: bool = True) -> GOClosureIndex:
+    """
+    Load (or build and persist) the GO closure index for an OBO file.
+    
+    The index is memoized in-process per (path, mtime, size) and cached on disk as
+    go_closure_v<GO_CLOSURE_VERSION>_<checksum>.npz; a cached file whose stored
+    checksum or builder version does not match is rebuilt.
+    
+    Args:
+        obo_path: Path to go-basic.obo
+        cache_dir: Directory for the persisted index (defaults to GO_CACHE_DIR)
+        use_disk_cache: If False, always build from the OBO (still memoized in-process)
+        
+    Returns:
+        GOClosureIndex: Closure index for the ontology
+    """
+    obo_path = Path(obo_path)
+    if not obo_path.exists():
+        raise FileNotFoundError(f"OBO file not found: {obo_path}")
+    
+    stat = obo_path.stat()
+    memo_key = (str(obo_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if memo_key in _CLOSURE_INDEX_CACHE:
+        return _CLOSURE_INDEX_CACHE[memo_key]
+    
+    checksum = compute_file_checksum(obo_path)
+    if cache_dir is None:
+        from config.paths import GO_CACHE_DIR
+        cache_dir = GO_CACHE_DIR
+    cache_path = Path(cache_dir) / f'go_closure_v{GO_CLOSURE_VERSION}_{checksum[:16]}.npz'
+    
+    index = None
+    if use_disk_cache and cache_path.exists():
+        try:
+            index = GOClosureIndex.load(cache_path)
+            if index.obo_checksum != checksum or index.version != GO_CLOSURE_VERSION:
+                print(f"[go_closure] Cached index checksum/version mismatch, rebuilding: {cache_path}")
+                index = None
+            else:
+                print(f"[go_closure] Loaded GO closure index: {index.n_terms:,} terms ({cache_path.name})")
+        except Exception as e:
+            print(f"[go_closure] Could not load cached index ({e}), rebuilding")
+            index = None
+    
+    if index is None:
+        from utils.go_utils import parse_obo_file
+        parents_map, _ = parse_obo_file(obo_path)
+        index = GOClosureIndex.from_parents_map(parents_map, obo_checksum=checksum)
+        print(f"[go_closure] Built GO closure index: {index.n_terms:,} terms, "
+              f"{len(index.ancestor_indices):,} ancestor links")
+        if use_disk_cache:
+            try:
+                index.save(cache_path)
+                print(f"[go_closure] Saved GO closure index: {cache_path}")
+            except OSError as e:
+                print(f"[go_closure] Could not save index ({e}), continuing in-memory")
+    
+    _CLOSURE_INDEX_CACHE[memo_key] = index
+    return index
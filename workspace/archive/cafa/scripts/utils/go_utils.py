@@ -41,9 +41,10 @@ def parse_obo_file(obo_path: Path) -> Tuple[Dict[str, Set[str]], Dict[str, Set[s
         try:
             graph = obonet.read_obo(str(obo_path))
             
-            for term_id in graph.nodes():
-                # Get all parent terms via is_a and part_of relationships
-                for parent_id in graph.predecessors(term_id):
+            # obonet edges run child -> parent, keyed by relationship type;
+            # keep is_a and part_of like the manual parser below
+            for term_id, parent_id, relation in graph.out_edges(keys=True):
+                if relation in ('is_a', 'part_of'):
                     parents_map[term_id].add(parent_id)
                     children_map[parent_id].add(term_id)
             
@@ -105,7 +106,8 @@ def get_ancestors(go_id: str, parents_map: Dict[str, Set[str]]) -> Set[str]:
 
 
 def propagate_labels_up(protein_terms_dict: Dict[str, List[str]], 
-                       parents_map: Dict[str, Set[str]]) -> Dict[str, List[str]]:
+                       parents_map: Optional[Dict[str, Set[str]]] = None,
+                       closure_index=None) -> Dict[str, List[str]]:
     """
     Propagate protein labels up the GO graph by adding ancestor terms.
     
@@ -115,10 +117,17 @@ def propagate_labels_up(protein_terms_dict: Dict[str, List[str]],
     Args:
         protein_terms_dict: Dictionary mapping protein_id -> list of GO term IDs
         parents_map: Dictionary mapping term_id -> set of parent term_ids
+        closure_index: Optional GOClosureIndex (utils.go_closure); when given, ancestors
+                       come from its precomputed CSR arrays in one vectorized pass
         
     Returns:
         dict: Updated protein_terms_dict with propagated labels
     """
+    if closure_index is not None:
+        return closure_index.propagate_up(protein_terms_dict)
+    if parents_map is None:
+        raise ValueError("propagate_labels_up requires parents_map or closure_index")
+    
     propagated = {}
     
     for protein_id, terms in protein_terms_dict.items():
@@ -136,21 +145,199 @@ def propagate_labels_up(protein_terms_dict: Dict[str, List[str]],
     return propagated
 
 
+# In-process cache: (id(parents_map), classes tuple) -> (parents_map, PropagationPlan).
+# The parents_map reference is held so its id cannot be reused while cached.
+_PROPAGATION_PLAN_CACHE: Dict[Tuple[int, Tuple[str, ...]], Tuple[Dict[str, Set[str]], 'PropagationPlan']] = {}
+
+
+class PropagationPlan:
+    """
+    Precompiled child -> parent max-propagation over a fixed class list.
+    
+    Terms are levelled bottom-up (leaves are level 0, every parent sits above all of
+    its children), and the child -> parent edges are grouped by the child's level and
+    sorted by parent. Sweeping the levels in order pushes each child's final score
+    into its parents with one gather + segment-max per level, which gives the exact
+    fixed point of iterative max-propagation in a single pass.
+    
+    Attributes:
+        n_classes: Number of prediction columns the plan was built for
+        levels: List of (child_idx, parent_idx, segment_starts) per level, where
+                parent_idx holds the unique parents of the level and segment_starts
+                the offsets of each parent's children in child_idx
+        cyclic_edges: Same triple for edges on or above a cycle (malformed OBO),
+                      applied iteratively until the scores stop changing
+    """
+    
+    def __init__(self,
+                 n_classes: int,
+                 levels: List[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                 cyclic_edges: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None):
+        self.n_classes = n_classes
+        self.levels = levels
+        self.cyclic_edges = cyclic_edges
+    
+    @property
+    def n_edges(self) -> int:
+        n_edges = sum(len(children) for children, _, _ in self.levels)
+        if self.cyclic_edges is not None:
+            n_edges += len(self.cyclic_edges[0])
+        return n_edges
+    
+    @staticmethod
+    def _group_edges(child_idx: np.ndarray, parent_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sort edges by parent and return (children, unique parents, segment starts)."""
+        order = np.argsort(parent_idx, kind='stable')
+        child_idx = child_idx[order]
+        parent_idx = parent_idx[order]
+        starts = np.flatnonzero(np.r_[True, parent_idx[1:] != parent_idx[:-1]])
+        return child_idx, parent_idx[starts], starts
+    
+    @staticmethod
+    def _push(pred_batch: np.ndarray, edges: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+        """Return max(parent score, max child score) for each unique parent in edges."""
+        children, parents, starts = edges
+        child_max = np.maximum.reduceat(pred_batch[:, children], starts, axis=1)
+        return np.maximum(pred_batch[:, parents], child_max)
+    
+    def apply(self, pred_batch: np.ndarray) -> np.ndarray:
+        """
+        Propagate scores up the graph in place.
+        
+        Args:
+            pred_batch: Prediction probabilities, shape (batch_size, n_classes)
+            
+        Returns:
+            np.ndarray: pred_batch (modified in place)
+        """
+        if pred_batch.shape[1] != self.n_classes:
+            raise ValueError(f"pred_batch columns ({pred_batch.shape[1]}) must match plan classes ({self.n_classes})")
+        if pred_batch.shape[0] == 0:
+            return pred_batch
+        
+        for edges in self.levels:
+            pred_batch[:, edges[1]] = self._push(pred_batch, edges)
+        
+        if self.cyclic_edges is not None:
+            parents = self.cyclic_edges[1]
+            while True:
+                updated = self._push(pred_batch, self.cyclic_edges)
+                if np.array_equal(updated, pred_batch[:, parents]):
+                    break
+                pred_batch[:, parents] = updated
+        
+        return pred_batch
+
+
+def build_propagation_plan(parents_map: Dict[str, Set[str]],
+                           classes_list: List[str]) -> PropagationPlan:
+    """
+    Compile the propagation plan for a class list.
+    
+    Only direct parent edges between terms that are both in classes_list are used,
+    matching the restricted parent map of the original iterative propagation.
+    
+    Args:
+        parents_map: Dictionary mapping term_id -> set of parent term_ids
+        classes_list: List of GO term IDs in the same order as the prediction columns
+        
+    Returns:
+        PropagationPlan: Level-grouped edge index arrays
+    """
+    term_to_idx = {term: idx for idx, term in enumerate(classes_list)}
+    n_classes = len(classes_list)
+    
+    edge_children = []
+    edge_parents = []
+    for child_idx, term in enumerate(classes_list):
+        for parent in parents_map.get(term, ()):
+            parent_idx = term_to_idx.get(parent)
+            if parent_idx is not None and parent_idx != child_idx:
+                edge_children.append(child_idx)
+                edge_parents.append(parent_idx)
+    edge_children = np.array(edge_children, dtype=np.int64)
+    edge_parents = np.array(edge_parents, dtype=np.int64)
+    
+    # Kahn's algorithm from the leaves upwards: a term's level is one above its highest child
+    children_of = [[] for _ in range(n_classes)]
+    parents_of = [[] for _ in range(n_classes)]
+    for child_idx, parent_idx in zip(edge_children.tolist(), edge_parents.tolist()):
+        children_of[parent_idx].append(child_idx)
+        parents_of[child_idx].append(parent_idx)
+    pending = [len(children) for children in children_of]
+    level = np.full(n_classes, -1, dtype=np.int64)
+    queue = [idx for idx in range(n_classes) if pending[idx] == 0]
+    for idx in queue:
+        level[idx] = 0
+    while queue:
+        node = queue.pop()
+        for parent_idx in parents_of[node]:
+            level[parent_idx] = max(level[parent_idx], level[node] + 1)
+            pending[parent_idx] -= 1
+            if pending[parent_idx] == 0:
+                queue.append(parent_idx)
+    
+    levels = []
+    edge_levels = level[edge_children]
+    if len(edge_levels):
+        for lvl in range(int(edge_levels.max()) + 1):
+            mask = edge_levels == lvl
+            if mask.any():
+                levels.append(PropagationPlan._group_edges(edge_children[mask], edge_parents[mask]))
+    
+    # Children never levelled sit on (or below) a cycle
+    cyclic_edges = None
+    cyclic_mask = edge_levels < 0
+    if cyclic_mask.any():
+        cyclic_edges = PropagationPlan._group_edges(edge_children[cyclic_mask], edge_parents[cyclic_mask])
+    
+    return PropagationPlan(n_classes, levels, cyclic_edges)
+
+
+def get_propagation_plan(parents_map: Dict[str, Set[str]],
+                         classes_list: List[str]) -> PropagationPlan:
+    """
+    Get the propagation plan for a class list, building it on first use.
+    
+    Plans are cached per (parents_map, classes_list), so repeated batches for the
+    same ontology reuse the compiled index arrays.
+    
+    Args:
+        parents_map: Dictionary mapping term_id -> set of parent term_ids
+        classes_list: List of GO term IDs (e.g., mlb.classes_)
+        
+    Returns:
+        PropagationPlan: Cached or newly built plan
+    """
+    cache_key = (id(parents_map), tuple(classes_list))
+    cached = _PROPAGATION_PLAN_CACHE.get(cache_key)
+    if cached is not None:
+        return cached[1]
+    
+    plan = build_propagation_plan(parents_map, list(classes_list))
+    _PROPAGATION_PLAN_CACHE[cache_key] = (parents_map, plan)
+    return plan
+
+
 def propagate_predictions_batch(pred_batch: np.ndarray,
                                parents_map: Dict[str, Set[str]],
                                classes_list: List[str],
-                               iterations: int = 3) -> np.ndarray:
+                               iterations: int = 3,
+                               plan: Optional[PropagationPlan] = None) -> np.ndarray:
     """
     Propagate predictions up the GO graph in batch.
     
     For each prediction, if a child term has a high score, propagate it to parent terms
     (using max operation: parent score = max(parent_score, child_score)).
+    Uses a precompiled PropagationPlan (cached per classes_list), so the result is the
+    fully converged propagation after a single level-ordered sweep.
     
     Args:
         pred_batch: Prediction probabilities, shape (batch_size, n_classes), dtype float32
         parents_map: Dictionary mapping term_id -> set of parent term_ids
         classes_list: List of GO term IDs in the same order as pred_batch columns
-        iterations: Number of propagation iterations (default: 3)
+        iterations: Unused; kept for backward compatibility (the sweep is exact)
+        plan: Optional prebuilt plan for classes_list (skips the cache lookup)
         
     Returns:
         np.ndarray: Updated pred_batch with propagated predictions, same shape
@@ -158,41 +345,6 @@ def propagate_predictions_batch(pred_batch: np.ndarray,
     if pred_batch.shape[1] != len(classes_list):
         raise ValueError(f"pred_batch columns ({pred_batch.shape[1]}) must match classes_list length ({len(classes_list)})")
     
-    # Create restricted parents map (only include terms that are in classes_list)
-    restricted_parents = {}
-    term_to_idx = {term: idx for idx, term in enumerate(classes_list)}
-    
-    for term in classes_list:
-        restricted_parents[term] = set()
-        for parent in parents_map.get(term, []):
-            if parent in term_to_idx:
-                restricted_parents[term].add(parent)
-    
-    # Create index mapping for efficient lookup
-    idx_map = {idx: classes_list[idx] for idx in range(len(classes_list))}
-    
-    # Propagate iteratively
-    for iteration in range(iterations):
-        changed = False
-        
-        # For each child term, update parent terms
-        for child_idx in range(len(classes_list)):
-            child_term = idx_map[child_idx]
-            child_scores = pred_batch[:, child_idx]
-            
-            # Update each parent of this child
-            for parent_term in restricted_parents.get(child_term, []):
-                parent_idx = term_to_idx[parent_term]
-                
-                # Update parent where child's score exceeds parent's score
-                mask = child_scores > pred_batch[:, parent_idx]
-                if mask.any():
-                    pred_batch[mask, parent_idx] = child_scores[mask]
-                    changed = True
-        
-        # Early stopping if no changes
-        if not changed:
-            break
-    
-    return pred_batch
-
+    if plan is None:
+        plan = get_propagation_plan(parents_map, classes_list)
+    return plan.apply(pred_batch)
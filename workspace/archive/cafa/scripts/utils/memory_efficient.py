@@ -118,6 +118,15 @@ def load_features_memmap(path: Union[str, Path],
     if not path.exists():
         raise FileNotFoundError(f"Memmap file not found: {path}")
     
+    # Real .npy files (e.g. feature store entries) carry their own header
+    with open(path, 'rb') as f:
+        is_npy = f.read(6) == b'\x93NUMPY'
+    if is_npy:
+        memmap = np.load(path, mmap_mode=mode)
+        X_size_mb = calculate_memory_size_mb(memmap.shape, dtype_bytes=FLOAT32_BYTES)
+        print(f"   📂 Loaded features from memmap: {path} ({memmap.shape}, {X_size_mb:.1f}MB)")
+        return memmap
+    
     # Load shape from metadata file if available
     metadata_path = path.with_suffix('.npy.meta')
     if metadata_path.exists():
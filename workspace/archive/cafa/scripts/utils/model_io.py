@@ -3,6 +3,7 @@ Model persistence utilities for CAFA 6 protein function prediction.
 Handles saving, loading, and metadata tracking for trained models.
 """
 
+import os
 import pickle
 import json
 from pathlib import Path
@@ -130,6 +131,10 @@ def load_model(ont_code, model_type, version='latest', models_dir=None, models_s
     """
     Load saved model and metadata using clean naming format.
     
+    Resolved through the model registry (utils/model_registry.py): directories are
+    indexed once per process and loaded models are kept in an LRU cache, so repeated
+    loads of the same file return the same (model, mlb, metadata) objects.
+    
     Args:
         ont_code: Ontology code ('F', 'P', 'C')
         model_type: Model type short name (e.g., 'lr', 'xgb', 'nn')
@@ -185,132 +190,27 @@ def load_model(ont_code, model_type, version='latest', models_dir=None, models_s
             else:
                 raise ValueError(f"No models directories found. MODELS_DIR and MODELS_INPUT_DIR are not set. ({source_desc})")
     
-    if version == 'latest':
-        # Find the latest version across all search directories
-        all_model_files = []
-        
-        for models_dir_path in search_dirs:
-            type_dir = models_dir_path / model_type
-            if type_dir.exists():
-                for version_dir in type_dir.iterdir():
-                    if version_dir.is_dir():
-                        # NN models use .pth, others use .pkl
-                        file_ext = MODEL_FILE_EXTENSION_PTH if model_type == 'nn' else MODEL_FILE_EXTENSION_PKL
-                        pattern = f"{model_type}_*_{ont_code}{file_ext}"
-                        all_model_files.extend(list(version_dir.glob(pattern)))
-        
-        if not all_model_files:
-            dirs_str = ', '.join(str(d) for d in search_dirs)
-            raise FileNotFoundError(f"No {model_type} models found for {ont_code} in {dirs_str}")
-        
-        # Extract version numbers and find latest
-        versions = []
-        for f in all_model_files:
-            try:
-                # Extract version from filename like "lr_1.1_F.pkl"
-                parts = f.stem.split('_')
-                if len(parts) >= 3:
-                    v_str = parts[1]
-                    # Convert to comparable format (e.g., "1.1" -> 1.1)
-                    if '.' in v_str:
-                        v_num = float(v_str)
-                    else:
-                        v_num = int(v_str)
-                    versions.append((v_num, f))
-            except (ValueError, IndexError):
-                continue
-        
-        if not versions:
-            dirs_str = ', '.join(str(d) for d in search_dirs)
-            raise FileNotFoundError(f"No valid {model_type} models found for {ont_code} in {dirs_str}")
-        
-        # Get latest version
-        latest_version, model_path = max(versions, key=lambda x: x[0])
-        print(f"   [OK] Loading latest {model_type} {latest_version} model for {ont_code} from {model_path.parent.parent.parent.name}")
-    else:
-        # Load specific version: check both locations
-        # NN models use .pth, others use .pkl
-        file_ext = MODEL_FILE_EXTENSION_PTH if model_type == 'nn' else MODEL_FILE_EXTENSION_PKL
-        filename = f"{model_type}_{version}_{ont_code}{file_ext}"
-        model_path = None
-        checked_paths = []
-        load_errors = []
-        
-        # Try MODELS_DIR first, then MODELS_INPUT_DIR
-        # If loading from one location fails, try the next
-        for models_dir_path in search_dirs:
-            # Ensure absolute path
-            models_dir_path = models_dir_path.resolve() if isinstance(models_dir_path, Path) else Path(models_dir_path).resolve()
-            
-            # Check if base directory exists
-            if not models_dir_path.exists():
-                checked_paths.append(f"[DIR NOT FOUND] {models_dir_path}")
-                continue
-            
-            # First, check version folder structure: models/{type}/{version}/{filename}
-            version_path = models_dir_path / model_type / f"{version}" / filename
-            checked_paths.append(str(version_path))
-            if version_path.exists():
-                # Try to load from this location
-                try:
-                    # For NN models, do a quick validation that the file can be loaded
-                    if model_type == 'nn':
-                        import torch
-                        checkpoint = torch.load(version_path, map_location='cpu')
-                        model_config = checkpoint.get('model_config', {})
-                        # Check if required config values are present
-                        if not model_config.get('input_dim') or not model_config.get('output_dim'):
-                            load_errors.append(f"{version_path}: Missing required model_config (input_dim or output_dim is None)")
-                            continue
-                    
-                    model_path = version_path
-                    break
-                except Exception as e:
-                    # Loading failed from this location, try next
-                    load_errors.append(f"{version_path}: {str(e)}")
-                    continue
-            
-            # Fallback: Check flat directory structure (files directly in directory)
-            # This handles cases like /kaggle/input/cafa6-models/pytorch/neural-network/4/nn_3.1_P.pth
-            flat_path = models_dir_path / filename
-            checked_paths.append(str(flat_path))
-            if flat_path.exists():
-                # Try to load from flat structure
-                try:
-                    # For NN models, do a quick validation that the file can be loaded
-                    if model_type == 'nn':
-                        import torch
-                        checkpoint = torch.load(flat_path, map_location='cpu')
-                        model_config = checkpoint.get('model_config', {})
-                        # Check if required config values are present
-                        if not model_config.get('input_dim') or not model_config.get('output_dim'):
-                            load_errors.append(f"{flat_path}: Missing required model_config (input_dim or output_dim is None)")
-                            continue
-                    
-                    model_path = flat_path
-                    break
-                except Exception as e:
-                    # Loading failed from this location, try next
-                    load_errors.append(f"{flat_path}: {str(e)}")
-                    continue
-        
-        if model_path is None:
-            paths_str = '\n    '.join(checked_paths)
-            dirs_str = ', '.join(str(d) for d in search_dirs)
-            error_msg = f"Model not found or failed to load: {filename}\n"
-            error_msg += f"Searched in directories: {dirs_str}\n"
-            error_msg += f"Checked paths:\n    {paths_str}"
-            if load_errors:
-                error_msg += f"\nLoad errors:\n    " + "\n    ".join(load_errors)
-            raise FileNotFoundError(error_msg)
-        
-        print(f"   [OK] Loading {model_type} {version} model for {ont_code} from {model_path.parent.parent.parent.name if 'models' in str(model_path.parent) else model_path.parent.name}")
+    from utils.model_registry import get_model_registry
+    return get_model_registry().load(ont_code, model_type, version, search_dirs)
+
+
+def _load_model_file(model_path: Path, model_type: str, version: str, ont_code: str) -> Tuple[Any, Any, Dict[str, Any]]:
+    """
+    Deserialize one model file found by the model registry.
     
+    Args:
+        model_path: Path to {model_type}_{version}_{ont_code}.pkl|.pth
+        model_type: Model type short name (e.g., 'lr', 'xgb', 'nn')
+        version: Version string from the file name
+        ont_code: Ontology code ('F', 'P', 'C')
+        
+    Returns:
+        tuple: (model, mlb, metadata)
+    """
     # Load model data
     if model_type == 'nn':
         # For NN models, load PyTorch model and MLB separately
         from models.nn import MLPModel
-        import torch
         
         # Load MLB from same directory as model file
         # Supports both nested (models/{type}/{version}/) and flat directory structures
@@ -327,7 +227,6 @@ def load_model(ont_code, model_type, version='latest', models_dir=None, models_s
                     f"Checked: {mlb_path} and {alt_mlb_path}"
                 )
         
-        import pickle
         with open(mlb_path, 'rb') as f:
             mlb = pickle.load(f)
         
@@ -386,61 +285,18 @@ def list_saved_models(ont_code=None, models_dir=None):
             project_root = Path(__file__).parent.parent.parent
             search_dirs.append(project_root / 'data' / 'models')
     
+    from utils.model_registry import get_model_registry
+    
     model_dict = {}  # Use dict to deduplicate: key = (type, version, ont_code)
-    model_list = []
     
-    # Search all directories (in order: MODELS_DIR first, then MODELS_INPUT_DIR)
-    for models_dir_path in search_dirs:
-        if not models_dir_path.exists():
-            continue
-            
-        # Search version subdirectories: models/{type}/{version}/*.pkl
-        for type_dir in models_dir_path.iterdir():
-            if not type_dir.is_dir():
-                continue
-            
-            for version_dir in type_dir.iterdir():
-                if not version_dir.is_dir():
-                    continue
-                
-                for model_file in version_dir.glob("*_*_*.pkl"):
-                    try:
-                        parts = model_file.stem.split('_')
-                        if len(parts) >= 3:
-                            m_type = parts[0]
-                            v_str = parts[1]
-                            m_ont = parts[2]
-                            
-                            if ont_code and m_ont != ont_code:
-                                continue
-                            
-                            # Create deduplication key
-                            key = (m_type, v_str, m_ont)
-                            
-                            # Only add if not already found (MODELS_DIR takes precedence)
-                            if key not in model_dict:
-                                # Load metadata if available
-                                metadata_file = model_file.with_stem(f"{m_type}_{v_str}_{m_ont}_metadata")
-                                metadata_path = metadata_file.with_suffix('.json')
-                                
-                                metadata = None
-                                if metadata_path.exists():
-                                    with open(metadata_path, 'r') as f:
-                                        metadata = json.load(f)
-                                
-                                model_info = {
-                                    'model_type': m_type,
-                                    'version': v_str,
-                                    'ont_code': m_ont,
-                                    'path': str(model_file),
-                                    'metadata': metadata
-                                }
-                                model_dict[key] = model_info
-                                model_list.append(model_info)
-                    except (ValueError, IndexError):
-                        continue
-    
-    return sorted(model_list, key=lambda x: (x['model_type'], float(x['version'].replace('.', '')), x['ont_code']))
+    # Answered from the registry manifest (in order: MODELS_DIR first, then MODELS_INPUT_DIR)
+    for record in get_model_registry().records(search_dirs, ont_code=ont_code):
+        key = (record.model_type, record.version, record.ont_code)
+        # Only add if not already found (MODELS_DIR takes precedence)
+        if key not in model_dict:
+            model_dict[key] = record.to_dict()
+    
+    return sorted(model_dict.values(), key=lambda x: (x['model_type'], float(x['version'].replace('.', '')), x['ont_code']))
 
 
 def check_model_exists(ont_code: str, model_type: str, version: Union[int, str], 
@@ -480,47 +336,21 @@ def check_model_exists(ont_code: str, model_type: str, version: Union[int, str],
     if not any(d.exists() for d in search_dirs):
         return False
     
+    # Answered from the registry manifest (rescanned if a directory listing changed)
+    from utils.model_registry import get_model_registry
+    
     # Determine file extension based on model type
     file_ext = MODEL_FILE_EXTENSION_PTH if model_type == 'nn' else MODEL_FILE_EXTENSION_PKL
-    
-    if version == 'latest':
-        # Check if any version exists across all search directories
-        model_files = []
-        
-        for models_dir_path in search_dirs:
-            if not models_dir_path.exists():
-                continue
-                
-            type_dir = models_dir_path / model_type
-            
-            # Search version subdirectories
-            if type_dir.exists():
-                for version_dir in type_dir.iterdir():
-                    if version_dir.is_dir():
-                        pattern = f"{model_type}_*_{ont_code}{file_ext}"
-                        model_files.extend(list(version_dir.glob(pattern)))
-        
-        return len(model_files) > 0
-    else:
-        # Check for specific version - try all locations
-        filename = f"{model_type}_{version}_{ont_code}{file_ext}"
-        
-        for models_dir_path in search_dirs:
-            if not models_dir_path.exists():
-                continue
-                
-            type_dir = models_dir_path / model_type
-            version_path = type_dir / f"{version}" / filename
-            
-            if version_path.exists():
-                return True
-        
-        return False
+    records = get_model_registry().records(
+        search_dirs, model_type=model_type, ont_code=ont_code,
+        version=None if version == 'latest' else str(version)
+    )
+    return any(record.path.suffix == file_ext for record in records)
 
 
 def get_model_summary(models_dir=None):
     """
-    Get a summary of all saved models.
+    Get a summary of all saved models (from the registry manifest and metadata sidecars).
     
     Args:
         models_dir: Models directory (defaults to kaggle/working/models)
@@ -551,9 +381,11 @@ def get_model_summary(models_dir=None):
         for ont_code in ['F', 'P', 'C']:
             if ont_code in ontologies:
                 model = ontologies[ont_code]
-                lines.append(f"  {ont_code}: {model['timestamp']} "
-                           f"(n_features={model['n_features']}, "
-                           f"n_classes={model['n_classes']})")
+                metadata = model['metadata'] or {}
+                lines.append(f"  {ont_code}: {metadata.get('timestamp', 'unknown time')} "
+                           f"(n_features={metadata.get('n_features')}, "
+                           f"n_classes={metadata.get('n_classes')}, "
+                           f"{model['size_bytes'] / (1024 ** 2):.1f}MB)")
             else:
                 lines.append(f"  {ont_code}: Not available")
     
@@ -592,6 +424,9 @@ def save_pytorch_model(model: Any, model_path: Union[str, Path],
             actual_model = model
         
         # Save model state dict
+        metadata = dict(metadata or {})
+        metadata.setdefault('timestamp', datetime.now().isoformat())
+        tmp_path = model_path.with_name(f".{model_path.name}.tmp")
         torch.save({
             'model_state_dict': actual_model.state_dict(),
             'model_class': actual_model.__class__.__name__,
@@ -601,8 +436,15 @@ def save_pytorch_model(model: Any, model_path: Union[str, Path],
                 'hidden_dims': getattr(actual_model, 'hidden_dims', None),
                 'dropout_rate': getattr(actual_model, 'dropout_rate', None)
             },
-            'metadata': metadata or {}
-        }, model_path)
+            'metadata': metadata
+        }, tmp_path)
+        # Replace atomically: a process that memory-mapped the previous file keeps its inode
+        os.replace(tmp_path, model_path)
+        
+        # Sidecar metadata (read by the model registry without opening the model file)
+        metadata_path = model_path.with_name(f"{model_path.stem}_metadata.json")
+        with open(metadata_path, 'w') as f:
+            json.dump(metadata, f, indent=2, default=str)
         
         print(f"   ✓ Saved PyTorch model to {model_path}")
         return str(model_path)
@@ -638,8 +480,18 @@ def load_pytorch_model(model_path: Union[str, Path], model_class=None,
         raise FileNotFoundError(f"Model file {model_path} not found")
     
     try:
-        # Load model data
-        checkpoint = torch.load(model_path, map_location=device)
+        # Load model data (memory-mapped: tensor pages are read on demand and shared via the page cache)
+        from config.training import MODEL_LOAD_MMAP
+        checkpoint = None
+        use_mmap = MODEL_LOAD_MMAP and str(device) == 'cpu'
+        if use_mmap:
+            try:
+                checkpoint = torch.load(model_path, map_location='cpu', mmap=True, weights_only=False)
+            except (TypeError, RuntimeError):
+                # Older torch or legacy (non-zipfile) serialization
+                use_mmap = False
+        if checkpoint is None:
+            checkpoint = torch.load(model_path, map_location=device)
         
         # Extract model configuration
         model_config = checkpoint.get('model_config', {})
@@ -661,7 +513,11 @@ def load_pytorch_model(model_path: Union[str, Path], model_class=None,
             # Filter out None values to avoid issues with optional parameters
             filtered_config = {k: v for k, v in model_config.items() if v is not None}
             model = model_class(**filtered_config)
-            model.load_state_dict(checkpoint['model_state_dict'])
+            if use_mmap:
+                # assign=True keeps the memory-mapped tensors instead of copying into fresh parameters
+                model.load_state_dict(checkpoint['model_state_dict'], assign=True)
+            else:
+                model.load_state_dict(checkpoint['model_state_dict'])
             model.to(device)
             model.eval()
         else:
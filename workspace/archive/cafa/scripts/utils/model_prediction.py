@@ -19,6 +19,8 @@ def predict_with_model(model: Any,
     Handles:
     - sklearn models (LogisticRegression, XGBoost) via predict_proba()
     - PyTorch models (MLP v1, v2, v3) via centralized inference utilities
+    - PyTorch MLPs on CPU via the BatchNorm-folded CPU inference engine
+      (utils/cpu_inference.py, CPU_INFERENCE_ENABLED)
     
     NOW USES: Centralized utilities from utils/gpu_utils and local functions.
     Follows DRY/SOLID principles - single source of truth for inference.
@@ -43,14 +45,23 @@ def predict_with_model(model: Any,
         return model.predict_proba(X)
     
     # PyTorch model - use centralized inference
-        if device is None:
-            from utils.gpu_utils import get_device
+    if device is None:
+        from utils.gpu_utils import get_device
         device = get_device()
     
     # Get batch size from config if not provided
     if batch_size is None:
         from config.features import get_batch_size
         batch_size = get_batch_size("nn_inference")
+    
+    # CPU: folded (optionally int8) engine, built once per model and reused across batches
+    from config.prediction import CPU_INFERENCE_ENABLED
+    from utils.cpu_inference import get_cpu_inference_engine, supports_cpu_inference
+    if CPU_INFERENCE_ENABLED and str(device).startswith('cpu') and supports_cpu_inference(model):
+        try:
+            return get_cpu_inference_engine(model, batch_size=batch_size).predict(X)
+        except Exception as e:
+            raise ValueError(f"Error predicting with CPU inference engine: {e}")
         
     # Use centralized PyTorch inference
     try:
@@ -0,0 +1,279 @@
+"""
+In-process model registry for CAFA 6 protein function prediction.
+
+Indexes each models directory once into a manifest of saved models
+(ont_code, model_type, version, size, path, mtime, sidecar metadata) and loads
+models lazily through a byte-budgeted LRU cache, so ensemble members and
+ontologies that share a model deserialize it once per process.
+
+- Manifest: built from directory listings and *_metadata.json sidecars only
+  (model files are never opened); a directory is rescanned when its mtime or the
+  mtime of one of its type/version subdirectories changes.
+- Cache: keyed by (path, mtime, size), so a model file rewritten in place is reloaded.
+  Cached objects are shared between callers - treat them as read-only.
+- PyTorch state dicts are loaded with torch.load(mmap=True) where supported.
+"""
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+MANIFEST_SKIP_SUFFIXES = ('_mlb', '_metadata')
+
+
+class ModelRecord(NamedTuple):
+    """One saved model file in the manifest."""
+    ont_code: str
+    model_type: str
+    version: str
+    size_bytes: int
+    path: Path
+    mtime: float
+    models_dir: Path
+    metadata: Optional[Dict[str, Any]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """list_saved_models() representation."""
+        return {
+            'model_type': self.model_type,
+            'version': self.version,
+            'ont_code': self.ont_code,
+            'path': str(self.path),
+            'size_bytes': self.size_bytes,
+            'mtime': self.mtime,
+            'metadata': self.metadata,
+        }
+
+
+def version_sort_key(version: str) -> Union[int, float]:
+    """Numeric version as compared by load_model(version='latest') ("1.1" -> 1.1, "3" -> 3)."""
+    return float(version) if '.' in version else int(version)
+
+
+def _parse_model_filename(path: Path) -> Optional[Tuple[str, str, str]]:
+    """(model_type, version, ont_code) from '{type}_{version}_{ont}.pkl|.pth', None for other files."""
+    from config.training import MODEL_FILE_EXTENSION_PKL, MODEL_FILE_EXTENSION_PTH, VALID_ONTOLOGY_CODES
+
+    if path.suffix not in (MODEL_FILE_EXTENSION_PKL, MODEL_FILE_EXTENSION_PTH):
+        return None
+    if any(path.stem.endswith(suffix) for suffix in MANIFEST_SKIP_SUFFIXES):
+        return None
+    parts = path.stem.split('_')
+    if len(parts) != 3 or parts[2] not in VALID_ONTOLOGY_CODES:
+        return None
+    try:
+        version_sort_key(parts[1])
+    except ValueError:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def _estimate_nbytes(model: Any, file_size: int) -> int:
+    """Resident size of a deserialized model (PyTorch tensors; file size for pickled models)."""
+    if hasattr(model, 'parameters') and hasattr(model, 'buffers'):
+        return sum(t.numel() * t.element_size() for t in list(model.parameters()) + list(model.buffers()))
+    return file_size
+
+
+class ModelRegistry:
+    """Manifest of saved models plus an LRU cache of loaded (model, mlb, metadata) tuples."""
+
+    def __init__(self, max_cache_bytes: Optional[int] = None):
+        """
+        Args:
+            max_cache_bytes: Budget for cached deserialized models (default: MODEL_CACHE_MAX_GB)
+        """
+        from config.training import MODEL_CACHE_MAX_GB, GB_TO_BYTES
+
+        self.max_cache_bytes = max_cache_bytes if max_cache_bytes is not None else int(MODEL_CACHE_MAX_GB * GB_TO_BYTES)
+        # models_dir -> {'records': [...], 'dir_mtimes': {dir: mtime}}
+        self._manifests: Dict[Path, Dict[str, Any]] = {}
+        self._cache: 'OrderedDict[Tuple[str, float, int], Tuple[Tuple[Any, Any, Dict], int]]' = OrderedDict()
+        self._cache_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+    def _scan(self, models_dir: Path) -> Dict[str, Any]:
+        """Index {type}/{version}/ files and flat files directly in models_dir."""
+        records = []
+        dir_mtimes = {models_dir: models_dir.stat().st_mtime}
+        candidate_dirs = []
+        for type_dir in models_dir.iterdir():
+            if not type_dir.is_dir():
+                continue
+            dir_mtimes[type_dir] = type_dir.stat().st_mtime
+            for version_dir in type_dir.iterdir():
+                if version_dir.is_dir():
+                    dir_mtimes[version_dir] = version_dir.stat().st_mtime
+                    candidate_dirs.append(version_dir)
+        # Flat layout last, as load_model checks models/{type}/{version}/ before the flat fallback
+        candidate_dirs.append(models_dir)
+
+        for directory in candidate_dirs:
+            for path in directory.iterdir():
+                parsed = _parse_model_filename(path) if path.is_file() else None
+                if parsed is None:
+                    continue
+                model_type, version, ont_code = parsed
+                metadata = None
+                metadata_path = path.with_name(f"{path.stem}_metadata.json")
+                if metadata_path.exists():
+                    try:
+                        with open(metadata_path, 'r') as f:
+                            metadata = json.load(f)
+                    except (OSError, json.JSONDecodeError):
+                        metadata = None
+                stat = path.stat()
+                records.append(ModelRecord(ont_code, model_type, version, stat.st_size, path,
+                                           stat.st_mtime, models_dir, metadata))
+        return {'records': records, 'dir_mtimes': dir_mtimes}
+
+    def _is_stale(self, manifest: Dict[str, Any], models_dir: Path) -> bool:
+        """A directory listing changed since the scan (files added/removed/renamed)."""
+        # New type/version subdirectories change their parent's mtime
+        try:
+            return any(directory.stat().st_mtime != mtime for directory, mtime in manifest['dir_mtimes'].items())
+        except OSError:
+            return True
+
+    def manifest(self, models_dir: Union[str, Path]) -> List[ModelRecord]:
+        """Records for one models directory (scanned on first use or when its listing changed)."""
+        models_dir = Path(models_dir).resolve()
+        if not models_dir.exists():
+            self._manifests.pop(models_dir, None)
+            return []
+        cached = self._manifests.get(models_dir)
+        if cached is None or self._is_stale(cached, models_dir):
+            cached = self._scan(models_dir)
+            self._manifests[models_dir] = cached
+        return cached['records']
+
+    def records(self,
+                search_dirs: Sequence[Union[str, Path]],
+                model_type: Optional[str] = None,
+                ont_code: Optional[str] = None,
+                version: Optional[str] = None) -> List[ModelRecord]:
+        """
+        Matching records, earlier search directories first (versioned layout before flat within a directory).
+        """
+        matches = []
+        for models_dir in search_dirs:
+            for record in self.manifest(models_dir):
+                if model_type is not None and record.model_type != model_type:
+                    continue
+                if ont_code is not None and record.ont_code != ont_code:
+                    continue
+                if version is not None and record.version != str(version):
+                    continue
+                matches.append(record)
+        return matches
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Drop manifests (all, or the one containing path) so the next lookup rescans."""
+        if path is None:
+            self._manifests.clear()
+            return
+        path = Path(path).resolve()
+        for models_dir in list(self._manifests):
+            if models_dir == path or models_dir in path.parents:
+                del self._manifests[models_dir]
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _cache_get(self, key: Tuple[str, float, int]) -> Optional[Tuple[Any, Any, Dict]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        self._cache.move_to_end(key)
+        return entry[0]
+
+    def _cache_put(self, key: Tuple[str, float, int], value: Tuple[Any, Any, Dict], nbytes: int) -> None:
+        if nbytes > self.max_cache_bytes:
+            print(f"   🗃️  Model too large for cache ({nbytes / (1024 ** 2):.1f}MB > budget) - not cached")
+            return
+        self._cache[key] = (value, nbytes)
+        self._cache_bytes += nbytes
+        while self._cache_bytes > self.max_cache_bytes:
+            evicted_key, (_, evicted_bytes) = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted_bytes
+            print(f"   🗃️  Model cache evicted {Path(evicted_key[0]).name} ({evicted_bytes / (1024 ** 2):.1f}MB)")
+
+    def load_record(self, record: ModelRecord) -> Tuple[Any, Any, Dict[str, Any]]:
+        """(model, mlb, metadata) for a record, from the cache when the file is unchanged."""
+        from utils.model_io import _load_model_file
+
+        stat = record.path.stat()
+        key = (str(record.path), stat.st_mtime, stat.st_size)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.hits += 1
+            print(f"   🗃️  Model cache hit: {record.path.name} (hits: {self.hits}, misses: {self.misses})")
+            return cached
+
+        self.misses += 1
+        loaded = _load_model_file(record.path, record.model_type, record.version, record.ont_code)
+        self._cache_put(key, loaded, _estimate_nbytes(loaded[0], stat.st_size))
+        return loaded
+
+    def load(self,
+             ont_code: str,
+             model_type: str,
+             version: Union[str, int],
+             search_dirs: Sequence[Union[str, Path]]) -> Tuple[Any, Any, Dict[str, Any]]:
+        """
+        Load a model the way load_model resolves it.
+
+        version='latest' picks the highest numeric version (earlier directories win ties);
+        a specific version tries each directory in order and falls back to the next one
+        when loading fails.
+
+        Raises:
+            FileNotFoundError: No matching model, or every candidate failed to load
+        """
+        dirs_str = ', '.join(str(d) for d in search_dirs)
+        if version == 'latest':
+            candidates = self.records(search_dirs, model_type=model_type, ont_code=ont_code)
+            if not candidates:
+                raise FileNotFoundError(f"No {model_type} models found for {ont_code} in {dirs_str}")
+            latest = max(version_sort_key(record.version) for record in candidates)
+            candidates = [record for record in candidates if version_sort_key(record.version) == latest][:1]
+            print(f"   [OK] Loading latest {model_type} {candidates[0].version} model for {ont_code} "
+                  f"from {candidates[0].models_dir.name}")
+        else:
+            candidates = self.records(search_dirs, model_type=model_type, ont_code=ont_code, version=str(version))
+            if not candidates:
+                raise FileNotFoundError(f"Model not found: {model_type}_{version}_{ont_code}\n"
+                                        f"Searched in directories: {dirs_str}")
+
+        load_errors = []
+        for record in candidates:
+            try:
+                if version != 'latest':
+                    print(f"   [OK] Loading {model_type} {version} model for {ont_code} from {record.models_dir.name}")
+                return self.load_record(record)
+            except Exception as e:
+                # Loading failed from this location, try next
+                load_errors.append(f"{record.path}: {e}")
+        raise FileNotFoundError(f"Model failed to load: {model_type}_{version}_{ont_code}\n"
+                                f"Searched in directories: {dirs_str}\n"
+                                f"Load errors:\n    " + "\n    ".join(load_errors))
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self._cache_bytes = 0
+
+
+_default_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide registry (cache and hit/miss counts shared by all load_model calls)."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry()
+    return _default_registry
@@ -0,0 +1,365 @@
+"""
+Stage-level run profiling for CAFA 6 pipelines.
+
+Major stages (load sequences, extract features, labels, train per ontology, predict,
+post-process, GOA filter) are wrapped in spans:
+
+    with profile_span('predict', ontology='F') as span:
+        ...
+        span.add_rows(n_written)
+
+    @profiled('extract_features', rows=lambda result: len(result[1]))
+    def extract_features(...): ...
+
+While a run profile is active (run.py --profile), every span appends one JSON line
+to the profile: wall time, CPU time, RSS at start/end, process peak RSS, rows and
+rows/s, nesting path, pid and thread. Spans are no-ops otherwise. Worker processes
+started during the run (e.g. process-based ontology training) append to the same
+file: the profile path is passed on through the environment. Optionally the
+outermost main-thread spans also run under cProfile, one .prof file per span.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+_PROFILE_ENV_VAR = 'CAFA_RUN_PROFILE'
+
+_active: Optional['RunProfile'] = None
+_active_lock = threading.Lock()
+_local = threading.local()
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB (None where unavailable)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Span:
+    """One timed stage; add_rows()/set() fill in what the stage processed."""
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.rows: Optional[int] = None
+
+    def add_rows(self, n: int) -> None:
+        self.rows = (self.rows or 0) + int(n)
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+
+class RunProfile:
+    """
+    JSONL run profile: one 'run' header line, then one line per finished span.
+
+    Lines are appended and flushed as spans finish, so a crashed run keeps the
+    stages it completed.
+    """
+
+    def __init__(self, path: Union[str, Path], cprofile: bool = False, run_info: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            path: JSONL file to append to
+            cprofile: Run outermost main-thread spans under cProfile
+            run_info: Header fields (pipeline, argv, ...); None when attaching from a worker process
+        """
+        self.path = Path(path)
+        self.cprofile = cprofile
+        self.cprofile_paths: List[Path] = []
+        self._lock = threading.Lock()
+        self._cprofile_active = False
+        self._span_count = 0
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        if run_info is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.write({'event': 'run', 'started': time.strftime('%Y-%m-%dT%H:%M:%S'), 'pid': os.getpid(),
+                        **run_info})
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + '\n'
+        with self._lock:
+            # One write per line in append mode: lines from worker processes do not interleave
+            with open(self.path, 'a') as f:
+                f.write(line)
+
+    def finish(self, **fields: Any) -> None:
+        """Append the 'run_end' line: total wall/CPU time and peak RSS (plus e.g. status)."""
+        self.write({'event': 'run_end', 'wall_s': round(time.perf_counter() - self._wall_start, 6),
+                    'cpu_s': round(time.process_time() - self._cpu_start, 6), 'peak_rss_mb': peak_rss_mb(),
+                    **fields})
+
+    def _cprofile_path(self, name: str) -> Path:
+        with self._lock:
+            self._span_count += 1
+            return self.path.with_name(f"{self.path.stem}.{os.getpid()}.{self._span_count:03d}_{name}.prof")
+
+
+def _span_stack() -> List[str]:
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def start_run_profile(path: Optional[Union[str, Path]] = None,
+                      cprofile: bool = False,
+                      **run_info: Any) -> RunProfile:
+    """
+    Start recording spans for this run (and worker processes it starts).
+
+    Args:
+        path: JSONL profile path (default: RUN_PROFILE_DIR/<pipeline>_<timestamp>.jsonl)
+        cprofile: Also run outermost spans under cProfile (.prof files next to the profile)
+        **run_info: Header fields, e.g. pipeline='train_only', model='xgboost_v1'
+
+    Returns:
+        RunProfile
+    """
+    global _active
+    if path is None:
+        from config.paths import RUN_PROFILE_DIR
+        path = RUN_PROFILE_DIR / f"{run_info.get('pipeline', 'run')}_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    profile = RunProfile(path, cprofile=cprofile, run_info={'argv': sys.argv, 'cprofile': cprofile, **run_info})
+    with _active_lock:
+        _active = profile
+    os.environ[_PROFILE_ENV_VAR] = str(profile.path)
+    return profile
+
+
+def stop_run_profile() -> Optional[RunProfile]:
+    """Stop recording; returns the profile that was active."""
+    global _active
+    with _active_lock:
+        profile, _active = _active, None
+    os.environ.pop(_PROFILE_ENV_VAR, None)
+    return profile
+
+
+def get_run_profile() -> Optional[RunProfile]:
+    """Active run profile (in a worker process: the parent's, attached on first use)."""
+    global _active
+    if _active is None and os.environ.get(_PROFILE_ENV_VAR):
+        with _active_lock:
+            if _active is None:
+                _active = RunProfile(os.environ[_PROFILE_ENV_VAR])
+    return _active
+
+
+@contextmanager
+def profile_span(name: str, rows: Optional[int] = None, **attrs: Any) -> Iterator[Span]:
+    """
+    Time a pipeline stage.
+
+    Args:
+        name: Stage name ('load_sequences', 'extract_features', 'train', 'predict', ...)
+        rows: Rows processed, if known up front (or call span.add_rows())
+        **attrs: Extra fields recorded with the span (ontology, datatype, ...)
+
+    Yields:
+        Span
+    """
+    span = Span(name, attrs)
+    if rows is not None:
+        span.add_rows(rows)
+    profile = get_run_profile()
+    if profile is None:
+        yield span
+        return
+
+    stack = _span_stack()
+    path = '/'.join(stack + [name])
+    stack.append(name)
+    profiler = None
+    if profile.cprofile and not profile._cprofile_active and threading.current_thread() is threading.main_thread():
+        import cProfile
+        profiler = cProfile.Profile()
+        profile._cprofile_active = True
+    started_at = time.time()
+    rss_start = current_rss_mb()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    error = None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield span
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profile._cprofile_active = False
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        stack.pop()
+        record = OrderedDict([
+            ('event', 'span'),
+            ('name', name),
+            ('path', path),
+            ('depth', len(stack)),
+            ('started_at', round(started_at, 6)),
+            ('wall_s', round(wall, 6)),
+            ('cpu_s', round(cpu, 6)),
+            ('rss_start_mb', rss_start),
+            ('rss_end_mb', current_rss_mb()),
+            ('peak_rss_mb', peak_rss_mb()),
+            ('rows', span.rows),
+            ('rows_per_s', span.rows / wall if span.rows is not None and wall > 0 else None),
+            ('pid', os.getpid()),
+            ('thread', threading.current_thread().name),
+            ('error', error),
+        ])
+        record.update(span.attrs)
+        if profiler is not None:
+            prof_path = profile._cprofile_path(name)
+            profiler.dump_stats(str(prof_path))
+            profile.cprofile_paths.append(prof_path)
+            record['cprofile'] = str(prof_path)
+        profile.write(record)
+
+
+def profiled(name: Optional[str] = None,
+             rows: Optional[Callable[[Any], Optional[int]]] = None,
+             **attrs: Any) -> Callable:
+    """
+    Decorator form of profile_span.
+
+    Args:
+        name: Stage name (default: function name)
+        rows: result -> rows processed
+        **attrs: Extra fields recorded with the span
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_span(span_name, **attrs) as span:
+                result = func(*args, **kwargs)
+                if rows is not None and get_run_profile() is not None:
+                    try:
+                        n = rows(result)
+                    except (TypeError, IndexError, AttributeError):
+                        n = None
+                    if n is not None:
+                        span.add_rows(n)
+                return result
+        return wrapper
+    return decorator
+
+
+def load_run_profile(path: Union[str, Path], event: str = 'span') -> List[Dict[str, Any]]:
+    """Records of one event type ('run', 'span' or 'run_end') from a JSONL run profile."""
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                if record.get('event') == event:
+                    records.append(record)
+    return records
+
+
+def summarize_run_profile(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aggregate spans by stage path (and ontology), ordered by first start (parents before children).
+
+    Returns:
+        list[dict]: stage, calls, wall_s, cpu_s, cpu_util, peak_rss_mb, rows, rows_per_s, errors
+    """
+    groups: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+    for record in sorted(records, key=lambda r: r.get('started_at', 0.0)):
+        key = (record['path'], record.get('ontology'))
+        group = groups.setdefault(key, {
+            'stage': '  ' * record.get('depth', 0) + record['name']
+                     + (f"[{record['ontology']}]" if record.get('ontology') else ''),
+            'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'peak_rss_mb': None, 'rows': None, 'errors': 0,
+        })
+        group['calls'] += 1
+        group['wall_s'] += record['wall_s']
+        group['cpu_s'] += record['cpu_s']
+        if record.get('peak_rss_mb') is not None:
+            group['peak_rss_mb'] = max(group['peak_rss_mb'] or 0.0, record['peak_rss_mb'])
+        if record.get('rows') is not None:
+            group['rows'] = (group['rows'] or 0) + record['rows']
+        if record.get('error'):
+            group['errors'] += 1
+    summary = []
+    for group in groups.values():
+        group['cpu_util'] = group['cpu_s'] / group['wall_s'] if group['wall_s'] > 0 else 0.0
+        group['rows_per_s'] = group['rows'] / group['wall_s'] if group['rows'] and group['wall_s'] > 0 else None
+        summary.append(group)
+    return summary
+
+
+def print_run_profile_summary(path: Union[str, Path], cprofile_top_n: Optional[int] = None) -> None:
+    """
+    Print the per-stage table of a run profile, plus the top cProfile entries of each profiled span.
+
+    Args:
+        path: JSONL run profile
+        cprofile_top_n: Functions to list per cProfile dump (default: RUN_PROFILE_CPROFILE_TOP_N)
+    """
+    from config.pipelines import RUN_PROFILE_CPROFILE_TOP_N
+
+    records = load_run_profile(path)
+    print(f"\n📊 Run profile: {path}")
+    if not records:
+        print("   (no spans recorded)")
+        return
+
+    def fmt(value, width, spec):
+        return format(value, f'>{width}{spec}') if value is not None else '-'.rjust(width)
+
+    header = (f"   {'stage':<32} {'calls':>5} {'wall_s':>9} {'cpu_s':>9} {'cpu/wall':>8} "
+              f"{'peak_rss_mb':>11} {'rows':>12} {'rows/s':>11}")
+    print(header)
+    print("   " + "-" * (len(header) - 3))
+    for row in summarize_run_profile(records):
+        stage = row['stage'] + (f" ❌{row['errors']}" if row['errors'] else '')
+        print(f"   {stage:<32} {row['calls']:>5} {row['wall_s']:>9.2f} {row['cpu_s']:>9.2f} "
+              f"{row['cpu_util']:>8.2f} {fmt(row['peak_rss_mb'], 11, '.0f')} {fmt(row['rows'], 12, ',')} "
+              f"{fmt(row['rows_per_s'], 11, ',.0f')}")
+    for run_end in load_run_profile(path, event='run_end'):
+        total_cpu = run_end['cpu_s'] / run_end['wall_s'] if run_end['wall_s'] > 0 else 0.0
+        print(f"   {'total (' + str(run_end.get('status', 'done')) + ')':<32} {'':>5} {run_end['wall_s']:>9.2f} "
+              f"{run_end['cpu_s']:>9.2f} {total_cpu:>8.2f} {fmt(run_end.get('peak_rss_mb'), 11, '.0f')}")
+
+    prof_records = [r for r in records if r.get('cprofile')]
+    if prof_records:
+        import pstats
+        top_n = cprofile_top_n or RUN_PROFILE_CPROFILE_TOP_N
+        for record in prof_records:
+            print(f"\n   🔬 cProfile {record['path']} ({record['wall_s']:.1f}s): {record['cprofile']}")
+            pstats.Stats(record['cprofile'], stream=sys.stdout).sort_stats('cumulative').print_stats(top_n)